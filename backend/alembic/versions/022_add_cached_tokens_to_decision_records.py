@@ -0,0 +1,28 @@
+"""Add cached_tokens to decision_records
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "decision_records",
+        sa.Column(
+            "cached_tokens",
+            sa.Integer(),
+            nullable=False,
+            server_default="0"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("decision_records", "cached_tokens")
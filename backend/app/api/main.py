@@ -128,6 +128,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Redis: Connection failed - {e}")
 
+    # Forward background backtest progress to websocket clients
+    from ..services.backtest_jobs import get_backtest_progress_relay
+
+    get_backtest_progress_relay().start()
+
     # Initialize metrics
     collector = get_metrics_collector()
     collector.set_app_info(settings.app_version, settings.environment)
@@ -178,15 +183,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Unified Worker Manager: Error stopping - {e}")
 
-    # Close task queue connections if in distributed mode
-    if settings.worker_distributed:
-        try:
-            from ..workers.queue import close_task_queue
+    await get_backtest_progress_relay().stop()
 
-            await close_task_queue()
-            logger.info("Task Queue: Closed")
-        except Exception as e:
-            logger.error(f"Task Queue: Error closing - {e}")
+    # Close task queue connections (distributed mode and background backtests)
+    try:
+        from ..workers.queue import close_task_queue
+
+        await close_task_queue()
+        logger.info("Task Queue: Closed")
+    except Exception as e:
+        logger.error(f"Task Queue: Error closing - {e}")
 
     # Close exchange connection pool
     try:
@@ -195,6 +201,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"ExchangePool: Error closing - {e}")
 
+    # Close pooled AI client connections
+    try:
+        from ..services.ai.factory import close_client_pools
+
+        await close_client_pools()
+        logger.info("AI client pool: Closed")
+    except Exception as e:
+        logger.error(f"AI client pool: Error closing - {e}")
+
     await close_db()
     await close_redis()
 
@@ -4,6 +4,7 @@ Backtest API routes.
 Endpoints for running strategy backtests.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Literal, Optional
@@ -14,6 +15,7 @@ from pydantic import BaseModel, Field
 
 from ...backtest import BacktestEngine, DataProvider
 from ...backtest.data_provider import DataProvider as _DP  # for SUPPORTED_EXCHANGES
+from ...backtest.metrics import downsample_points
 from ...core.config import get_settings
 from ...services.ai import get_ai_client, resolve_provider_credentials
 from ...core.dependencies import (
@@ -37,6 +39,7 @@ settings = get_settings()
 
 SUPPORTED_EXCHANGES = _DP.SUPPORTED_EXCHANGES
 ExchangeLiteral = Literal["binance", "bybit", "okx", "hyperliquid"]
+IntrabarPolicyLiteral = Literal["stop_first", "target_first", "nearest_first"]
 
 
 class BacktestRequest(BaseModel):
@@ -58,6 +61,19 @@ class BacktestRequest(BaseModel):
     exchange: ExchangeLiteral = Field(
         default="hyperliquid", description="Exchange data source"
     )
+    intrabar_policy: IntrabarPolicyLiteral = Field(
+        default="stop_first",
+        description="Which of stop loss / take profit fills first when a candle touches both",
+    )
+    intrabar_timeframe: str | None = Field(
+        default=None,
+        description="Lower timeframe (e.g. '1m') used to resolve such candles",
+    )
+    ai_replay: bool | None = Field(
+        default=None,
+        description="Reuse AI outputs recorded by earlier runs with identical prompts "
+        "(default: server setting)",
+    )
 
 
 class TradeRecord(BaseModel):
@@ -138,6 +154,17 @@ class BacktestAnalysis(BaseModel):
     recommendations: list[str] = Field(default_factory=list)
 
 
+class DataLoadStats(BaseModel):
+    """Exchange download statistics of the backtest's data load"""
+
+    candles: int
+    requests: int
+    retries: int
+    failed_requests: int
+    seconds: float
+    candles_per_second: float
+
+
 class BacktestResponse(BaseModel):
     """Backtest result response"""
 
@@ -163,6 +190,7 @@ class BacktestResponse(BaseModel):
     trade_statistics: Optional[TradeStatistics] = None
     symbol_breakdown: list[SymbolBreakdown] = Field(default_factory=list)
     analysis: Optional[BacktestAnalysis] = None
+    data_load: Optional[DataLoadStats] = None
 
 
 class QuickBacktestRequest(BaseModel):
@@ -178,6 +206,84 @@ class QuickBacktestRequest(BaseModel):
     exchange: ExchangeLiteral = Field(
         default="hyperliquid", description="Exchange data source"
     )
+    intrabar_policy: IntrabarPolicyLiteral = Field(
+        default="stop_first",
+        description="Which of stop loss / take profit fills first when a candle touches both",
+    )
+    intrabar_timeframe: str | None = Field(
+        default=None,
+        description="Lower timeframe (e.g. '1m') used to resolve such candles",
+    )
+
+
+class SweepRequest(QuickBacktestRequest):
+    """Parameter sweep over the quick (rule-based) backtest"""
+
+    grid: dict[str, list[float]] = Field(
+        description=(
+            "Parameter grid, e.g. {'max_leverage': [2, 5], 'sma_period': [10, 20]}. "
+            "Supported: max_leverage, max_position_ratio, sma_period"
+        )
+    )
+    rank_by: Literal[
+        "sharpe_ratio",
+        "sortino_ratio",
+        "calmar_ratio",
+        "total_return_percent",
+        "max_drawdown_percent",
+    ] = Field(default="sharpe_ratio")
+
+
+class WalkForwardRequest(SweepRequest):
+    """Walk-forward optimization over the quick (rule-based) backtest"""
+
+    in_sample_bars: int = Field(ge=20, description="Bars per optimization window")
+    out_of_sample_bars: int = Field(ge=5, description="Bars per evaluation window")
+    step_bars: Optional[int] = Field(
+        default=None, ge=1, description="Window advance (default: out_of_sample_bars)"
+    )
+    monte_carlo_simulations: int = Field(
+        default=0,
+        ge=0,
+        le=20000,
+        description="Resample the out-of-sample trades this many times (0 = off)",
+    )
+    seed: Optional[int] = None
+
+
+class DistributionSummary(BaseModel):
+    """Summary statistics of a metric distribution"""
+
+    count: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: dict[str, Optional[float]] = Field(default_factory=dict)
+    band: Optional[list[Optional[float]]] = None
+
+
+class MonteCarloResponse(BaseModel):
+    """Monte-Carlo trade resampling result"""
+
+    method: str
+    simulations: int
+    trades: int
+    initial_balance: float
+    confidence: float
+    probability_of_loss: float
+    probability_of_ruin: float
+    total_return_percent: DistributionSummary
+    max_drawdown_percent: DistributionSummary
+
+
+class MonteCarloRequest(BaseModel):
+    """Monte-Carlo resampling of a persisted backtest's trades"""
+
+    simulations: int = Field(default=1000, ge=100, le=20000)
+    method: Literal["bootstrap", "shuffle"] = Field(default="bootstrap")
+    confidence: float = Field(default=0.9, ge=0.5, le=0.99)
+    seed: Optional[int] = None
 
 
 def _build_response(result) -> BacktestResponse:
@@ -261,17 +367,18 @@ def _build_response(result) -> BacktestResponse:
         max_drawdown_percent=result.max_drawdown_percent,
         sharpe_ratio=result.sharpe_ratio,
         total_fees=result.total_fees,
-        equity_curve=result.equity_curve[:limit],
+        equity_curve=downsample_points(result.equity_curve, limit),
         trades=trade_records,
-        drawdown_curve=result.drawdown_curve[:limit],
+        drawdown_curve=downsample_points(result.drawdown_curve, limit),
         monthly_returns=monthly_returns,
         trade_statistics=trade_statistics,
         symbol_breakdown=symbol_breakdown,
         analysis=analysis,
+        data_load=result.data_load,
     )
 
 
-@router.post("/run", response_model=BacktestResponse)
+@router.post("/run", response_model=BacktestResponse, deprecated=True)
 async def run_backtest(
     request: BacktestRequest,
     db: DbSessionDep,
@@ -283,6 +390,8 @@ async def run_backtest(
     Run backtest for a saved strategy.
 
     Fetches historical data and simulates strategy execution.
+
+    Deprecated: runs inside the API process; use ``/run/async``.
     """
     # Get strategy
     repo = StrategyRepository(db)
@@ -370,6 +479,9 @@ async def run_backtest(
             use_ai=request.use_ai,
             ai_client=ai_client,
             analysis_ai_client=analysis_ai_client,
+            intrabar_policy=request.intrabar_policy,
+            intrabar_timeframe=request.intrabar_timeframe,
+            ai_replay=request.ai_replay,
         )
 
         result = await engine.run()
@@ -386,7 +498,7 @@ async def run_backtest(
         raise backtest_failed_error(e)
 
 
-@router.post("/quick", response_model=BacktestResponse)
+@router.post("/quick", response_model=BacktestResponse, deprecated=True)
 async def quick_backtest(
     request: QuickBacktestRequest,
     user_id: CurrentUserDep,
@@ -399,6 +511,8 @@ async def quick_backtest(
 
     Uses default momentum strategy without AI.
     Good for quick market analysis.
+
+    Deprecated: runs inside the API process; use ``/quick/async``.
     """
     from ...db.models import StrategyDB
     from ...models.decision import RiskControls
@@ -446,6 +560,8 @@ async def quick_backtest(
             data_provider=data_provider,
             use_ai=False,
             analysis_ai_client=analysis_ai_client,
+            intrabar_policy=request.intrabar_policy,
+            intrabar_timeframe=request.intrabar_timeframe,
         )
 
         result = await engine.run()
@@ -460,6 +576,228 @@ async def quick_backtest(
         raise backtest_failed_error(e)
 
 
+def _validate_grid(grid: dict[str, list[float]]) -> None:
+    """Reject unknown grid parameters and oversized sweeps (400)."""
+    from ...backtest.sweep import expand_grid
+
+    try:
+        combinations = len(expand_grid(grid))
+    except ValueError as e:
+        raise create_http_exception(
+            ErrorCode.VALIDATION_ERROR,
+            user_message=str(e),
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    if combinations > settings.backtest_sweep_max_combinations:
+        raise create_http_exception(
+            ErrorCode.VALIDATION_ERROR,
+            user_message=(
+                f"Parameter sweep needs {combinations} backtest runs; "
+                f"the limit is {settings.backtest_sweep_max_combinations}"
+            ),
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+# ==================== Background Jobs ====================
+
+
+class BacktestJobResponse(BaseModel):
+    """Status of a backtest running in a background worker"""
+
+    job_id: str
+    kind: str
+    status: str
+    progress: float = 0.0
+    candles_processed: int = 0
+    total_candles: int = 0
+    equity: Optional[float] = None
+    result_id: Optional[str] = None
+    # Sweep / walk-forward output (these are not saved as backtest records)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+async def _get_queue():
+    """Task queue for background backtests (503 when Redis is unavailable)."""
+    from ...workers.queue import get_task_queue_service
+
+    try:
+        return await get_task_queue_service()
+    except Exception as e:
+        raise create_http_exception(
+            ErrorCode.SERVICE_UNAVAILABLE,
+            user_message="Background backtests are temporarily unavailable",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            internal_error=e,
+        )
+
+
+async def _submit_job(user_id: str, kind: str, params: dict) -> BacktestJobResponse:
+    from ...workers.queue import BacktestLimitExceeded
+
+    queue = await _get_queue()
+    try:
+        job_id = await queue.submit_backtest(user_id, kind, params)
+    except BacktestLimitExceeded as e:
+        raise create_http_exception(
+            ErrorCode.VALIDATION_ERROR,
+            user_message=str(e),
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+    if job_id is None:
+        raise create_http_exception(
+            ErrorCode.SERVICE_UNAVAILABLE,
+            user_message="Failed to queue backtest",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    job = await queue.get_backtest_job(job_id, user_id)
+    return BacktestJobResponse(**job)
+
+
+@router.post(
+    "/run/async",
+    response_model=BacktestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def run_backtest_async(
+    request: BacktestRequest,
+    db: DbSessionDep,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Queue a saved-strategy backtest for a background worker.
+
+    The result is saved to the backtest records when the job completes.
+    Progress is pushed over the websocket as ``backtest_progress`` messages.
+    """
+    strategy = await StrategyRepository(db).get_by_id(request.strategy_id, user_id)
+    if not strategy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Strategy not found"
+        )
+    if request.use_ai and not request.ai_model:
+        raise create_http_exception(
+            ErrorCode.VALIDATION_ERROR,
+            user_message="AI model is required when use_ai is enabled. Please select an AI model.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return await _submit_job(user_id, "strategy", request.model_dump(mode="json"))
+
+
+@router.post(
+    "/quick/async",
+    response_model=BacktestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def quick_backtest_async(
+    request: QuickBacktestRequest,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Queue a quick (rule-based) backtest for a background worker.
+    """
+    return await _submit_job(user_id, "quick", request.model_dump(mode="json"))
+
+
+@router.post(
+    "/sweep",
+    response_model=BacktestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def sweep_backtest(
+    request: SweepRequest,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Queue a grid search over quick backtest parameters.
+
+    The worker loads the candles once and runs every combination of
+    ``grid`` in a process pool; the rows ranked by ``rank_by`` are returned
+    as the job's ``result``.
+    """
+    _validate_grid(request.grid)
+    return await _submit_job(user_id, "sweep", request.model_dump(mode="json"))
+
+
+@router.post(
+    "/walk-forward",
+    response_model=BacktestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def walk_forward_backtest(
+    request: WalkForwardRequest,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Queue a walk-forward optimization of quick backtest parameters.
+
+    The worker searches ``grid`` on each rolling in-sample window, re-runs
+    the winner on the following out-of-sample window and returns the
+    out-of-sample metric distributions (optionally with a Monte-Carlo
+    resample of the out-of-sample trades) as the job's ``result``.
+    """
+    _validate_grid(request.grid)
+    return await _submit_job(user_id, "walk_forward", request.model_dump(mode="json"))
+
+
+@router.get("/jobs", response_model=list[BacktestJobResponse])
+async def list_backtest_jobs(
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    List the current user's queued and running backtests.
+    """
+    queue = await _get_queue()
+    jobs = await queue.list_backtest_jobs(user_id)
+    return [BacktestJobResponse(**job) for job in jobs]
+
+
+@router.get("/jobs/{job_id}", response_model=BacktestJobResponse)
+async def get_backtest_job(
+    job_id: str,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Get the status of a background backtest.
+    """
+    queue = await _get_queue()
+    job = await queue.get_backtest_job(job_id, user_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Backtest job not found"
+        )
+    return BacktestJobResponse(**job)
+
+
+@router.delete("/jobs/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_backtest_job(
+    job_id: str,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Cancel a queued or running background backtest.
+    """
+    queue = await _get_queue()
+    if not await queue.cancel_backtest(job_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest job not found or already finished",
+        )
+    return None
+
+
 @router.get("/symbols")
 async def get_available_symbols(
     exchange: ExchangeLiteral = Query(default="hyperliquid"),
@@ -668,9 +1006,9 @@ def _build_detail_response(record) -> BacktestDetailResponse:
         sortino_ratio=record.sortino_ratio,
         calmar_ratio=record.calmar_ratio,
         total_fees=record.total_fees,
-        equity_curve=(record.equity_curve or [])[:limit],
+        equity_curve=downsample_points(record.equity_curve or [], limit),
         trades=trade_records,
-        drawdown_curve=(record.drawdown_curve or [])[:limit],
+        drawdown_curve=downsample_points(record.drawdown_curve or [], limit),
         monthly_returns=monthly_returns,
         trade_statistics=trade_statistics,
         symbol_breakdown=symbol_breakdown,
@@ -799,6 +1137,9 @@ async def create_backtest(
             use_ai=request.use_ai,
             ai_client=ai_client,
             analysis_ai_client=analysis_ai_client,
+            intrabar_policy=request.intrabar_policy,
+            intrabar_timeframe=request.intrabar_timeframe,
+            ai_replay=request.ai_replay,
         )
 
         result = await engine.run()
@@ -806,62 +1147,14 @@ async def create_backtest(
 
         # Persist result
         backtest_repo = BacktestRepository(db)
-        record = await backtest_repo.create(
+        record = await backtest_repo.create_from_result(
             user_id=UUID(user_id),
             strategy_id=strategy.id,
-            strategy_name=result.strategy_name,
+            result=result,
             symbols=symbols,
             exchange=request.exchange,
-            initial_balance=result.initial_balance,
             timeframe=request.timeframe,
             use_ai=request.use_ai,
-            start_date=result.start_date,
-            end_date=result.end_date,
-            final_balance=result.final_balance,
-            total_return_percent=result.total_return_percent,
-            total_trades=result.total_trades,
-            winning_trades=result.winning_trades,
-            losing_trades=result.losing_trades,
-            win_rate=result.win_rate,
-            profit_factor=result.profit_factor,
-            max_drawdown_percent=result.max_drawdown_percent,
-            sharpe_ratio=result.sharpe_ratio,
-            sortino_ratio=result.sortino_ratio,
-            calmar_ratio=result.calmar_ratio,
-            total_fees=result.total_fees,
-            equity_curve=result.equity_curve,
-            drawdown_curve=result.drawdown_curve,
-            trades=[
-                {
-                    "symbol": t.symbol,
-                    "side": t.side,
-                    "size": t.size,
-                    "entry_price": t.entry_price,
-                    "exit_price": t.exit_price,
-                    "leverage": t.leverage,
-                    "pnl": t.pnl,
-                    "pnl_percent": t.pnl_percent,
-                    "opened_at": t.opened_at.isoformat() if t.opened_at else None,
-                    "closed_at": t.closed_at.isoformat() if t.closed_at else None,
-                    "duration_minutes": t.duration_minutes,
-                    "exit_reason": t.exit_reason,
-                }
-                for t in result.trades
-            ],
-            monthly_returns=result.monthly_returns or [],
-            trade_statistics=result.trade_statistics,
-            symbol_breakdown=result.symbol_breakdown or [],
-            analysis=(
-                {
-                    "strengths": result.analysis.strengths if result.analysis else [],
-                    "weaknesses": result.analysis.weaknesses if result.analysis else [],
-                    "recommendations": (
-                        result.analysis.recommendations if result.analysis else []
-                    ),
-                }
-                if result.analysis
-                else None
-            ),
         )
 
         return _build_detail_response(record)
@@ -896,6 +1189,45 @@ async def get_backtest(
     return _build_detail_response(record)
 
 
+@records_router.post("/{backtest_id}/monte-carlo", response_model=MonteCarloResponse)
+async def monte_carlo_backtest(
+    backtest_id: UUID,
+    request: MonteCarloRequest,
+    db: DbSessionDep,
+    user_id: CurrentUserDep,
+    _rate_limit: RateLimitApiDep = None,
+):
+    """
+    Resample a persisted backtest's trades into return / drawdown bands.
+    """
+    from ...backtest.robustness import run_monte_carlo
+
+    repo = BacktestRepository(db)
+    record = await repo.get_by_id(backtest_id, UUID(user_id))
+
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Backtest result not found"
+        )
+    if not record.trades:
+        raise create_http_exception(
+            ErrorCode.VALIDATION_ERROR,
+            user_message="Backtest has no trades to resample",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    result = await asyncio.to_thread(
+        run_monte_carlo,
+        record.trades,
+        initial_balance=record.initial_balance,
+        simulations=request.simulations,
+        method=request.method,
+        confidence=request.confidence,
+        seed=request.seed,
+    )
+    return MonteCarloResponse(**result.to_dict())
+
+
 @records_router.delete("/{backtest_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_backtest(
     backtest_id: UUID,
@@ -41,6 +41,7 @@ class DecisionResponse(BaseModel):
 
     ai_model: str
     tokens_used: int
+    cached_tokens: int = 0
     latency_ms: int
 
     # Market data snapshot at the time of decision
@@ -229,6 +230,7 @@ def _decision_to_response(decision) -> DecisionResponse:
         execution_results=execution_results,
         ai_model=decision.ai_model,
         tokens_used=decision.tokens_used,
+        cached_tokens=decision.cached_tokens or 0,
         latency_ms=decision.latency_ms,
         raw_response=decision.raw_response,
         market_snapshot=decision.market_snapshot,
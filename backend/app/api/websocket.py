@@ -34,10 +34,12 @@ class MessageType(str, Enum):
 
     # Server -> Client
     DECISION = "decision"
+    DECISION_STREAM = "decision_stream"
     POSITION_UPDATE = "position_update"
     ACCOUNT_UPDATE = "account_update"
     PRICE_UPDATE = "price_update"
     STRATEGY_STATUS = "strategy_status"
+    BACKTEST_PROGRESS = "backtest_progress"
     NOTIFICATION = "notification"
     ERROR = "error"
     PONG = "pong"
@@ -512,6 +514,24 @@ async def publish_decision(
     await manager.broadcast_to_channel(f"strategy:{strategy_id}", message)
 
 
+async def publish_decision_stream(
+    user_id: str,
+    strategy_id: str,
+    delta: str,
+) -> None:
+    """Publish a chunk of an AI response that is still streaming"""
+    message = WSMessage(
+        type=MessageType.DECISION_STREAM,
+        data={
+            "strategy_id": strategy_id,
+            "delta": delta,
+        },
+    )
+
+    await manager.send_to_user(user_id, message)
+    await manager.broadcast_to_channel(f"strategy:{strategy_id}", message)
+
+
 async def publish_position_update(
     user_id: str,
     account_id: str,
@@ -603,6 +623,19 @@ async def publish_strategy_status(
     await manager.broadcast_to_channel(f"strategy:{strategy_id}", message)
 
 
+async def publish_backtest_progress(
+    user_id: str,
+    job: dict,
+) -> None:
+    """Publish queued backtest status / progress to its owner"""
+    message = WSMessage(
+        type=MessageType.BACKTEST_PROGRESS,
+        data=job,
+    )
+
+    await manager.send_to_user(user_id, message)
+
+
 async def publish_notification(
     user_id: str,
     title: str,
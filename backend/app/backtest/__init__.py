@@ -1,14 +1,42 @@
 """Backtesting module for strategy simulation"""
 
-from .engine import BacktestEngine, BacktestResult
+from .engine import BacktestCancelled, BacktestEngine, BacktestResult
 from .data_provider import DataProvider, OHLCV
+from .columnar import ColumnarCandleStore
 from .simulator import SimulatedTrader, SimulatedPosition
+from .robustness import (
+    MonteCarloResult,
+    WalkForwardOptimizer,
+    WalkForwardResult,
+    run_monte_carlo,
+)
+from .sweep import ParameterSweep, SweepResult
+from .vectorized import (
+    RULE_STRATEGIES,
+    RuleStrategy,
+    VectorizedBacktester,
+    VectorizedResult,
+    create_rule,
+)
 
 __all__ = [
+    "BacktestCancelled",
     "BacktestEngine",
     "BacktestResult",
+    "ColumnarCandleStore",
     "DataProvider",
+    "MonteCarloResult",
     "OHLCV",
+    "ParameterSweep",
+    "RULE_STRATEGIES",
+    "RuleStrategy",
     "SimulatedPosition",
     "SimulatedTrader",
+    "SweepResult",
+    "VectorizedBacktester",
+    "VectorizedResult",
+    "WalkForwardOptimizer",
+    "WalkForwardResult",
+    "create_rule",
+    "run_monte_carlo",
 ]
@@ -0,0 +1,345 @@
+"""
+Columnar candle storage for backtesting.
+
+Stores OHLCV history as contiguous NumPy arrays instead of one dataclass per
+candle.  Every symbol gets one float64 array per field, aligned on a shared
+int64 timestamp index (milliseconds since epoch).  Slots where a symbol has no
+candle are NaN and masked out via ``present``.
+
+Snapshots are exposed as lightweight views over a row of the store, so a
+multi-year 1m backtest does not materialize millions of ``MarketSnapshot`` /
+``OHLCV`` objects up front.
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .data_provider import OHLCV
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def datetime_to_ms(ts: datetime) -> int:
+    """Convert a datetime to epoch milliseconds (naive values are UTC)"""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(round(ts.timestamp() * 1000))
+
+
+def ms_to_datetime(ms: int, tz: Optional[tzinfo] = None) -> datetime:
+    """Convert epoch milliseconds back to a datetime (naive UTC by default)"""
+    dt = _EPOCH + timedelta(milliseconds=int(ms))
+    if tz is not None:
+        dt = dt.replace(tzinfo=timezone.utc).astimezone(tz)
+    return dt
+
+
+def candles_to_columns(candles: List[OHLCV]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of OHLCV candles into column arrays.
+
+    Returns:
+        Dict with ``timestamp`` (int64 ms) and one float64 array per field
+    """
+    n = len(candles)
+    columns: Dict[str, np.ndarray] = {
+        "timestamp": np.fromiter(
+            (datetime_to_ms(c.timestamp) for c in candles), dtype=np.int64, count=n
+        )
+    }
+    for name in FIELDS:
+        columns[name] = np.fromiter(
+            (getattr(c, name) for c in candles), dtype=np.float64, count=n
+        )
+    return columns
+
+
+def columns_to_candles(columns: Dict[str, np.ndarray]) -> List[OHLCV]:
+    """Materialize ``candles_to_columns`` output back into OHLCV objects"""
+    fields = [columns[name].tolist() for name in FIELDS]
+    return [
+        OHLCV(ms_to_datetime(ts), *values)
+        for ts, *values in zip(columns["timestamp"].tolist(), *fields)
+    ]
+
+
+class ColumnarCandleStore:
+    """
+    Candle history for several symbols stored as aligned NumPy columns.
+
+    Usage:
+        store = ColumnarCandleStore.from_candles({"BTC": btc_candles})
+        for snapshot in store.snapshots():
+            price = snapshot.get_price("BTC")
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        columns: Dict[str, Dict[str, np.ndarray]],
+        tz: Optional[tzinfo] = None,
+    ):
+        """
+        Initialize store from pre-aligned arrays.
+
+        Args:
+            timestamps: Sorted, unique int64 epoch-ms index shared by all symbols
+            columns: symbol -> field -> float64 array aligned on ``timestamps``
+            tz: Timezone to attach to materialized datetimes (None = naive UTC)
+        """
+        self.timestamps = timestamps
+        self.tz = tz
+        self._columns = columns
+        self._present: Dict[str, np.ndarray] = {
+            symbol: ~np.isnan(cols["close"]) for symbol, cols in columns.items()
+        }
+        self._rows: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_columns(
+        cls,
+        per_symbol: Dict[str, Dict[str, np.ndarray]],
+        tz: Optional[tzinfo] = None,
+    ) -> "ColumnarCandleStore":
+        """
+        Build a store from unaligned per-symbol columns.
+
+        Args:
+            per_symbol: symbol -> output of ``candles_to_columns``
+            tz: Timezone of the source timestamps (None = naive UTC)
+        """
+        non_empty = {s: c for s, c in per_symbol.items() if len(c["timestamp"])}
+        if not non_empty:
+            return cls(np.empty(0, dtype=np.int64), {}, tz=tz)
+
+        timestamps = np.unique(
+            np.concatenate([c["timestamp"] for c in non_empty.values()])
+        )
+
+        aligned: Dict[str, Dict[str, np.ndarray]] = {}
+        for symbol, cols in non_empty.items():
+            # Keep the first candle when the source contains duplicate timestamps
+            src_ts, first = np.unique(cols["timestamp"], return_index=True)
+            slots = np.searchsorted(timestamps, src_ts)
+            aligned[symbol] = {}
+            for name in FIELDS:
+                arr = np.full(len(timestamps), np.nan, dtype=np.float64)
+                arr[slots] = cols[name][first]
+                aligned[symbol][name] = arr
+
+        return cls(timestamps, aligned, tz=tz)
+
+    @classmethod
+    def from_candles(cls, data: Dict[str, List[OHLCV]]) -> "ColumnarCandleStore":
+        """Build a store from per-symbol OHLCV lists"""
+        tz = None
+        for candles in data.values():
+            if candles:
+                tz = candles[0].timestamp.tzinfo
+                break
+        return cls.from_columns(
+            {symbol: candles_to_columns(candles) for symbol, candles in data.items()},
+            tz=tz,
+        )
+
+    # ==================== Accessors ====================
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._columns.keys())
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the underlying arrays"""
+        total = self.timestamps.nbytes
+        for symbol, cols in self._columns.items():
+            total += sum(arr.nbytes for arr in cols.values())
+            total += self._present[symbol].nbytes
+        return total
+
+    def column(self, symbol: str, name: str) -> np.ndarray:
+        """Get an aligned column (NaN where the symbol has no candle)"""
+        return self._columns[symbol][name]
+
+    def present(self, symbol: str) -> np.ndarray:
+        """Boolean mask of index slots where the symbol has a candle"""
+        return self._present[symbol]
+
+    def rows(self, symbol: str) -> np.ndarray:
+        """Index slots holding this symbol's candles, in time order"""
+        rows = self._rows.get(symbol)
+        if rows is None:
+            rows = np.flatnonzero(self._present[symbol])
+            self._rows[symbol] = rows
+        return rows
+
+    def timestamp_at(self, index: int) -> datetime:
+        return ms_to_datetime(self.timestamps[index], self.tz)
+
+    def price_at(self, symbol: str, index: int) -> Optional[float]:
+        """Close price of a symbol at an index slot, or None if absent"""
+        cols = self._columns.get(symbol)
+        if cols is None:
+            return None
+        value = cols["close"][index]
+        if value != value:  # NaN
+            return None
+        return float(value)
+
+    def candle_at(self, symbol: str, index: int) -> Optional[OHLCV]:
+        """Materialize a single OHLCV at an index slot, or None if absent"""
+        cols = self._columns.get(symbol)
+        if cols is None or not self._present[symbol][index]:
+            return None
+        return OHLCV(
+            timestamp=self.timestamp_at(index),
+            open=float(cols["open"][index]),
+            high=float(cols["high"][index]),
+            low=float(cols["low"][index]),
+            close=float(cols["close"][index]),
+            volume=float(cols["volume"][index]),
+        )
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "ColumnarCandleStore":
+        """
+        Store restricted to index slots ``[start, stop)``.
+
+        Arrays are NumPy views, so no candle data is copied. Symbols without
+        candles in the range are dropped.
+        """
+        columns = {
+            symbol: {name: arr[start:stop] for name, arr in cols.items()}
+            for symbol, cols in self._columns.items()
+            if self._present[symbol][start:stop].any()
+        }
+        return ColumnarCandleStore(self.timestamps[start:stop], columns, tz=self.tz)
+
+    def candles(self, symbol: str) -> "ColumnarCandles":
+        """Lazy per-symbol candle sequence (drop-in for ``List[OHLCV]``)"""
+        return ColumnarCandles(self, symbol)
+
+    def snapshots(self) -> "SnapshotSequence":
+        """Lazy snapshot sequence over the shared index"""
+        return SnapshotSequence(self)
+
+
+class ColumnarCandles(Sequence):
+    """
+    Read-only sequence of a symbol's candles backed by a store.
+
+    Items are materialized as ``OHLCV`` objects only when accessed.
+    """
+
+    __slots__ = ("_store", "_symbol", "_rows")
+
+    def __init__(self, store: ColumnarCandleStore, symbol: str):
+        self._store = store
+        self._symbol = symbol
+        self._rows = store.rows(symbol) if symbol in store.symbols else np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self._store.candle_at(self._symbol, int(row))
+                for row in self._rows[index]
+            ]
+        return self._store.candle_at(self._symbol, int(self._rows[index]))
+
+    def column(self, name: str) -> np.ndarray:
+        """Dense column for this symbol (no NaN gaps)"""
+        return self._store.column(self._symbol, name)[self._rows]
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.column("close")
+
+
+class SnapshotView:
+    """
+    Lightweight market snapshot referencing one row of a store.
+
+    Mirrors the ``MarketSnapshot`` interface used by the backtest engine.
+    ``prices`` and ``candles`` are built on first access and kept only for
+    the lifetime of the view.
+    """
+
+    __slots__ = ("_store", "_index", "_prices")
+
+    def __init__(self, store: ColumnarCandleStore, index: int):
+        self._store = store
+        self._index = index
+        self._prices: Optional[Dict[str, float]] = None
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._store.timestamp_at(self._index)
+
+    @property
+    def prices(self) -> Dict[str, float]:
+        if self._prices is None:
+            prices = {}
+            for symbol in self._store.symbols:
+                price = self._store.price_at(symbol, self._index)
+                if price is not None:
+                    prices[symbol] = price
+            self._prices = prices
+        return self._prices
+
+    @property
+    def candles(self) -> Dict[str, OHLCV]:
+        candles = {}
+        for symbol in self._store.symbols:
+            candle = self._store.candle_at(symbol, self._index)
+            if candle is not None:
+                candles[symbol] = candle
+        return candles
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        if self._prices is not None:
+            return self._prices.get(symbol)
+        return self._store.price_at(symbol, self._index)
+
+
+class SnapshotSequence(Sequence):
+    """Sequence of ``SnapshotView`` objects created on demand"""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store: ColumnarCandleStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                SnapshotView(self._store, i)
+                for i in range(*index.indices(len(self._store)))
+            ]
+        n = len(self._store)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("snapshot index out of range")
+        return SnapshotView(self._store, index)
+
+    def __iter__(self) -> Iterator[SnapshotView]:
+        store = self._store
+        for i in range(len(store)):
+            yield SnapshotView(store, i)
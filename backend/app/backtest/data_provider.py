@@ -3,15 +3,18 @@ Historical data provider for backtesting.
 
 Supports multiple data sources:
 - CCXT (exchange historical data)
+- On-disk history store (fetched ranges are kept; only gaps are downloaded)
 - Redis cache (for faster repeated access)
 - CSV files
 - Database storage
 """
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import ccxt.async_support as ccxt
 
@@ -52,6 +55,31 @@ class OHLCV:
         }
 
 
+@dataclass
+class FetchStats:
+    """Exchange download statistics of one ``load_data`` call"""
+
+    candles: int = 0
+    requests: int = 0
+    retries: int = 0
+    failed_requests: int = 0
+    seconds: float = 0.0
+
+    @property
+    def candles_per_second(self) -> float:
+        return self.candles / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "candles": self.candles,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failed_requests": self.failed_requests,
+            "seconds": round(self.seconds, 3),
+            "candles_per_second": round(self.candles_per_second, 1),
+        }
+
+
 @dataclass
 class MarketSnapshot:
     """Market snapshot at a point in time"""
@@ -81,6 +109,12 @@ class DataProvider:
 
         for snapshot in provider.iterate():
             price = snapshot.get_price("BTC")
+
+    With ``columnar=True`` candles are kept in a ``ColumnarCandleStore``
+    (NumPy arrays aligned on a shared timestamp index) and ``iterate()``
+    yields lightweight snapshot views instead of materialized snapshots.
+    Use it for long / high-frequency backtests where per-candle objects
+    would not fit in memory.
     """
 
     TIMEFRAME_MS = {
@@ -92,27 +126,56 @@ class DataProvider:
         "1d": 24 * 60 * 60 * 1000,
     }
 
+    # Max candles per fetch_ohlcv request (default 1000)
+    PAGE_LIMITS = {
+        "binance": 1500,
+        "bybit": 1000,
+        "okx": 300,
+        "hyperliquid": 5000,
+    }
+
+    FETCH_ATTEMPTS = 4
+    FETCH_RETRY_BASE_DELAY = 1.0
+    FETCH_RETRY_MAX_DELAY = 30.0
+
     def __init__(
         self,
         exchange: str = "hyperliquid",
         data_dir: Optional[str] = None,
         use_cache: bool = True,
+        columnar: bool = False,
     ):
         """
         Initialize data provider.
 
         Args:
             exchange: Exchange to fetch data from
-            data_dir: Directory to cache data (optional)
-            use_cache: Whether to use Redis cache for data
+            data_dir: On-disk history directory (default:
+                ``settings.backtest_history_dir``)
+            use_cache: Whether to use the on-disk history / Redis cache
+            columnar: Store candles as NumPy columns instead of OHLCV lists
         """
+        from ..core.config import get_settings
+        from .history_store import get_history_store
+
         self.exchange_name = exchange
-        self.data_dir = data_dir
+        self.data_dir = data_dir or get_settings().backtest_history_dir
         self.use_cache = use_cache
         self._exchange: Optional[ccxt.Exchange] = None
         self._data: Dict[str, List[OHLCV]] = {}  # symbol -> list of candles
         self._snapshots: List[MarketSnapshot] = []
+        self.columnar = columnar
+        self._store = None  # ColumnarCandleStore when columnar=True
         self._cache = get_market_data_cache() if use_cache else None
+        # On-disk history replaces the Redis range cache when configured
+        self._history = (
+            get_history_store(self.data_dir) if use_cache and self.data_dir else None
+        )
+        self.timeframe: Optional[str] = None  # timeframe of the loaded data
+        self.fetch_stats = FetchStats()
+        self._request_slots = asyncio.Semaphore(
+            max(1, get_settings().backtest_fetch_concurrency)
+        )
 
     # Exchanges supported for backtesting (public OHLCV data, no API key needed)
     SUPPORTED_EXCHANGES = ("binance", "bybit", "okx", "hyperliquid")
@@ -167,6 +230,11 @@ class DataProvider:
         """
         Load historical data for symbols.
 
+        Symbols (and the pages of each symbol's range) are fetched
+        concurrently, bounded by ``settings.backtest_fetch_concurrency``
+        in-flight requests; ccxt's rate limiter spaces the requests within
+        the exchange's budget. Throughput is recorded in ``fetch_stats``.
+
         Args:
             symbols: List of symbols to load
             start_date: Start date
@@ -180,66 +248,209 @@ class DataProvider:
             await self.initialize()
 
         self._data.clear()
+        self._store = None
+        self.timeframe = timeframe
+        self.fetch_stats = FetchStats()
+        started = time.perf_counter()
+
+        loaded = await asyncio.gather(
+            *(
+                self._load_symbol(symbol, start_date, end_date, timeframe)
+                for symbol in symbols
+            )
+        )
+        self.fetch_stats.seconds = time.perf_counter() - started
+
+        columns: Dict[str, Dict[str, Any]] = {}
+        tz = None
         total_candles = 0
+        for symbol, data in zip(symbols, loaded):
+            if data is None:
+                continue
+            if isinstance(data, dict):  # Columns from the on-disk history
+                total_candles += len(data["timestamp"])
+            else:
+                total_candles += len(data)
+            if not self.columnar:
+                self._data[symbol] = data
+                continue
 
-        for symbol in symbols:
-            ccxt_symbol = self._normalize_symbol(symbol)
+            from .columnar import candles_to_columns
 
-            try:
-                # Try cache first
-                candles = None
-                if self._cache:
-                    cached_data = await self._cache.get_klines(
+            if not isinstance(data, dict):
+                if data and tz is None:
+                    tz = data[0].timestamp.tzinfo
+                data = candles_to_columns(data)
+            columns[symbol] = data
+
+        stats = self.fetch_stats
+        if stats.requests:
+            logger.info(
+                f"Fetched {stats.candles} candles for {len(symbols)} symbols in "
+                f"{stats.seconds:.1f}s ({stats.candles_per_second:.0f} candles/s, "
+                f"{stats.requests} requests, {stats.retries} retries)"
+            )
+
+        if self.columnar:
+            from .columnar import ColumnarCandleStore
+
+            self._store = ColumnarCandleStore.from_columns(columns, tz=tz)
+            self._snapshots.clear()
+            return total_candles
+
+        # Build snapshots
+        self._build_snapshots()
+
+        return total_candles
+
+    async def _load_symbol(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        timeframe: str,
+    ) -> Optional[Any]:
+        """
+        Load one symbol from history / cache / exchange.
+
+        Returns:
+            Candle list, history columns in columnar mode, or None on failure
+        """
+        ccxt_symbol = self._normalize_symbol(symbol)
+
+        try:
+            if self._history:
+                cols = await self._load_history(
+                    ccxt_symbol, timeframe, start_date, end_date
+                )
+                if self.columnar:
+                    return cols
+                from .columnar import columns_to_candles
+
+                return columns_to_candles(cols)
+
+            # Try cache first
+            candles = None
+            if self._cache:
+                cached = await self._cache.get_klines(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_time=start_date,
+                    end_time=end_date,
+                    exchange=self.exchange_name,
+                    candle_type=OHLCV,
+                )
+                if cached:
+                    candles = cached
+                    logger.debug(f"Loaded {len(candles)} cached candles for {symbol}")
+
+            # Fetch from exchange if not cached
+            if not candles:
+                candles = await self._fetch_ohlcv(
+                    ccxt_symbol, timeframe, start_date, end_date
+                )
+
+                # Cache the data
+                if self._cache and candles:
+                    await self._cache.set_klines(
                         symbol=symbol,
                         timeframe=timeframe,
                         start_time=start_date,
                         end_time=end_date,
+                        klines=candles,
                         exchange=self.exchange_name,
                     )
-                    if cached_data:
-                        candles = [
-                            OHLCV(
-                                timestamp=datetime.fromisoformat(c["timestamp"]),
-                                open=c["open"],
-                                high=c["high"],
-                                low=c["low"],
-                                close=c["close"],
-                                volume=c["volume"],
-                            )
-                            for c in cached_data
-                        ]
-                        logger.debug(
-                            f"Loaded {len(candles)} cached candles for {symbol}"
-                        )
-
-                # Fetch from exchange if not cached
-                if not candles:
-                    candles = await self._fetch_ohlcv(
-                        ccxt_symbol, timeframe, start_date, end_date
-                    )
+                    logger.debug(f"Cached {len(candles)} candles for {symbol}")
 
-                    # Cache the data
-                    if self._cache and candles:
-                        await self._cache.set_klines(
-                            symbol=symbol,
-                            timeframe=timeframe,
-                            start_time=start_date,
-                            end_time=end_date,
-                            klines=[c.to_dict() for c in candles],
-                            exchange=self.exchange_name,
-                        )
-                        logger.debug(f"Cached {len(candles)} candles for {symbol}")
-
-                self._data[symbol] = candles
-                total_candles += len(candles)
-            except Exception as e:
-                logger.warning(f"Failed to load data for {symbol}: {e}")
-                continue
+            return candles
+        except Exception as e:
+            logger.warning(f"Failed to load data for {symbol}: {e}")
+            return None
 
-        # Build snapshots
-        self._build_snapshots()
+    async def fetch_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[OHLCV]:
+        """
+        Fetch candles for a symbol outside the loaded data set (e.g. a lower
+        timeframe for intrabar resolution), via the on-disk history when
+        enabled.
+        """
+        from .columnar import columns_to_candles
 
-        return total_candles
+        if not self._exchange:
+            await self.initialize()
+        ccxt_symbol = self._normalize_symbol(symbol)
+        if self._history:
+            cols = await self._load_history(
+                ccxt_symbol, timeframe, start_date, end_date
+            )
+            return columns_to_candles(cols)
+        return await self._fetch_ohlcv(ccxt_symbol, timeframe, start_date, end_date)
+
+    async def _load_history(
+        self,
+        ccxt_symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, Any]:
+        """
+        Read a symbol's candles from the on-disk history, fetching only the
+        parts of the range that are not stored yet.
+
+        Returns:
+            Columns in ``candles_to_columns`` format
+        """
+        from .columnar import candles_to_columns, datetime_to_ms, ms_to_datetime
+
+        start_ms = datetime_to_ms(start_date)
+        end_ms = datetime_to_ms(end_date)
+        step_ms = self.TIMEFRAME_MS.get(timeframe, 3600000)
+        history = self._history
+        exchange = self.exchange_name
+
+        gaps = history.missing(exchange, ccxt_symbol, timeframe, start_ms, end_ms)
+        fetched = await asyncio.gather(
+            *(
+                self._fetch_ohlcv_range(
+                    ccxt_symbol,
+                    timeframe,
+                    ms_to_datetime(gap_start),
+                    ms_to_datetime(gap_end),
+                )
+                for gap_start, gap_end in gaps
+            )
+        )
+        for (gap_start, gap_end), (candles, failed_from) in zip(gaps, fetched):
+            # Still-forming candles and ranges from a failed page onwards are
+            # not marked as covered, so they are fetched again next time
+            complete_until = int(time.time() * 1000) - step_ms
+            if failed_from is not None:
+                complete_until = min(complete_until, failed_from - 1)
+            await asyncio.to_thread(
+                history.write,
+                exchange,
+                ccxt_symbol,
+                timeframe,
+                gap_start,
+                gap_end,
+                candles_to_columns(candles),
+                complete_until,
+            )
+            logger.debug(
+                f"Fetched {len(candles)} candles for {ccxt_symbol} {timeframe} gap "
+                f"{ms_to_datetime(gap_start)} - {ms_to_datetime(gap_end)}"
+            )
+
+        if not gaps:
+            logger.debug(f"Loaded {ccxt_symbol} {timeframe} from on-disk history")
+        return await asyncio.to_thread(
+            history.read, exchange, ccxt_symbol, timeframe, start_ms, end_ms
+        )
 
     async def _fetch_ohlcv(
         self,
@@ -249,49 +460,144 @@ class DataProvider:
         end_date: datetime,
     ) -> List[OHLCV]:
         """Fetch OHLCV data from exchange"""
-        candles = []
-        since = int(start_date.timestamp() * 1000)
-        end_ms = int(end_date.timestamp() * 1000)
-        limit = 1000  # Most exchanges limit to 1000 candles per request
+        candles, _ = await self._fetch_ohlcv_range(
+            symbol, timeframe, start_date, end_date
+        )
+        return candles
 
-        while since < end_ms:
-            try:
-                raw_candles = await self._exchange.fetch_ohlcv(
-                    symbol, timeframe, since=since, limit=limit
-                )
+    async def _fetch_ohlcv_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Tuple[List[OHLCV], Optional[int]]:
+        """
+        Fetch OHLCV data from exchange.
 
-                if not raw_candles:
-                    break
+        The range is split into pages of ``page_limit`` candles that are
+        fetched concurrently.
 
-                for c in raw_candles:
-                    ts = datetime.utcfromtimestamp(c[0] / 1000)
-                    if ts > end_date:
-                        break
-
-                    candles.append(
-                        OHLCV(
-                            timestamp=ts,
-                            open=float(c[1]),
-                            high=float(c[2]),
-                            low=float(c[3]),
-                            close=float(c[4]),
-                            volume=float(c[5]),
-                        )
-                    )
+        Returns:
+            (candles, failed_from) - ``failed_from`` is the start (epoch ms)
+            of the earliest page that failed after retries, None if complete
+        """
+        from .columnar import datetime_to_ms
+
+        start_ms = datetime_to_ms(start_date)
+        end_ms = datetime_to_ms(end_date)
+        step_ms = self.TIMEFRAME_MS.get(timeframe, 3600000)
+        page_ms = self.page_limit * step_ms
+
+        pages = [
+            (since, min(since + page_ms - 1, end_ms))
+            for since in range(start_ms, end_ms + 1, page_ms)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._fetch_page(symbol, timeframe, since, until, step_ms)
+                for since, until in pages
+            )
+        )
 
-                # Move to next batch
-                since = raw_candles[-1][0] + self.TIMEFRAME_MS.get(timeframe, 3600000)
+        candles: List[OHLCV] = []
+        failed_from = None
+        for (since, _), (page, ok) in zip(pages, results):
+            candles.extend(page)
+            if not ok and failed_from is None:
+                failed_from = since
+        return candles, failed_from
 
-                # Rate limiting
-                import asyncio
+    @property
+    def page_limit(self) -> int:
+        """Max candles per fetch_ohlcv request for this exchange"""
+        return self.PAGE_LIMITS.get(self.exchange_name, 1000)
+
+    async def _fetch_page(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: int,
+        step_ms: int,
+    ) -> Tuple[List[OHLCV], bool]:
+        """
+        Fetch candles with timestamps in ``[since, until]``.
 
-                await asyncio.sleep(0.5)
+        Continues from the last candle if the exchange returns fewer candles
+        than the page spans.
 
-            except Exception as e:
-                logger.error(f"Error fetching OHLCV for {symbol}: {e}")
+        Returns:
+            (candles, ok) - ``ok`` is False if a request failed after retries
+        """
+        candles: List[OHLCV] = []
+        ok = True
+        while since <= until:
+            raw_candles = await self._request_ohlcv(symbol, timeframe, since)
+            if raw_candles is None:
+                ok = False
+                break
+            if not raw_candles:
                 break
 
-        return candles
+            for c in raw_candles:
+                if c[0] > until:
+                    break
+                if c[0] < since:
+                    continue
+                candles.append(
+                    OHLCV(
+                        timestamp=datetime.utcfromtimestamp(c[0] / 1000),
+                        open=float(c[1]),
+                        high=float(c[2]),
+                        low=float(c[3]),
+                        close=float(c[4]),
+                        volume=float(c[5]),
+                    )
+                )
+
+            # Move to next batch (always forward, even on unexpected pages)
+            since = max(since, raw_candles[-1][0]) + step_ms
+
+        self.fetch_stats.candles += len(candles)
+        return candles, ok
+
+    async def _request_ohlcv(
+        self, symbol: str, timeframe: str, since: int
+    ) -> Optional[List[list]]:
+        """
+        One fetch_ohlcv request with retry and exponential backoff.
+
+        Returns:
+            Raw candles, or None if all attempts failed
+        """
+        from ..core.retry_utils import (
+            ErrorType,
+            calculate_backoff_delay,
+            classify_error,
+        )
+
+        stats = self.fetch_stats
+        for attempt in range(self.FETCH_ATTEMPTS):
+            try:
+                async with self._request_slots:
+                    stats.requests += 1
+                    return await self._exchange.fetch_ohlcv(
+                        symbol, timeframe, since=since, limit=self.page_limit
+                    )
+            except Exception as e:
+                permanent = classify_error(e) == ErrorType.PERMANENT
+                if permanent or attempt == self.FETCH_ATTEMPTS - 1:
+                    logger.error(f"Error fetching OHLCV for {symbol}: {e}")
+                    stats.failed_requests += 1
+                    return None
+                stats.retries += 1
+                delay = calculate_backoff_delay(
+                    attempt, self.FETCH_RETRY_BASE_DELAY, self.FETCH_RETRY_MAX_DELAY
+                )
+                logger.debug(f"Retrying OHLCV fetch for {symbol} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+        return None
 
     def _build_snapshots(self) -> None:
         """Build market snapshots from candle data"""
@@ -300,29 +606,26 @@ class DataProvider:
         if not self._data:
             return
 
-        # Get all unique timestamps
+        # Index each symbol's candles by timestamp (first occurrence wins)
+        by_timestamp: Dict[str, Dict[datetime, OHLCV]] = {}
         all_timestamps = set()
-        for candles in self._data.values():
-            for c in candles:
-                all_timestamps.add(c.timestamp)
-
-        # Sort timestamps
-        sorted_timestamps = sorted(all_timestamps)
+        for symbol, symbol_candles in self._data.items():
+            index: Dict[datetime, OHLCV] = {}
+            for c in symbol_candles:
+                index.setdefault(c.timestamp, c)
+            by_timestamp[symbol] = index
+            all_timestamps.update(index)
 
         # Build snapshots
-        for ts in sorted_timestamps:
+        for ts in sorted(all_timestamps):
             prices = {}
             candles = {}
 
-            for symbol, symbol_candles in self._data.items():
-                # Find candle for this timestamp
-                for c in symbol_candles:
-                    if c.timestamp == ts:
-                        prices[symbol] = c.close
-                        candles[symbol] = c
-                        break
-                    elif c.timestamp > ts:
-                        break
+            for symbol, index in by_timestamp.items():
+                c = index.get(ts)
+                if c is not None:
+                    prices[symbol] = c.close
+                    candles[symbol] = c
 
             if prices:  # Only add if we have at least one price
                 self._snapshots.append(
@@ -333,20 +636,34 @@ class DataProvider:
                     )
                 )
 
-    def iterate(self) -> List[MarketSnapshot]:
+    def iterate(self) -> Sequence[MarketSnapshot]:
         """Get all market snapshots for iteration"""
+        if self._store is not None:
+            return self._store.snapshots()
         return self._snapshots
 
-    def get_data(self, symbol: str) -> List[OHLCV]:
+    def get_data(self, symbol: str) -> Sequence[OHLCV]:
         """Get raw OHLCV data for a symbol"""
+        if self._store is not None:
+            return self._store.candles(symbol)
         return self._data.get(symbol, [])
 
+    def get_store(self):
+        """Get the columnar candle store (None unless columnar=True)"""
+        return self._store
+
     def get_symbols(self) -> List[str]:
         """Get list of loaded symbols"""
+        if self._store is not None:
+            return self._store.symbols
         return list(self._data.keys())
 
     def get_date_range(self) -> tuple[Optional[datetime], Optional[datetime]]:
         """Get date range of loaded data"""
+        if self._store is not None:
+            if not len(self._store):
+                return None, None
+            return self._store.timestamp_at(0), self._store.timestamp_at(-1)
         if not self._snapshots:
             return None, None
         return self._snapshots[0].timestamp, self._snapshots[-1].timestamp
@@ -401,6 +718,18 @@ class DataProvider:
         # Fallback when markets not loaded
         return f"{symbol}/USDT"
 
+    @staticmethod
+    def from_store(store) -> "DataProvider":
+        """
+        Wrap an already-built ``ColumnarCandleStore``.
+
+        No exchange connection or cache is used; ``initialize`` / ``load_data``
+        are not needed before iterating.
+        """
+        provider = DataProvider(use_cache=False, columnar=True)
+        provider._store = store
+        return provider
+
     @staticmethod
     def from_csv(filepath: str, symbol: str) -> "DataProvider":
         """
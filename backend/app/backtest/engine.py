@@ -4,23 +4,41 @@ Backtest engine for strategy simulation.
 Runs strategies against historical data with simulated execution.
 """
 
+import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from ..core.config import get_settings
 from ..db.models import StrategyDB
 from ..models.decision import DecisionResponse
 from ..models.strategy import StrategyConfig
-from ..services.ai import BaseAIClient
+from ..services.ai import BaseAIClient, CachedAIClient, get_replay_cache
 from ..services.decision_parser import DecisionParser
 from ..services.prompt_builder import PromptBuilder
 from ..traders.base import MarketData
-from .data_provider import DataProvider, MarketSnapshot
-from .simulator import SimulatedTrader, Trade
+from .columnar import ColumnarCandleStore
+from .data_provider import DataProvider, FetchStats, MarketSnapshot
+from .intrabar import LowerTimeframeResolver
+from .metrics import EquityTracker
+from .simulator import IntrabarPolicy, SimulatedTrader, Trade
+from .vectorized import (
+    RuleStrategy,
+    SMAMomentumRule,
+    VectorizedBacktester,
+    VectorizedResult,
+)
 
 settings = get_settings()
 
+# Called as ``await callback(candles_processed, total_candles, equity)``
+ProgressCallback = Callable[[int, int, float], Awaitable[None]]
+
+
+class BacktestCancelled(Exception):
+    """Raised by a progress callback to stop a running backtest"""
+
 
 @dataclass
 class BacktestAnalysis:
@@ -60,6 +78,7 @@ class BacktestResult:
     symbol_breakdown: List[Dict[str, Any]] = field(default_factory=list)
     decisions: List[Dict[str, Any]] = field(default_factory=list)
     analysis: Optional[BacktestAnalysis] = None
+    data_load: Optional[Dict[str, Any]] = None  # FetchStats of the data provider
 
     def to_dict(self) -> dict:
         return {
@@ -80,6 +99,7 @@ class BacktestResult:
             "calmar_ratio": self.calmar_ratio,
             "total_fees": self.total_fees,
             "equity_curve": self.equity_curve,
+            "data_load": self.data_load,
         }
 
 
@@ -104,6 +124,12 @@ class BacktestEngine:
         result = await engine.run()
     """
 
+    # Lookback of the rule-based momentum SMA
+    SMA_PERIOD = 20
+    # Longest stretch ``run`` holds the event loop before yielding, so a
+    # backtest in a shared worker does not stall other jobs (seconds)
+    YIELD_SECONDS = 0.02
+
     def __init__(
         self,
         strategy: StrategyDB,
@@ -117,6 +143,13 @@ class BacktestEngine:
         analysis_ai_client: Optional[
             BaseAIClient
         ] = None,  # Optional AI client for analysis
+        sma_period: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        progress_interval: Optional[int] = None,
+        intrabar_policy: IntrabarPolicy = "stop_first",
+        intrabar_timeframe: Optional[str] = None,
+        ai_replay: Optional[bool] = None,
+        warmup_bars: int = 0,
     ):
         """
         Initialize backtest engine.
@@ -130,6 +163,20 @@ class BacktestEngine:
             use_ai: If True, use AI for decisions (slow, expensive)
             ai_client: AI client for decision generation (if None, uses strategy's ai_model)
             decision_interval_candles: How often to make decisions
+            sma_period: Lookback of the rule-based momentum SMA (default 20)
+            progress_callback: Awaited with (processed, total, equity) while
+                running; may raise ``BacktestCancelled`` to stop the run
+            progress_interval: Candles between progress callbacks
+                (default: ~1% of the run)
+            intrabar_policy: Which of SL/TP fills first when a candle touches
+                both (``stop_first``, ``target_first``, ``nearest_first``)
+            intrabar_timeframe: Lower timeframe (e.g. "1m") fetched to resolve
+                such candles before falling back to ``intrabar_policy``
+            ai_replay: Answer prompts seen in earlier runs with the recorded
+                AI output instead of calling the model again
+                (default: ``backtest_ai_replay`` setting)
+            warmup_bars: Leading candles that only prime the rule-based SMA;
+                no decisions, trades or equity points before them
         """
         self.strategy = strategy
         self.initial_balance = initial_balance
@@ -138,6 +185,11 @@ class BacktestEngine:
         self.data_provider = data_provider
         self.use_ai = use_ai
         self.decision_interval = decision_interval_candles
+        self.sma_period = sma_period or self.SMA_PERIOD
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.intrabar_timeframe = intrabar_timeframe
+        self.warmup_bars = max(0, warmup_bars)
 
         # AI client must be provided by caller when use_ai=True (resolve from DB in route)
         if use_ai and ai_client is None:
@@ -145,6 +197,10 @@ class BacktestEngine:
                 "use_ai=True requires ai_client. Resolve credentials from DB in the caller "
                 "(e.g. resolve_provider_credentials) and pass ai_client."
             )
+        if ai_replay is None:
+            ai_replay = settings.backtest_ai_replay
+        if ai_client is not None and ai_replay:
+            ai_client = CachedAIClient(ai_client, get_replay_cache())
         self.ai_client = ai_client
         self.analysis_ai_client = analysis_ai_client
 
@@ -159,15 +215,20 @@ class BacktestEngine:
             maker_fee=settings.simulator_maker_fee,
             taker_fee=settings.simulator_taker_fee,
             default_slippage=settings.simulator_default_slippage,
+            intrabar_policy=intrabar_policy,
         )
         self.prompt_builder = PromptBuilder(config=self.config)
         self.decision_parser = DecisionParser(risk_controls=self.config.risk_controls)
 
         # Results
-        self._equity_curve: List[Dict[str, Any]] = []
+        self._equity = EquityTracker()
         self._decisions: List[Dict[str, Any]] = []
         self._candles_processed = 0
 
+        # Rule-based state: per-symbol candle cursor and rolling close sum
+        self._cursors: Dict[str, int] = {}
+        self._sma_sums: Dict[str, float] = {}
+
     async def run(self) -> BacktestResult:
         """
         Run the backtest.
@@ -175,45 +236,60 @@ class BacktestEngine:
         Returns:
             BacktestResult with performance metrics
         """
-        # Initialize data provider if needed
-        if not self.data_provider:
-            self.data_provider = DataProvider()
-            await self.data_provider.initialize()
-            await self.data_provider.load_data(
-                symbols=self.config.symbols,
-                start_date=self.start_date,
-                end_date=self.end_date,
-                timeframe="1h",
+        await self._ensure_data()
+        if self.intrabar_timeframe:
+            self.trader.intrabar_resolver = LowerTimeframeResolver(
+                self.data_provider, self.intrabar_timeframe
             )
 
         # Get snapshots
         snapshots = self.data_provider.iterate()
-        if not snapshots:
+        if len(snapshots) <= self.warmup_bars:
             raise ValueError("No data to backtest")
 
+        total = len(snapshots) - self.warmup_bars
+        interval = self.progress_interval or max(1, total // 100)
+        yield_at = time.monotonic() + self.YIELD_SECONDS
+
         # Run simulation
         for i, snapshot in enumerate(snapshots):
-            # Update trader with current prices
-            self.trader.set_current_time(snapshot.timestamp)
-            self.trader.set_prices(snapshot.prices)
+            # Warmup candles stay visible to the SMA through get_data()
+            if i < self.warmup_bars:
+                continue
 
-            # Record equity
-            account = await self.trader.get_account_state()
-            self._equity_curve.append(
-                {
-                    "timestamp": snapshot.timestamp.isoformat(),
-                    "equity": account.equity,
-                    "balance": self.trader.balance,
-                    "positions": account.position_count,
-                }
+            # Update trader with current prices; open SL/TP orders are
+            # checked against the candle's high/low
+            self.trader.set_current_time(snapshot.timestamp)
+            if self.trader.has_exit_orders and snapshot.candles:
+                await self.trader.set_candles(snapshot.candles)
+            else:
+                self.trader.set_prices(snapshot.prices)
+
+            # Record equity (as computed by the price update above)
+            equity = self.trader.last_equity
+            self._equity.update(
+                snapshot.timestamp,
+                equity,
+                self.trader.balance,
+                self.trader.position_count,
             )
 
             # Make decision at intervals
-            if i % self.decision_interval == 0:
+            if (i - self.warmup_bars) % self.decision_interval == 0:
                 await self._make_decision(snapshot)
 
             self._candles_processed += 1
 
+            if self.progress_callback and (
+                self._candles_processed % interval == 0
+                or self._candles_processed == total
+            ):
+                await self.progress_callback(self._candles_processed, total, equity)
+
+            if time.monotonic() >= yield_at:
+                await asyncio.sleep(0)
+                yield_at = time.monotonic() + self.YIELD_SECONDS
+
         # Close any remaining positions
         for symbol in list(self.trader._positions.keys()):
             await self.trader.close_position(symbol)
@@ -221,6 +297,53 @@ class BacktestEngine:
         # Calculate final results
         return await self._build_result()
 
+    async def run_vectorized(
+        self, rule: Optional[RuleStrategy] = None
+    ) -> VectorizedResult:
+        """
+        Run a vectorized rule-strategy backtest on the same data.
+
+        Fast screening path for non-AI strategies; ``run()`` stays the
+        reference implementation.
+
+        Args:
+            rule: Rule strategy (default: SMA momentum, like ``run()``)
+
+        Returns:
+            VectorizedResult with summary metrics, trades and equity array
+        """
+        await self._ensure_data()
+
+        store = self.data_provider.get_store()
+        if store is None:
+            store = ColumnarCandleStore.from_candles(
+                {s: list(self.data_provider.get_data(s)) for s in self.config.symbols}
+            )
+        if not len(store):
+            raise ValueError("No data to backtest")
+
+        backtester = VectorizedBacktester(
+            rule=rule or SMAMomentumRule(period=self.sma_period),
+            initial_balance=self.initial_balance,
+            max_leverage=self.config.risk_controls.max_leverage,
+            max_position_ratio=self.config.risk_controls.max_position_ratio,
+            taker_fee=self.trader.taker_fee,
+            slippage=self.trader.default_slippage,
+        )
+        return backtester.run(store, symbols=self.config.symbols)
+
+    async def _ensure_data(self) -> None:
+        """Initialize the data provider and load candles if none was given"""
+        if not self.data_provider:
+            self.data_provider = DataProvider()
+            await self.data_provider.initialize()
+            await self.data_provider.load_data(
+                symbols=self.config.symbols,
+                start_date=self.start_date,
+                end_date=self.end_date,
+                timeframe="1h",
+            )
+
     async def _make_decision(self, snapshot: MarketSnapshot) -> None:
         """Make trading decision for current snapshot"""
         if self.use_ai and self.ai_client:
@@ -302,28 +425,23 @@ class BacktestEngine:
 
             # Get historical prices for SMA
             candles = self.data_provider.get_data(symbol)
-            if len(candles) < 20:
+            if len(candles) < self.sma_period:
                 continue
 
-            # Find current candle index
-            current_idx = -1
-            for i, c in enumerate(candles):
-                if c.timestamp >= snapshot.timestamp:
-                    current_idx = i
-                    break
-
-            if current_idx < 20:
+            # Advance cursor to the current candle (first at/after snapshot)
+            current_idx = self._advance_cursor(symbol, candles, snapshot.timestamp)
+            if current_idx < self.sma_period:
                 continue
 
-            # Calculate SMA(20)
-            sma_20 = sum(c.close for c in candles[current_idx - 20 : current_idx]) / 20
+            # SMA over the candles preceding the current one
+            sma = self._sma_sums[symbol] / self.sma_period
 
             # Current position
             position = await self.trader.get_position(symbol)
 
             # Decision logic
             leverage = self.config.risk_controls.max_leverage
-            if price > sma_20 * 1.01:  # 1% above SMA
+            if price > sma * 1.01:  # 1% above SMA
                 if not position:
                     # Open long — max_position_ratio limits margin, multiply
                     # by leverage to get the notional position value.
@@ -343,7 +461,7 @@ class BacktestEngine:
                 elif position and position.side == "short":
                     await self.trader.close_position(symbol)
 
-            elif price < sma_20 * 0.99:  # 1% below SMA
+            elif price < sma * 0.99:  # 1% below SMA
                 if not position:
                     # Open short — same margin-based sizing
                     max_margin = (
@@ -362,6 +480,36 @@ class BacktestEngine:
                 elif position and position.side == "long":
                     await self.trader.close_position(symbol)
 
+    def _advance_cursor(self, symbol: str, candles, timestamp: datetime) -> int:
+        """
+        Move a symbol's cursor to the first candle at or after ``timestamp``.
+
+        Snapshots arrive in time order, so the cursor only moves forward and
+        each candle is visited once per backtest. The rolling sum of the
+        ``sma_period`` closes before the cursor is updated along the way.
+
+        Returns:
+            Index of the current candle, or -1 if all candles are older
+        """
+        idx = self._cursors.get(symbol, 0)
+        window_sum = self._sma_sums.get(symbol, 0.0)
+        period = self.sma_period
+
+        # Rewind if time went backwards (e.g. engine reused on another range)
+        if idx > 0 and candles[idx - 1].timestamp >= timestamp:
+            idx, window_sum = 0, 0.0
+
+        n = len(candles)
+        while idx < n and candles[idx].timestamp < timestamp:
+            window_sum += candles[idx].close
+            if idx >= period:
+                window_sum -= candles[idx - period].close
+            idx += 1
+
+        self._cursors[symbol] = idx
+        self._sma_sums[symbol] = window_sum
+        return idx if idx < n else -1
+
     async def _execute_decisions(
         self,
         decision: DecisionResponse,
@@ -535,93 +683,34 @@ class BacktestEngine:
 
     async def _build_result(self) -> BacktestResult:
         """Build final backtest result"""
-        import statistics as stats_mod
-
         stats = self.trader.get_statistics()
         trades = self.trader.get_trades()
+        equity = self._equity
 
-        # --- Periodic returns for ratio calculations ---
-        returns = []
-        if len(self._equity_curve) > 1:
-            for i in range(1, len(self._equity_curve)):
-                prev = self._equity_curve[i - 1]["equity"]
-                curr = self._equity_curve[i]["equity"]
-                if prev > 0:
-                    returns.append((curr - prev) / prev)
-
-        # --- Sharpe Ratio (annualised, assuming hourly data) ---
-        sharpe = None
-        if returns:
-            mean_return = stats_mod.mean(returns)
-            std_return = stats_mod.stdev(returns) if len(returns) > 1 else 0
-            if std_return > 0:
-                sharpe = (mean_return * 8760) / (std_return * (8760**0.5))
-
-        # --- Sortino Ratio (only downside deviation) ---
-        sortino = None
-        if returns:
-            mean_return = stats_mod.mean(returns)
-            downside = [r for r in returns if r < 0]
-            if downside and len(downside) > 1:
-                downside_std = stats_mod.stdev(downside)
-                if downside_std > 0:
-                    sortino = (mean_return * 8760) / (downside_std * (8760**0.5))
+        # --- Sharpe / Sortino (annualised, assuming hourly data) ---
+        sharpe = equity.sharpe_ratio()
+        sortino = equity.sortino_ratio()
 
         # --- Calmar Ratio (annualised return / max drawdown) ---
         calmar = None
         max_dd_pct = stats["max_drawdown"]  # already in %
-        if max_dd_pct > 0 and len(self._equity_curve) > 1:
+        if max_dd_pct > 0 and len(equity) > 1:
             # Compute annualised return
-            total_hours = len(self._equity_curve)
+            total_hours = len(equity)
             total_return_pct = stats["total_pnl_percent"]
-            if total_hours > 0:
-                annualised_return = total_return_pct * (8760 / total_hours)
-                calmar = annualised_return / max_dd_pct
+            annualised_return = total_return_pct * (8760 / total_hours)
+            calmar = annualised_return / max_dd_pct
 
         # --- Recovery Factor (total return / max drawdown) ---
         recovery_factor = None
         if max_dd_pct > 0:
             recovery_factor = round(stats["total_pnl_percent"] / max_dd_pct, 2)
 
-        # --- Drawdown curve ---
-        drawdown_curve = []
-        if self._equity_curve:
-            peak = self._equity_curve[0]["equity"]
-            for pt in self._equity_curve:
-                eq = pt["equity"]
-                if eq > peak:
-                    peak = eq
-                dd_pct = ((peak - eq) / peak * 100) if peak > 0 else 0
-                drawdown_curve.append(
-                    {
-                        "timestamp": pt["timestamp"],
-                        "drawdown_percent": round(dd_pct, 4),
-                    }
-                )
-
-        # --- Monthly returns ---
-        monthly_returns = []
-        if len(self._equity_curve) > 1:
-            monthly_buckets: dict = {}
-            for pt in self._equity_curve:
-                month_key = pt["timestamp"][:7]  # "YYYY-MM"
-                if month_key not in monthly_buckets:
-                    monthly_buckets[month_key] = {
-                        "first": pt["equity"],
-                        "last": pt["equity"],
-                    }
-                monthly_buckets[month_key]["last"] = pt["equity"]
-
-            for month_key, bucket in sorted(monthly_buckets.items()):
-                first_eq = bucket["first"]
-                last_eq = bucket["last"]
-                ret_pct = ((last_eq - first_eq) / first_eq * 100) if first_eq > 0 else 0
-                monthly_returns.append(
-                    {
-                        "month": month_key,
-                        "return_percent": round(ret_pct, 2),
-                    }
-                )
+        # --- Curves (downsampled) and monthly returns ---
+        max_points = settings.backtest_equity_curve_limit
+        equity_curve = equity.equity_curve(max_points)
+        drawdown_curve = equity.drawdown_curve(max_points)
+        monthly_returns = equity.monthly_returns()
 
         # --- Trade statistics (extended) ---
         trade_statistics = {
@@ -673,15 +762,23 @@ class BacktestEngine:
             recovery_factor=recovery_factor,
             total_fees=stats["total_fees"],
             trades=trades,
-            equity_curve=self._equity_curve,
+            equity_curve=equity_curve,
             drawdown_curve=drawdown_curve,
             monthly_returns=monthly_returns,
             trade_statistics=trade_statistics,
             symbol_breakdown=stats["symbol_breakdown"],
             decisions=self._decisions,
             analysis=analysis,
+            data_load=self._data_load_stats(),
         )
 
+    def _data_load_stats(self) -> Optional[Dict[str, Any]]:
+        """Exchange download statistics, if the provider fetched anything"""
+        stats = getattr(self.data_provider, "fetch_stats", None)
+        if not isinstance(stats, FetchStats) or not stats.requests:
+            return None
+        return stats.to_dict()
+
     async def cleanup(self) -> None:
         """Cleanup resources"""
         if self.data_provider:
@@ -0,0 +1,262 @@
+"""
+Persistent on-disk OHLCV history for backtesting.
+
+Candles are stored per exchange / symbol / timeframe as a NumPy ``.npy``
+record array (int64 timestamp + float64 OHLCV fields) that is memory-mapped
+on read.  A small JSON sidecar records which time intervals have been fetched
+completely, so a new request only downloads the parts of its range that no
+earlier request covered:
+
+    <root>/<exchange>/<symbol>/<timeframe>/candles.npy
+    <root>/<exchange>/<symbol>/<timeframe>/coverage.json
+
+Intervals are inclusive ``[start_ms, end_ms]`` epoch-millisecond ranges.
+Both files are replaced atomically, candles before coverage, so readers never
+see coverage without its candles.  Concurrent writers to the same series may
+drop each other's additions, which only costs a re-fetch.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .columnar import FIELDS
+
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[int, int]
+
+CANDLE_DTYPE = np.dtype(
+    [("timestamp", np.int64)] + [(name, np.float64) for name in FIELDS]
+)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merge overlapping or adjacent inclusive intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(start: int, end: int, covered: List[Interval]) -> List[Interval]:
+    """Parts of ``[start, end]`` not covered by the (merged) intervals"""
+    gaps: List[Interval] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start - 1))
+        cursor = max(cursor, c_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class OHLCVHistoryStore:
+    """
+    Local candle history with interval coverage tracking.
+
+    Usage:
+        store = OHLCVHistoryStore("data/ohlcv")
+        for start, end in store.missing("binance", "BTC/USDT", "1h", s, e):
+            store.write("binance", "BTC/USDT", "1h", start, end, fetched_columns)
+        columns = store.read("binance", "BTC/USDT", "1h", s, e)
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _series_dir(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        parts = (exchange, symbol, timeframe)
+        return self.root.joinpath(*(_UNSAFE_CHARS.sub("_", p) for p in parts))
+
+    # ==================== Coverage ====================
+
+    def coverage(self, exchange: str, symbol: str, timeframe: str) -> List[Interval]:
+        """Fetched intervals of a series (merged, sorted)"""
+        path = self._series_dir(exchange, symbol, timeframe) / "coverage.json"
+        try:
+            with open(path) as f:
+                return [tuple(i) for i in json.load(f)["intervals"]]
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable OHLCV coverage {path}: {e}")
+            return []
+
+    def missing(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> List[Interval]:
+        """Sub-ranges of ``[start_ms, end_ms]`` that still need fetching"""
+        return subtract_intervals(
+            start_ms, end_ms, self.coverage(exchange, symbol, timeframe)
+        )
+
+    # ==================== Read / Write ====================
+
+    def read(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Stored candles with timestamps in ``[start_ms, end_ms]``.
+
+        Returns:
+            Columns in ``candles_to_columns`` format (empty if nothing stored)
+        """
+        candles = self._load(exchange, symbol, timeframe, mmap=True)
+        timestamps = candles["timestamp"]
+        lo = int(np.searchsorted(timestamps, start_ms, side="left"))
+        hi = int(np.searchsorted(timestamps, end_ms, side="right"))
+        rows = candles[lo:hi]
+        return {name: np.array(rows[name]) for name in CANDLE_DTYPE.names}
+
+    def write(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+        columns: Dict[str, np.ndarray],
+        complete_until_ms: Optional[int] = None,
+    ) -> None:
+        """
+        Merge fetched candles into the series and mark the range as covered.
+
+        Args:
+            start_ms / end_ms: Range the candles were fetched for
+            columns: Fetched candles (``candles_to_columns`` format); they
+                replace stored candles with the same timestamps
+            complete_until_ms: Only mark coverage up to this time (e.g. the
+                last closed candle), so still-forming candles are re-fetched
+        """
+        series_dir = self._series_dir(exchange, symbol, timeframe)
+        new = np.empty(len(columns["timestamp"]), dtype=CANDLE_DTYPE)
+        for name in CANDLE_DTYPE.names:
+            new[name] = columns[name]
+
+        with self._lock:
+            old = self._load(exchange, symbol, timeframe, mmap=False)
+
+            # New candles first so np.unique keeps them over stored duplicates
+            merged = np.concatenate([new, old])
+            _, first = np.unique(merged["timestamp"], return_index=True)
+            candles = merged[first]
+
+            covered_end = end_ms
+            if complete_until_ms is not None:
+                covered_end = min(end_ms, complete_until_ms)
+            intervals = self.coverage(exchange, symbol, timeframe)
+            if covered_end >= start_ms:
+                intervals = merge_intervals(intervals + [(start_ms, covered_end)])
+
+            series_dir.mkdir(parents=True, exist_ok=True)
+            self._atomic_save(series_dir / "candles.npy", candles)
+            self._atomic_write_json(
+                series_dir / "coverage.json",
+                {"intervals": [list(i) for i in intervals]},
+            )
+
+    def clear(
+        self,
+        exchange: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> int:
+        """
+        Delete stored series.
+
+        Returns:
+            Number of series removed
+        """
+        import shutil
+
+        base = self.root
+        if exchange:
+            base = base / _UNSAFE_CHARS.sub("_", exchange)
+            if symbol:
+                base = base / _UNSAFE_CHARS.sub("_", symbol)
+        if not base.exists():
+            return 0
+        removed = sum(1 for _ in base.rglob("coverage.json"))
+        shutil.rmtree(base, ignore_errors=True)
+        return removed
+
+    # ==================== Internals ====================
+
+    def _load(
+        self, exchange: str, symbol: str, timeframe: str, mmap: bool
+    ) -> np.ndarray:
+        path = self._series_dir(exchange, symbol, timeframe) / "candles.npy"
+        try:
+            candles = np.load(path, mmap_mode="r" if mmap else None)
+            if candles.dtype == CANDLE_DTYPE:
+                return candles
+            logger.warning(f"Discarding OHLCV history with unknown layout: {path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable OHLCV history {path}: {e}")
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    @staticmethod
+    def _atomic_save(path: Path, array: np.ndarray) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @staticmethod
+    def _atomic_write_json(path: Path, data: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+_history_stores: Dict[str, OHLCVHistoryStore] = {}
+
+
+def get_history_store(root: str) -> OHLCVHistoryStore:
+    """Get the shared history store for a directory"""
+    store = _history_stores.get(root)
+    if store is None:
+        store = OHLCVHistoryStore(root)
+        _history_stores[root] = store
+    return store
@@ -0,0 +1,80 @@
+"""
+Intrabar stop-loss / take-profit resolution for backtesting.
+
+A candle whose range touches both a position's stop loss and its take
+profit does not say which level traded first.  ``SimulatedTrader`` settles
+such candles with a fixed policy (``stop_first`` by default); a
+``LowerTimeframeResolver`` can instead replay the candle's span on a lower
+timeframe.  Only these ambiguous candles are drilled into, so a run fetches
+a handful of lower-timeframe windows rather than the whole range.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from .simulator import SimulatedPosition
+
+logger = logging.getLogger(__name__)
+
+
+class LowerTimeframeResolver:
+    """
+    Decide which exit level a candle hit first from lower-timeframe candles.
+
+    Usage:
+        resolver = LowerTimeframeResolver(data_provider, lower_timeframe="1m")
+        trader = SimulatedTrader(intrabar_resolver=resolver)
+
+    Returns None (fall back to the trader's policy) when the lower timeframe
+    is not finer than the backtest's, the candles cannot be fetched, or a
+    lower-timeframe candle is itself ambiguous.
+    """
+
+    def __init__(self, data_provider: Any, lower_timeframe: str = "1m"):
+        self.data_provider = data_provider
+        self.lower_timeframe = lower_timeframe
+        self.drilldowns = 0
+        self.resolved = 0
+        self._results: Dict[Tuple[str, Any], Optional[str]] = {}
+
+    async def __call__(self, pos: SimulatedPosition, candle: Any) -> Optional[str]:
+        key = (pos.symbol, candle.timestamp)
+        if key in self._results:
+            return self._results[key]
+
+        result = await self._drill_down(pos, candle)
+        self._results[key] = result
+        return result
+
+    async def _drill_down(self, pos: SimulatedPosition, candle: Any) -> Optional[str]:
+        timeframe_ms = self.data_provider.TIMEFRAME_MS
+        bar_ms = timeframe_ms.get(self.data_provider.timeframe or "1h", 3600000)
+        lower_ms = timeframe_ms.get(self.lower_timeframe)
+        if not lower_ms or lower_ms >= bar_ms:
+            return None
+
+        self.drilldowns += 1
+        start = candle.timestamp
+        end = start + timedelta(milliseconds=bar_ms - 1)
+        try:
+            lower = await self.data_provider.fetch_candles(
+                pos.symbol, self.lower_timeframe, start, end
+            )
+        except Exception as e:
+            logger.warning(
+                f"Intrabar drilldown failed for {pos.symbol} at {start}: {e}"
+            )
+            return None
+
+        for c in lower:
+            sl_hit, tp_hit = pos.touched_levels(c.high, c.low)
+            if sl_hit and tp_hit:
+                sl_gapped, tp_gapped = pos.touched_levels(c.open, c.open)
+                if not (sl_gapped or tp_gapped):
+                    return None
+                sl_hit = sl_gapped
+            if sl_hit or tp_hit:
+                self.resolved += 1
+                return "stop_loss" if sl_hit else "take_profit"
+        return None
@@ -0,0 +1,222 @@
+"""
+Streaming performance metrics for the event-driven backtest.
+
+``EquityTracker`` is updated once per simulated candle and keeps everything
+``BacktestEngine`` reports about the equity curve without a second pass:
+
+- Return mean / variance (Welford), overall and downside-only, for the
+  Sharpe and Sortino ratios
+- Running peak and maximum drawdown
+- First / last equity per calendar month
+
+The curve itself is kept in typed ``array`` buffers (28 bytes per candle
+instead of a dict with an ISO string) and only turned into JSON-ready dicts,
+downsampled, when the result is built.
+"""
+
+import math
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .columnar import datetime_to_ms, ms_to_datetime
+
+# Annualisation factor of the ratios (hourly candles)
+PERIODS_PER_YEAR = 8760
+
+
+class RunningStats:
+    """Welford's online mean / sample variance"""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two values)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+def downsample_indices(n: int, max_points: int, keep: Sequence[int] = ()) -> List[int]:
+    """
+    Evenly spaced indices into ``n`` points, at most ``max_points`` of them.
+
+    The first and last points are always included, as are the ``keep``
+    indices (e.g. the trough of the maximum drawdown).
+    """
+    if n <= max_points:
+        return list(range(n))
+    keep = sorted({i for i in keep if 0 <= i < n})
+    slots = max(max_points - len(keep), 2)
+    spaced = np.unique(np.linspace(0, n - 1, slots).round().astype(np.int64))
+    return sorted(set(spaced.tolist()) | set(keep))
+
+
+def downsample_points(points: List[Any], max_points: int) -> List[Any]:
+    """Evenly downsample an already materialized curve"""
+    return [points[i] for i in downsample_indices(len(points), max_points)]
+
+
+class EquityTracker:
+    """
+    Incremental equity-curve metrics.
+
+    Usage:
+        tracker = EquityTracker()
+        for snapshot in snapshots:
+            ...
+            tracker.update(snapshot.timestamp, equity, balance, positions)
+        tracker.sharpe_ratio(), tracker.equity_curve(max_points=1000)
+    """
+
+    def __init__(self, periods_per_year: int = PERIODS_PER_YEAR):
+        self.periods_per_year = periods_per_year
+        self.returns = RunningStats()
+        self.downside_returns = RunningStats()
+        self.peak = 0.0
+        self.max_drawdown = 0.0  # fraction of the peak
+        self._peak_index = 0
+        self._max_dd_span: Tuple[int, int] = (0, 0)  # (peak, trough) indices
+
+        self._timestamps = array("q")
+        self._equity = array("d")
+        self._balance = array("d")
+        self._positions = array("i")
+        self._tz = None
+
+        # "YYYY-MM" -> [first equity, last equity], in time order
+        self._months: Dict[str, List[float]] = {}
+        self._month: Optional[Tuple[int, int]] = None
+        self._month_bucket: Optional[List[float]] = None
+
+    def __len__(self) -> int:
+        return len(self._equity)
+
+    def update(
+        self,
+        timestamp: datetime,
+        equity: float,
+        balance: float = 0.0,
+        positions: int = 0,
+    ) -> None:
+        """Record one step of the equity curve"""
+        index = len(self._equity)
+        if index:
+            prev = self._equity[-1]
+            if prev > 0:
+                r = (equity - prev) / prev
+                self.returns.push(r)
+                if r < 0:
+                    self.downside_returns.push(r)
+        else:
+            self._tz = timestamp.tzinfo
+            self.peak = equity
+
+        if equity > self.peak:
+            self.peak = equity
+            self._peak_index = index
+        if self.peak > 0:
+            drawdown = (self.peak - equity) / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+                self._max_dd_span = (self._peak_index, index)
+
+        month = (timestamp.year, timestamp.month)
+        if month != self._month:
+            self._month = month
+            key = f"{month[0]:04d}-{month[1]:02d}"
+            self._month_bucket = self._months.setdefault(key, [equity, equity])
+        self._month_bucket[1] = equity
+
+        self._timestamps.append(datetime_to_ms(timestamp))
+        self._equity.append(equity)
+        self._balance.append(balance)
+        self._positions.append(positions)
+
+    # ==================== Ratios ====================
+
+    def sharpe_ratio(self) -> Optional[float]:
+        """Annualised Sharpe ratio of per-candle returns"""
+        std = self.returns.stdev
+        if not self.returns.count or std <= 0:
+            return None
+        n = self.periods_per_year
+        return (self.returns.mean * n) / (std * math.sqrt(n))
+
+    def sortino_ratio(self) -> Optional[float]:
+        """Annualised Sortino ratio (deviation of negative returns only)"""
+        if self.downside_returns.count < 2:
+            return None
+        std = self.downside_returns.stdev
+        if std <= 0:
+            return None
+        n = self.periods_per_year
+        return (self.returns.mean * n) / (std * math.sqrt(n))
+
+    def monthly_returns(self) -> List[Dict[str, Any]]:
+        if len(self._equity) < 2:
+            return []
+        return [
+            {
+                "month": key,
+                "return_percent": round(
+                    ((last - first) / first * 100) if first > 0 else 0, 2
+                ),
+            }
+            for key, (first, last) in sorted(self._months.items())
+        ]
+
+    # ==================== Curves ====================
+
+    def _indices(self, max_points: Optional[int]) -> List[int]:
+        n = len(self._equity)
+        if max_points is None:
+            return list(range(n))
+        return downsample_indices(n, max_points, keep=self._max_dd_span)
+
+    def _timestamp(self, i: int) -> str:
+        return ms_to_datetime(self._timestamps[i], self._tz).isoformat()
+
+    def equity_curve(self, max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Equity points (downsampled to ``max_points`` if given)"""
+        return [
+            {
+                "timestamp": self._timestamp(i),
+                "equity": self._equity[i],
+                "balance": self._balance[i],
+                "positions": self._positions[i],
+            }
+            for i in self._indices(max_points)
+        ]
+
+    def drawdown_curve(self, max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Drawdown from the running peak in percent, at the same points"""
+        if not len(self._equity):
+            return []
+        equity = np.frombuffer(self._equity, dtype=np.float64)
+        peak = np.maximum.accumulate(equity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+        return [
+            {
+                "timestamp": self._timestamp(i),
+                "drawdown_percent": round(float(drawdown[i]), 4),
+            }
+            for i in self._indices(max_points)
+        ]
@@ -0,0 +1,534 @@
+"""
+Robustness analysis for rule-based backtests.
+
+- Walk-forward optimization: rolling in-sample / out-of-sample windows over
+  one loaded history; every in-sample grid search and out-of-sample check
+  runs in a shared ``BacktestPool``.
+- Monte-Carlo trade resampling: bootstrap or shuffle closed-trade P&L to get
+  confidence bands for return and drawdown.
+
+Results are returned as distributions rather than single numbers.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .columnar import ColumnarCandleStore
+from .sweep import (
+    RANK_METRICS,
+    BacktestPool,
+    SearchProgressCallback,
+    SweepRow,
+    expand_grid,
+    rank_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+MONTE_CARLO_METHODS = ("bootstrap", "shuffle")
+
+
+@dataclass
+class Distribution:
+    """Summary of a sample of metric values"""
+
+    values: np.ndarray
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[float]]) -> "Distribution":
+        """Build from raw values, dropping None / NaN"""
+        arr = np.array([v for v in values if v is not None], dtype=np.float64).reshape(
+            -1
+        )
+        return cls(values=arr[~np.isnan(arr)])
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return float(self.values.mean()) if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        return float(self.values.std(ddof=1)) if self.count > 1 else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        return float(np.percentile(self.values, q)) if self.count else None
+
+    def band(self, confidence: float = 0.9) -> Tuple[Optional[float], Optional[float]]:
+        """Central interval holding ``confidence`` of the values"""
+        tail = (1 - confidence) / 2 * 100
+        return self.percentile(tail), self.percentile(100 - tail)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": float(self.values.min()) if self.count else None,
+            "max": float(self.values.max()) if self.count else None,
+            "percentiles": {f"p{q}": self.percentile(q) for q in PERCENTILES},
+        }
+
+
+# ==================== Monte-Carlo ====================
+
+
+@dataclass
+class MonteCarloResult:
+    """Distributions of resampled trade sequences"""
+
+    method: str
+    simulations: int
+    trades: int
+    initial_balance: float
+    total_return_percent: Distribution
+    max_drawdown_percent: Distribution
+    probability_of_loss: float
+    probability_of_ruin: float = 0.0
+    confidence: float = 0.9
+
+    def to_dict(self) -> dict:
+        return_band = self.total_return_percent.band(self.confidence)
+        drawdown_band = self.max_drawdown_percent.band(self.confidence)
+        return {
+            "method": self.method,
+            "simulations": self.simulations,
+            "trades": self.trades,
+            "initial_balance": self.initial_balance,
+            "confidence": self.confidence,
+            "probability_of_loss": self.probability_of_loss,
+            "probability_of_ruin": self.probability_of_ruin,
+            "total_return_percent": {
+                **self.total_return_percent.to_dict(),
+                "band": list(return_band),
+            },
+            "max_drawdown_percent": {
+                **self.max_drawdown_percent.to_dict(),
+                "band": list(drawdown_band),
+            },
+        }
+
+
+def _trade_pnl(trade: Any) -> float:
+    if isinstance(trade, dict):
+        return float(trade.get("pnl", 0.0))
+    if isinstance(trade, (int, float)):
+        return float(trade)
+    return float(trade.pnl)
+
+
+def run_monte_carlo(
+    trades: Sequence[Any],
+    initial_balance: float,
+    simulations: int = 1000,
+    method: str = "bootstrap",
+    confidence: float = 0.9,
+    seed: Optional[int] = None,
+    chunk_size: int = 2000,
+) -> MonteCarloResult:
+    """
+    Resample closed trades to estimate return and drawdown distributions.
+
+    Args:
+        trades: ``Trade`` objects (``SimulatedTrader.get_trades()``), persisted
+            trade dicts or raw P&L values
+        initial_balance: Starting balance of each simulated path
+        simulations: Number of resampled paths
+        method: ``bootstrap`` (draw with replacement) or ``shuffle``
+            (permute order; final return is fixed, drawdown varies)
+        confidence: Width of the reported bands
+        seed: Random seed for reproducible results
+        chunk_size: Paths simulated per vectorized batch
+
+    Raises:
+        ValueError: On an unknown method, no trades or invalid counts
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(
+            f"Unknown Monte-Carlo method: {method}. "
+            f"Supported: {', '.join(MONTE_CARLO_METHODS)}"
+        )
+    if simulations < 1:
+        raise ValueError("simulations must be >= 1")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    pnls = np.array([_trade_pnl(t) for t in trades], dtype=np.float64)
+    if not len(pnls):
+        raise ValueError("No trades to resample")
+
+    rng = np.random.default_rng(seed)
+    n = len(pnls)
+    returns = np.empty(simulations)
+    drawdowns = np.empty(simulations)
+    ruin = np.zeros(simulations, dtype=bool)
+
+    for start in range(0, simulations, chunk_size):
+        stop = min(start + chunk_size, simulations)
+        if method == "bootstrap":
+            sample = pnls[rng.integers(0, n, size=(stop - start, n))]
+        else:
+            sample = rng.permuted(np.broadcast_to(pnls, (stop - start, n)), axis=1)
+
+        equity = initial_balance + np.cumsum(sample, axis=1)
+        # A path that hits zero equity is ruined and stays there
+        ruined = np.logical_or.accumulate(equity <= 0, axis=1)
+        equity[ruined] = 0.0
+        ruin[start:stop] = ruined[:, -1]
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial_balance)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+        returns[start:stop] = (equity[:, -1] - initial_balance) / initial_balance * 100
+        drawdowns[start:stop] = drawdown.max(axis=1)
+
+    return MonteCarloResult(
+        method=method,
+        simulations=simulations,
+        trades=n,
+        initial_balance=initial_balance,
+        total_return_percent=Distribution(returns),
+        max_drawdown_percent=Distribution(drawdowns),
+        probability_of_loss=float((returns < 0).mean()),
+        probability_of_ruin=float(ruin.mean()),
+        confidence=confidence,
+    )
+
+
+# ==================== Walk-forward ====================
+
+
+def walk_forward_windows(
+    length: int,
+    in_sample_bars: int,
+    out_of_sample_bars: int,
+    step_bars: Optional[int] = None,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Rolling window boundaries over ``length`` bars.
+
+    Returns:
+        ``(is_start, is_stop, oos_start, oos_stop)`` index tuples; the
+        out-of-sample range directly follows its in-sample range
+
+    Raises:
+        ValueError: On non-positive sizes or when no window fits
+    """
+    step = step_bars or out_of_sample_bars
+    if in_sample_bars <= 0 or out_of_sample_bars <= 0 or step <= 0:
+        raise ValueError("Window sizes must be positive")
+
+    windows = []
+    start = 0
+    while start + in_sample_bars + out_of_sample_bars <= length:
+        split = start + in_sample_bars
+        windows.append((start, split, split, split + out_of_sample_bars))
+        start += step
+    if not windows:
+        raise ValueError(
+            f"History of {length} bars is too short for "
+            f"{in_sample_bars} in-sample + {out_of_sample_bars} out-of-sample bars"
+        )
+    return windows
+
+
+@dataclass
+class WalkForwardWindow:
+    """One in-sample optimization and its out-of-sample check"""
+
+    index: int
+    in_sample_start: datetime
+    in_sample_end: datetime
+    out_of_sample_start: datetime
+    out_of_sample_end: datetime
+    best_params: Optional[Dict[str, Any]] = None
+    in_sample: Optional[SweepRow] = None
+    out_of_sample: Optional[SweepRow] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "in_sample_start": self.in_sample_start.isoformat(),
+            "in_sample_end": self.in_sample_end.isoformat(),
+            "out_of_sample_start": self.out_of_sample_start.isoformat(),
+            "out_of_sample_end": self.out_of_sample_end.isoformat(),
+            "best_params": self.best_params,
+            "in_sample": self.in_sample.to_dict() if self.in_sample else None,
+            "out_of_sample": (
+                self.out_of_sample.to_dict() if self.out_of_sample else None
+            ),
+        }
+
+
+@dataclass
+class WalkForwardResult:
+    """Walk-forward windows with out-of-sample metric distributions"""
+
+    rank_by: str
+    windows: List[WalkForwardWindow] = field(default_factory=list)
+    distributions: Dict[str, Distribution] = field(default_factory=dict)
+    efficiency: Optional[float] = None
+    monte_carlo: Optional[MonteCarloResult] = None
+    evaluations: int = 0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "rank_by": self.rank_by,
+            "windows": [w.to_dict() for w in self.windows],
+            "distributions": {k: d.to_dict() for k, d in self.distributions.items()},
+            "efficiency": self.efficiency,
+            "monte_carlo": self.monte_carlo.to_dict() if self.monte_carlo else None,
+            "evaluations": self.evaluations,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+# Out-of-sample metrics summarized as distributions
+WALK_FORWARD_METRICS = (
+    "total_return_percent",
+    "max_drawdown_percent",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "calmar_ratio",
+)
+
+
+class WalkForwardOptimizer:
+    """
+    Rolling in-sample grid search with out-of-sample evaluation.
+
+    For each window the grid is searched on the in-sample bars, the best
+    combination (by ``rank_by``) is re-run on the following out-of-sample
+    bars, and out-of-sample metrics are collected across windows.
+
+    Usage:
+        optimizer = WalkForwardOptimizer(store, strategy_config=config)
+        result = await optimizer.run(
+            {"sma_period": [10, 20, 50]},
+            in_sample_bars=24 * 90,
+            out_of_sample_bars=24 * 30,
+        )
+    """
+
+    def __init__(
+        self,
+        store: ColumnarCandleStore,
+        strategy_config: Dict[str, Any],
+        strategy_name: str = "Walk-Forward",
+        initial_balance: float = 10000.0,
+        max_workers: Optional[int] = None,
+        intrabar_policy: str = "stop_first",
+    ):
+        """
+        Initialize optimizer.
+
+        Args:
+            store: Loaded candle data shared by all runs
+            strategy_config: Base StrategyConfig dict; grid values override it
+            strategy_name: Name reported by each run
+            initial_balance: Starting balance of every window run
+            intrabar_policy: SL/TP fill order of every run (see SimulatedTrader)
+            max_workers: Process pool size (default: settings, capped at CPU count)
+        """
+        if max_workers is None:
+            from ..core.config import get_settings
+
+            max_workers = get_settings().backtest_sweep_max_workers
+        self.store = store
+        self.strategy_config = strategy_config
+        self.strategy_name = strategy_name
+        self.initial_balance = initial_balance
+        self.intrabar_policy = intrabar_policy
+        self.max_workers = max(1, min(max_workers, os.cpu_count() or 1))
+
+    def _job(self, params: Dict[str, Any], bars: Tuple[int, int], **extra) -> dict:
+        return {
+            "strategy_name": self.strategy_name,
+            "config": self.strategy_config,
+            "initial_balance": self.initial_balance,
+            "intrabar_policy": self.intrabar_policy,
+            "params": params,
+            "bars": bars,
+            **extra,
+        }
+
+    async def run(
+        self,
+        grid: Dict[str, Sequence[Any]],
+        in_sample_bars: int,
+        out_of_sample_bars: int,
+        step_bars: Optional[int] = None,
+        rank_by: str = "sharpe_ratio",
+        monte_carlo_simulations: int = 0,
+        seed: Optional[int] = None,
+        progress_callback: Optional[SearchProgressCallback] = None,
+    ) -> WalkForwardResult:
+        """
+        Run the walk-forward optimization.
+
+        Args:
+            grid: Parameter grid searched in every in-sample window
+            in_sample_bars: Bars per optimization window
+            out_of_sample_bars: Bars per evaluation window
+            step_bars: Window advance (default: ``out_of_sample_bars``)
+            rank_by: Metric used to pick the in-sample winner
+            monte_carlo_simulations: If > 0, resample the stitched
+                out-of-sample trades this many times
+            seed: Random seed for the Monte-Carlo step
+            progress_callback: Awaited after each backtest run with (runs
+                done, total runs); an exception it raises (e.g.
+                ``BacktestCancelled``) cancels the remaining runs
+
+        Raises:
+            ValueError: On an invalid grid, metric or window sizes
+        """
+        from .engine import BacktestEngine
+
+        if rank_by not in RANK_METRICS:
+            raise ValueError(
+                f"Unknown rank metric: {rank_by}. Supported: {', '.join(RANK_METRICS)}"
+            )
+        combinations = expand_grid(grid)
+        bounds = walk_forward_windows(
+            len(self.store), in_sample_bars, out_of_sample_bars, step_bars
+        )
+
+        started = time.perf_counter()
+        ts = self.store.timestamp_at
+        windows = [
+            WalkForwardWindow(
+                index=i,
+                in_sample_start=ts(is_start),
+                in_sample_end=ts(is_stop - 1),
+                out_of_sample_start=ts(oos_start),
+                out_of_sample_end=ts(oos_stop - 1),
+            )
+            for i, (is_start, is_stop, oos_start, oos_stop) in enumerate(bounds)
+        ]
+
+        in_sample_jobs = [
+            self._job(params, (is_start, is_stop))
+            for is_start, is_stop, _, _ in bounds
+            for params in combinations
+        ]
+        # One out-of-sample run per window at most
+        total = len(in_sample_jobs) + len(bounds)
+        done = 0
+
+        async def on_done() -> None:
+            nonlocal done
+            done += 1
+            await progress_callback(done, total)
+
+        tracked = on_done if progress_callback else None
+        workers = min(self.max_workers, len(in_sample_jobs))
+        async with BacktestPool(self.store, workers) as pool:
+            outcomes = await pool.map(in_sample_jobs, tracked)
+
+            out_of_sample_jobs = []
+            for window, (_, _, oos_start, oos_stop) in zip(windows, bounds):
+                offset = window.index * len(combinations)
+                rows = [
+                    _to_row(params, outcome)
+                    for params, outcome in zip(
+                        combinations, outcomes[offset : offset + len(combinations)]
+                    )
+                ]
+                best = rank_rows(rows, rank_by)[0]
+                if best.error is None:
+                    window.in_sample = best
+                    window.best_params = best.params
+                    # Prime the SMA on the bars before the window so it can
+                    # trade from its first bar; only the window is scored
+                    period = best.params.get("sma_period", BacktestEngine.SMA_PERIOD)
+                    start = max(oos_start - period, 0)
+                    out_of_sample_jobs.append(
+                        (
+                            window,
+                            self._job(
+                                best.params,
+                                (start, oos_stop),
+                                warmup=oos_start - start,
+                                include_trades=True,
+                            ),
+                        )
+                    )
+
+            oos_outcomes = await pool.map(
+                [job for _, job in out_of_sample_jobs], tracked
+            )
+
+        trade_pnls: List[float] = []
+        for (window, _), outcome in zip(out_of_sample_jobs, oos_outcomes):
+            if not isinstance(outcome, BaseException):
+                trade_pnls.extend(outcome.pop("trade_pnls", []))
+            window.out_of_sample = _to_row(window.best_params, outcome)
+
+        evaluated = [
+            w for w in windows if w.out_of_sample and not w.out_of_sample.error
+        ]
+        distributions = {
+            metric: Distribution.from_values(
+                [getattr(w.out_of_sample, metric) for w in evaluated]
+            )
+            for metric in WALK_FORWARD_METRICS
+        }
+
+        # Walk-forward efficiency: mean OOS return relative to mean IS return,
+        # both per bar so differently sized windows are comparable
+        efficiency = None
+        if evaluated:
+            is_rate = (
+                np.mean([w.in_sample.total_return_percent for w in evaluated])
+                / in_sample_bars
+            )
+            oos_rate = (
+                np.mean([w.out_of_sample.total_return_percent for w in evaluated])
+                / out_of_sample_bars
+            )
+            if is_rate > 0:
+                efficiency = float(oos_rate / is_rate)
+
+        monte_carlo = None
+        if monte_carlo_simulations > 0 and trade_pnls:
+            monte_carlo = await asyncio.to_thread(
+                run_monte_carlo,
+                trade_pnls,
+                initial_balance=self.initial_balance,
+                simulations=monte_carlo_simulations,
+                seed=seed,
+            )
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Walk-forward finished: {len(windows)} windows x "
+            f"{len(combinations)} combinations in {elapsed:.2f}s"
+        )
+        return WalkForwardResult(
+            rank_by=rank_by,
+            windows=windows,
+            distributions=distributions,
+            efficiency=efficiency,
+            monte_carlo=monte_carlo,
+            evaluations=len(in_sample_jobs) + len(out_of_sample_jobs),
+            elapsed_seconds=elapsed,
+        )
+
+
+def _to_row(params: Dict[str, Any], outcome: Any) -> SweepRow:
+    if isinstance(outcome, BaseException):
+        logger.warning(f"Walk-forward run {params} failed: {outcome}")
+        return SweepRow(params=params, error=str(outcome))
+    return SweepRow(params=params, **outcome)
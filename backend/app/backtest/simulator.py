@@ -6,7 +6,7 @@ Implements BaseTrader interface with simulated execution.
 
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Dict, List, Literal, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
 
 from ..traders.base import (
     AccountState,
@@ -72,6 +72,16 @@ class SimulatedPosition:
         else:
             return current_price <= self.take_profit
 
+    def touched_levels(self, high: float, low: float) -> Tuple[bool, bool]:
+        """(stop loss touched, take profit touched) within a candle's range"""
+        if self.side == "long":
+            sl_hit = bool(self.stop_loss) and low <= self.stop_loss
+            tp_hit = bool(self.take_profit) and high >= self.take_profit
+        else:
+            sl_hit = bool(self.stop_loss) and high >= self.stop_loss
+            tp_hit = bool(self.take_profit) and low <= self.take_profit
+        return sl_hit, tp_hit
+
     def to_position(self, current_price: float) -> Position:
         """Convert to Position object"""
         pnl = self.calculate_pnl(current_price)
@@ -125,6 +135,15 @@ class Trade:
         return (self.closed_at - self.opened_at).total_seconds() / 60
 
 
+# Which level fills first when a candle touches both stop loss and take profit
+IntrabarPolicy = Literal["stop_first", "target_first", "nearest_first"]
+INTRABAR_POLICIES = ("stop_first", "target_first", "nearest_first")
+
+# Resolves an ambiguous candle (both levels touched) to "stop_loss" /
+# "take_profit", or None to fall back to the intrabar policy
+IntrabarResolver = Callable[["SimulatedPosition", Any], Awaitable[Optional[str]]]
+
+
 class SimulatedTrader(BaseTrader):
     """
     Simulated trader for backtesting.
@@ -142,6 +161,12 @@ class SimulatedTrader(BaseTrader):
         trader.set_prices({"BTC": 50000, "ETH": 3000})
 
         result = await trader.open_long("BTC", 1000, leverage=10)
+
+    ``set_prices`` checks SL/TP against the given (close) prices only.
+    ``set_candles`` checks them against each candle's high/low: a candle
+    that opens beyond a level fills at the open, otherwise at the level.
+    When a candle touches both levels, ``intrabar_resolver`` (e.g. a lower
+    timeframe drilldown) decides, falling back to ``intrabar_policy``.
     """
 
     def __init__(
@@ -150,6 +175,8 @@ class SimulatedTrader(BaseTrader):
         maker_fee: float = 0.0002,  # 0.02%
         taker_fee: float = 0.0005,  # 0.05%
         default_slippage: float = 0.001,  # 0.1%
+        intrabar_policy: IntrabarPolicy = "stop_first",
+        intrabar_resolver: Optional[IntrabarResolver] = None,
     ):
         """
         Initialize simulated trader.
@@ -159,13 +186,24 @@ class SimulatedTrader(BaseTrader):
             maker_fee: Maker fee rate
             taker_fee: Taker fee rate
             default_slippage: Default slippage for market orders
+            intrabar_policy: Fill order when a candle touches both SL and TP:
+                ``stop_first`` (conservative), ``target_first`` or
+                ``nearest_first`` (level closer to the candle open)
+            intrabar_resolver: Optional async resolver for such candles
         """
+        if intrabar_policy not in INTRABAR_POLICIES:
+            raise ValueError(
+                f"Unknown intrabar policy: {intrabar_policy}. "
+                f"Supported: {', '.join(INTRABAR_POLICIES)}"
+            )
         super().__init__(testnet=True, default_slippage=default_slippage)
 
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.maker_fee = maker_fee
         self.taker_fee = taker_fee
+        self.intrabar_policy = intrabar_policy
+        self.intrabar_resolver = intrabar_resolver
 
         self._positions: Dict[str, SimulatedPosition] = {}
         self._trades: List[Trade] = []
@@ -178,6 +216,7 @@ class SimulatedTrader(BaseTrader):
         self.total_fees_paid = 0.0
         self.peak_balance = initial_balance
         self.max_drawdown = 0.0
+        self.last_equity = initial_balance  # equity at the last price update
 
     @property
     def exchange_name(self) -> str:
@@ -216,9 +255,76 @@ class SimulatedTrader(BaseTrader):
             elif pos.check_take_profit(price):
                 self._close_position_internal(symbol, price, "take_profit")
 
+    @property
+    def has_exit_orders(self) -> bool:
+        """Whether any open position has a stop loss or take profit"""
+        return any(p.stop_loss or p.take_profit for p in self._positions.values())
+
+    async def set_candles(self, candles: Dict[str, Any]) -> None:
+        """
+        Update prices to candle closes and resolve SL/TP against high/low.
+
+        Args:
+            candles: symbol -> candle with open/high/low/close attributes
+        """
+        self._current_prices.update({s: c.close for s, c in candles.items()})
+
+        for symbol in list(self._positions.keys()):
+            pos = self._positions.get(symbol)
+            candle = candles.get(symbol)
+            if not pos or candle is None:
+                continue
+            exit_ = await self._resolve_intrabar_exit(pos, candle)
+            if exit_:
+                reason, price = exit_
+                self._close_position_internal(symbol, price, reason)
+
+        self._update_metrics()
+
+    async def _resolve_intrabar_exit(
+        self, pos: SimulatedPosition, candle: Any
+    ) -> Optional[Tuple[str, float]]:
+        """Exit reason and fill price of a position within a candle, if any"""
+        # Gap through a level: the open is the first tradable price
+        sl_gapped, tp_gapped = pos.touched_levels(candle.open, candle.open)
+        if sl_gapped:
+            return "stop_loss", candle.open
+        if tp_gapped:
+            return "take_profit", candle.open
+
+        sl_hit, tp_hit = pos.touched_levels(candle.high, candle.low)
+        if sl_hit and tp_hit:
+            reason = None
+            if self.intrabar_resolver is not None:
+                reason = await self.intrabar_resolver(pos, candle)
+            if reason is None:
+                reason = self._apply_intrabar_policy(pos, candle)
+            sl_hit = reason == "stop_loss"
+            tp_hit = not sl_hit
+
+        if sl_hit:
+            return "stop_loss", pos.stop_loss
+        if tp_hit:
+            return "take_profit", pos.take_profit
+        return None
+
+    def _apply_intrabar_policy(self, pos: SimulatedPosition, candle: Any) -> str:
+        if self.intrabar_policy == "target_first":
+            return "take_profit"
+        if self.intrabar_policy == "nearest_first":
+            sl_distance = abs(candle.open - pos.stop_loss)
+            tp_distance = abs(candle.open - pos.take_profit)
+            return "take_profit" if tp_distance < sl_distance else "stop_loss"
+        return "stop_loss"
+
+    @property
+    def position_count(self) -> int:
+        return len(self._positions)
+
     def _update_metrics(self) -> None:
         """Update tracking metrics"""
         equity = self._calculate_equity()
+        self.last_equity = equity
 
         if equity > self.peak_balance:
             self.peak_balance = equity
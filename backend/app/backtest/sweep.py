@@ -0,0 +1,489 @@
+"""
+Parameter sweep (grid search) for rule-based backtests.
+
+Candles are loaded once, copied into a single shared-memory block and
+attached read-only by every worker of a process pool.  Each parameter
+combination runs a full ``BacktestEngine`` in a worker process, so the
+calling event loop only awaits the results.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .columnar import FIELDS, ColumnarCandleStore
+
+logger = logging.getLogger(__name__)
+
+# Awaited with (evaluations done, total evaluations); may raise to stop the run
+SearchProgressCallback = Callable[[int, int], Awaitable[None]]
+
+# Tunable parameters and the type their grid values are coerced to
+SWEEP_PARAMETERS = {
+    "max_leverage": int,
+    "max_position_ratio": float,
+    "sma_period": int,
+}
+
+# Metrics a sweep can be ranked by; True = higher is better
+RANK_METRICS = {
+    "sharpe_ratio": True,
+    "sortino_ratio": True,
+    "calmar_ratio": True,
+    "total_return_percent": True,
+    "max_drawdown_percent": False,
+}
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into the list of all combinations.
+
+    Args:
+        grid: parameter name -> candidate values
+
+    Raises:
+        ValueError: On unknown parameters or empty value lists
+    """
+    unknown = [name for name in grid if name not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown sweep parameter(s): {', '.join(sorted(unknown))}. "
+            f"Supported: {', '.join(SWEEP_PARAMETERS)}"
+        )
+    names = list(grid)
+    values = []
+    for name in names:
+        if not grid[name]:
+            raise ValueError(f"Sweep parameter '{name}' has no values")
+        cast = SWEEP_PARAMETERS[name]
+        # Preserve order, drop duplicates after coercion
+        values.append(list(dict.fromkeys(cast(v) for v in grid[name])))
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+# ==================== Shared candle arrays ====================
+
+
+class SharedCandleStore:
+    """
+    Copy of a ``ColumnarCandleStore`` in one shared-memory block.
+
+    The owner creates the block and must call ``close()`` when done; workers
+    rebuild a store from ``spec`` with ``attach()`` without copying.
+    """
+
+    def __init__(self, store: ColumnarCandleStore):
+        arrays: List[Tuple[str, str, np.ndarray]] = [
+            ("", "timestamp", store.timestamps)
+        ]
+        for symbol in store.symbols:
+            for name in FIELDS:
+                arrays.append((symbol, name, store.column(symbol, name)))
+
+        size = sum(arr.nbytes for _, _, arr in arrays)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        layout = []
+        offset = 0
+        for symbol, name, arr in arrays:
+            view = np.ndarray(
+                arr.shape, dtype=arr.dtype, buffer=self._shm.buf, offset=offset
+            )
+            view[:] = arr
+            layout.append((symbol, name, arr.dtype.str, len(arr), offset))
+            offset += arr.nbytes
+
+        self.spec: Dict[str, Any] = {
+            "name": self._shm.name,
+            "layout": layout,
+            "tz": store.tz,
+        }
+
+    @staticmethod
+    def attach(
+        spec: Dict[str, Any],
+    ) -> Tuple[shared_memory.SharedMemory, ColumnarCandleStore]:
+        """
+        Attach to a shared block and build a read-only store over it.
+
+        The returned ``SharedMemory`` handle must stay referenced for as long
+        as the store is used.
+        """
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        timestamps = None
+        columns: Dict[str, Dict[str, np.ndarray]] = {}
+        for symbol, name, dtype, length, offset in spec["layout"]:
+            arr = np.ndarray((length,), dtype=dtype, buffer=shm.buf, offset=offset)
+            arr.setflags(write=False)
+            if name == "timestamp":
+                timestamps = arr
+            else:
+                columns.setdefault(symbol, {})[name] = arr
+        return shm, ColumnarCandleStore(timestamps, columns, tz=spec["tz"])
+
+    def close(self) -> None:
+        """Release and unlink the shared block"""
+        self._shm.close()
+        self._shm.unlink()
+
+
+# ==================== Worker side ====================
+
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_store: Optional[ColumnarCandleStore] = None
+
+
+def _init_worker(spec: Dict[str, Any]) -> None:
+    """Process pool initializer: attach the shared candle arrays once"""
+    global _worker_shm, _worker_store
+    _worker_shm, _worker_store = SharedCandleStore.attach(spec)
+
+
+def _run_combination(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Process pool task: run one backtest on the worker's shared store"""
+    return asyncio.run(evaluate_combination(_worker_store, job))
+
+
+async def evaluate_combination(
+    store: ColumnarCandleStore, job: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Run a rule-based ``BacktestEngine`` for one parameter combination.
+
+    Args:
+        store: Candle data to backtest on
+        job: ``strategy_name``, ``config`` (StrategyConfig dict),
+            ``initial_balance`` and ``params``; optional ``bars``
+            (``(start, stop)`` index range of the store), ``warmup``
+            (leading bars of that range that only prime the SMA),
+            ``intrabar_policy`` and ``include_trades`` (add closed-trade
+            P&L as ``trade_pnls``)
+
+    Returns:
+        Dict of summary metrics
+    """
+    from .data_provider import DataProvider
+    from .engine import BacktestEngine
+
+    bars = job.get("bars")
+    if bars is not None:
+        store = store.slice(*bars)
+
+    params = job["params"]
+    config = dict(job["config"])
+    risk_controls = dict(config.get("risk_controls") or {})
+    for name in ("max_leverage", "max_position_ratio"):
+        if name in params:
+            risk_controls[name] = params[name]
+    config["risk_controls"] = risk_controls
+
+    strategy = SimpleNamespace(name=job["strategy_name"], config=config)
+    engine = BacktestEngine(
+        strategy=strategy,
+        initial_balance=job["initial_balance"],
+        data_provider=DataProvider.from_store(store),
+        use_ai=False,
+        sma_period=params.get("sma_period"),
+        intrabar_policy=job.get("intrabar_policy", "stop_first"),
+        warmup_bars=job.get("warmup", 0),
+    )
+    result = await engine.run()
+    metrics = {
+        "final_balance": result.final_balance,
+        "total_return_percent": result.total_return_percent,
+        "total_trades": result.total_trades,
+        "win_rate": result.win_rate,
+        "profit_factor": result.profit_factor,
+        "max_drawdown_percent": result.max_drawdown_percent,
+        "sharpe_ratio": result.sharpe_ratio,
+        "sortino_ratio": result.sortino_ratio,
+        "calmar_ratio": result.calmar_ratio,
+    }
+    if job.get("include_trades"):
+        metrics["trade_pnls"] = [t.pnl for t in result.trades]
+    return metrics
+
+
+class BacktestPool:
+    """
+    Process pool whose workers share one store's candle arrays.
+
+    Usage:
+        async with BacktestPool(store, max_workers=4) as pool:
+            outcomes = await pool.map(jobs)
+    """
+
+    def __init__(self, store: ColumnarCandleStore, max_workers: int):
+        self.store = store
+        self.max_workers = max(1, max_workers)
+        self._shared: Optional[SharedCandleStore] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self) -> "BacktestPool":
+        self._shared = SharedCandleStore(self.store)
+        # spawn: workers must not inherit the parent's event loop
+        # and open connections
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._shared.spec,),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        executor, shared = self._executor, self._shared
+        self._executor = None
+        self._shared = None
+        try:
+            if executor is None:
+                pass
+            elif exc_type is None:
+                # Joining the workers blocks; keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(
+                    None, executor.shutdown
+                )
+            else:
+                # On error or cancellation drop queued combinations and let
+                # the running ones finish in the background
+                executor.shutdown(wait=False, cancel_futures=True)
+        finally:
+            # Attached workers keep their mapping after the unlink
+            if shared:
+                shared.close()
+
+    async def map(
+        self,
+        jobs: List[Dict[str, Any]],
+        on_done: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[Any]:
+        """
+        Run ``evaluate_combination`` jobs in the pool.
+
+        Args:
+            jobs: Combination jobs
+            on_done: Awaited after each job finishes; if it raises, the
+                jobs not yet finished are cancelled and the error propagates
+
+        Returns:
+            One metrics dict per job, or the exception the job raised
+        """
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(self._executor, _run_combination, job) for job in jobs
+        ]
+        if on_done is not None:
+            try:
+                for next_done in asyncio.as_completed(futures):
+                    try:
+                        await next_done
+                    except Exception:
+                        pass  # Collected with the other outcomes below
+                    await on_done()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+
+# ==================== Results ====================
+
+
+@dataclass
+class SweepRow:
+    """Metrics of one parameter combination"""
+
+    params: Dict[str, Any]
+    rank: int = 0
+    final_balance: Optional[float] = None
+    total_return_percent: Optional[float] = None
+    total_trades: int = 0
+    win_rate: Optional[float] = None
+    profit_factor: Optional[float] = None
+    max_drawdown_percent: Optional[float] = None
+    sharpe_ratio: Optional[float] = None
+    sortino_ratio: Optional[float] = None
+    calmar_ratio: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "rank": self.rank,
+            "params": self.params,
+            "final_balance": self.final_balance,
+            "total_return_percent": self.total_return_percent,
+            "total_trades": self.total_trades,
+            "win_rate": self.win_rate,
+            "profit_factor": self.profit_factor,
+            "max_drawdown_percent": self.max_drawdown_percent,
+            "sharpe_ratio": self.sharpe_ratio,
+            "sortino_ratio": self.sortino_ratio,
+            "calmar_ratio": self.calmar_ratio,
+            "error": self.error,
+        }
+
+
+@dataclass
+class SweepResult:
+    """Ranked parameter sweep results"""
+
+    rank_by: str
+    rows: List[SweepRow] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def best(self) -> Optional[SweepRow]:
+        return self.rows[0] if self.rows and self.rows[0].error is None else None
+
+    def to_dict(self) -> dict:
+        return {
+            "rank_by": self.rank_by,
+            "combinations": len(self.rows),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows": [row.to_dict() for row in self.rows],
+        }
+
+
+def rank_rows(rows: List[SweepRow], rank_by: str) -> List[SweepRow]:
+    """
+    Sort rows best-first by a metric and assign 1-based ranks.
+
+    Failed rows and rows without a value for the metric go last.
+    """
+    if rank_by not in RANK_METRICS:
+        raise ValueError(
+            f"Unknown rank metric: {rank_by}. Supported: {', '.join(RANK_METRICS)}"
+        )
+    higher_is_better = RANK_METRICS[rank_by]
+
+    def key(row: SweepRow):
+        value = getattr(row, rank_by)
+        if row.error is not None or value is None:
+            return (1, 0.0)
+        return (0, -value if higher_is_better else value)
+
+    ranked = sorted(rows, key=key)
+    for i, row in enumerate(ranked, start=1):
+        row.rank = i
+    return ranked
+
+
+# ==================== Orchestrator ====================
+
+
+class ParameterSweep:
+    """
+    Grid search over rule-based backtest parameters.
+
+    Usage:
+        sweep = ParameterSweep(store, strategy_config=config.model_dump())
+        result = await sweep.run(
+            {"max_leverage": [2, 5], "sma_period": [10, 20, 50]},
+            rank_by="sortino_ratio",
+        )
+    """
+
+    def __init__(
+        self,
+        store: ColumnarCandleStore,
+        strategy_config: Dict[str, Any],
+        strategy_name: str = "Parameter Sweep",
+        initial_balance: float = 10000.0,
+        max_workers: Optional[int] = None,
+        intrabar_policy: str = "stop_first",
+    ):
+        """
+        Initialize sweep.
+
+        Args:
+            store: Loaded candle data shared by all runs
+            strategy_config: Base StrategyConfig dict; grid values override it
+            strategy_name: Name reported by each run
+            initial_balance: Starting balance of every run
+            intrabar_policy: SL/TP fill order of every run (see SimulatedTrader)
+            max_workers: Process pool size (default: settings, capped at CPU count)
+        """
+        if max_workers is None:
+            from ..core.config import get_settings
+
+            max_workers = get_settings().backtest_sweep_max_workers
+        self.store = store
+        self.strategy_config = strategy_config
+        self.strategy_name = strategy_name
+        self.initial_balance = initial_balance
+        self.intrabar_policy = intrabar_policy
+        self.max_workers = max(1, min(max_workers, os.cpu_count() or 1))
+
+    async def run(
+        self,
+        grid: Dict[str, Sequence[Any]],
+        rank_by: str = "sharpe_ratio",
+        progress_callback: Optional[SearchProgressCallback] = None,
+    ) -> SweepResult:
+        """
+        Run every combination of the grid and rank the results.
+
+        ``progress_callback`` is awaited after each combination with
+        (combinations done, total); an exception it raises (e.g.
+        ``BacktestCancelled``) cancels the remaining combinations.
+
+        Raises:
+            ValueError: On an invalid grid or rank metric
+        """
+        if rank_by not in RANK_METRICS:
+            raise ValueError(
+                f"Unknown rank metric: {rank_by}. Supported: {', '.join(RANK_METRICS)}"
+            )
+        combinations = expand_grid(grid)
+        jobs = [
+            {
+                "strategy_name": self.strategy_name,
+                "config": self.strategy_config,
+                "initial_balance": self.initial_balance,
+                "intrabar_policy": self.intrabar_policy,
+                "params": params,
+            }
+            for params in combinations
+        ]
+
+        done = 0
+
+        async def on_done() -> None:
+            nonlocal done
+            done += 1
+            await progress_callback(done, len(jobs))
+
+        started = time.perf_counter()
+        async with BacktestPool(self.store, min(self.max_workers, len(jobs))) as pool:
+            outcomes = await pool.map(jobs, on_done if progress_callback else None)
+
+        rows = []
+        for params, outcome in zip(combinations, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Sweep combination {params} failed: {outcome}")
+                rows.append(SweepRow(params=params, error=str(outcome)))
+            else:
+                rows.append(SweepRow(params=params, **outcome))
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Parameter sweep finished: {len(rows)} combinations "
+            f"in {elapsed:.2f}s ({self.max_workers} workers)"
+        )
+        return SweepResult(
+            rank_by=rank_by,
+            rows=rank_rows(rows, rank_by),
+            elapsed_seconds=elapsed,
+        )
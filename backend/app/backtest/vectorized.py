@@ -0,0 +1,601 @@
+"""
+Vectorized backtesting for rule-based strategies.
+
+Screens non-AI strategies much faster than the event-driven loop:
+signals for a whole history are computed in one pass with array
+indicators, and each trade's exit (stop-loss, take-profit or opposite
+signal) is located with array searches against candle highs/lows instead
+of stepping ``SimulatedTrader`` bar by bar.
+
+The event-driven ``BacktestEngine.run`` remains the reference path.
+Both resolve SL/TP intrabar against high/low with gap-through fills at the
+open.  Differences by design:
+- Candles touching both levels always fill the stop first (the engine's
+  default ``intrabar_policy``; no lower-timeframe drilldown)
+- Symbols are evaluated independently; capital is shared through a
+  single time-ordered sizing pass, exits before entries within a bar
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..services import indicator_series as series
+from .columnar import ColumnarCandleStore
+from .simulator import Trade
+
+# Annualisation factor used by BacktestEngine (hourly data)
+PERIODS_PER_YEAR = 8760
+
+# Minimum notional for a new position (same as the rule-based engine)
+MIN_POSITION_USD = 100
+
+
+# ==================== Rule Strategies ====================
+
+
+class RuleStrategy(ABC):
+    """
+    Base class for vectorized rule strategies.
+
+    Subclasses implement ``signals()`` returning an int8 array over the
+    symbol's candles: +1 = long bias, -1 = short bias, 0 = no signal.
+    On a signal the backtester opens a position when flat, or closes a
+    position on the opposite side (like ``_rule_based_decision``).
+
+    Stops default to fixed percentages of the entry price; set
+    ``sl_atr_mult`` / ``tp_atr_mult`` to use ATR multiples instead.
+    """
+
+    name = "rule"
+
+    def __init__(
+        self,
+        stop_loss_pct: float = 0.03,
+        take_profit_pct: float = 0.06,
+        sl_atr_mult: Optional[float] = None,
+        tp_atr_mult: Optional[float] = None,
+        atr_period: int = 14,
+    ):
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.sl_atr_mult = sl_atr_mult
+        self.tp_atr_mult = tp_atr_mult
+        self.atr_period = atr_period
+
+    @abstractmethod
+    def signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        """Compute signal array from ``open/high/low/close/volume`` columns"""
+
+    def params(self) -> Dict[str, Any]:
+        """Strategy parameters (for reporting)"""
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+    def stop_distances(
+        self, bars: Dict[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stop-loss and take-profit distances (in price) for an entry at each bar.
+
+        NaN disables the level for entries at that bar.
+        """
+        close = bars["close"]
+        sl = close * self.stop_loss_pct if self.stop_loss_pct else np.nan * close
+        tp = close * self.take_profit_pct if self.take_profit_pct else np.nan * close
+        if self.sl_atr_mult or self.tp_atr_mult:
+            atr = series.atr(bars["high"], bars["low"], close, self.atr_period)
+            if self.sl_atr_mult:
+                sl = atr * self.sl_atr_mult
+            if self.tp_atr_mult:
+                tp = atr * self.tp_atr_mult
+        return sl, tp
+
+
+def _sign(long_mask: np.ndarray, short_mask: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(long_mask), dtype=np.int8)
+    out[long_mask] = 1
+    out[short_mask] = -1
+    return out
+
+
+class SMAMomentumRule(RuleStrategy):
+    """Price vs SMA of the preceding candles (the engine's default rule)"""
+
+    name = "sma_momentum"
+
+    def __init__(self, period: int = 20, band: float = 0.01, **kwargs):
+        super().__init__(**kwargs)
+        self.period = period
+        self.band = band
+
+    def signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        close = bars["close"]
+        # SMA of the `period` closes before each bar
+        prev_sma = np.full(len(close), np.nan)
+        prev_sma[1:] = series.sma(close, self.period)[:-1]
+        with np.errstate(invalid="ignore"):
+            return _sign(
+                close > prev_sma * (1 + self.band),
+                close < prev_sma * (1 - self.band),
+            )
+
+
+class EMACrossRule(RuleStrategy):
+    """Fast EMA above / below slow EMA"""
+
+    name = "ema_cross"
+
+    def __init__(self, fast: int = 9, slow: int = 21, **kwargs):
+        super().__init__(**kwargs)
+        self.fast = fast
+        self.slow = slow
+
+    def signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        fast = series.ema(bars["close"], self.fast)
+        slow = series.ema(bars["close"], self.slow)
+        with np.errstate(invalid="ignore"):
+            return _sign(fast > slow, fast < slow)
+
+
+class RSIReversionRule(RuleStrategy):
+    """Long when oversold, short when overbought"""
+
+    name = "rsi_reversion"
+
+    def __init__(
+        self,
+        period: int = 14,
+        oversold: float = 30,
+        overbought: float = 70,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+
+    def signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        values = series.rsi(bars["close"], self.period)
+        with np.errstate(invalid="ignore"):
+            return _sign(values < self.oversold, values > self.overbought)
+
+
+class MACDRule(RuleStrategy):
+    """Sign of the MACD histogram"""
+
+    name = "macd"
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, **kwargs):
+        super().__init__(**kwargs)
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+
+    def signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        hist = series.macd(bars["close"], self.fast, self.slow, self.signal)[
+            "histogram"
+        ]
+        with np.errstate(invalid="ignore"):
+            return _sign(hist > 0, hist < 0)
+
+
+class BollingerReversionRule(RuleStrategy):
+    """Long below the lower band, short above the upper band"""
+
+    name = "bollinger_reversion"
+
+    def __init__(self, period: int = 20, num_std: float = 2.0, **kwargs):
+        super().__init__(**kwargs)
+        self.period = period
+        self.num_std = num_std
+
+    def signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        bands = series.bollinger(bars["close"], self.period, self.num_std)
+        close = bars["close"]
+        with np.errstate(invalid="ignore"):
+            return _sign(close < bands["lower"], close > bands["upper"])
+
+
+RULE_STRATEGIES = {
+    "sma_momentum": SMAMomentumRule,
+    "ema_cross": EMACrossRule,
+    "rsi_reversion": RSIReversionRule,
+    "macd": MACDRule,
+    "bollinger_reversion": BollingerReversionRule,
+}
+
+
+def create_rule(name: str, params: Optional[dict] = None) -> RuleStrategy:
+    """Factory function to create a rule strategy by name"""
+    rule_class = RULE_STRATEGIES.get(name)
+    if not rule_class:
+        raise ValueError(f"Unknown rule strategy: {name}")
+    return rule_class(**(params or {}))
+
+
+# ==================== Trade Resolution ====================
+
+
+@dataclass
+class _Leg:
+    """Trade interval resolved before position sizing"""
+
+    symbol: str
+    side: int  # +1 long, -1 short
+    entry: int  # global bar index
+    exit: int  # global bar index
+    signal_price: float
+    entry_price: float
+    exit_price: float
+    reason: str
+
+
+def _first_touch(
+    high: np.ndarray,
+    low: np.ndarray,
+    start: int,
+    stop: int,
+    side: int,
+    sl: float,
+    tp: float,
+) -> Optional[int]:
+    """
+    Index of the first bar in [start, stop) whose range touches SL or TP.
+
+    Searches in geometrically growing chunks so cost is proportional to the
+    trade's length rather than the remaining history.
+    """
+    chunk = 64
+    while start < stop:
+        end = min(stop, start + chunk)
+        if side > 0:
+            hit = (low[start:end] <= sl) | (high[start:end] >= tp)
+        else:
+            hit = (high[start:end] >= sl) | (low[start:end] <= tp)
+        if hit.any():
+            return start + int(np.argmax(hit))
+        start = end
+        chunk *= 4
+    return None
+
+
+def _next_index(indices: List[int], start: int, default: int) -> int:
+    pos = bisect_left(indices, start)
+    return indices[pos] if pos < len(indices) else default
+
+
+@dataclass
+class VectorizedResult:
+    """Summary of a vectorized backtest"""
+
+    rule: str
+    params: Dict[str, Any]
+    initial_balance: float
+    final_balance: float
+    total_return_percent: float
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    profit_factor: float
+    max_drawdown_percent: float
+    sharpe_ratio: Optional[float] = None
+    sortino_ratio: Optional[float] = None
+    total_fees: float = 0.0
+    trades: List[Trade] = field(default_factory=list)
+    timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    equity: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    def to_dict(self) -> dict:
+        return {
+            "rule": self.rule,
+            "params": self.params,
+            "initial_balance": self.initial_balance,
+            "final_balance": self.final_balance,
+            "total_return_percent": self.total_return_percent,
+            "total_trades": self.total_trades,
+            "winning_trades": self.winning_trades,
+            "losing_trades": self.losing_trades,
+            "win_rate": self.win_rate,
+            "profit_factor": self.profit_factor,
+            "max_drawdown_percent": self.max_drawdown_percent,
+            "sharpe_ratio": self.sharpe_ratio,
+            "sortino_ratio": self.sortino_ratio,
+            "total_fees": self.total_fees,
+        }
+
+
+class VectorizedBacktester:
+    """
+    Array-based backtester for ``RuleStrategy`` implementations.
+
+    Usage:
+        backtester = VectorizedBacktester(EMACrossRule(fast=9, slow=21))
+        result = backtester.run(store, symbols=["BTC", "ETH"])
+    """
+
+    def __init__(
+        self,
+        rule: RuleStrategy,
+        initial_balance: float = 10000.0,
+        max_leverage: int = 1,
+        max_position_ratio: float = 0.1,
+        taker_fee: float = 0.0005,
+        slippage: float = 0.001,
+    ):
+        self.rule = rule
+        self.initial_balance = initial_balance
+        self.max_leverage = max_leverage
+        self.max_position_ratio = max_position_ratio
+        self.taker_fee = taker_fee
+        self.slippage = slippage
+
+    def run(
+        self,
+        store: ColumnarCandleStore,
+        symbols: Optional[List[str]] = None,
+    ) -> VectorizedResult:
+        """
+        Run the rule over every symbol in the store.
+
+        Args:
+            store: Candle history
+            symbols: Symbols to trade (default: all symbols in the store)
+        """
+        symbols = [s for s in (symbols or store.symbols) if s in store.symbols]
+        closes: Dict[str, np.ndarray] = {}
+        legs: List[_Leg] = []
+
+        for symbol in symbols:
+            rows = store.rows(symbol)
+            if not len(rows):
+                continue
+            bars = {
+                name: store.column(symbol, name)[rows]
+                for name in ("open", "high", "low", "close", "volume")
+            }
+            legs.extend(self._resolve_symbol(symbol, rows, bars))
+            closes[symbol] = self._forward_fill(store.column(symbol, "close"))
+
+        trades, equity, fees = self._size_and_mark(store, legs, closes)
+        return self._build_result(store, trades, equity, fees)
+
+    # ---------- per-symbol signal resolution ----------
+
+    def _resolve_symbol(
+        self,
+        symbol: str,
+        rows: np.ndarray,
+        bars: Dict[str, np.ndarray],
+    ) -> List[_Leg]:
+        opens, highs, lows, closes = (
+            bars["open"],
+            bars["high"],
+            bars["low"],
+            bars["close"],
+        )
+        n = len(closes)
+        signal = np.asarray(self.rule.signals(bars), dtype=np.int8)
+        sl_dist, tp_dist = self.rule.stop_distances(bars)
+
+        # Scalar lookups below run once per trade; plain lists avoid NumPy
+        # scalar overhead there
+        entries = np.flatnonzero(signal != 0).tolist()
+        longs = np.flatnonzero(signal > 0).tolist()
+        shorts = np.flatnonzero(signal < 0).tolist()
+        sides = signal.tolist()
+        open_list, close_list = opens.tolist(), closes.tolist()
+        sl_list, tp_list = sl_dist.tolist(), tp_dist.tolist()
+        row_list = rows.tolist()
+        slip = self.slippage
+
+        legs: List[_Leg] = []
+        i = _next_index(entries, 0, n)
+        while i < n:
+            side = sides[i]
+            price = close_list[i]
+            sl = price - side * sl_list[i] if sl_list[i] == sl_list[i] else None
+            tp = price + side * tp_list[i] if tp_list[i] == tp_list[i] else None
+            opposite = _next_index(shorts if side > 0 else longs, i + 1, n)
+
+            # SL/TP are checked before the decision on the opposite-signal bar
+            touch = _first_touch(
+                highs,
+                lows,
+                i + 1,
+                min(opposite + 1, n),
+                side,
+                sl if sl is not None else (-np.inf if side > 0 else np.inf),
+                tp if tp is not None else (np.inf if side > 0 else -np.inf),
+            )
+
+            if touch is not None:
+                j = touch
+                stop_hit = sl is not None and (
+                    lows[j] <= sl if side > 0 else highs[j] >= sl
+                )
+                level = sl if stop_hit else tp
+                reason = "stop_loss" if stop_hit else "take_profit"
+                # Gap through the level fills at the open
+                gapped = (open_list[j] - level) * side
+                exit_price = open_list[j] if (gapped < 0) == stop_hit else level
+                next_start = j  # decision on the same bar may re-enter
+            else:
+                j = min(opposite, n - 1)
+                reason = "signal"
+                exit_price = close_list[j] * (1 - side * slip)
+                next_start = j + 1
+
+            legs.append(
+                _Leg(
+                    symbol=symbol,
+                    side=side,
+                    entry=row_list[i],
+                    exit=row_list[j],
+                    signal_price=price,
+                    entry_price=price * (1 + side * slip),
+                    exit_price=exit_price,
+                    reason=reason,
+                )
+            )
+            i = _next_index(entries, max(next_start, i + 1), n)
+
+        return legs
+
+    # ---------- portfolio sizing and equity ----------
+
+    @staticmethod
+    def _forward_fill(values: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(values)
+        idx = np.where(valid, np.arange(len(values)), 0)
+        np.maximum.accumulate(idx, out=idx)
+        return values[idx]
+
+    def _size_and_mark(
+        self,
+        store: ColumnarCandleStore,
+        legs: List[_Leg],
+        closes: Dict[str, np.ndarray],
+    ) -> Tuple[List[Trade], np.ndarray, float]:
+        n = len(store)
+        leverage = self.max_leverage
+        realized = np.zeros(n + 1)
+        unrealized = np.zeros(n)
+        trades: List[Trade] = []
+        fees = 0.0
+
+        # Event sweep by bar. Exits settle first; entries on a bar are then
+        # sized from one account snapshot, as the engine reads the account
+        # once per decision step.
+        exits_at: Dict[int, List[int]] = {}
+        entries_at: Dict[int, List[int]] = {}
+        for k, leg in enumerate(legs):
+            entries_at.setdefault(leg.entry, []).append(k)
+            settle = leg.exit + 1 if leg.reason == "signal" else leg.exit
+            exits_at.setdefault(settle, []).append(k)
+
+        balance = self.initial_balance
+        margin_used = 0.0
+        open_legs: Dict[int, Tuple[float, float]] = {}  # leg -> (qty, margin)
+
+        for bar in sorted(set(exits_at) | set(entries_at)):
+            for k in exits_at.get(bar, ()):
+                if k not in open_legs:
+                    continue
+                leg = legs[k]
+                qty, margin = open_legs.pop(k)
+                margin_used -= margin
+                pnl = (leg.exit_price - leg.entry_price) * qty * leg.side
+                balance += pnl
+                if leg.reason == "signal":
+                    fees += qty * leg.exit_price * self.taker_fee
+
+                # Equity is recorded before decisions: a signal close shows up
+                # on the next bar, an intrabar SL/TP on the bar itself
+                realized[bar] += pnl
+                close = closes[leg.symbol]
+                unrealized[leg.entry + 1 : bar] += (
+                    (close[leg.entry + 1 : bar] - leg.entry_price) * qty * leg.side
+                )
+
+                trades.append(
+                    Trade(
+                        symbol=leg.symbol,
+                        side="long" if leg.side > 0 else "short",
+                        size=qty,
+                        entry_price=leg.entry_price,
+                        exit_price=leg.exit_price,
+                        leverage=leverage,
+                        pnl=pnl,
+                        pnl_percent=pnl / margin * 100 if margin else 0.0,
+                        opened_at=store.timestamp_at(leg.entry),
+                        closed_at=store.timestamp_at(leg.exit),
+                        exit_reason=leg.reason,
+                    )
+                )
+
+            available = balance - margin_used
+            for k in entries_at.get(bar, ()):
+                leg = legs[k]
+                size_usd = available * self.max_position_ratio * leverage
+                if size_usd <= MIN_POSITION_USD:
+                    continue
+                qty = size_usd / leg.signal_price
+                margin = qty * leg.entry_price / leverage
+                if margin > balance:
+                    continue
+                open_legs[k] = (qty, margin)
+                margin_used += margin
+                fees += qty * leg.entry_price * self.taker_fee
+
+        equity = self.initial_balance + np.cumsum(realized[:n]) + unrealized
+        trades.sort(key=lambda t: t.closed_at)
+        return trades, equity, fees
+
+    def _build_result(
+        self,
+        store: ColumnarCandleStore,
+        trades: List[Trade],
+        equity: np.ndarray,
+        fees: float,
+    ) -> VectorizedResult:
+        pnls = np.array([t.pnl for t in trades], dtype=np.float64)
+        final_balance = self.initial_balance + float(pnls.sum())
+        gross_profit = float(pnls[pnls > 0].sum())
+        gross_loss = float(-pnls[pnls < 0].sum())
+        wins = int((pnls > 0).sum())
+        losses = int((pnls < 0).sum())
+
+        max_drawdown = 0.0
+        sharpe = sortino = None
+        if len(equity):
+            peak = np.maximum.accumulate(equity)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+            max_drawdown = float(drawdown.max()) * 100
+
+        if len(equity) > 2:
+            prev = equity[:-1]
+            returns = (equity[1:] - prev)[prev > 0] / prev[prev > 0]
+            if len(returns) > 1:
+                std = float(returns.std(ddof=1))
+                mean = float(returns.mean())
+                scale = PERIODS_PER_YEAR**0.5
+                if std > 0:
+                    sharpe = mean / std * scale
+                downside = returns[returns < 0]
+                if len(downside) > 1:
+                    downside_std = float(downside.std(ddof=1))
+                    if downside_std > 0:
+                        sortino = mean / downside_std * scale
+
+        return VectorizedResult(
+            rule=self.rule.name,
+            params=self.rule.params(),
+            initial_balance=self.initial_balance,
+            final_balance=final_balance,
+            total_return_percent=(
+                (final_balance - self.initial_balance) / self.initial_balance * 100
+                if self.initial_balance > 0
+                else 0
+            ),
+            total_trades=len(trades),
+            winning_trades=wins,
+            losing_trades=losses,
+            win_rate=wins / len(trades) * 100 if trades else 0,
+            profit_factor=(
+                gross_profit / gross_loss
+                if gross_loss > 0
+                else (float("inf") if gross_profit > 0 else 0)
+            ),
+            max_drawdown_percent=max_drawdown,
+            sharpe_ratio=sharpe,
+            sortino_ratio=sortino,
+            total_fees=fees,
+            trades=trades,
+            timestamps=store.timestamps,
+            equity=equity,
+        )
@@ -3,14 +3,18 @@
 import os
 import secrets
 from functools import lru_cache
+from pathlib import Path
 from typing import Literal
 
-from pydantic import Field, PostgresDsn, RedisDsn, model_validator
+from pydantic import Field, PostgresDsn, RedisDsn, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Marker to detect if JWT_SECRET was auto-generated vs explicitly set
 _JWT_SECRET_AUTO_GENERATED = secrets.token_urlsafe(32)
 
+# backend/ directory; relative data paths resolve against it, not the CWD
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
@@ -71,6 +75,17 @@ class Settings(BaseSettings):
     jwt_access_token_expire_minutes: int = 60
     jwt_refresh_token_expire_days: int = 7
 
+    @field_validator("backtest_history_dir")
+    @classmethod
+    def resolve_backtest_history_dir(cls, value: str) -> str:
+        """Anchor a relative history directory at the backend root"""
+        if not value:
+            return value
+        path = Path(value).expanduser()
+        if not path.is_absolute():
+            path = BACKEND_ROOT / path
+        return str(path)
+
     @model_validator(mode="after")
     def validate_production_settings(self) -> "Settings":
         """
@@ -116,6 +131,28 @@ class Settings(BaseSettings):
     # Backtest settings
     backtest_equity_curve_limit: int = 1000
     backtest_trades_limit: int = 1000  # Limit number of trades returned in response
+    backtest_sweep_max_workers: int = 4  # Process pool size for parameter sweeps
+    backtest_sweep_max_combinations: int = 200  # Max grid size per sweep request
+    backtest_job_timeout: int = 3600  # Queued backtest job timeout in seconds
+    backtest_max_concurrent_jobs_per_user: int = 2  # Queued/running jobs per user
+    backtest_history_dir: str = "data/ohlcv"  # On-disk OHLCV history ("" = off)
+    backtest_fetch_concurrency: int = 8  # In-flight OHLCV requests per load
+    backtest_ai_replay: bool = False  # Reuse AI outputs of earlier identical runs
+    backtest_ai_replay_ttl: int = 7 * 86400  # Lifetime of recorded AI outputs
+
+    # AI client pool
+    ai_client_idle_timeout: int = 300  # Close pooled AI clients unused this long
+    ai_provider_max_concurrency: int = 16  # In-flight requests per AI provider
+    # Per-provider overrides, e.g. {"deepseek": 32}
+    ai_provider_concurrency: dict[str, int] = Field(default_factory=dict)
+    # Stream single-model responses; execute decisions once their array closes
+    ai_stream_decisions: bool = False
+
+    # AI response cache (identical prompts of mock agents answered once)
+    ai_response_cache_enabled: bool = False
+    ai_response_cache_ttl: int = 60  # Seconds a response is reused
+    ai_response_cache_max_entries: int = 1024  # In-process entries per cache
+    ai_response_cache_max_chars: int = 32768  # Longer responses are not cached
 
     # Execution worker settings
     worker_enabled: bool = True  # Enable/disable automatic strategy execution
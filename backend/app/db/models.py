@@ -835,6 +835,7 @@ class DecisionRecordDB(Base):
     # Metadata
     ai_model: Mapped[str] = mapped_column(String(100), default="")
     tokens_used: Mapped[int] = mapped_column(Integer, default=0)
+    cached_tokens: Mapped[int] = mapped_column(Integer, default=0)
     latency_ms: Mapped[int] = mapped_column(Integer, default=0)
 
     # Market data snapshot at the time of decision (structured JSON)
@@ -88,6 +88,74 @@ class BacktestRepository:
         await self.session.refresh(result)
         return result
 
+    async def create_from_result(
+        self,
+        user_id: uuid.UUID,
+        strategy_id: Optional[uuid.UUID],
+        result,
+        symbols: list[str],
+        exchange: str,
+        timeframe: str,
+        use_ai: bool,
+    ) -> BacktestResultDB:
+        """Persist a ``BacktestResult`` from the backtest engine"""
+        analysis = result.analysis
+        return await self.create(
+            user_id=user_id,
+            strategy_id=strategy_id,
+            strategy_name=result.strategy_name,
+            symbols=symbols,
+            exchange=exchange,
+            initial_balance=result.initial_balance,
+            timeframe=timeframe,
+            use_ai=use_ai,
+            start_date=result.start_date,
+            end_date=result.end_date,
+            final_balance=result.final_balance,
+            total_return_percent=result.total_return_percent,
+            total_trades=result.total_trades,
+            winning_trades=result.winning_trades,
+            losing_trades=result.losing_trades,
+            win_rate=result.win_rate,
+            profit_factor=result.profit_factor,
+            max_drawdown_percent=result.max_drawdown_percent,
+            sharpe_ratio=result.sharpe_ratio,
+            sortino_ratio=result.sortino_ratio,
+            calmar_ratio=result.calmar_ratio,
+            total_fees=result.total_fees,
+            equity_curve=result.equity_curve,
+            drawdown_curve=result.drawdown_curve,
+            trades=[
+                {
+                    "symbol": t.symbol,
+                    "side": t.side,
+                    "size": t.size,
+                    "entry_price": t.entry_price,
+                    "exit_price": t.exit_price,
+                    "leverage": t.leverage,
+                    "pnl": t.pnl,
+                    "pnl_percent": t.pnl_percent,
+                    "opened_at": t.opened_at.isoformat() if t.opened_at else None,
+                    "closed_at": t.closed_at.isoformat() if t.closed_at else None,
+                    "duration_minutes": t.duration_minutes,
+                    "exit_reason": t.exit_reason,
+                }
+                for t in result.trades
+            ],
+            monthly_returns=result.monthly_returns or [],
+            trade_statistics=result.trade_statistics,
+            symbol_breakdown=result.symbol_breakdown or [],
+            analysis=(
+                {
+                    "strengths": analysis.strengths,
+                    "weaknesses": analysis.weaknesses,
+                    "recommendations": analysis.recommendations,
+                }
+                if analysis
+                else None
+            ),
+        )
+
     async def get_by_id(
         self,
         backtest_id: uuid.UUID,
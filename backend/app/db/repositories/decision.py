@@ -33,6 +33,7 @@ class DecisionRepository:
         overall_confidence: int = 0,
         ai_model: str = "",
         tokens_used: int = 0,
+        cached_tokens: int = 0,
         latency_ms: int = 0,
         # Debate fields
         is_debate: bool = False,
@@ -58,6 +59,7 @@ class DecisionRepository:
             overall_confidence=overall_confidence,
             ai_model=ai_model,
             tokens_used=tokens_used,
+            cached_tokens=cached_tokens,
             latency_ms=latency_ms,
             market_snapshot=market_snapshot,
             account_snapshot=account_snapshot,
@@ -36,6 +36,7 @@ class DebateParticipant(BaseModel):
     overall_confidence: int = Field(default=0, ge=0, le=100)
     latency_ms: int = Field(default=0, ge=0)
     tokens_used: int = Field(default=0, ge=0)
+    cached_tokens: int = Field(default=0, ge=0)
     error: Optional[str] = Field(default=None, description="Error if model failed")
 
     @property
@@ -7,14 +7,16 @@ Provides structured data types for:
 - Complete market context for prompt building
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Optional
 
-from ..traders.base import FundingRate, MarketData, OHLCV
+from ..traders.base import OHLCV, FundingRate, KlineSeries, MarketData
 
 # Re-export for backwards compatibility
 __all__ = [
     "OHLCV",
+    "KlineSeries",
     "FundingRate",
     "TechnicalIndicators",
     "MarketContext",
@@ -67,6 +69,11 @@ class TechnicalIndicators:
     sma: dict[int, float] = field(default_factory=dict)  # Simple Moving Average
     volume_sma: Optional[float] = None  # Volume SMA for comparison
 
+    # Market structure (nearest first), filled in by the DataAccessLayer
+    support: list[float] = field(default_factory=list)
+    resistance: list[float] = field(default_factory=list)
+    trend_strength: Optional[float] = None  # ADX-like, 0-100
+
     @property
     def rsi_signal(self) -> str:
         """Get RSI signal interpretation"""
@@ -125,6 +132,9 @@ class TechnicalIndicators:
             "atr": self.atr,
             "bollinger": self.bollinger,
             "ema_trend": self.ema_trend,
+            "support": self.support,
+            "resistance": self.resistance,
+            "trend_strength": self.trend_strength,
         }
 
 
@@ -150,11 +160,16 @@ class MarketContext:
     exchange_name: str = ""
 
     # K-line data by timeframe {"15m": [OHLCV, ...], "1h": [...]}
-    klines: dict[str, list[OHLCV]] = field(default_factory=dict)
+    # (lists of OHLCV or KlineSeries)
+    klines: dict[str, Sequence[OHLCV]] = field(default_factory=dict)
 
     # Technical indicators by timeframe {"15m": TechnicalIndicators, "1h": ...}
     indicators: dict[str, TechnicalIndicators] = field(default_factory=dict)
 
+    # Support/resistance merged across timeframes, nearest first
+    # {"support": [{"price": float, "timeframes": [str, ...]}], "resistance": [...]}
+    key_levels: dict[str, list[dict]] = field(default_factory=dict)
+
     # Funding rate history (most recent first)
     funding_history: list[FundingRate] = field(default_factory=list)
 
@@ -128,6 +128,11 @@ class AIStrategyConfig(BaseModel):
     timeframes: list[str] = Field(
         default=["15m", "1h", "4h"], description="Timeframes to analyze"
     )
+    base_timeframe: Optional[str] = Field(
+        default=None,
+        description="Fetch only this timeframe and resample the other timeframes "
+        "from it (None = fetch every timeframe from the exchange)",
+    )
 
     # Risk controls (hard limits)
     risk_controls: RiskControls = Field(
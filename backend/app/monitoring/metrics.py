@@ -70,7 +70,27 @@ class MetricsCollector:
         self.ai_tokens_total = Counter(
             f"{app_name}_ai_tokens_total",
             "Total AI tokens used",
-            ["model", "type"],  # type: input/output
+            ["model", "type"],  # type: input/output/cached
+        )
+
+        self.ai_connection_setup_seconds = Histogram(
+            f"{app_name}_ai_connection_setup_seconds",
+            "TCP/TLS connection setup per AI request (0 on a pooled connection)",
+            ["provider"],
+            buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+        )
+
+        self.ai_provider_wait_seconds = Histogram(
+            f"{app_name}_ai_provider_wait_seconds",
+            "Time AI requests wait for a provider concurrency slot",
+            ["provider"],
+            buckets=(0.0, 0.01, 0.1, 0.5, 1.0, 5.0, 30.0),
+        )
+
+        self.ai_response_cache_total = Counter(
+            f"{app_name}_ai_response_cache_total",
+            "AI response cache lookups",
+            ["result"],  # result: hit/miss
         )
 
         self.ai_decision_confidence = Histogram(
@@ -137,6 +157,12 @@ class MetricsCollector:
             ["strategy_id"],
         )
 
+        self.market_context_latency_seconds = Histogram(
+            f"{app_name}_market_context_latency_seconds",
+            "Time from cycle start until the market context prompt is ready",
+            buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+        )
+
         # ==================== WebSocket Metrics ====================
 
         self.websocket_connections = Gauge(
@@ -229,6 +255,26 @@ class MetricsCollector:
 
         self.ai_decision_confidence.labels(strategy_id=strategy_id).observe(confidence)
 
+    def track_ai_cached_tokens(self, model: str, cached_tokens: int) -> None:
+        """Track input tokens served from the provider prompt cache"""
+        self.ai_tokens_total.labels(model=model, type="cached").inc(cached_tokens)
+
+    def track_ai_response_cache(self, result: str) -> None:
+        """Track an AI response cache lookup (hit/miss)"""
+        self.ai_response_cache_total.labels(result=result).inc()
+
+    def track_ai_connection(
+        self,
+        provider: str,
+        setup_seconds: float,
+        wait_seconds: float,
+    ) -> None:
+        """Track connection setup and concurrency wait of one AI request"""
+        self.ai_connection_setup_seconds.labels(provider=provider).observe(
+            setup_seconds
+        )
+        self.ai_provider_wait_seconds.labels(provider=provider).observe(wait_seconds)
+
     # ==================== Trade Tracking ====================
 
     def track_trade(
@@ -309,6 +355,10 @@ class MetricsCollector:
         """Update strategy statistics"""
         self.strategy_win_rate.labels(strategy_id=strategy_id).set(win_rate)
 
+    def track_context_latency(self, seconds: float) -> None:
+        """Track time from cycle start to prompt-ready market context"""
+        self.market_context_latency_seconds.observe(seconds)
+
     def set_active_strategies(self, count: int) -> None:
         """Set active strategy count"""
         self.active_strategies.set(count)
@@ -33,6 +33,7 @@ from .base import (
     AIConnectionError,
     AIInvalidRequestError,
     AIResponse,
+    AIStreamChunk,
     BaseAIClient,
     ModelInfo,
     PRESET_PROVIDER_MODELS,
@@ -42,6 +43,12 @@ from .base import (
 )
 from .credentials import resolve_provider_credentials
 from .factory import AIClientFactory, get_ai_client, register_custom_model
+from .response_cache import (
+    CachedAIClient,
+    ResponseCache,
+    get_replay_cache,
+    get_response_cache,
+)
 
 __all__ = [
     "resolve_provider_credentials",
@@ -54,6 +61,7 @@ __all__ = [
     "AIConnectionError",
     "AIInvalidRequestError",
     "AIResponse",
+    "AIStreamChunk",
     "BaseAIClient",
     "ModelInfo",
     # Preset model registry (for populating new provider configs)
@@ -65,4 +73,9 @@ __all__ = [
     "AIClientFactory",
     "get_ai_client",
     "register_custom_model",
+    # Response cache
+    "CachedAIClient",
+    "ResponseCache",
+    "get_replay_cache",
+    "get_response_cache",
 ]
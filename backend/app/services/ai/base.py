@@ -5,10 +5,12 @@ Defines the abstract interface for AI clients and model configuration system
 that supports multiple providers (DeepSeek, Qwen, Zhipu, MiniMax, Kimi, etc.)
 """
 
+import hashlib
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 
 class AIProvider(str, Enum):
@@ -57,6 +59,7 @@ class AIClientConfig:
     temperature: float = 0.7
     timeout: int = 120
     extra_params: dict = field(default_factory=dict)  # Provider-specific params
+    http_client: Optional[Any] = None  # Shared httpx client (AIClientFactory pool)
 
 
 @dataclass
@@ -72,6 +75,41 @@ class AIResponse:
     stop_reason: str = ""
     latency_ms: int = 0
     raw_response: Optional[Any] = None  # Original response object
+    cached_tokens: int = 0  # Input tokens served from the provider prompt cache
+
+
+@dataclass
+class AIStreamChunk:
+    """One increment of a streamed response"""
+
+    content: str  # Text delta (may be empty)
+    response: Optional[AIResponse] = None  # Set on the final chunk only
+
+
+def prompt_cache_key(system_prompt: str) -> str:
+    """Stable key identifying a system prompt for provider-side prompt caches"""
+    return hashlib.sha256(system_prompt.encode()).hexdigest()[:32]
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """
+    Prompt tokens served from the provider's prefix cache.
+
+    Reads OpenAI-style usage (``prompt_tokens_details.cached_tokens``, also
+    used by Qwen, Zhipu and Grok), DeepSeek's ``prompt_cache_hit_tokens``
+    and Kimi's top-level ``cached_tokens``.
+    """
+    if usage is None:
+        return 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    for value in (
+        getattr(details, "cached_tokens", None),
+        getattr(usage, "prompt_cache_hit_tokens", None),
+        getattr(usage, "cached_tokens", None),
+    ):
+        if isinstance(value, int) and value > 0:
+            return value
+    return 0
 
 
 class AIClientError(Exception):
@@ -132,6 +170,12 @@ class BaseAIClient(ABC):
         self.config = config
         self._validate_config()
 
+    def _http_client_kwargs(self) -> dict:
+        """SDK client kwargs sharing the pooled HTTP client, if any"""
+        if self.config.http_client is None:
+            return {}
+        return {"http_client": self.config.http_client}
+
     def _validate_config(self) -> None:
         """Validate configuration. Override for provider-specific validation."""
         if not self.config.api_key:
@@ -166,6 +210,93 @@ class BaseAIClient(ABC):
         """
         pass
 
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = True,
+    ) -> AsyncIterator[AIStreamChunk]:
+        """
+        Stream a response from the AI model.
+
+        Yields text deltas as they arrive; the final chunk carries the
+        complete ``AIResponse``.  Providers without streaming support fall
+        back to ``generate`` and yield the whole content at once.
+
+        Raises:
+            AIClientError: On any error from the AI provider
+        """
+        response = await self.generate(system_prompt, user_prompt, json_mode)
+        yield AIStreamChunk(content=response.content, response=response)
+
+    async def _stream_chat_completion(
+        self,
+        openai_module: Any,
+        request_kwargs: dict,
+    ) -> AsyncIterator[AIStreamChunk]:
+        """
+        Stream a chat completion from an OpenAI-compatible ``self._client``.
+
+        Shared by the OpenAI-compatible adapters; maps SDK errors the same
+        way their ``generate`` does.
+        """
+        start_time = time.time()
+        parts: list[str] = []
+        model = request_kwargs.get("model", self.config.model)
+        stop_reason = ""
+        usage = None
+
+        try:
+            stream = await self._client.chat.completions.create(
+                **request_kwargs,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for event in stream:
+                model = getattr(event, "model", None) or model
+                if getattr(event, "usage", None):
+                    usage = event.usage
+                if not event.choices:
+                    continue
+                choice = event.choices[0]
+                if choice.finish_reason:
+                    stop_reason = choice.finish_reason
+                delta = choice.delta.content if choice.delta else None
+                if delta:
+                    parts.append(delta)
+                    yield AIStreamChunk(content=delta)
+
+        except openai_module.BadRequestError as e:
+            raise AIInvalidRequestError(f"Bad request: {e}", self.provider)
+        except openai_module.AuthenticationError as e:
+            raise AIAuthenticationError(f"Authentication failed: {e}", self.provider)
+        except openai_module.RateLimitError as e:
+            raise AIRateLimitError(f"Rate limit exceeded: {e}", self.provider)
+        except openai_module.APIConnectionError as e:
+            raise AIConnectionError(f"Connection failed: {e}", self.provider)
+        except openai_module.APIStatusError as e:
+            raise AIClientError(f"API error: {e}", self.provider)
+        except Exception as e:
+            raise AIClientError(f"Unexpected error: {e}", self.provider)
+
+        input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        output_tokens = getattr(usage, "completion_tokens", 0) or 0
+
+        yield AIStreamChunk(
+            content="",
+            response=AIResponse(
+                content="".join(parts),
+                model=model,
+                provider=self.provider,
+                tokens_used=input_tokens + output_tokens,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                stop_reason=stop_reason,
+                latency_ms=int((time.time() - start_time) * 1000),
+                cached_tokens=cached_prompt_tokens(usage),
+            ),
+        )
+
     @abstractmethod
     async def test_connection(self) -> bool:
         """
@@ -0,0 +1,282 @@
+"""
+Shared HTTP connection pools for AI clients.
+
+Strategy engines are rebuilt every cycle, and each used to construct a
+fresh SDK client with its own connection pool, so every decision paid a new
+TCP + TLS handshake with the provider.  ``AIClientFactory`` now keeps one
+``PooledClient`` per (provider, base_url, API key fingerprint) in its
+``_CLIENT_CACHE``; the clients it hands out share that entry's keep-alive
+``httpx.AsyncClient`` (HTTP/2 when the ``h2`` package is installed).
+
+``PooledTransport`` sits under the SDKs and:
+
+- Bounds in-flight requests per provider (``ai_provider_max_concurrency``,
+  ``ai_provider_concurrency`` overrides), holding a slot until the response
+  body is consumed
+- Times TCP/TLS connection setup per request via the httpcore ``trace``
+  extension (0 when a pooled connection is reused) and reports it in
+  ``ai_connection_setup_seconds``
+
+Entries idle for ``ai_client_idle_timeout`` seconds are closed.  Pools are
+bound to the event loop that created them; a call from another loop gets
+its own entry.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+from .base import AIProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_MAX_CONCURRENCY = 16
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def api_key_fingerprint(api_key: Optional[str]) -> str:
+    """Short digest identifying an API key without keeping it in cache keys"""
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _settings() -> tuple[int, int, dict[str, int]]:
+    """(idle timeout, default concurrency, per-provider concurrency)"""
+    try:
+        from ...core.config import get_settings
+
+        settings = get_settings()
+        return (
+            int(settings.ai_client_idle_timeout),
+            int(settings.ai_provider_max_concurrency),
+            dict(settings.ai_provider_concurrency),
+        )
+    except Exception:
+        return DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_CONCURRENCY, {}
+
+
+# =============================================================================
+# Per-provider concurrency
+# =============================================================================
+
+# provider -> (loop, semaphore); semaphores cannot be shared across loops
+_limiters: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def provider_limit(provider: AIProvider) -> int:
+    """Maximum in-flight requests to ``provider``"""
+    _, default, overrides = _settings()
+    return max(int(overrides.get(provider.value, default)), 1)
+
+
+def provider_semaphore(provider: AIProvider) -> asyncio.Semaphore:
+    """Semaphore bounding in-flight requests to ``provider`` on this loop"""
+    loop = asyncio.get_running_loop()
+    entry = _limiters.get(provider.value)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(provider_limit(provider)))
+        _limiters[provider.value] = entry
+    return entry[1]
+
+
+def _track(provider: AIProvider, setup: float, wait: float) -> None:
+    try:
+        from ...monitoring.metrics import get_metrics_collector
+
+        get_metrics_collector().track_ai_connection(provider.value, setup, wait)
+    except Exception as e:
+        logger.debug(f"Failed to record AI connection metrics: {e}")
+
+
+# =============================================================================
+# Transport
+# =============================================================================
+
+
+class _ConnectTimer:
+    """httpcore ``trace`` callback measuring TCP + TLS setup of one request"""
+
+    __slots__ = ("started", "completed")
+
+    def __init__(self):
+        self.started: Optional[float] = None
+        self.completed: Optional[float] = None
+
+    async def __call__(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.started":
+            self.started = time.perf_counter()
+        elif event in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            self.completed = time.perf_counter()
+
+    @property
+    def seconds(self) -> float:
+        """Setup time (0 when a pooled connection was reused)"""
+        if self.started is None or self.completed is None:
+            return 0.0
+        return max(self.completed - self.started, 0.0)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees the provider slot once closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    Keep-alive transport shared by the clients of one pool entry.
+
+    Args:
+        provider: Provider whose concurrency limit applies
+        transport: Wrapped transport (default: ``httpx.AsyncHTTPTransport``
+                   with keep-alive and HTTP/2 when available)
+    """
+
+    def __init__(
+        self,
+        provider: AIProvider,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.provider = provider
+        self._transport = transport or httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=idle_timeout,
+            ),
+        )
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+        # Metrics
+        self.requests = 0
+        self.connections_opened = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = provider_semaphore(self.provider)
+        queued = time.perf_counter()
+        await semaphore.acquire()
+        wait = time.perf_counter() - queued
+        self.in_flight += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.in_flight -= 1
+                self.last_used = time.monotonic()
+                semaphore.release()
+
+        timer = _ConnectTimer()
+        request.extensions = {**request.extensions, "trace": timer}
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        self.requests += 1
+        if timer.started is not None:
+            self.connections_opened += 1
+        _track(self.provider, timer.seconds, wait)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# =============================================================================
+# Pool entries
+# =============================================================================
+
+
+@dataclass
+class PooledClient:
+    """One provider endpoint + API key: shared HTTP client and AI clients"""
+
+    provider: AIProvider
+    loop: asyncio.AbstractEventLoop
+    transport: PooledTransport
+    http_client: httpx.AsyncClient
+    # Client config -> AI client built on ``http_client``
+    clients: dict[tuple, Any] = field(default_factory=dict)
+
+    @classmethod
+    def create(
+        cls,
+        provider: AIProvider,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> "PooledClient":
+        idle_timeout, _, _ = _settings()
+        pooled = PooledTransport(provider, transport, idle_timeout)
+        return cls(
+            provider=provider,
+            loop=asyncio.get_running_loop(),
+            transport=pooled,
+            http_client=httpx.AsyncClient(transport=pooled, follow_redirects=True),
+        )
+
+    def idle_seconds(self, now: Optional[float] = None) -> float:
+        if self.transport.in_flight:
+            return 0.0
+        return (now or time.monotonic()) - self.transport.last_used
+
+    def close(self) -> None:
+        """Close the HTTP client on its loop (no-op once the loop has stopped)"""
+        if self.loop.is_closed() or not self.loop.is_running():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.loop.create_task(self.http_client.aclose())
+        else:
+            asyncio.run_coroutine_threadsafe(self.http_client.aclose(), self.loop)
+
+    def get_stats(self) -> dict:
+        return {
+            "provider": self.provider.value,
+            "clients": len(self.clients),
+            "in_flight": self.transport.in_flight,
+            "requests": self.transport.requests,
+            "connections_opened": self.transport.connections_opened,
+            "idle_seconds": round(self.idle_seconds(), 1),
+        }
+
+
+def idle_timeout() -> int:
+    """Seconds after which an unused pool entry is closed"""
+    return _settings()[0]
@@ -7,6 +7,7 @@ other providers that implement the OpenAI API format.
 """
 
 import time
+from typing import AsyncIterator
 
 from .base import (
     AIClientConfig,
@@ -17,7 +18,9 @@ from .base import (
     AIInvalidRequestError,
     AIProvider,
     AIResponse,
+    AIStreamChunk,
     BaseAIClient,
+    cached_prompt_tokens,
 )
 
 # Lazy import to avoid hard dependency
@@ -88,6 +91,7 @@ class CustomOpenAIClient(BaseAIClient):
             # Use a dummy key for endpoints that don't require auth
             client_kwargs["api_key"] = "not-needed"
 
+        client_kwargs.update(self._http_client_kwargs())
         self._client = _openai.AsyncOpenAI(**client_kwargs)
 
     def _validate_config(self) -> None:
@@ -120,33 +124,9 @@ class CustomOpenAIClient(BaseAIClient):
         start_time = time.time()
 
         try:
-            # Build messages
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
-
-            # Build request kwargs
-            request_kwargs = {
-                "model": self.config.model,
-                "messages": messages,
-            }
-
-            # Only add optional params if the endpoint supports them
-            # Some endpoints may not support all parameters
-            if self.config.max_tokens:
-                request_kwargs["max_tokens"] = self.config.max_tokens
-
-            if self.config.temperature is not None:
-                request_kwargs["temperature"] = self.config.temperature
-
-            # JSON mode - try to add but handle gracefully
-            # Not all custom endpoints support this
-            if json_mode and self.config.extra_params.get("supports_json_mode", True):
-                try:
-                    request_kwargs["response_format"] = {"type": "json_object"}
-                except Exception:
-                    pass  # Endpoint doesn't support it
+            request_kwargs = self._build_request_kwargs(
+                system_prompt, user_prompt, json_mode
+            )
 
             # Call the API
             response = await self._client.chat.completions.create(**request_kwargs)
@@ -173,6 +153,7 @@ class CustomOpenAIClient(BaseAIClient):
                 stop_reason=response.choices[0].finish_reason or "",
                 latency_ms=latency_ms,
                 raw_response=response,
+                cached_tokens=cached_prompt_tokens(getattr(response, "usage", None)),
             )
 
         except _openai.BadRequestError as e:
@@ -188,6 +169,56 @@ class CustomOpenAIClient(BaseAIClient):
         except Exception as e:
             raise AIClientError(f"Unexpected error: {e}", self.provider)
 
+    def _build_request_kwargs(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+    ) -> dict:
+        """Chat completion kwargs shared by generate and generate_stream"""
+        # Build messages
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+        # Build request kwargs
+        request_kwargs = {
+            "model": self.config.model,
+            "messages": messages,
+        }
+
+        # Only add optional params if the endpoint supports them
+        # Some endpoints may not support all parameters
+        if self.config.max_tokens:
+            request_kwargs["max_tokens"] = self.config.max_tokens
+
+        if self.config.temperature is not None:
+            request_kwargs["temperature"] = self.config.temperature
+
+        # JSON mode - try to add but handle gracefully
+        # Not all custom endpoints support this
+        if json_mode and self.config.extra_params.get("supports_json_mode", True):
+            try:
+                request_kwargs["response_format"] = {"type": "json_object"}
+            except Exception:
+                pass  # Endpoint doesn't support it
+
+        return request_kwargs
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = True,
+    ) -> AsyncIterator[AIStreamChunk]:
+        """Stream a response from the custom endpoint, yielding text deltas."""
+        request_kwargs = self._build_request_kwargs(
+            system_prompt, user_prompt, json_mode
+        )
+        async for chunk in self._stream_chat_completion(_get_openai(), request_kwargs):
+            yield chunk
+
     async def test_connection(self) -> bool:
         """Test API connection using a minimal request."""
         _openai = _get_openai()
@@ -3,9 +3,17 @@ AI Client Factory.
 
 Creates and manages AI client instances for different providers.
 Supports dynamic model registration for custom endpoints.
+
+Clients created inside an event loop are pooled: one ``PooledClient`` per
+(provider, base_url, API key fingerprint) holds a keep-alive HTTP client
+shared by every client created for that endpoint and key, so connections
+survive across strategy cycles (see ``client_pool``).
 """
 
+import asyncio
+import dataclasses
 import logging
+import time
 from typing import Optional
 
 from .base import (
@@ -15,6 +23,7 @@ from .base import (
     BaseAIClient,
     ModelInfo,
 )
+from .client_pool import PooledClient, api_key_fingerprint, idle_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +33,8 @@ _CLIENT_CLASSES: dict[AIProvider, type[BaseAIClient]] = {}
 # Custom models registry (for user-defined models)
 _CUSTOM_MODELS: dict[str, ModelInfo] = {}
 
-# Client instance cache (for singleton patterns if needed)
-_CLIENT_CACHE: dict[str, BaseAIClient] = {}
+# Pooled clients: (provider, base_url, API key fingerprint) -> PooledClient
+_CLIENT_CACHE: dict[tuple[str, str, str], PooledClient] = {}
 
 
 def _ensure_clients_registered():
@@ -265,7 +274,18 @@ class AIClientFactory:
             )
 
         client_class = _CLIENT_CLASSES[provider]
-        return client_class(config)
+        # A caller-supplied HTTP client opts out of pooling
+        pooled = None if config.http_client else _get_pooled_client(provider, config)
+        if pooled is None:
+            return client_class(config)
+
+        key = _client_config_key(config)
+        client = pooled.clients.get(key)
+        if client is None:
+            config = dataclasses.replace(config, http_client=pooled.http_client)
+            client = client_class(config)
+            pooled.clients[key] = client
+        return client
 
     @staticmethod
     def _get_api_key(provider: AIProvider) -> str:
@@ -309,6 +329,83 @@ def get_ai_client(
     return AIClientFactory.create(model_full_id, api_key, **kwargs)
 
 
+def _get_pooled_client(
+    provider: AIProvider, config: AIClientConfig
+) -> Optional[PooledClient]:
+    """Pool entry for the config's endpoint and key (None outside a loop)"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # HTTP connections are bound to an event loop
+        return None
+
+    evict_idle_clients()
+    key = (
+        provider.value,
+        config.base_url or "",
+        api_key_fingerprint(config.api_key),
+    )
+    pooled = _CLIENT_CACHE.get(key)
+    if pooled is None or pooled.loop is not loop:
+        if pooled is not None:
+            pooled.close()
+        pooled = PooledClient.create(provider)
+        _CLIENT_CACHE[key] = pooled
+    return pooled
+
+
+def _client_config_key(config: AIClientConfig) -> tuple:
+    """Settings that distinguish clients sharing one pool entry"""
+    return (
+        config.model,
+        config.max_tokens,
+        config.temperature,
+        config.timeout,
+        repr(sorted(config.extra_params.items())),
+    )
+
+
+def evict_idle_clients(max_idle: Optional[float] = None) -> int:
+    """
+    Close pool entries without requests for ``max_idle`` seconds
+    (default: ``ai_client_idle_timeout``).
+
+    Returns:
+        Number of entries closed
+    """
+    max_idle = idle_timeout() if max_idle is None else max_idle
+    now = time.monotonic()
+    idle = [
+        key
+        for key, pooled in _CLIENT_CACHE.items()
+        if pooled.idle_seconds(now) >= max_idle
+    ]
+    for key in idle:
+        _CLIENT_CACHE.pop(key).close()
+    if idle:
+        logger.debug(f"Closed {len(idle)} idle AI client pools")
+    return len(idle)
+
+
+def get_client_pool_stats() -> list[dict]:
+    """Statistics of the pooled AI clients."""
+    return [pooled.get_stats() for pooled in _CLIENT_CACHE.values()]
+
+
+async def close_client_pools() -> None:
+    """Close every pooled HTTP client and wait for the connections to drop."""
+    pools = list(_CLIENT_CACHE.values())
+    _CLIENT_CACHE.clear()
+    loop = asyncio.get_running_loop()
+    for pooled in pools:
+        if pooled.loop is loop:
+            await pooled.http_client.aclose()
+        else:
+            pooled.close()
+
+
 def clear_client_cache():
     """Clear the client cache. Useful for testing or reconfiguration."""
+    for pooled in _CLIENT_CACHE.values():
+        pooled.close()
     _CLIENT_CACHE.clear()
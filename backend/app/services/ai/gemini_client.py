@@ -5,7 +5,10 @@ Implements the BaseAIClient interface for Google's Gemini models.
 """
 
 import asyncio
+import datetime
+import logging
 import time
+from typing import Any, Optional
 
 from .base import (
     AIClientConfig,
@@ -17,7 +20,12 @@ from .base import (
     AIProvider,
     AIResponse,
     BaseAIClient,
+    prompt_cache_key,
 )
+from ..lru_cache import LRUCache
+from .client_pool import provider_semaphore
+
+logger = logging.getLogger(__name__)
 
 # Lazy import to avoid hard dependency
 genai = None
@@ -39,6 +47,14 @@ def _get_genai():
     return genai
 
 
+# Explicit context caching of the system prompt.  Gemini rejects cached
+# content below a model-specific minimum (1K-4K tokens), so shorter prompts
+# rely on the API's implicit prefix caching instead (~4 chars per token).
+CACHE_MIN_PROMPT_CHARS = 16384
+CACHE_TTL = datetime.timedelta(hours=1)
+CACHE_MAX_ENTRIES = 32
+
+
 class GeminiClient(BaseAIClient):
     """
     Google Gemini client.
@@ -69,6 +85,11 @@ class GeminiClient(BaseAIClient):
             },
         )
 
+        # prompt_cache_key -> (CachedContent or None if rejected, created_at)
+        self._cached_contents = LRUCache(CACHE_MAX_ENTRIES)
+        # prompt_cache_key -> CachedContent being created
+        self._cache_creates: dict[str, asyncio.Future] = {}
+
     @property
     def provider(self) -> AIProvider:
         return AIProvider.GEMINI
@@ -97,25 +118,36 @@ class GeminiClient(BaseAIClient):
             # Gemini uses a different format - combine system and user into contents
             # System instructions can be set as system_instruction or prepended to content
 
-            # Create a new model instance with system instruction
-            model = _genai.GenerativeModel(
-                model_name=self.config.model,
-                generation_config={
-                    "max_output_tokens": self.config.max_tokens,
-                    "temperature": self.config.temperature,
-                    "response_mime_type": (
-                        "application/json" if json_mode else "text/plain"
-                    ),
-                },
-                system_instruction=system_prompt,
-            )
+            generation_config = {
+                "max_output_tokens": self.config.max_tokens,
+                "temperature": self.config.temperature,
+                "response_mime_type": (
+                    "application/json" if json_mode else "text/plain"
+                ),
+            }
+
+            # Reuse a cached system prompt when available, otherwise create
+            # a new model instance with system instruction
+            cached_content = await self._get_cached_content(system_prompt)
+            if cached_content is not None:
+                model = _genai.GenerativeModel.from_cached_content(
+                    cached_content=cached_content,
+                    generation_config=generation_config,
+                )
+            else:
+                model = _genai.GenerativeModel(
+                    model_name=self.config.model,
+                    generation_config=generation_config,
+                    system_instruction=system_prompt,
+                )
 
             # Generate content asynchronously
             # Note: google-generativeai uses synchronous API, so we run in executor
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, lambda: model.generate_content(user_prompt)
-            )
+            async with provider_semaphore(self.provider):
+                response = await loop.run_in_executor(
+                    None, lambda: model.generate_content(user_prompt)
+                )
 
             # Extract content
             content = response.text if response.text else ""
@@ -123,11 +155,16 @@ class GeminiClient(BaseAIClient):
             # Calculate tokens (Gemini provides usage metadata)
             input_tokens = 0
             output_tokens = 0
+            cached_tokens = 0
             if hasattr(response, "usage_metadata") and response.usage_metadata:
                 input_tokens = getattr(response.usage_metadata, "prompt_token_count", 0)
                 output_tokens = getattr(
                     response.usage_metadata, "candidates_token_count", 0
                 )
+                cached = getattr(
+                    response.usage_metadata, "cached_content_token_count", 0
+                )
+                cached_tokens = cached if isinstance(cached, int) else 0
 
             latency_ms = int((time.time() - start_time) * 1000)
 
@@ -148,6 +185,7 @@ class GeminiClient(BaseAIClient):
                 stop_reason=stop_reason,
                 latency_ms=latency_ms,
                 raw_response=response,
+                cached_tokens=cached_tokens,
             )
 
         except Exception as e:
@@ -170,6 +208,84 @@ class GeminiClient(BaseAIClient):
             else:
                 raise AIClientError(f"Gemini error: {e}", self.provider)
 
+    async def _get_cached_content(self, system_prompt: str) -> Optional[Any]:
+        """
+        Cached content holding ``system_prompt``, created on first use.
+
+        Returns None for prompts below the caching minimum or when Gemini
+        rejects the cache (unsupported model, too few tokens); rejections
+        are remembered until the entry's TTL passes.  Concurrent callers
+        share one create, and cached content that is refreshed or evicted
+        is deleted on the server instead of being billed until it expires.
+        """
+        if len(system_prompt) < CACHE_MIN_PROMPT_CHARS:
+            return None
+
+        key = prompt_cache_key(system_prompt)
+        entry = self._cached_contents.get(key)
+        # Refresh a little before the server-side TTL runs out
+        if (
+            entry is not None
+            and time.monotonic() - entry[1] < CACHE_TTL.total_seconds() * 0.9
+        ):
+            return entry[0]
+
+        pending = self._cache_creates.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The creating request gave up: use the full prompt
+                return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._cache_creates[key] = future
+        try:
+            cached_content = await self._create_cached_content(system_prompt)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._cache_creates[key]
+
+        stale = self._cached_contents.put(key, (cached_content, time.monotonic()))
+        if entry is not None:
+            stale.append(entry)
+        future.set_result(cached_content)
+        await self._delete_cached_contents(
+            [content for content, _ in stale if content is not None]
+        )
+        return cached_content
+
+    async def _create_cached_content(self, system_prompt: str) -> Optional[Any]:
+        """New server-side cached content, or None if Gemini rejects it"""
+        _genai = _get_genai()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                None,
+                lambda: _genai.caching.CachedContent.create(
+                    model=self.config.model,
+                    system_instruction=system_prompt,
+                    ttl=CACHE_TTL,
+                ),
+            )
+        except Exception as e:
+            logger.debug(f"Gemini context cache unavailable, using full prompt: {e}")
+            return None
+
+    @staticmethod
+    async def _delete_cached_contents(contents: list[Any]) -> None:
+        """Delete superseded cached content (failures only cost storage)"""
+        loop = asyncio.get_running_loop()
+        for content in contents:
+            try:
+                await loop.run_in_executor(None, content.delete)
+            except Exception as e:
+                logger.debug(f"Failed to delete Gemini cached content: {e}")
+
     async def test_connection(self) -> bool:
         """Test API connection using a minimal request."""
         try:
@@ -6,6 +6,7 @@ Uses OpenAI-compatible API.
 """
 
 import time
+from typing import AsyncIterator
 
 from .base import (
     AIClientConfig,
@@ -16,7 +17,9 @@ from .base import (
     AIInvalidRequestError,
     AIProvider,
     AIResponse,
+    AIStreamChunk,
     BaseAIClient,
+    cached_prompt_tokens,
 )
 
 # Lazy import to avoid hard dependency
@@ -71,6 +74,7 @@ class KimiClient(BaseAIClient):
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
+            **self._http_client_kwargs(),
         )
 
     @property
@@ -98,23 +102,9 @@ class KimiClient(BaseAIClient):
         start_time = time.time()
 
         try:
-            # Build messages
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
-
-            # Build request kwargs
-            request_kwargs = {
-                "model": self.config.model,
-                "messages": messages,
-                "max_tokens": self.config.max_tokens,
-                "temperature": self.config.temperature,
-            }
-
-            # Kimi supports JSON mode
-            if json_mode:
-                request_kwargs["response_format"] = {"type": "json_object"}
+            request_kwargs = self._build_request_kwargs(
+                system_prompt, user_prompt, json_mode
+            )
 
             # Call Kimi API
             response = await self._client.chat.completions.create(**request_kwargs)
@@ -138,6 +128,7 @@ class KimiClient(BaseAIClient):
                 stop_reason=response.choices[0].finish_reason or "",
                 latency_ms=latency_ms,
                 raw_response=response,
+                cached_tokens=cached_prompt_tokens(getattr(response, "usage", None)),
             )
 
         except _openai.BadRequestError as e:
@@ -153,6 +144,46 @@ class KimiClient(BaseAIClient):
         except Exception as e:
             raise AIClientError(f"Unexpected error: {e}", self.provider)
 
+    def _build_request_kwargs(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+    ) -> dict:
+        """Chat completion kwargs shared by generate and generate_stream"""
+        # Build messages
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+        # Build request kwargs
+        request_kwargs = {
+            "model": self.config.model,
+            "messages": messages,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+        }
+
+        # Kimi supports JSON mode
+        if json_mode:
+            request_kwargs["response_format"] = {"type": "json_object"}
+
+        return request_kwargs
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = True,
+    ) -> AsyncIterator[AIStreamChunk]:
+        """Stream a response from Kimi, yielding text deltas."""
+        request_kwargs = self._build_request_kwargs(
+            system_prompt, user_prompt, json_mode
+        )
+        async for chunk in self._stream_chat_completion(_get_openai(), request_kwargs):
+            yield chunk
+
     async def test_connection(self) -> bool:
         """Test API connection using a minimal request."""
         _openai = _get_openai()
@@ -5,6 +5,7 @@ Implements the BaseAIClient interface for OpenAI's GPT models.
 """
 
 import time
+from typing import AsyncIterator
 
 from .base import (
     AIClientConfig,
@@ -15,7 +16,10 @@ from .base import (
     AIInvalidRequestError,
     AIProvider,
     AIResponse,
+    AIStreamChunk,
     BaseAIClient,
+    cached_prompt_tokens,
+    prompt_cache_key,
 )
 
 # Lazy import to avoid hard dependency
@@ -60,6 +64,7 @@ class OpenAIClient(BaseAIClient):
         self._client = _openai.AsyncOpenAI(
             api_key=config.api_key,
             timeout=config.timeout,
+            **self._http_client_kwargs(),
         )
 
     @property
@@ -87,23 +92,9 @@ class OpenAIClient(BaseAIClient):
         start_time = time.time()
 
         try:
-            # Build messages
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
-
-            # Build request kwargs
-            request_kwargs = {
-                "model": self.config.model,
-                "messages": messages,
-                "max_tokens": self.config.max_tokens,
-                "temperature": self.config.temperature,
-            }
-
-            # OpenAI supports JSON mode
-            if json_mode:
-                request_kwargs["response_format"] = {"type": "json_object"}
+            request_kwargs = self._build_request_kwargs(
+                system_prompt, user_prompt, json_mode
+            )
 
             # Call OpenAI API
             response = await self._client.chat.completions.create(**request_kwargs)
@@ -127,6 +118,7 @@ class OpenAIClient(BaseAIClient):
                 stop_reason=response.choices[0].finish_reason or "",
                 latency_ms=latency_ms,
                 raw_response=response,
+                cached_tokens=cached_prompt_tokens(getattr(response, "usage", None)),
             )
 
         except _openai.BadRequestError as e:
@@ -142,6 +134,51 @@ class OpenAIClient(BaseAIClient):
         except Exception as e:
             raise AIClientError(f"Unexpected error: {e}", self.provider)
 
+    def _build_request_kwargs(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool,
+    ) -> dict:
+        """Chat completion kwargs shared by generate and generate_stream"""
+        # Build messages
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+        # Build request kwargs
+        request_kwargs = {
+            "model": self.config.model,
+            "messages": messages,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+        }
+
+        # OpenAI supports JSON mode
+        if json_mode:
+            request_kwargs["response_format"] = {"type": "json_object"}
+
+        # Route requests sharing a system prompt to the same prefix cache
+        request_kwargs["extra_body"] = {
+            "prompt_cache_key": prompt_cache_key(system_prompt)
+        }
+
+        return request_kwargs
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = True,
+    ) -> AsyncIterator[AIStreamChunk]:
+        """Stream a response from OpenAI, yielding text deltas."""
+        request_kwargs = self._build_request_kwargs(
+            system_prompt, user_prompt, json_mode
+        )
+        async for chunk in self._stream_chat_completion(_get_openai(), request_kwargs):
+            yield chunk
+
     async def test_connection(self) -> bool:
         """Test API connection using a minimal request."""
         _openai = _get_openai()
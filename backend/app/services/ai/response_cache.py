@@ -0,0 +1,349 @@
+"""
+AI response cache.
+
+Mock agents cloned from one strategy template on the same symbols, and
+repeated AI backtest runs, send the same prompts over and over.
+``ResponseCache`` stores responses under a hash of (model, system prompt,
+user prompt) so an identical decision context is paid for once:
+
+- L1: in-process LRU with per-entry TTL
+- L2: Redis, shared across worker processes and backtest runs
+  (see ``lru_cache.TieredCache``)
+
+Prompts are normalized before hashing: whitespace runs collapse and the
+wall-clock ``Timestamp:`` header of user prompts is masked, so agents that
+build the same context a moment apart share an entry.  Concurrent misses on
+one key wait for the first request instead of calling the provider again.
+
+``CachedAIClient`` wraps any ``BaseAIClient`` with a cache.  Hits come back
+with zero token usage and latency, since nothing was billed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from ...core.config import get_settings
+from ..lru_cache import TieredCache
+from .base import AIProvider, AIResponse, AIStreamChunk, BaseAIClient
+
+logger = logging.getLogger(__name__)
+
+# "Timestamp: 2024-01-15 12:00:00 UTC" header written by PromptBuilder
+_TIMESTAMP_LINE = re.compile(
+    r"^Timestamp: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} UTC$", re.MULTILINE
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt with the wall-clock header masked and whitespace collapsed"""
+    prompt = _TIMESTAMP_LINE.sub("Timestamp: -", prompt)
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def response_cache_key(
+    model: str, system_prompt: str, user_prompt: str, json_mode: bool = True
+) -> str:
+    """Stable hash of a request's normalized model and prompts"""
+    raw = "\0".join(
+        (
+            model,
+            "json" if json_mode else "text",
+            normalize_prompt(system_prompt),
+            normalize_prompt(user_prompt),
+        )
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _encode(response: AIResponse) -> dict:
+    return {
+        "content": response.content,
+        "model": response.model,
+        "provider": response.provider.value,
+        "stop_reason": response.stop_reason,
+    }
+
+
+def _decode(data: dict) -> AIResponse:
+    return AIResponse(
+        content=data["content"],
+        model=data["model"],
+        provider=AIProvider(data["provider"]),
+        tokens_used=0,
+        input_tokens=0,
+        output_tokens=0,
+        stop_reason=data.get("stop_reason", ""),
+    )
+
+
+class ResponseCache(TieredCache):
+    """
+    Two-tier cache of AI responses.
+
+    Usage:
+        cache = get_response_cache()
+        response = await cache.get_or_generate(
+            key, lambda: client.generate(system_prompt, user_prompt)
+        )
+    """
+
+    label = "AI response cache"
+
+    def __init__(
+        self,
+        prefix: str,
+        ttl: int,
+        max_entries: int = 1024,
+        max_chars: int = 32768,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """
+        Args:
+            prefix: Redis key prefix
+            ttl: Entry lifetime in seconds, in both tiers
+            max_entries: In-process entries kept (least recently used evicted)
+            max_chars: Responses longer than this are not cached
+            redis_getter: Async callable returning the Redis service
+                          (None = in-process cache only)
+        """
+        # Entries hold encoded responses: every hit decodes a fresh copy
+        super().__init__(max_entries)
+        self.prefix = prefix
+        self.ttl = ttl
+        self.max_chars = max_chars
+        self.redis_getter = redis_getter
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _from_redis(self, data: Any) -> Optional[dict]:
+        return data if isinstance(data, dict) and "content" in data else None
+
+    def _record(self, hit: bool) -> None:
+        _track("hit" if hit else "miss")
+
+    async def get(self, key: str) -> Optional[AIResponse]:
+        """Cached response, or None on a miss"""
+        data = await self.lookup(key, self.ttl, self.redis_getter)
+        return _decode(data) if data is not None else None
+
+    async def put(self, key: str, response: AIResponse) -> None:
+        """Cache a response in both tiers (empty or oversized ones are skipped)"""
+        if not response.content or len(response.content) > self.max_chars:
+            return
+        await self.store(key, _encode(response), self.ttl, self.redis_getter)
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[AIResponse]],
+    ) -> AIResponse:
+        """
+        Cached response, generating and caching it on a miss.
+
+        Concurrent callers with the same key share one ``generate`` call.
+        """
+        response = await self._lookup(key)
+        if response is not None:
+            return response
+
+        future = self._claim(key)
+        try:
+            response = await generate()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, response)
+        await self.put(key, response)
+        return response
+
+    async def _lookup(self, key: str) -> Optional[AIResponse]:
+        """Response from the cache or from a request already in flight"""
+        pending = self._inflight.get(key)
+        if pending is None:
+            response = await self.get(key)
+            if response is not None:
+                return response
+            # Another caller may have started the request while Redis was awaited
+            pending = self._inflight.get(key)
+            if pending is None:
+                return None
+        try:
+            return _shared(await asyncio.shield(pending))
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The first request gave up; the caller sends its own
+            return None
+
+    def _claim(self, key: str) -> asyncio.Future:
+        """Mark a request for ``key`` as in flight"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def _settle(
+        self,
+        key: str,
+        future: asyncio.Future,
+        response: Optional[AIResponse] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Hand the outcome of an in-flight request to its waiters"""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if isinstance(error, asyncio.CancelledError) or (
+            error is None and response is None
+        ):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+            # Mark retrieved: there may be no waiters
+            future.exception()
+        else:
+            future.set_result(response)
+
+
+def _shared(response: AIResponse) -> AIResponse:
+    """Copy of a response generated for another caller, without its usage"""
+    return AIResponse(
+        content=response.content,
+        model=response.model,
+        provider=response.provider,
+        tokens_used=0,
+        input_tokens=0,
+        output_tokens=0,
+        stop_reason=response.stop_reason,
+    )
+
+
+def _track(result: str) -> None:
+    try:
+        from ...monitoring.metrics import get_metrics_collector
+
+        get_metrics_collector().track_ai_response_cache(result)
+    except Exception as e:
+        logger.debug(f"Failed to record AI response cache metrics: {e}")
+
+
+class CachedAIClient(BaseAIClient):
+    """
+    AI client answering repeated prompts from a ``ResponseCache``.
+
+    Usage:
+        client = CachedAIClient(get_ai_client(model_id, api_key=key),
+                                get_response_cache())
+        response = await client.generate(system_prompt, user_prompt)
+    """
+
+    def __init__(self, client: BaseAIClient, cache: ResponseCache):
+        self.client = client
+        self.cache = cache
+        super().__init__(client.config)
+
+    def _validate_config(self) -> None:
+        """The wrapped client validated the config already"""
+
+    @property
+    def provider(self) -> AIProvider:
+        return self.client.provider
+
+    def _key(self, system_prompt: str, user_prompt: str, json_mode: bool) -> str:
+        return response_cache_key(
+            f"{self.provider.value}:{self.config.model}",
+            system_prompt,
+            user_prompt,
+            json_mode,
+        )
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = True,
+    ) -> AIResponse:
+        """Cached response, or one generated by the wrapped client"""
+        return await self.cache.get_or_generate(
+            self._key(system_prompt, user_prompt, json_mode),
+            lambda: self.client.generate(system_prompt, user_prompt, json_mode),
+        )
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = True,
+    ) -> AsyncIterator[AIStreamChunk]:
+        """
+        Yield a cached response whole, otherwise stream from the wrapped
+        client and cache the final response.
+        """
+        key = self._key(system_prompt, user_prompt, json_mode)
+        response = await self.cache._lookup(key)
+        if response is not None:
+            yield AIStreamChunk(content=response.content, response=response)
+            return
+
+        future = self.cache._claim(key)
+        try:
+            async for chunk in self.client.generate_stream(
+                system_prompt, user_prompt, json_mode
+            ):
+                if chunk.response is not None:
+                    response = chunk.response
+                yield chunk
+        except BaseException as e:
+            self.cache._settle(key, future, error=e)
+            raise
+        self.cache._settle(key, future, response)
+        if response is not None:
+            await self.cache.put(key, response)
+
+    async def test_connection(self) -> bool:
+        return await self.client.test_connection()
+
+
+async def _get_redis():
+    from ..redis_service import get_redis_service
+
+    return await get_redis_service()
+
+
+# Process-wide caches: live decision dedup and AI backtest replay
+_response_cache: Optional[ResponseCache] = None
+_replay_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Short-lived cache deduplicating identical live decision contexts"""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = ResponseCache(
+            "ai:response:",
+            ttl=settings.ai_response_cache_ttl,
+            max_entries=settings.ai_response_cache_max_entries,
+            max_chars=settings.ai_response_cache_max_chars,
+            redis_getter=_get_redis,
+        )
+    return _response_cache
+
+
+def get_replay_cache() -> ResponseCache:
+    """Long-lived cache replaying AI outputs when a backtest is re-run"""
+    global _replay_cache
+    if _replay_cache is None:
+        settings = get_settings()
+        _replay_cache = ResponseCache(
+            "ai:replay:",
+            ttl=settings.backtest_ai_replay_ttl,
+            max_entries=settings.ai_response_cache_max_entries,
+            max_chars=settings.ai_response_cache_max_chars,
+            redis_getter=_get_redis,
+        )
+    return _replay_cache
@@ -0,0 +1,244 @@
+"""
+Backtest job tracking shared by the API and ARQ workers.
+
+Backtests submitted through ``TaskQueueService.submit_backtest`` run in an
+ARQ worker.  Their state lives in Redis so both processes can see it:
+
+- ``backtest:job:<job_id>``      JSON status document (TTL: 1 day)
+- ``backtest:active:<user_id>``  set of the user's queued/running job IDs,
+                                 used for the per-user concurrency cap
+- ``backtest:cancel:<job_id>``   cancellation flag checked while running
+
+Workers publish progress events on a Redis pub/sub channel; the API process
+runs a ``BacktestProgressRelay`` that forwards them to the user's websocket
+connections.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY_PREFIX = "backtest:job:"
+ACTIVE_KEY_PREFIX = "backtest:active:"
+CANCEL_KEY_PREFIX = "backtest:cancel:"
+PROGRESS_CHANNEL = "bitrun:backtest:progress"
+
+JOB_TTL_SECONDS = 86400
+
+
+class BacktestJobStatus(str, Enum):
+    """Lifecycle of a queued backtest"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINAL_STATUSES = {
+    BacktestJobStatus.COMPLETED.value,
+    BacktestJobStatus.FAILED.value,
+    BacktestJobStatus.CANCELLED.value,
+}
+
+
+def _decode(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class BacktestJobStore:
+    """
+    Redis-backed status, concurrency and cancellation state of backtest jobs.
+
+    Works with any ``redis.asyncio`` client, including the ARQ pool.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+
+    # ==================== Lifecycle ====================
+
+    async def create(
+        self,
+        job_id: str,
+        user_id: str,
+        kind: str,
+        max_active: int,
+        active_ttl: int = JOB_TTL_SECONDS,
+    ) -> bool:
+        """
+        Register a new queued job if the user is below ``max_active``.
+
+        Returns:
+            False if the user already has ``max_active`` jobs in flight
+        """
+        active_key = f"{ACTIVE_KEY_PREFIX}{user_id}"
+        await self.redis.sadd(active_key, job_id)
+        if await self.redis.scard(active_key) > max_active:
+            await self.redis.srem(active_key, job_id)
+            return False
+        # Expire the set eventually in case a worker dies without cleanup
+        await self.redis.expire(active_key, active_ttl)
+
+        await self._save(
+            job_id,
+            {
+                "job_id": job_id,
+                "user_id": user_id,
+                "kind": kind,
+                "status": BacktestJobStatus.QUEUED.value,
+                "progress": 0.0,
+                "candles_processed": 0,
+                "total_candles": 0,
+                "equity": None,
+                "result_id": None,
+                "result": None,
+                "error": None,
+                "created_at": datetime.now(UTC).isoformat(),
+                "started_at": None,
+                "finished_at": None,
+            },
+        )
+        return True
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self.redis.get(f"{JOB_KEY_PREFIX}{job_id}")
+        if raw is None:
+            return None
+        return json.loads(_decode(raw))
+
+    async def update(self, job_id: str, **fields: Any) -> Optional[dict]:
+        """Merge fields into the job document"""
+        job = await self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        await self._save(job_id, job)
+        return job
+
+    async def finish(
+        self,
+        job_id: str,
+        user_id: str,
+        status: BacktestJobStatus,
+        **fields: Any,
+    ) -> Optional[dict]:
+        """Record a final status and release the user's concurrency slot"""
+        await self.redis.srem(f"{ACTIVE_KEY_PREFIX}{user_id}", job_id)
+        await self.redis.delete(f"{CANCEL_KEY_PREFIX}{job_id}")
+        return await self.update(
+            job_id,
+            status=status.value,
+            finished_at=datetime.now(UTC).isoformat(),
+            **fields,
+        )
+
+    async def active_jobs(self, user_id: str) -> list[str]:
+        """IDs of the user's queued or running jobs"""
+        members = await self.redis.smembers(f"{ACTIVE_KEY_PREFIX}{user_id}")
+        return sorted(_decode(m) for m in members)
+
+    # ==================== Cancellation ====================
+
+    async def request_cancel(self, job_id: str) -> None:
+        await self.redis.set(f"{CANCEL_KEY_PREFIX}{job_id}", "1", ex=JOB_TTL_SECONDS)
+
+    async def is_cancel_requested(self, job_id: str) -> bool:
+        return bool(await self.redis.exists(f"{CANCEL_KEY_PREFIX}{job_id}"))
+
+    # ==================== Progress events ====================
+
+    async def publish(self, job: dict) -> None:
+        """Publish a job's current state for websocket delivery"""
+        try:
+            await self.redis.publish(PROGRESS_CHANNEL, json.dumps(job))
+        except Exception as e:
+            logger.debug(f"Failed to publish backtest progress: {e}")
+
+    async def _save(self, job_id: str, job: dict) -> None:
+        await self.redis.set(
+            f"{JOB_KEY_PREFIX}{job_id}", json.dumps(job), ex=JOB_TTL_SECONDS
+        )
+
+
+class BacktestProgressRelay:
+    """
+    Forward worker progress events from Redis pub/sub to websocket clients.
+
+    Runs in the API process, which owns the ``ConnectionManager``.
+    """
+
+    RECONNECT_DELAY = 5.0
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # Dedicated connection: the shared client has a short socket
+            # timeout that would break a blocking subscription
+            client = redis.from_url(str(get_settings().redis_url))
+            try:
+                pubsub = client.pubsub()
+                await pubsub.subscribe(PROGRESS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self.handle(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Backtest progress relay error: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                await client.close()
+
+    @staticmethod
+    async def handle(raw: Any) -> None:
+        """Deliver one published job document to its owner"""
+        from ..api.websocket import publish_backtest_progress
+
+        try:
+            job = json.loads(_decode(raw))
+        except (TypeError, ValueError):
+            return
+        user_id = job.get("user_id")
+        if user_id:
+            await publish_backtest_progress(user_id, job)
+
+
+_relay: Optional[BacktestProgressRelay] = None
+
+
+def get_backtest_progress_relay() -> BacktestProgressRelay:
+    """Get the API process's progress relay singleton"""
+    global _relay
+    if _relay is None:
+        _relay = BacktestProgressRelay()
+    return _relay
@@ -9,9 +9,10 @@ Provides a single interface for:
 """
 
 import asyncio
-import json
 import logging
-from datetime import datetime
+import time
+from collections.abc import Sequence
+from dataclasses import replace
 from typing import Optional
 
 from ..models.market_context import (
@@ -24,7 +25,17 @@ from ..models.market_context import (
 )
 from ..models.strategy import StrategyConfig
 from ..traders.base import BaseTrader, MarketData
+from .indicator_cache import (
+    get_indicator_cache,
+    indicator_cache_key,
+    indicator_config_hash,
+)
 from .indicator_calculator import IndicatorCalculator
+from .indicator_stream import get_streaming_indicator_engine, timeframe_seconds
+from .kline_buffer import get_kline_buffers
+from .kline_resampler import can_resample, resample_klines
+from .market_context_builder import get_market_context_builder
+from .market_codec import decode_funding, encode_funding, is_binary
 from .market_data_cache import MarketDataCache
 from .redis_service import get_redis_service
 
@@ -72,10 +83,25 @@ class DataAccessLayer:
 
         # Initialize indicator calculator with config
         self.indicator_calc = IndicatorCalculator(self.config.indicators)
+        # Per-series incremental indicator state, shared across instances
+        self.indicator_stream = get_streaming_indicator_engine(self.config.indicators)
+        # Computed indicators, shared by agents with the same indicator config
+        self.indicator_cache = get_indicator_cache()
+        self._indicator_config_hash = indicator_config_hash(self.config.indicators)
+        # Rolling K-line windows, shared across instances
+        self.kline_buffers = get_kline_buffers()
+        # Timeframes resampled from config.base_timeframe, and the number of
+        # base candles buffered for them
+        self._resample_bases, self._base_limit = self._plan_resampling()
+        # Contexts precomputed at candle close for running agents
+        self.context_builder = get_market_context_builder()
 
         # Redis connection (lazy init)
         self._redis = None
 
+        # Stage timings of the last get_market_contexts call
+        self.last_context_timings: dict = {}
+
     async def _get_redis(self):
         """Get Redis connection lazily"""
         if self._redis is None:
@@ -103,6 +129,140 @@ class DataAccessLayer:
         Returns:
             MarketContext with all data populated
         """
+        context = await self._fetch_context(symbol, timeframes)
+        await self._calculate_context_indicators({symbol: context})
+        return context
+
+    async def get_market_contexts(
+        self,
+        symbols: list[str],
+        timeframes: Optional[list[str]] = None,
+    ) -> dict[str, MarketContext]:
+        """
+        Get market contexts for multiple symbols.
+
+        Contexts precomputed by the market context builder at the latest
+        candle close are used when a running agent subscribed them (only the
+        tickers are refreshed); otherwise they are built here.
+
+        Args:
+            symbols: List of trading symbols
+            timeframes: Optional list of timeframes
+
+        Returns:
+            Dict mapping symbol to MarketContext
+        """
+        started = time.perf_counter()
+        timeframes = timeframes or self.config.timeframes
+        published = await self.context_builder.get_contexts(
+            self.trader.exchange_name,
+            timeframes,
+            self._indicator_config_hash,
+            symbols,
+            self.config.base_timeframe,
+        )
+        if published is None:
+            return await self.build_market_contexts(symbols, timeframes)
+
+        contexts = await self._with_current_market_data(published)
+        self.last_context_timings = {
+            "symbols": len(symbols),
+            "precomputed": True,
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        return contexts
+
+    async def _with_current_market_data(
+        self,
+        contexts: dict[str, MarketContext],
+    ) -> dict[str, MarketContext]:
+        """Copies of shared contexts with freshly fetched tickers"""
+        results = await asyncio.gather(
+            *(self.trader.get_market_data(symbol) for symbol in contexts),
+            return_exceptions=True,
+        )
+        fresh = {}
+        for (symbol, context), current in zip(contexts.items(), results):
+            if isinstance(current, Exception):
+                logger.warning(f"Failed to get market data for {symbol}: {current}")
+                current = context.current
+            fresh[symbol] = replace(
+                context,
+                current=current,
+                key_levels=self.indicator_calc.merge_support_resistance(
+                    context.indicators, current.mid_price
+                ),
+            )
+        return fresh
+
+    async def build_market_contexts(
+        self,
+        symbols: list[str],
+        timeframes: Optional[list[str]] = None,
+    ) -> dict[str, MarketContext]:
+        """
+        Build market contexts for multiple symbols (parallel).
+
+        Data for all symbols is fetched concurrently first; indicators for
+        every symbol and timeframe are then computed in one batch off the
+        event loop.  Stage timings are kept in ``last_context_timings``.
+
+        Args:
+            symbols: List of trading symbols
+            timeframes: Optional list of timeframes
+
+        Returns:
+            Dict mapping symbol to MarketContext
+        """
+        started = time.perf_counter()
+        tasks = {symbol: self._fetch_context(symbol, timeframes) for symbol in symbols}
+
+        results = await asyncio.gather(
+            *tasks.values(),
+            return_exceptions=True,
+        )
+        fetched = time.perf_counter()
+
+        contexts = {}
+        for symbol, result in zip(tasks.keys(), results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to get context for {symbol}: {result}")
+                # Create empty context
+                contexts[symbol] = MarketContext(
+                    symbol=symbol,
+                    current=MarketData(
+                        symbol=symbol,
+                        mid_price=0.0,
+                        bid_price=0.0,
+                        ask_price=0.0,
+                        volume_24h=0.0,
+                    ),
+                    exchange_name=self.trader.exchange_name,
+                )
+            else:
+                contexts[symbol] = result
+
+        computed = await self._calculate_context_indicators(contexts)
+        finished = time.perf_counter()
+
+        self.last_context_timings = {
+            "symbols": len(symbols),
+            "series_computed": computed,
+            "fetch_ms": round((fetched - started) * 1000, 2),
+            "indicators_ms": round((finished - fetched) * 1000, 2),
+            "total_ms": round((finished - started) * 1000, 2),
+        }
+        logger.debug(
+            f"Built {len(symbols)} market contexts: {self.last_context_timings}"
+        )
+        return contexts
+
+    async def _fetch_context(
+        self,
+        symbol: str,
+        timeframes: Optional[list[str]] = None,
+    ) -> MarketContext:
+        """MarketContext with market data, K-lines and funding (no indicators)"""
         timeframes = timeframes or self.config.timeframes
 
         # 1. Fetch real-time market data
@@ -135,127 +295,195 @@ class DataAccessLayer:
             else:
                 klines[tf] = result
 
-        # 3. Calculate technical indicators for each timeframe
-        indicators: dict[str, TechnicalIndicators] = {}
-        for tf, candles in klines.items():
-            if candles:
-                indicators[tf] = self.indicator_calc.calculate(candles)
-            else:
-                indicators[tf] = TechnicalIndicators()
-
-        # 4. Fetch funding rate history
+        # 3. Fetch funding rate history
         funding_history = await self._get_funding_cached(symbol)
 
-        # 5. Build and return MarketContext
         return MarketContext(
             symbol=symbol,
             current=current,
             exchange_name=self.trader.exchange_name,
             klines=klines,
-            indicators=indicators,
             funding_history=funding_history,
         )
 
-    async def get_market_contexts(
+    async def _calculate_context_indicators(
         self,
-        symbols: list[str],
-        timeframes: Optional[list[str]] = None,
-    ) -> dict[str, MarketContext]:
+        contexts: dict[str, MarketContext],
+    ) -> int:
         """
-        Get market contexts for multiple symbols (parallel).
+        Fill in the indicators of every context's K-line series.
 
-        Args:
-            symbols: List of trading symbols
-            timeframes: Optional list of timeframes
+        Series found in the shared indicator cache are used as is; the rest
+        are grouped by timeframe and computed in one executor call.
 
         Returns:
-            Dict mapping symbol to MarketContext
+            Number of series computed (cache misses)
         """
-        tasks = {
-            symbol: self.get_market_context(symbol, timeframes) for symbol in symbols
-        }
+        exchange = self.trader.exchange_name
+        ttl = {}
+        keys: dict[tuple[str, str], str] = {}
+        for symbol, context in contexts.items():
+            for tf, candles in context.klines.items():
+                if candles:
+                    ttl[tf] = CACHE_TTL.get(tf, 300)
+                    keys[(symbol, tf)] = indicator_cache_key(
+                        self.INDICATOR_CACHE_PREFIX,
+                        exchange,
+                        symbol,
+                        tf,
+                        candles,
+                        self._indicator_config_hash,
+                    )
 
-        results = await asyncio.gather(
-            *tasks.values(),
-            return_exceptions=True,
+        cached = await asyncio.gather(
+            *(
+                self.indicator_cache.get(key, ttl[tf], self._get_redis)
+                for (_, tf), key in keys.items()
+            )
         )
-
-        contexts = {}
-        for symbol, result in zip(tasks.keys(), results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to get context for {symbol}: {result}")
-                # Create empty context
-                contexts[symbol] = MarketContext(
-                    symbol=symbol,
-                    current=MarketData(
-                        symbol=symbol,
-                        mid_price=0.0,
-                        bid_price=0.0,
-                        ask_price=0.0,
-                        volume_24h=0.0,
-                    ),
-                    exchange_name=self.trader.exchange_name,
+        found = dict(zip(keys, cached))
+
+        pending: dict[str, dict[str, list[OHLCV]]] = {}
+        for (symbol, tf), indicators in found.items():
+            if indicators is None:
+                pending.setdefault(tf, {})[symbol] = contexts[symbol].klines[tf]
+
+        if pending:
+            computed = await asyncio.to_thread(self._update_indicator_batches, pending)
+            for tf, by_symbol in computed.items():
+                for symbol, indicators in by_symbol.items():
+                    found[(symbol, tf)] = indicators
+            await asyncio.gather(
+                *(
+                    self.indicator_cache.put(
+                        keys[(symbol, tf)],
+                        found[(symbol, tf)],
+                        ttl[tf],
+                        self._get_redis,
+                    )
+                    for tf, by_symbol in computed.items()
+                    for symbol in by_symbol
                 )
-            else:
-                contexts[symbol] = result
+            )
 
-        return contexts
+        for symbol, context in contexts.items():
+            context.indicators = {
+                tf: found.get((symbol, tf)) or TechnicalIndicators()
+                for tf in context.klines
+            }
+            context.key_levels = self.indicator_calc.merge_support_resistance(
+                context.indicators, context.current.mid_price
+            )
+        return sum(len(by_symbol) for by_symbol in pending.values())
+
+    def _update_indicator_batches(
+        self,
+        pending: dict[str, dict[str, list[OHLCV]]],
+    ) -> dict[str, dict[str, TechnicalIndicators]]:
+        """Streaming indicator updates per timeframe (runs in an executor)"""
+        exchange = self.trader.exchange_name
+        return {
+            tf: {
+                symbol: self._with_structure(indicators, by_symbol[symbol])
+                for symbol, indicators in self.indicator_stream.update_batch(
+                    exchange, tf, by_symbol
+                ).items()
+            }
+            for tf, by_symbol in pending.items()
+        }
+
+    def _with_structure(
+        self,
+        indicators: TechnicalIndicators,
+        klines: Sequence[OHLCV],
+    ) -> TechnicalIndicators:
+        """Indicators plus support/resistance and trend strength (cached with them)"""
+        return replace(indicators, **self.indicator_calc.calculate_structure(klines))
 
     # ==================== K-line Data ====================
 
+    def _plan_resampling(self) -> tuple[dict[str, str], int]:
+        """
+        Timeframes derived from ``config.base_timeframe`` and the number of
+        base candles to buffer for them.
+
+        A timeframe is derived when its candles are made of whole base
+        candles (in the exchange's session alignment) and its window fits in
+        one ``get_klines`` call; other timeframes are fetched directly.
+        """
+        base = self.config.base_timeframe
+        if not base:
+            return {}, 0
+        exchange = self.trader.exchange_name
+        max_limit = self.trader.max_kline_limit
+        base_limit = TIMEFRAME_LIMITS.get(base, 100)
+        bases = {}
+        for tf in self.config.timeframes:
+            if not can_resample(base, tf, exchange):
+                continue
+            needed = self._base_candles(base, tf, TIMEFRAME_LIMITS.get(tf, 100))
+            if needed > max_limit:
+                continue
+            bases[tf] = base
+            base_limit = max(base_limit, needed)
+        if not bases:
+            logger.warning(
+                f"No timeframe of {self.config.timeframes} can be resampled "
+                f"from {base} on {exchange}"
+            )
+        return bases, min(base_limit, max_limit)
+
+    @staticmethod
+    def _base_candles(base: str, timeframe: str, limit: int) -> int:
+        """Base candles covering ``limit`` candles plus a partial leading one"""
+        ratio = timeframe_seconds(timeframe) // timeframe_seconds(base)
+        return (limit + 1) * ratio
+
     async def _get_klines_cached(
         self,
         symbol: str,
         timeframe: str,
-    ) -> list[OHLCV]:
+        limit: Optional[int] = None,
+    ) -> Sequence[OHLCV]:
         """
-        Get K-line data with caching.
+        Get K-line data from the shared ring buffers.
 
-        Checks cache first, fetches from exchange if not cached.
+        The buffer of a series is warmed by one full fetch; later calls only
+        fetch the candles since its newest one (see ``KlineBufferStore``).
+        With ``config.base_timeframe`` set, the base series is buffered once
+        per symbol and the timeframes planned for it are resampled from it.
         """
-        cache_key = (
-            f"{self.KLINE_CACHE_PREFIX}{self.trader.exchange_name}:{symbol}:{timeframe}"
-        )
-
-        # Try cache first
-        try:
-            redis = await self._get_redis()
-            cached = await redis.get(cache_key)
-
-            if cached:
-                data = json.loads(cached)
-                return [
-                    OHLCV(
-                        timestamp=datetime.fromisoformat(k["timestamp"]),
-                        open=k["open"],
-                        high=k["high"],
-                        low=k["low"],
-                        close=k["close"],
-                        volume=k["volume"],
-                    )
-                    for k in data
-                ]
-        except Exception as e:
-            logger.debug(f"Cache miss for klines {symbol} {timeframe}: {e}")
-
-        # Fetch from exchange
-        limit = TIMEFRAME_LIMITS.get(timeframe, 100)
-        klines = await self.trader.get_klines(symbol, timeframe, limit)
-
-        if not klines:
-            return []
-
-        # Cache the result
-        try:
-            redis = await self._get_redis()
-            ttl = CACHE_TTL.get(timeframe, 300)
-
-            cache_data = json.dumps([k.to_dict() for k in klines])
-            await redis.set(cache_key, cache_data, ex=ttl)
-        except Exception as e:
-            logger.debug(f"Failed to cache klines: {e}")
+        limit = limit or TIMEFRAME_LIMITS.get(timeframe, 100)
+        base = self._resample_bases.get(timeframe)
+        if base and self._base_candles(base, timeframe, limit) <= self._base_limit:
+            klines = await self._get_buffered_klines(symbol, base, self._base_limit)
+            resampled = resample_klines(klines, timeframe, self.trader.exchange_name)
+            return resampled[-limit:]
+        if timeframe == self.config.base_timeframe and limit <= self._base_limit:
+            # Keep one buffer capacity for the base series
+            klines = await self._get_buffered_klines(
+                symbol, timeframe, self._base_limit
+            )
+            return klines[-limit:]
+        return await self._get_buffered_klines(symbol, timeframe, limit)
 
-        return klines
+    async def _get_buffered_klines(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> Sequence[OHLCV]:
+        exchange = self.trader.exchange_name
+        return await self.kline_buffers.get_klines(
+            exchange,
+            symbol,
+            timeframe,
+            limit=limit,
+            ttl=CACHE_TTL.get(timeframe, 300),
+            fetch=lambda n: self.trader.get_klines(symbol, timeframe, n),
+            redis_getter=self._get_redis,
+            redis_key=f"{self.KLINE_CACHE_PREFIX}{exchange}:{symbol}:{timeframe}",
+        )
 
     async def get_klines(
         self,
@@ -263,7 +491,7 @@ class DataAccessLayer:
         timeframe: str,
         limit: Optional[int] = None,
         use_cache: bool = True,
-    ) -> list[OHLCV]:
+    ) -> Sequence[OHLCV]:
         """
         Get K-line data for a symbol.
 
@@ -274,10 +502,10 @@ class DataAccessLayer:
             use_cache: Whether to use caching
 
         Returns:
-            List of OHLCV objects
+            KlineSeries (OHLCV sequence) or list of OHLCV objects
         """
         if use_cache:
-            return await self._get_klines_cached(symbol, timeframe)
+            return await self._get_klines_cached(symbol, timeframe, limit)
 
         # Direct fetch without cache
         limit = limit or TIMEFRAME_LIMITS.get(timeframe, 100)
@@ -298,17 +526,16 @@ class DataAccessLayer:
         # Try cache first
         try:
             redis = await self._get_redis()
-            cached = await redis.get(cache_key)
+            cached = await redis.get_bytes(cache_key)
 
             if cached:
-                data = json.loads(cached)
-                return [
-                    FundingRate(
-                        timestamp=datetime.fromisoformat(f["timestamp"]),
-                        rate=f["rate"],
+                funding_history = decode_funding(cached)
+                if not is_binary(cached):
+                    # Rewrite keys cached in the legacy JSON format
+                    await redis.set_bytes(
+                        cache_key, encode_funding(funding_history), ttl=3600
                     )
-                    for f in data
-                ]
+                return funding_history
         except Exception as e:
             logger.debug(f"Cache miss for funding {symbol}: {e}")
 
@@ -321,8 +548,9 @@ class DataAccessLayer:
         # Cache the result (funding rates update every 8 hours)
         try:
             redis = await self._get_redis()
-            cache_data = json.dumps([f.to_dict() for f in funding_history])
-            await redis.set(cache_key, cache_data, ex=3600)  # 1 hour TTL
+            await redis.set_bytes(
+                cache_key, encode_funding(funding_history), ttl=3600
+            )  # 1 hour TTL
         except Exception as e:
             logger.debug(f"Failed to cache funding: {e}")
 
@@ -345,7 +573,39 @@ class DataAccessLayer:
         if not klines:
             return TechnicalIndicators()
 
-        return self.indicator_calc.calculate(klines)
+        return await self._calculate_indicators(symbol, timeframe, klines)
+
+    async def _calculate_indicators(
+        self,
+        symbol: str,
+        timeframe: str,
+        klines: list[OHLCV],
+    ) -> TechnicalIndicators:
+        """
+        Indicators for a K-line series.
+
+        Served from the shared indicator cache when another agent with the
+        same indicator config already computed this candle; otherwise taken
+        from the series' streaming state (new candles only) and cached.
+        """
+        exchange = self.trader.exchange_name
+        key = indicator_cache_key(
+            self.INDICATOR_CACHE_PREFIX,
+            exchange,
+            symbol,
+            timeframe,
+            klines,
+            self._indicator_config_hash,
+        )
+        return await self.indicator_cache.get_or_compute(
+            key,
+            lambda: self._with_structure(
+                self.indicator_stream.update(exchange, symbol, timeframe, klines),
+                klines,
+            ),
+            ttl=CACHE_TTL.get(timeframe, 300),
+            redis_getter=self._get_redis,
+        )
 
     async def get_indicators_multi(
         self,
@@ -387,6 +647,7 @@ class DataAccessLayer:
         Returns:
             Number of keys deleted
         """
+        self.kline_buffers.reset(self.trader.exchange_name, symbol, timeframe)
         try:
             redis = await self._get_redis()
 
@@ -408,7 +669,9 @@ class DataAccessLayer:
             return 0
 
     async def get_cache_stats(self) -> dict:
-        """Get cache statistics"""
+        """Get cache statistics (buffer and indicator counters are process-wide)"""
+        indicator_cache = self.indicator_cache.get_stats()
+        kline_buffers = self.kline_buffers.get_stats()
         try:
             redis = await self._get_redis()
 
@@ -424,9 +687,15 @@ class DataAccessLayer:
                 + len(funding_keys)
                 + len(indicator_keys),
                 "exchange": self.trader.exchange_name,
+                "indicator_cache": indicator_cache,
+                "kline_buffers": kline_buffers,
             }
         except Exception as e:
-            return {"error": str(e)}
+            return {
+                "error": str(e),
+                "indicator_cache": indicator_cache,
+                "kline_buffers": kline_buffers,
+            }
 
     # ==================== Preloading ====================
 
@@ -222,6 +222,7 @@ class DebateEngine:
                     raw_response=response.content,
                     latency_ms=latency_ms,
                     tokens_used=response.tokens_used,
+                    cached_tokens=response.cached_tokens,
                     error=f"Parse error: {e.message}",
                 )
 
@@ -234,6 +235,7 @@ class DebateEngine:
                 overall_confidence=parsed.overall_confidence,
                 latency_ms=latency_ms,
                 tokens_used=response.tokens_used,
+                cached_tokens=response.cached_tokens,
             )
 
         except asyncio.TimeoutError:
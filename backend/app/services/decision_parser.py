@@ -101,6 +101,20 @@ class DecisionParser:
         except json.JSONDecodeError as e:
             raise DecisionParseError(f"Invalid JSON: {e}", raw_response)
 
+        return self._build_and_validate(data, raw_response)
+
+    def stream(self) -> "DecisionStream":
+        """
+        Start incremental parsing of a streamed response.
+
+        Feed text deltas to the returned ``DecisionStream``; it yields a
+        validated ``DecisionResponse`` as soon as the ``decisions`` array
+        closes, before the rest of the response has arrived.
+        """
+        return DecisionStream(self)
+
+    def _build_and_validate(self, data, raw_response: str) -> DecisionResponse:
+        """Build the response object and enforce risk controls"""
         # Build response object
         try:
             response = self._build_response(data, raw_response)
@@ -471,3 +485,148 @@ class DecisionParser:
             return False, "Position size is zero"
 
         return True, "Passed validation"
+
+
+class DecisionStream:
+    """
+    Incremental decision extraction from a streamed AI response.
+
+    Scans the top-level JSON object as text arrives, decoding each top-level
+    field once its value closes.  When ``decisions`` closes, ``feed`` returns
+    a ``DecisionResponse`` built from the fields seen so far (typically
+    ``chain_of_thought``, ``market_assessment`` and ``decisions``) so trades
+    can be executed while the remaining fields are still streaming.
+
+    Anything that does not look like a well-formed top-level object (e.g. a
+    bare decisions array) simply never produces an early result; callers
+    should then ``DecisionParser.parse`` the complete text.
+    """
+
+    def __init__(self, parser: DecisionParser):
+        self._parser = parser
+        self._text = ""
+        self._pos = 0
+
+        # Scanner state (top-level object only)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._expect_key = False
+        self._done = False
+
+        self.fields: dict = {}
+        self.early_response: Optional[DecisionResponse] = None
+
+    @property
+    def text(self) -> str:
+        """Text received so far (encoding-fixed)"""
+        return self._text
+
+    def feed(self, delta: str) -> Optional[DecisionResponse]:
+        """
+        Consume a text delta.
+
+        Returns:
+            The early ``DecisionResponse`` on the call where the
+            ``decisions`` array closes, otherwise None
+
+        Raises:
+            DecisionParseError: If the closed decisions fail validation
+        """
+        if not delta:
+            return None
+
+        self._text += self._parser._fix_encoding(delta)
+        if self._done:
+            return None
+
+        had_decisions = "decisions" in self.fields
+        self._scan()
+
+        if had_decisions or "decisions" not in self.fields:
+            return None
+        if not isinstance(self.fields["decisions"], list):
+            return None
+
+        self.early_response = self._parser._build_and_validate(
+            dict(self.fields), self._text
+        )
+        return self.early_response
+
+    def _scan(self) -> None:
+        text = self._text
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._depth == 0:
+                if c == "{":
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(text[self._key_start : i + 1])
+                        self._key_start = None
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expect_key:
+                        self._key_start = i
+                        self._expect_key = False
+                    elif self._key is not None and self._value_start is None:
+                        self._value_start = i
+            elif c in "{[":
+                if (
+                    self._depth == 1
+                    and self._key is not None
+                    and self._value_start is None
+                ):
+                    self._value_start = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    # A nested object/array value just closed
+                    self._store(i + 1)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._store(i)
+                    self._done = True
+            elif self._depth == 1:
+                if c == ",":
+                    if self._value_start is not None:
+                        self._store(i)
+                    self._expect_key = True
+                elif (
+                    self._key is not None
+                    and self._value_start is None
+                    and c not in " \t\r\n:"
+                ):
+                    self._value_start = i  # number / true / false / null
+
+            if self._done:
+                break
+
+        self._pos = len(text)
+
+    def _store(self, end: int) -> None:
+        """Decode the current top-level value ending at ``end``"""
+        try:
+            self.fields[self._key] = json.loads(self._text[self._value_start : end])
+        except json.JSONDecodeError:
+            # Not the JSON we expected; leave it to the full parse
+            self._done = True
+        self._key = None
+        self._value_start = None
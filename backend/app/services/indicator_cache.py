@@ -0,0 +1,165 @@
+"""
+Shared technical indicator cache.
+
+Agents trading the same symbols poll the same K-line series, and agents with
+the same indicator settings compute the same ``TechnicalIndicators`` from
+them.  ``IndicatorCache`` lets them share one computation per series update:
+
+- L1: in-process LRU with per-entry TTL, shared by every DataAccessLayer
+- L2: Redis, shared across worker processes (see ``lru_cache.TieredCache``)
+
+Keys name the series, the close time of its newest candle and a hash of the
+indicator configuration.  The newest candle is usually still forming, so a
+digest of its values is part of the key too: a later fetch in which the
+price has moved is a new entry rather than a stale hit.
+
+Cached ``TechnicalIndicators`` are shared between callers and must be
+treated as read-only.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Optional
+
+from ..models.market_context import TechnicalIndicators
+from ..traders.base import OHLCV
+from .indicator_stream import timeframe_seconds
+from .lru_cache import TieredCache
+
+
+def indicator_config_hash(indicator_config: Optional[dict] = None) -> str:
+    """Short stable hash of an indicator configuration (key order ignored)"""
+    raw = json.dumps(indicator_config or {}, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def indicator_cache_key(
+    prefix: str,
+    exchange: str,
+    symbol: str,
+    timeframe: str,
+    klines: list[OHLCV],
+    config_hash: str,
+) -> str:
+    """
+    Cache key for the indicators of a K-line series.
+
+    Format: ``{prefix}{exchange}:{symbol}:{timeframe}:{close_ms}:{config}:{candle}``
+    where ``close_ms`` is the close time of the newest candle and ``candle``
+    a digest of its OHLCV values.
+    """
+    last = klines[-1]
+    close_ms = int(last.timestamp.timestamp() * 1000)
+    seconds = timeframe_seconds(timeframe)
+    if seconds:
+        close_ms += seconds * 1000
+    values = f"{last.open!r}|{last.high!r}|{last.low!r}|{last.close!r}|{last.volume!r}"
+    candle = hashlib.sha1(values.encode()).hexdigest()[:8]
+    return f"{prefix}{exchange}:{symbol}:{timeframe}:{close_ms}:{config_hash}:{candle}"
+
+
+def _encode(indicators: TechnicalIndicators) -> dict:
+    return asdict(indicators)
+
+
+def _decode(data: dict) -> TechnicalIndicators:
+    # JSON turns the integer period keys of ema / sma into strings
+    return TechnicalIndicators(
+        ema={int(k): v for k, v in data["ema"].items()},
+        rsi=data["rsi"],
+        macd=dict(data["macd"]),
+        atr=data["atr"],
+        bollinger=dict(data["bollinger"]),
+        sma={int(k): v for k, v in data["sma"].items()},
+        volume_sma=data["volume_sma"],
+        support=data.get("support", []),
+        resistance=data.get("resistance", []),
+        trend_strength=data.get("trend_strength"),
+    )
+
+
+class IndicatorCache(TieredCache):
+    """
+    Two-tier cache of computed indicators.
+
+    Usage:
+        cache = get_indicator_cache()
+        indicators = await cache.get_or_compute(
+            key, lambda: calc.calculate(klines), ttl=300, redis_getter=get_redis
+        )
+    """
+
+    DEFAULT_MAX_ENTRIES = 4096
+    label = "Indicator cache"
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(max_entries)
+
+    def _to_redis(self, indicators: TechnicalIndicators) -> dict:
+        return _encode(indicators)
+
+    def _from_redis(self, data: Any) -> Optional[TechnicalIndicators]:
+        return _decode(data) if isinstance(data, dict) else None
+
+    async def get(
+        self,
+        key: str,
+        ttl: int,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Optional[TechnicalIndicators]:
+        """
+        Cached indicators, or None on a miss.
+
+        Args:
+            key: Cache key (see ``indicator_cache_key``)
+            ttl: Lifetime in seconds of an L2 hit promoted to L1
+            redis_getter: Async callable returning the Redis service
+                          (None = in-process cache only)
+        """
+        return await self.lookup(key, ttl, redis_getter)
+
+    async def put(
+        self,
+        key: str,
+        indicators: TechnicalIndicators,
+        ttl: int,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> None:
+        """Cache computed indicators in both tiers"""
+        await self.store(key, indicators, ttl, redis_getter)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], TechnicalIndicators],
+        ttl: int,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> TechnicalIndicators:
+        """
+        Get cached indicators, computing and caching them on a miss.
+
+        Args:
+            key: Cache key (see ``indicator_cache_key``)
+            compute: Computes the indicators on a miss
+            ttl: Entry lifetime in seconds, in both tiers
+            redis_getter: Async callable returning the Redis service
+                          (None = in-process cache only)
+        """
+        indicators = await self.get(key, ttl, redis_getter)
+        if indicators is None:
+            indicators = compute()
+            await self.put(key, indicators, ttl, redis_getter)
+        return indicators
+
+
+# Process-wide instance shared by every DataAccessLayer
+_indicator_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Get the process-wide indicator cache"""
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache()
+    return _indicator_cache
@@ -6,10 +6,16 @@ Supports EMA, SMA, RSI, MACD, ATR, and Bollinger Bands.
 """
 
 import logging
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from typing import Optional
 
+import numpy as np
+
 from ..models.market_context import TechnicalIndicators
-from ..traders.base import OHLCV
+from ..traders.base import OHLCV, KlineSeries
+from . import indicator_series as series
+from .indicator_series import IndicatorSeries, latest_value
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +24,9 @@ class IndicatorCalculator:
     """
     Technical indicator calculator.
 
-    Calculates indicators from K-line data without external dependencies.
-    Uses pure Python implementations for portability.
+    Indicators are computed for the whole K-line list at once with NumPy
+    (see ``indicator_series``); ``calculate`` returns the latest values and
+    ``calculate_series`` the full aligned arrays.
 
     Supported indicators:
     - EMA (Exponential Moving Average)
@@ -32,6 +39,7 @@ class IndicatorCalculator:
     Usage:
         calculator = IndicatorCalculator(config)
         indicators = calculator.calculate(klines)
+        chart = calculator.calculate_series(klines).to_dict()
     """
 
     def __init__(self, indicator_config: Optional[dict] = None):
@@ -65,13 +73,18 @@ class IndicatorCalculator:
         self.atr_period = self.config.get("atr_period", 14)
         self.bollinger_period = self.config.get("bollinger_period", 20)
         self.bollinger_std = self.config.get("bollinger_std", 2.0)
+        # Market structure
+        self.sr_lookback = self.config.get("sr_lookback", 20)
+        self.sr_threshold = self.config.get("sr_threshold", 0.02)
+        self.sr_pivot_window = self.config.get("sr_pivot_window", 1)
+        self.trend_period = self.config.get("trend_period", 20)
 
-    def calculate(self, klines: list[OHLCV]) -> TechnicalIndicators:
+    def calculate(self, klines: Sequence[OHLCV]) -> TechnicalIndicators:
         """
         Calculate all configured technical indicators.
 
         Args:
-            klines: List of OHLCV objects (oldest first)
+            klines: OHLCV list or KlineSeries (oldest first)
 
         Returns:
             TechnicalIndicators object with all calculated values
@@ -79,273 +92,104 @@ class IndicatorCalculator:
         if not klines:
             return TechnicalIndicators()
 
-        # Extract price arrays
-        closes = [k.close for k in klines]
-        highs = [k.high for k in klines]
-        lows = [k.low for k in klines]
-        volumes = [k.volume for k in klines]
-
-        # Calculate indicators (skip disabled ones where period=0)
-        indicators = TechnicalIndicators(
-            ema=self._calc_ema_multi(closes),
-            sma=self._calc_sma_multi(closes),
-            rsi=self._calc_rsi(closes) if self.rsi_period > 0 else None,
-            macd=(
-                self._calc_macd(closes)
-                if self.macd_fast > 0 and self.macd_slow > 0
-                else {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
-            ),
-            atr=self._calc_atr(highs, lows, closes) if self.atr_period > 0 else None,
-            bollinger=self._calc_bollinger(closes),
-            volume_sma=self._calc_sma(volumes, self.bollinger_period),
-        )
-
-        return indicators
-
-    # ==================== EMA (Exponential Moving Average) ====================
-
-    def _calc_ema_multi(self, closes: list[float]) -> dict[int, float]:
-        """Calculate EMA for multiple periods"""
-        result = {}
-        for period in self.ema_periods:
-            ema = self._calc_ema(closes, period)
-            if ema is not None:
-                result[period] = ema
-        return result
-
-    def _calc_ema(self, data: list[float], period: int) -> Optional[float]:
-        """
-        Calculate Exponential Moving Average.
-
-        EMA = Price(t) * k + EMA(y) * (1 - k)
-        where k = 2 / (period + 1)
-        """
-        if len(data) < period:
-            return None
-
-        # Multiplier
-        k = 2 / (period + 1)
-
-        # Start with SMA for first EMA value
-        ema = sum(data[:period]) / period
-
-        # Calculate EMA for remaining values
-        for price in data[period:]:
-            ema = price * k + ema * (1 - k)
-
-        return round(ema, 8)
+        return self.calculate_series(klines, exact=True).latest()
 
-    # ==================== SMA (Simple Moving Average) ====================
-
-    def _calc_sma_multi(self, closes: list[float]) -> dict[int, float]:
-        """Calculate SMA for multiple periods"""
-        result = {}
-        for period in self.sma_periods:
-            sma = self._calc_sma(closes, period)
-            if sma is not None:
-                result[period] = sma
-        return result
-
-    def _calc_sma(self, data: list[float], period: int) -> Optional[float]:
-        """
-        Calculate Simple Moving Average.
-
-        SMA = Sum of last N prices / N
+    def calculate_series(
+        self, klines: Sequence[OHLCV], exact: bool = False
+    ) -> IndicatorSeries:
         """
-        if len(data) < period:
-            return None
+        Calculate all configured indicators for every candle.
 
-        return round(sum(data[-period:]) / period, 8)
-
-    # ==================== RSI (Relative Strength Index) ====================
+        Args:
+            klines: OHLCV list or KlineSeries (oldest first)
+            exact: Run EMA / Wilder recurrences candle by candle instead of
+                in blocked closed form (see ``indicator_series``)
 
-    def _calc_rsi(self, closes: list[float]) -> Optional[float]:
+        Returns:
+            IndicatorSeries with arrays aligned with ``klines``
         """
-        Calculate Relative Strength Index.
-
-        RSI = 100 - (100 / (1 + RS))
-        RS = Average Gain / Average Loss
+        klines = KlineSeries.coerce(klines)
+        result = self._series(
+            *(
+                np.ascontiguousarray(column)
+                for column in (klines.closes, klines.highs, klines.lows, klines.volumes)
+            ),
+            exact=exact,
+        )
+        result.timestamps = klines.timestamps
+        return result
 
-        Uses Wilder's smoothing method (exponential moving average).
+    def calculate_batch(
+        self, klines_list: list[Sequence[OHLCV]]
+    ) -> list[TechnicalIndicators]:
         """
-        period = self.rsi_period
-
-        if len(closes) < period + 1:
-            return None
-
-        # Calculate price changes
-        changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+        Calculate the latest indicators of many series in one pass.
 
-        # Separate gains and losses
-        gains = [max(0, change) for change in changes]
-        losses = [abs(min(0, change)) for change in changes]
+        Series of equal length (e.g. every symbol of one timeframe) are
+        stacked into 2-D arrays, so each indicator is computed for all of
+        them at once.  Results equal ``calculate`` per series.
 
-        # Initial average gain and loss (SMA)
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
-
-        # Smooth using Wilder's method
-        for i in range(period, len(gains)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-
-        # Calculate RSI
-        if avg_loss == 0:
-            return 100.0
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-
-        return round(rsi, 2)
-
-    # ==================== MACD (Moving Average Convergence Divergence) ====================
-
-    def _calc_macd(self, closes: list[float]) -> dict[str, float]:
-        """
-        Calculate MACD indicator.
+        Args:
+            klines_list: OHLCV lists or KlineSeries (oldest first), one per series
 
-        MACD Line = EMA(fast) - EMA(slow)
-        Signal Line = EMA of MACD Line
-        Histogram = MACD Line - Signal Line
+        Returns:
+            TechnicalIndicators per series, in input order
         """
-        result = {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
-
-        min_required = max(self.macd_slow, self.macd_fast) + self.macd_signal
-        if len(closes) < min_required:
-            return result
-
-        # Calculate fast and slow EMAs
-        fast_ema = self._calc_ema(closes, self.macd_fast)
-        slow_ema = self._calc_ema(closes, self.macd_slow)
-
-        if fast_ema is None or slow_ema is None:
-            return result
-
-        # Calculate MACD line for all data points
-        macd_values = []
-
-        # Need to calculate EMA series to get MACD history for signal line
-        k_fast = 2 / (self.macd_fast + 1)
-        k_slow = 2 / (self.macd_slow + 1)
-
-        # Initialize EMAs
-        ema_fast = sum(closes[: self.macd_fast]) / self.macd_fast
-        ema_slow = sum(closes[: self.macd_slow]) / self.macd_slow
-
-        # Calculate MACD values
-        for i in range(self.macd_slow, len(closes)):
-            # Update fast EMA
-            if i >= self.macd_fast:
-                ema_fast = closes[i] * k_fast + ema_fast * (1 - k_fast)
-
-            # Update slow EMA
-            ema_slow = closes[i] * k_slow + ema_slow * (1 - k_slow)
-
-            macd_values.append(ema_fast - ema_slow)
-
-        if len(macd_values) < self.macd_signal:
-            return result
-
-        # Calculate signal line (EMA of MACD)
-        signal = self._calc_ema(macd_values, self.macd_signal)
-
-        if signal is None:
-            return result
-
-        macd_line = macd_values[-1] if macd_values else 0
-        histogram = macd_line - signal
-
-        return {
-            "macd": round(macd_line, 8),
-            "signal": round(signal, 8),
-            "histogram": round(histogram, 8),
-        }
-
-    # ==================== ATR (Average True Range) ====================
-
-    def _calc_atr(
+        results = [TechnicalIndicators() for _ in klines_list]
+        by_length: dict[int, list[int]] = {}
+        for i, klines in enumerate(klines_list):
+            if klines:
+                by_length.setdefault(len(klines), []).append(i)
+
+        for indices in by_length.values():
+            rows = np.stack(
+                [KlineSeries.coerce(klines_list[i]).values for i in indices]
+            )
+            stacked = self._series(
+                *(np.ascontiguousarray(rows[..., j]) for j in (4, 2, 3, 5)),
+                exact=True,
+            )
+            for row, i in enumerate(indices):
+                results[i] = stacked.row(row).latest()
+        return results
+
+    def _series(
         self,
-        highs: list[float],
-        lows: list[float],
-        closes: list[float],
-    ) -> Optional[float]:
-        """
-        Calculate Average True Range.
-
-        True Range = max(
-            high - low,
-            abs(high - previous_close),
-            abs(low - previous_close)
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray,
+        exact: bool = False,
+    ) -> IndicatorSeries:
+        """Indicator arrays for 1-D (one series) or 2-D (series x time) input"""
+        # Skip disabled indicators (period=0)
+        return IndicatorSeries(
+            ema={p: series.ema(closes, p, exact) for p in self.ema_periods},
+            sma={p: series.sma(closes, p) for p in self.sma_periods},
+            rsi=(
+                series.rsi(closes, self.rsi_period, exact)
+                if self.rsi_period > 0
+                else None
+            ),
+            macd=series.macd(
+                closes, self.macd_fast, self.macd_slow, self.macd_signal, exact
+            ),
+            atr=(
+                series.atr(highs, lows, closes, self.atr_period, exact)
+                if self.atr_period > 0
+                else None
+            ),
+            bollinger=series.bollinger(
+                closes, self.bollinger_period, self.bollinger_std
+            ),
+            volume_sma=series.sma(volumes, self.bollinger_period),
         )
 
-        ATR = EMA or SMA of True Range
-        """
-        period = self.atr_period
-
-        if len(closes) < period + 1:
-            return None
-
-        # Calculate True Range for each period
-        true_ranges = []
-        for i in range(1, len(closes)):
-            high_low = highs[i] - lows[i]
-            high_close = abs(highs[i] - closes[i - 1])
-            low_close = abs(lows[i] - closes[i - 1])
-
-            tr = max(high_low, high_close, low_close)
-            true_ranges.append(tr)
-
-        if len(true_ranges) < period:
-            return None
-
-        # Calculate ATR using Wilder's smoothing
-        atr = sum(true_ranges[:period]) / period
-
-        for tr in true_ranges[period:]:
-            atr = (atr * (period - 1) + tr) / period
-
-        return round(atr, 8)
-
-    # ==================== Bollinger Bands ====================
-
-    def _calc_bollinger(self, closes: list[float]) -> dict[str, float]:
-        """
-        Calculate Bollinger Bands.
-
-        Middle Band = SMA(period)
-        Upper Band = Middle Band + (std_dev * multiplier)
-        Lower Band = Middle Band - (std_dev * multiplier)
-        """
-        result = {"upper": 0.0, "middle": 0.0, "lower": 0.0}
-
-        period = self.bollinger_period
-        multiplier = self.bollinger_std
-
-        if len(closes) < period:
-            return result
-
-        # Calculate SMA (middle band)
-        recent_closes = closes[-period:]
-        middle = sum(recent_closes) / period
-
-        # Calculate standard deviation
-        variance = sum((x - middle) ** 2 for x in recent_closes) / period
-        std_dev = variance**0.5
-
-        upper = middle + (std_dev * multiplier)
-        lower = middle - (std_dev * multiplier)
-
-        return {
-            "upper": round(upper, 8),
-            "middle": round(middle, 8),
-            "lower": round(lower, 8),
-        }
-
     # ==================== Additional Utilities ====================
 
     def calculate_trend_strength(
         self,
-        klines: list[OHLCV],
+        klines: Sequence[OHLCV],
         period: int = 20,
     ) -> Optional[float]:
         """
@@ -360,36 +204,18 @@ class IndicatorCalculator:
         if len(klines) < period + 1:
             return None
 
-        closes = [k.close for k in klines]
-        highs = [k.high for k in klines]
-        lows = [k.low for k in klines]
-
-        # Calculate directional movement
-        plus_dm = []
-        minus_dm = []
-
-        for i in range(1, len(klines)):
-            up_move = highs[i] - highs[i - 1]
-            down_move = lows[i - 1] - lows[i]
-
-            if up_move > down_move and up_move > 0:
-                plus_dm.append(up_move)
-            else:
-                plus_dm.append(0)
-
-            if down_move > up_move and down_move > 0:
-                minus_dm.append(down_move)
-            else:
-                minus_dm.append(0)
+        klines = KlineSeries.coerce(klines)
+        highs, lows, closes = klines.highs, klines.lows, klines.closes
 
         # Calculate ATR
-        atr = self._calc_atr(highs, lows, closes)
+        atr = latest_value(series.atr(highs, lows, closes, self.atr_period))
         if atr is None or atr == 0:
             return None
 
         # Smooth directional movement
-        smooth_plus = sum(plus_dm[-period:]) / period
-        smooth_minus = sum(minus_dm[-period:]) / period
+        plus_dm, minus_dm = series.directional_movement(highs, lows)
+        smooth_plus = sum(plus_dm[-period:].tolist()) / period
+        smooth_minus = sum(minus_dm[-period:].tolist()) / period
 
         # Calculate directional indicators
         plus_di = (smooth_plus / atr) * 100
@@ -406,19 +232,21 @@ class IndicatorCalculator:
 
     def identify_support_resistance(
         self,
-        klines: list[OHLCV],
+        klines: Sequence[OHLCV],
         lookback: int = 20,
         threshold: float = 0.02,
+        window: int = 1,
     ) -> dict[str, list[float]]:
         """
         Identify support and resistance levels.
 
-        Uses local minima/maxima within lookback period.
+        Uses local minima/maxima (pivots) within lookback period.
 
         Args:
             klines: K-line data
             lookback: Number of periods to analyze
             threshold: Minimum distance between levels (as ratio)
+            window: Candles on each side a pivot must be extreme over
 
         Returns:
             Dict with 'support' and 'resistance' lists
@@ -426,49 +254,106 @@ class IndicatorCalculator:
         if len(klines) < lookback:
             return {"support": [], "resistance": []}
 
-        recent = klines[-lookback:]
-        current_price = recent[-1].close
+        recent = KlineSeries.coerce(klines)[-lookback:]
+        current_price = float(recent.closes[-1])
+        lows, highs = recent.lows, recent.highs
 
-        supports = []
-        resistances = []
+        supports = _cluster_levels(
+            lows[series.pivot_lows(lows, window)].tolist(), threshold
+        )
+        resistances = _cluster_levels(
+            highs[series.pivot_highs(highs, window)].tolist(), threshold
+        )
 
-        # Find local minima (support) and maxima (resistance)
-        for i in range(1, len(recent) - 1):
-            prev_low = recent[i - 1].low
-            curr_low = recent[i].low
-            next_low = recent[i + 1].low
+        # Only keep supports below price and resistances above
+        below = bisect_left(supports, current_price)
+        above = bisect_right(resistances, current_price)
+        return {
+            "support": supports[max(below - 3, 0) : below][::-1],  # Top 3 nearest
+            "resistance": resistances[above : above + 3],  # Top 3 nearest
+        }
 
-            prev_high = recent[i - 1].high
-            curr_high = recent[i].high
-            next_high = recent[i + 1].high
+    def calculate_structure(self, klines: Sequence[OHLCV]) -> dict:
+        """
+        Support/resistance levels and trend strength with the configured
+        parameters, as ``TechnicalIndicators`` fields.
+        """
+        levels = self.identify_support_resistance(
+            klines, self.sr_lookback, self.sr_threshold, self.sr_pivot_window
+        )
+        return {
+            "support": levels["support"],
+            "resistance": levels["resistance"],
+            "trend_strength": self.calculate_trend_strength(klines, self.trend_period),
+        }
 
-            # Local minimum (support)
-            if curr_low <= prev_low and curr_low <= next_low:
-                supports.append(curr_low)
+    def merge_support_resistance(
+        self,
+        indicators: dict[str, TechnicalIndicators],
+        current_price: float,
+        limit: int = 3,
+    ) -> dict[str, list[dict]]:
+        """
+        Merge the levels of several timeframes.
 
-            # Local maximum (resistance)
-            if curr_high >= prev_high and curr_high >= next_high:
-                resistances.append(curr_high)
+        Levels within ``sr_threshold`` of each other are one level (their
+        mean); a level confirmed by more timeframes is a stronger one.
 
-        # Filter levels too close together
-        def filter_levels(levels: list[float]) -> list[float]:
-            if not levels:
-                return []
+        Args:
+            indicators: Indicators by timeframe
+            current_price: Price splitting supports from resistances
+            limit: Levels kept per side (nearest first)
 
-            levels = sorted(set(levels))
-            filtered = [levels[0]]
+        Returns:
+            Dict with 'support' and 'resistance' lists of
+            {"price": float, "timeframes": [str, ...]}
+        """
+        result: dict[str, list[dict]] = {"support": [], "resistance": []}
+        if current_price <= 0:
+            return result
 
-            for level in levels[1:]:
-                if abs(level - filtered[-1]) / filtered[-1] > threshold:
-                    filtered.append(level)
+        for side in result:
+            tagged = sorted(
+                (level, tf)
+                for tf, ind in indicators.items()
+                for level in getattr(ind, side)
+            )
+            clusters: list[tuple[list[float], set[str]]] = []
+            for level, tf in tagged:
+                anchor = clusters[-1][0][0] if clusters else None
+                if anchor and abs(level - anchor) / anchor <= self.sr_threshold:
+                    clusters[-1][0].append(level)
+                    clusters[-1][1].add(tf)
+                else:
+                    clusters.append(([level], {tf}))
+
+            merged = [
+                {
+                    "price": round(sum(levels) / len(levels), 8),
+                    "timeframes": [tf for tf in indicators if tf in tfs],
+                }
+                for levels, tfs in clusters
+            ]
+            prices = [level["price"] for level in merged]
+            if side == "support":
+                end = bisect_left(prices, current_price)
+                result[side] = merged[max(end - limit, 0) : end][::-1]
+            else:
+                begin = bisect_right(prices, current_price)
+                result[side] = merged[begin : begin + limit]
+        return result
 
-            return filtered
 
-        # Only keep supports below price and resistances above
-        supports = [s for s in filter_levels(supports) if s < current_price]
-        resistances = [r for r in filter_levels(resistances) if r > current_price]
+def _cluster_levels(levels: list[float], threshold: float) -> list[float]:
+    """Sorted distinct levels, dropping any within ``threshold`` of the last kept"""
+    if not levels:
+        return []
 
-        return {
-            "support": sorted(supports, reverse=True)[:3],  # Top 3 nearest
-            "resistance": sorted(resistances)[:3],  # Top 3 nearest
-        }
+    levels = sorted(set(levels))
+    filtered = [levels[0]]
+
+    for level in levels[1:]:
+        if abs(level - filtered[-1]) / filtered[-1] > threshold:
+            filtered.append(level)
+
+    return filtered
@@ -0,0 +1,456 @@
+"""
+Full-series technical indicators.
+
+Each function returns an array aligned with its input where index ``i`` is
+the indicator value computed from data up to and including ``i``; entries
+before the warm-up period are NaN.  ``IndicatorCalculator.calculate_series``
+bundles them into an ``IndicatorSeries`` for charts, backtests and
+screening, and the scalar ``IndicatorCalculator.calculate`` is the rounded
+last element of the exact series.
+
+- Windowed indicators (SMA, Bollinger Bands, volume SMA) are computed for
+  every window at once.  Each window is still summed left to right, one
+  column per step, so a value does not depend on the candles before its
+  window and equals a plain ``sum(window)``.
+- Recursive indicators (EMA, Wilder RSI / ATR, MACD) are first-order
+  recurrences ``y = x * gain + y_prev * decay``.  By default they are
+  evaluated in closed form over blocks of candles (a scaled cumulative sum
+  per block, then one carry step per block), with differences, gains and
+  true ranges prepared vectorized.  Blocks are sized so ``decay ** -block``
+  stays below ``2 ** 10``; values agree with the sequential recurrence
+  within ``RECURRENCE_RTOL`` of their magnitude (differences such as the
+  MACD histogram: of the price magnitude).
+- ``exact=True`` runs the recurrence one candle at a time instead, which is
+  bit-for-bit what ``IndicatorState`` ingestion produces.  The scalar
+  ``IndicatorCalculator.calculate`` and the indicator stream use it so their
+  rounded values never differ from incrementally updated ones.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..models.market_context import TechnicalIndicators
+
+# Relative tolerance of the blocked recurrences against the sequential ones
+RECURRENCE_RTOL = 1e-12
+
+# Largest factor a block's scaled cumulative sum may grow by (2 ** 10)
+_BLOCK_GROWTH_LOG = 10 * math.log(2)
+
+
+def _as_float_array(data) -> np.ndarray:
+    return np.asarray(data, dtype=np.float64)
+
+
+def _head_sum(x: np.ndarray, period: int):
+    """Sum of the first ``period`` values along the last axis, left to right"""
+    if x.ndim == 1:
+        return sum(x[:period].tolist())
+    total = x[:, 0].copy()
+    for j in range(1, period):
+        total += x[:, j]
+    return total
+
+
+def _window_sums(x: np.ndarray, period: int) -> np.ndarray:
+    """Sum of every trailing window of ``period`` values, added left to right"""
+    windows = sliding_window_view(x, period, axis=-1)
+    total = windows[..., 0].copy()
+    for j in range(1, period):
+        total += windows[..., j]
+    return total
+
+
+def _ema_recurrence(values: np.ndarray, seed, k: float) -> np.ndarray:
+    """``y = x * k + y_prev * (1 - k)`` from ``seed`` along the last axis"""
+    decay = 1 - k
+    if values.ndim == 1:
+        result = []
+        append = result.append
+        y = seed
+        for x in values.tolist():
+            y = x * k + y * decay
+            append(y)
+        return np.array(result, dtype=np.float64)
+
+    out = np.empty_like(values)
+    y = seed
+    for t in range(values.shape[-1]):
+        y = values[:, t] * k + y * decay
+        out[:, t] = y
+    return out
+
+
+def _wilder_recurrence(values: np.ndarray, seed, period: int) -> np.ndarray:
+    """``y = (y_prev * (period - 1) + x) / period`` from ``seed``"""
+    keep = period - 1
+    if values.ndim == 1:
+        result = []
+        append = result.append
+        y = seed
+        for x in values.tolist():
+            y = (y * keep + x) / period
+            append(y)
+        return np.array(result, dtype=np.float64)
+
+    out = np.empty_like(values)
+    y = seed
+    for t in range(values.shape[-1]):
+        y = (y * keep + values[:, t]) / period
+        out[:, t] = y
+    return out
+
+
+def _blocked_recurrence(values: np.ndarray, seed, decay: float, gain: float):
+    """
+    ``y = x * gain + y_prev * decay`` from ``seed`` along the last axis,
+    in closed form per block.
+
+    Within a block starting after ``y0``,
+    ``y_i = decay ** (i + 1) * y0 + gain * decay ** i * cumsum(x_j / decay ** j)``,
+    so only one carry per block is sequential.
+    """
+    if decay <= 0:
+        return values * gain
+    n = values.shape[-1]
+    block = max(1, min(n, int(_BLOCK_GROWTH_LOG / -math.log(decay))))
+    blocks = -(-n // block)
+    pad = blocks * block - n
+    if pad:
+        padding = np.zeros(values.shape[:-1] + (pad,))
+        values = np.concatenate([values, padding], axis=-1)
+    x = values.reshape(values.shape[:-1] + (blocks, block))
+
+    powers = decay ** np.arange(block)
+    local = np.cumsum(x * (gain / powers), axis=-1) * powers
+    ends = local[..., -1]
+    step = decay**block
+    starts = np.empty_like(ends)
+    if ends.ndim == 1:
+        y = float(seed)
+        carries = []
+        for end in ends.tolist():
+            carries.append(y)
+            y = end + y * step
+        starts[:] = carries
+    else:
+        y = seed
+        for b in range(blocks):
+            starts[..., b] = y
+            y = ends[..., b] + y * step
+    local += np.expand_dims(starts, -1) * (powers * decay)
+    return local.reshape(values.shape)[..., :n]
+
+
+def _ema_values(values: np.ndarray, seed, period: int, exact: bool) -> np.ndarray:
+    k = 2 / (period + 1)
+    if exact:
+        return _ema_recurrence(values, seed, k)
+    return _blocked_recurrence(values, seed, 1 - k, k)
+
+
+def sma(data, period: int) -> np.ndarray:
+    """Simple moving average over a trailing window of ``period`` values"""
+    x = _as_float_array(data)
+    out = np.full(x.shape, np.nan)
+    if period <= 0 or x.shape[-1] < period:
+        return out
+    out[..., period - 1 :] = _window_sums(x, period) / period
+    return out
+
+
+def ema(data, period: int, exact: bool = False) -> np.ndarray:
+    """
+    Exponential moving average seeded with the SMA of the first ``period``
+    values (``EMA = price * k + EMA_prev * (1 - k)``, ``k = 2 / (period + 1)``).
+    """
+    x = _as_float_array(data)
+    out = np.full(x.shape, np.nan)
+    if period <= 0 or x.shape[-1] < period:
+        return out
+
+    seed = _head_sum(x, period) / period
+    out[..., period - 1] = seed
+    out[..., period:] = _ema_values(x[..., period:], seed, period, exact)
+    return out
+
+
+def wilder_average(data, period: int, exact: bool = False) -> np.ndarray:
+    """Wilder-smoothed average seeded with the SMA of the first ``period`` values"""
+    x = _as_float_array(data)
+    out = np.full(x.shape, np.nan)
+    if period <= 0 or x.shape[-1] < period:
+        return out
+
+    seed = _head_sum(x, period) / period
+    out[..., period - 1] = seed
+    if exact:
+        out[..., period:] = _wilder_recurrence(x[..., period:], seed, period)
+    else:
+        out[..., period:] = _blocked_recurrence(
+            x[..., period:], seed, (period - 1) / period, 1 / period
+        )
+    return out
+
+
+def gains_losses(closes) -> tuple[np.ndarray, np.ndarray]:
+    """Close-to-close gains and losses (both positive), one per change"""
+    changes = np.diff(_as_float_array(closes))
+    return np.maximum(changes, 0.0), np.maximum(-changes, 0.0)
+
+
+def rsi(closes, period: int = 14, exact: bool = False) -> np.ndarray:
+    """Relative Strength Index with Wilder's smoothing"""
+    x = _as_float_array(closes)
+    out = np.full(x.shape, np.nan)
+    if period <= 0 or x.shape[-1] < period + 1:
+        return out
+
+    gains, losses = gains_losses(x)
+    avg_gain = wilder_average(gains, period, exact)
+    avg_loss = wilder_average(losses, period, exact)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[..., 1:] = np.where(
+            avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss))
+        )
+    return out
+
+
+def macd_emas(
+    closes, fast: int = 12, slow: int = 26, exact: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fast and slow EMAs behind the MACD line, from index ``slow`` on.
+
+    Both are seeded with their SMA; the fast EMA only starts advancing at
+    index ``max(fast, slow)``.
+    """
+    x = _as_float_array(closes)
+    fast_ema = np.full(x.shape, np.nan)
+    slow_ema = np.full(x.shape, np.nan)
+    n = x.shape[-1]
+    if fast <= 0 or slow <= 0 or n < max(fast, slow):
+        return fast_ema, slow_ema
+
+    start = max(fast, slow)
+    seed_fast = _head_sum(x, fast) / fast
+    seed_slow = _head_sum(x, slow) / slow
+    fast_ema[..., slow:start] = np.expand_dims(seed_fast, -1)
+    fast_ema[..., start:] = _ema_values(x[..., start:], seed_fast, fast, exact)
+    slow_ema[..., slow:] = _ema_values(x[..., slow:], seed_slow, slow, exact)
+    return fast_ema, slow_ema
+
+
+def macd(
+    closes, fast: int = 12, slow: int = 26, signal: int = 9, exact: bool = False
+) -> dict[str, np.ndarray]:
+    """
+    MACD line, signal line and histogram.
+
+    The MACD line (see ``macd_emas``) starts at index ``slow``; the signal
+    line is an EMA of the MACD line.
+    """
+    x = _as_float_array(closes)
+    line = np.full(x.shape, np.nan)
+    sig = np.full(x.shape, np.nan)
+    if fast <= 0 or slow <= 0 or x.shape[-1] < max(slow, fast) + signal:
+        return {"macd": line, "signal": sig, "histogram": np.full(x.shape, np.nan)}
+
+    fast_ema, slow_ema = macd_emas(x, fast, slow, exact)
+    line = fast_ema - slow_ema
+    sig[..., slow:] = ema(line[..., slow:], signal, exact)
+    return {"macd": line, "signal": sig, "histogram": line - sig}
+
+
+def true_range(highs, lows, closes) -> np.ndarray:
+    """True range; index 0 is NaN because it needs a previous close"""
+    h = _as_float_array(highs)
+    lo = _as_float_array(lows)
+    c = _as_float_array(closes)
+    out = np.full(c.shape, np.nan)
+    if c.shape[-1] < 2:
+        return out
+    prev = c[..., :-1]
+    h, lo = h[..., 1:], lo[..., 1:]
+    out[..., 1:] = np.maximum(h - lo, np.maximum(np.abs(h - prev), np.abs(lo - prev)))
+    return out
+
+
+def atr(highs, lows, closes, period: int = 14, exact: bool = False) -> np.ndarray:
+    """Average True Range with Wilder's smoothing"""
+    tr = true_range(highs, lows, closes)
+    out = np.full(tr.shape, np.nan)
+    if period <= 0 or tr.shape[-1] < period + 1:
+        return out
+    out[..., 1:] = wilder_average(tr[..., 1:], period, exact)
+    return out
+
+
+def bollinger(closes, period: int = 20, num_std: float = 2.0) -> dict[str, np.ndarray]:
+    """Bollinger bands (SMA middle band, population standard deviation)"""
+    x = _as_float_array(closes)
+    upper = np.full(x.shape, np.nan)
+    middle = np.full(x.shape, np.nan)
+    lower = np.full(x.shape, np.nan)
+    if period <= 0 or x.shape[-1] < period:
+        return {"upper": upper, "middle": middle, "lower": lower}
+
+    windows = sliding_window_view(x, period, axis=-1)
+    mean = _window_sums(x, period) / period
+    deviation = windows[..., 0] - mean
+    variance = deviation * deviation
+    for j in range(1, period):
+        deviation = windows[..., j] - mean
+        variance += deviation * deviation
+    std = np.sqrt(variance / period)
+    middle[..., period - 1 :] = mean
+    upper[..., period - 1 :] = mean + std * num_std
+    lower[..., period - 1 :] = mean - std * num_std
+    return {"upper": upper, "middle": middle, "lower": lower}
+
+
+# ==================== Market Structure ====================
+
+
+def directional_movement(highs, lows) -> tuple[np.ndarray, np.ndarray]:
+    """+DM and -DM between consecutive candles (one element shorter)"""
+    h = _as_float_array(highs)
+    lo = _as_float_array(lows)
+    up = np.diff(h, axis=-1)
+    down = -np.diff(lo, axis=-1)
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    return plus_dm, minus_dm
+
+
+def _pivots(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    out = np.zeros(x.shape, dtype=bool)
+    span = 2 * window + 1
+    if window <= 0 or x.shape[-1] < span:
+        return out
+    extreme = reduce(sliding_window_view(x, span, axis=-1), axis=-1)
+    out[..., window:-window] = x[..., window:-window] == extreme
+    return out
+
+
+def pivot_lows(lows, window: int = 1) -> np.ndarray:
+    """
+    True where a low is <= every low within ``window`` candles on either
+    side (the first and last ``window`` candles are never pivots).
+    """
+    return _pivots(_as_float_array(lows), window, np.min)
+
+
+def pivot_highs(highs, window: int = 1) -> np.ndarray:
+    """True where a high is >= every high within ``window`` candles on either side"""
+    return _pivots(_as_float_array(highs), window, np.max)
+
+
+# ==================== Bundled Series ====================
+
+
+def latest_value(values: Optional[np.ndarray], ndigits: int = 8) -> Optional[float]:
+    """Rounded last element of a series (None while still warming up)"""
+    if values is None or not len(values):
+        return None
+    value = float(values[-1])
+    if math.isnan(value):
+        return None
+    return round(value, ndigits)
+
+
+def _to_list(values: np.ndarray) -> list[Optional[float]]:
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+@dataclass
+class IndicatorSeries:
+    """
+    Every configured indicator over a whole K-line list.
+
+    Arrays are aligned with ``timestamps``.  Disabled indicators are None
+    (RSI, ATR, volume SMA) or all-NaN (MACD, Bollinger Bands).  A batch of
+    equal-length series holds 2-D (series x time) arrays; ``row`` picks one.
+    """
+
+    timestamps: list[datetime] = field(default_factory=list)
+    ema: dict[int, np.ndarray] = field(default_factory=dict)
+    sma: dict[int, np.ndarray] = field(default_factory=dict)
+    rsi: Optional[np.ndarray] = None
+    macd: dict[str, np.ndarray] = field(default_factory=dict)
+    atr: Optional[np.ndarray] = None
+    bollinger: dict[str, np.ndarray] = field(default_factory=dict)
+    volume_sma: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def row(self, index: int) -> "IndicatorSeries":
+        """One series of a 2-D (series x time) batch"""
+
+        def pick(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return None if values is None else values[index]
+
+        return IndicatorSeries(
+            ema={p: v[index] for p, v in self.ema.items()},
+            sma={p: v[index] for p, v in self.sma.items()},
+            rsi=pick(self.rsi),
+            macd={k: v[index] for k, v in self.macd.items()},
+            atr=pick(self.atr),
+            bollinger={k: v[index] for k, v in self.bollinger.items()},
+            volume_sma=pick(self.volume_sma),
+        )
+
+    def latest(self) -> TechnicalIndicators:
+        """Values at the newest candle, rounded like ``IndicatorCalculator``"""
+        ema = {
+            p: v for p, arr in self.ema.items() if (v := latest_value(arr)) is not None
+        }
+        sma = {
+            p: v for p, arr in self.sma.items() if (v := latest_value(arr)) is not None
+        }
+
+        macd = {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
+        signal = latest_value(self.macd.get("signal"))
+        if signal is not None:
+            line = float(self.macd["macd"][-1])
+            # The histogram is taken against the rounded signal line
+            macd = {
+                "macd": round(line, 8),
+                "signal": signal,
+                "histogram": round(line - signal, 8),
+            }
+
+        bollinger = {"upper": 0.0, "middle": 0.0, "lower": 0.0}
+        if latest_value(self.bollinger.get("middle")) is not None:
+            bollinger = {k: latest_value(v) for k, v in self.bollinger.items()}
+
+        return TechnicalIndicators(
+            ema=ema,
+            sma=sma,
+            rsi=latest_value(self.rsi, 2),
+            macd=macd,
+            atr=latest_value(self.atr),
+            bollinger=bollinger,
+            volume_sma=latest_value(self.volume_sma),
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-ready lists for charts (NaN warm-up values become None)"""
+        return {
+            "timestamps": [t.isoformat() for t in self.timestamps],
+            "ema": {p: _to_list(v) for p, v in self.ema.items()},
+            "sma": {p: _to_list(v) for p, v in self.sma.items()},
+            "rsi": _to_list(self.rsi) if self.rsi is not None else None,
+            "macd": {k: _to_list(v) for k, v in self.macd.items()},
+            "atr": _to_list(self.atr) if self.atr is not None else None,
+            "bollinger": {k: _to_list(v) for k, v in self.bollinger.items()},
+            "volume_sma": (
+                _to_list(self.volume_sma) if self.volume_sma is not None else None
+            ),
+        }
@@ -0,0 +1,597 @@
+"""
+Streaming technical indicators.
+
+``IndicatorCalculator.calculate`` recomputes every indicator over the whole
+K-line list on each call.  ``StreamingIndicatorEngine`` instead keeps one
+``IndicatorState`` per (exchange, symbol, timeframe) and feeds it only the
+candles that closed since the previous call:
+
+- EMA, Wilder RSI / ATR and MACD (including its signal EMA) advance their
+  recursions in O(1) per candle
+- SMA, Bollinger Bands and volume SMA read fixed-size trailing windows
+
+Every update follows the same seeding, operation order and rounding as
+``IndicatorCalculator``, so a state's ``indicators()`` equals
+``IndicatorCalculator.calculate`` over all candles the state has ingested,
+bit for bit.  Window sums are re-added over the window rather than kept as
+running totals, which would drift from a fresh ``sum``.
+
+The newest K-line of a fetch is treated as still forming: it is applied to a
+copy of the state and ingested for real once a newer candle arrives.
+
+Each state is anchored at the first candle of the fetch it was built from
+and follows the series from there, while fetches keep sliding forward:
+
+- Its values equal ``IndicatorCalculator.calculate`` over the candles from
+  the anchor to now, bit for bit.  Trailing-window indicators (SMA,
+  Bollinger Bands, volume SMA) match a calculation over the fetched window
+  exactly; the EMA / Wilder / MACD recursions differ from it only in where
+  they were seeded, a difference that decays by ``1 - k`` per candle.
+  Exact equality with a fresh calculation over every sliding window would
+  need a rebuild per closed candle, which is what this module avoids.
+- Once the state spans ``ANCHOR_SPAN`` times the fetched window it is
+  rebuilt from the current fetch (a new anchor), so its history stays
+  bounded and a rebuild costs O(window) once per ``window`` candles.
+
+The state is also rebuilt when the new candles do not continue the stored
+series (a gap, a revised candle or an older list).
+
+``update_batch`` handles many symbols of one timeframe: the states to
+rebuild (every series on a cold start) are restored together from 2-D
+indicator arrays rather than candle by candle.
+"""
+
+import json
+import logging
+import math
+import re
+import sys
+import threading
+from collections import deque
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, Optional
+
+import numpy as np
+
+from ..models.market_context import TechnicalIndicators
+from ..traders.base import OHLCV, KlineSeries
+from . import indicator_series as series
+from .indicator_calculator import IndicatorCalculator
+from .lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Smallest group of equal-length series worth restoring from 2-D arrays;
+# below it, per-candle ingestion is cheaper than the per-step NumPy overhead
+RESTORE_MIN_SERIES = 10
+
+# A state is re-anchored once it spans this many times the fetched window
+ANCHOR_SPAN = 2
+
+_TIMEFRAME_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+_TIMEFRAME_RE = re.compile(r"^(\d+)([mhdw])$")
+
+
+def timeframe_seconds(timeframe: str) -> Optional[int]:
+    """Length of a timeframe such as "15m" or "4h" in seconds (None if unknown)"""
+    match = _TIMEFRAME_RE.match(timeframe)
+    if not match:
+        return None
+    return int(match.group(1)) * _TIMEFRAME_UNITS[match.group(2)]
+
+
+class _Wilder:
+    """Wilder-smoothed average seeded with the SMA of the first ``period`` values"""
+
+    __slots__ = ("period", "seed", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.seed: list[float] = []
+        self.value: Optional[float] = None
+
+    def push(self, x: float) -> None:
+        if self.value is not None:
+            self.value = (self.value * (self.period - 1) + x) / self.period
+        else:
+            self.seed.append(x)
+            if len(self.seed) == self.period:
+                self.value = sum(self.seed) / self.period
+                self.seed = []
+
+    def copy(self) -> "_Wilder":
+        other = _Wilder(self.period)
+        other.seed = list(self.seed)
+        other.value = self.value
+        return other
+
+
+class IndicatorState:
+    """
+    Incremental indicator state of one K-line series.
+
+    Usage:
+        state = IndicatorState(calculator)
+        for candle in closed_candles:
+            state.ingest(candle)
+        indicators = state.indicators()
+    """
+
+    def __init__(self, calculator: IndicatorCalculator):
+        c = calculator
+        self.calc = c
+        self.count = 0
+        self.last_candle: Optional[OHLCV] = None
+
+        self.ema_periods = [p for p in c.ema_periods if p > 0]
+        self.sma_periods = [p for p in c.sma_periods if p > 0]
+        self.macd_enabled = c.macd_fast > 0 and c.macd_slow > 0
+
+        # First closes, kept until every EMA / MACD seed has been taken
+        seeds = list(self.ema_periods)
+        if self.macd_enabled:
+            seeds += [c.macd_fast, c.macd_slow]
+        self._head_size = max(seeds, default=0)
+        self._head: list[float] = []
+
+        self._ema: dict[int, float] = {}
+        self._ema_k = {p: 2 / (p + 1) for p in self.ema_periods}
+
+        self._gain = _Wilder(c.rsi_period) if c.rsi_period > 0 else None
+        self._loss = _Wilder(c.rsi_period) if c.rsi_period > 0 else None
+        self._atr = _Wilder(c.atr_period) if c.atr_period > 0 else None
+
+        self._macd_fast: Optional[float] = None
+        self._macd_slow: Optional[float] = None
+        self._macd_last: Optional[float] = None
+        self._macd_signal_seed: list[float] = []
+        self._macd_signal: Optional[float] = None
+
+        window = max(self.sma_periods + [c.bollinger_period, 0])
+        self._closes: deque = deque(maxlen=max(window, 1))
+        self._volumes: deque = deque(maxlen=max(c.bollinger_period, 1))
+
+    # ==================== Updates ====================
+
+    def ingest(self, candle: OHLCV) -> None:
+        """Advance every indicator by one closed candle"""
+        close = candle.close
+        prev = self.last_candle
+        i = self.count
+        self.count += 1
+        self.last_candle = candle
+
+        if len(self._head) < self._head_size:
+            self._head.append(close)
+
+        for period in self.ema_periods:
+            if i >= period:
+                k = self._ema_k[period]
+                self._ema[period] = close * k + self._ema[period] * (1 - k)
+            elif i == period - 1:
+                self._ema[period] = sum(self._head[:period]) / period
+
+        if prev is not None:
+            change = close - prev.close
+            if self._gain is not None:
+                self._gain.push(max(0, change))
+                self._loss.push(abs(min(0, change)))
+            if self._atr is not None:
+                self._atr.push(
+                    max(
+                        candle.high - candle.low,
+                        abs(candle.high - prev.close),
+                        abs(candle.low - prev.close),
+                    )
+                )
+
+        if self.macd_enabled:
+            self._advance_macd(i, close)
+
+        self._closes.append(close)
+        self._volumes.append(candle.volume)
+
+    def _advance_macd(self, i: int, close: float) -> None:
+        c = self.calc
+        fast, slow = c.macd_fast, c.macd_slow
+        ready = max(fast, slow)
+        if i < ready - 1:
+            return
+        if i == ready - 1:
+            # Seeds are available; replay MACD points from ``slow`` up to now
+            self._macd_fast = sum(self._head[:fast]) / fast
+            self._macd_slow = sum(self._head[:slow]) / slow
+            for j in range(slow, i + 1):
+                self._macd_step(j, self._head[j])
+            return
+        self._macd_step(i, close)
+
+    def _macd_step(self, i: int, close: float) -> None:
+        c = self.calc
+        k_fast = 2 / (c.macd_fast + 1)
+        k_slow = 2 / (c.macd_slow + 1)
+        if i >= c.macd_fast:
+            self._macd_fast = close * k_fast + self._macd_fast * (1 - k_fast)
+        self._macd_slow = close * k_slow + self._macd_slow * (1 - k_slow)
+        value = self._macd_fast - self._macd_slow
+        self._macd_last = value
+
+        period = c.macd_signal
+        if self._macd_signal is not None:
+            k = 2 / (period + 1)
+            self._macd_signal = value * k + self._macd_signal * (1 - k)
+        else:
+            self._macd_signal_seed.append(value)
+            if len(self._macd_signal_seed) == period:
+                self._macd_signal = sum(self._macd_signal_seed) / period
+                self._macd_signal_seed = []
+
+    @property
+    def warmup(self) -> int:
+        """Candles after which every recursion is seeded (see ``restore_states``)"""
+        c = self.calc
+        sizes = [self._head_size, 1]
+        if self._gain is not None:
+            sizes.append(c.rsi_period + 1)
+        if self._atr is not None:
+            sizes.append(c.atr_period + 1)
+        if self.macd_enabled:
+            if c.macd_signal <= 0:
+                return sys.maxsize
+            sizes.append(max(c.macd_fast, c.macd_slow) + c.macd_signal)
+        return max(sizes)
+
+    def _restore(self, closed: KlineSeries, values: dict) -> None:
+        """Jump to the state after ``closed``, given each recursion's last value"""
+        self.count = len(closed)
+        self.last_candle = closed[-1]
+        closes = closed.closes
+        self._head = closes[: self._head_size].tolist()
+        self._ema = {p: values[f"ema_{p}"] for p in self.ema_periods}
+        if self._gain is not None:
+            self._gain.value = values["gain"]
+            self._loss.value = values["loss"]
+        if self._atr is not None:
+            self._atr.value = values["atr"]
+        if self.macd_enabled:
+            self._macd_fast = values["macd_fast"]
+            self._macd_slow = values["macd_slow"]
+            self._macd_last = values["macd"]
+            self._macd_signal = values["macd_signal"]
+        self._closes.extend(closes[-self._closes.maxlen :].tolist())
+        self._volumes.extend(closed.volumes[-self._volumes.maxlen :].tolist())
+
+    # ==================== Output ====================
+
+    def indicators(self) -> TechnicalIndicators:
+        """Indicators over every candle ingested so far"""
+        c = self.calc
+        if not self.count:
+            return TechnicalIndicators()
+
+        ema = {p: round(self._ema[p], 8) for p in self.ema_periods if p in self._ema}
+        sma = {}
+        for period in self.sma_periods:
+            value = self._window_sma(self._closes, period)
+            if value is not None:
+                sma[period] = value
+
+        rsi = None
+        if self._gain is not None and self.count >= c.rsi_period + 1:
+            avg_gain, avg_loss = self._gain.value, self._loss.value
+            if avg_loss == 0:
+                rsi = 100.0
+            else:
+                rs = avg_gain / avg_loss
+                rsi = round(100 - (100 / (1 + rs)), 2)
+
+        atr = None
+        if self._atr is not None and self.count >= c.atr_period + 1:
+            atr = round(self._atr.value, 8)
+
+        return TechnicalIndicators(
+            ema=ema,
+            sma=sma,
+            rsi=rsi,
+            macd=self._macd_output(),
+            atr=atr,
+            bollinger=self._bollinger(),
+            volume_sma=self._window_sma(self._volumes, c.bollinger_period),
+        )
+
+    def _macd_output(self) -> dict[str, float]:
+        c = self.calc
+        result = {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
+        if not self.macd_enabled:
+            return result
+        if self.count < max(c.macd_slow, c.macd_fast) + c.macd_signal:
+            return result
+        if self._macd_signal is None:
+            return result
+        macd_line = self._macd_last
+        signal = round(self._macd_signal, 8)
+        return {
+            "macd": round(macd_line, 8),
+            "signal": signal,
+            "histogram": round(macd_line - signal, 8),
+        }
+
+    def _bollinger(self) -> dict[str, float]:
+        period = self.calc.bollinger_period
+        if period <= 0 or self.count < period:
+            return {"upper": 0.0, "middle": 0.0, "lower": 0.0}
+        recent = list(islice(self._closes, len(self._closes) - period, None))
+        middle = sum(recent) / period
+        variance = sum((x - middle) * (x - middle) for x in recent) / period
+        std_dev = math.sqrt(variance)
+        multiplier = self.calc.bollinger_std
+        return {
+            "upper": round(middle + (std_dev * multiplier), 8),
+            "middle": round(middle, 8),
+            "lower": round(middle - (std_dev * multiplier), 8),
+        }
+
+    def _window_sma(self, window: deque, period: int) -> Optional[float]:
+        if period <= 0 or self.count < period:
+            return None
+        return round(sum(islice(window, len(window) - period, None)) / period, 8)
+
+    def copy(self) -> "IndicatorState":
+        """Independent copy (used to apply a still-forming candle)"""
+        other = IndicatorState.__new__(IndicatorState)
+        other.__dict__.update(self.__dict__)
+        other._head = list(self._head)
+        other._ema = dict(self._ema)
+        other._gain = self._gain.copy() if self._gain else None
+        other._loss = self._loss.copy() if self._loss else None
+        other._atr = self._atr.copy() if self._atr else None
+        other._macd_signal_seed = list(self._macd_signal_seed)
+        other._closes = deque(self._closes, maxlen=self._closes.maxlen)
+        other._volumes = deque(self._volumes, maxlen=self._volumes.maxlen)
+        return other
+
+
+def restore_states(
+    calculator: IndicatorCalculator,
+    closed_list: list[Sequence[OHLCV]],
+) -> list[IndicatorState]:
+    """
+    States equal to ingesting each K-line list candle by candle.
+
+    When at least ``RESTORE_MIN_SERIES`` lists share a length long enough
+    for every recursion to be seeded, they are stacked into 2-D arrays: the
+    series functions run each recursion for all of them at once and every
+    state is set from the last values.  Other lists are ingested one candle
+    at a time.
+    """
+    states = [IndicatorState(calculator) for _ in closed_list]
+    by_length: dict[int, list[int]] = {}
+    for i, closed in enumerate(closed_list):
+        if closed and len(closed) >= states[i].warmup:
+            by_length.setdefault(len(closed), []).append(i)
+
+    restored: set[int] = set()
+    for indices in by_length.values():
+        if len(indices) < RESTORE_MIN_SERIES:
+            continue
+        packed = [KlineSeries.coerce(closed_list[i]) for i in indices]
+        rows = np.stack([klines.values for klines in packed])
+        closes, highs, lows = (np.ascontiguousarray(rows[..., j]) for j in (4, 2, 3))
+        last = _last_recursion_values(states[indices[0]], closes, highs, lows)
+        for row, i in enumerate(indices):
+            states[i]._restore(
+                packed[row], {name: float(v[row]) for name, v in last.items()}
+            )
+        restored.update(indices)
+
+    for i, closed in enumerate(closed_list):
+        if i not in restored:
+            for candle in closed:
+                states[i].ingest(candle)
+    return states
+
+
+def _last_recursion_values(
+    state: IndicatorState,
+    closes: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Last value of every recursion ``state`` tracks, per row of 2-D input"""
+    c = state.calc
+    values = {
+        f"ema_{p}": series.ema(closes, p, exact=True)[:, -1] for p in state.ema_periods
+    }
+    if state._gain is not None:
+        gains, losses = series.gains_losses(closes)
+        values["gain"] = series.wilder_average(gains, c.rsi_period, exact=True)[:, -1]
+        values["loss"] = series.wilder_average(losses, c.rsi_period, exact=True)[:, -1]
+    if state._atr is not None:
+        values["atr"] = series.atr(highs, lows, closes, c.atr_period, exact=True)[:, -1]
+    if state.macd_enabled:
+        fast, slow = series.macd_emas(closes, c.macd_fast, c.macd_slow, exact=True)
+        line = fast - slow
+        values["macd_fast"] = fast[:, -1]
+        values["macd_slow"] = slow[:, -1]
+        values["macd"] = line[:, -1]
+        signal = series.ema(line[:, c.macd_slow :], c.macd_signal, exact=True)
+        values["macd_signal"] = signal[:, -1]
+    return values
+
+
+class StreamingIndicatorEngine:
+    """
+    Indicator states per (exchange, symbol, timeframe).
+
+    Usage:
+        engine = get_streaming_indicator_engine(config.indicators)
+        indicators = engine.update("binance", "BTC/USDT", "1h", klines)
+
+    ``klines`` is the latest fetch (oldest first); only candles newer than
+    the stored series are ingested, and the series is re-anchored at the
+    fetch once it spans ``ANCHOR_SPAN`` fetch windows.  At most ``max_series`` states are kept,
+    least recently used first out.
+    """
+
+    MAX_SERIES = 4096
+
+    def __init__(
+        self,
+        indicator_config: Optional[dict] = None,
+        max_series: int = MAX_SERIES,
+    ):
+        self.calculator = IndicatorCalculator(indicator_config)
+        self.max_series = max_series
+        # (exchange, symbol, timeframe) -> IndicatorState
+        self._states = LRUCache(max_series)
+        # Updates may come from executor threads (DataAccessLayer batches)
+        self._lock = threading.RLock()
+        self.incremental_updates = 0
+        self.full_recomputes = 0
+        self.candles_ingested = 0
+
+    def update(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        klines: list[OHLCV],
+    ) -> TechnicalIndicators:
+        """Ingest newly closed candles and return the current indicators"""
+        return self.update_batch(exchange, timeframe, {symbol: klines})[symbol]
+
+    def update_batch(
+        self,
+        exchange: str,
+        timeframe: str,
+        klines_by_symbol: dict[str, list[OHLCV]],
+    ) -> dict[str, TechnicalIndicators]:
+        """
+        ``update`` for many symbols of one timeframe.
+
+        Series that need a rebuild are restored together from 2-D arrays
+        (see ``restore_states``) instead of candle by candle.  Safe to call
+        from an executor thread.
+        """
+        results: dict[str, TechnicalIndicators] = {}
+        with self._lock:
+            rebuild: list[str] = []
+            for symbol, klines in klines_by_symbol.items():
+                if not klines:
+                    results[symbol] = TechnicalIndicators()
+                    continue
+                key = (exchange, symbol, timeframe)
+                state = self._states.get(key)
+                new = (
+                    self._new_candles(state, klines[:-1], timeframe) if state else None
+                )
+                if new is None:
+                    rebuild.append(symbol)
+                    continue
+                self.incremental_updates += 1
+                for candle in new:
+                    state.ingest(candle)
+                self.candles_ingested += len(new)
+                results[symbol] = self._store(key, state, klines[-1])
+
+            closed = [klines_by_symbol[symbol][:-1] for symbol in rebuild]
+            states = restore_states(self.calculator, closed)
+            for symbol, candles, state in zip(rebuild, closed, states):
+                self.full_recomputes += 1
+                self.candles_ingested += len(candles)
+                key = (exchange, symbol, timeframe)
+                results[symbol] = self._store(key, state, klines_by_symbol[symbol][-1])
+        return results
+
+    def _store(
+        self, key: tuple[str, str, str], state: IndicatorState, forming: OHLCV
+    ) -> TechnicalIndicators:
+        """Keep ``state`` for the series; indicators including ``forming``"""
+        self._states.put(key, state)
+
+        preview = state.copy()
+        preview.ingest(forming)
+        return preview.indicators()
+
+    @staticmethod
+    def _new_candles(
+        state: IndicatorState, closed: list[OHLCV], timeframe: str
+    ) -> Optional[list[OHLCV]]:
+        """
+        Closed candles that extend the state, or None if the fetch does not
+        continue the stored series or the state is due for a new anchor
+        (rebuild required).
+        """
+        last = state.last_candle
+        if last is None:
+            return None
+
+        # Locate the last ingested candle (it is usually near the end)
+        index = None
+        for i in range(len(closed) - 1, -1, -1):
+            ts = closed[i].timestamp
+            if ts == last.timestamp:
+                index = i
+                break
+            if ts < last.timestamp:
+                break
+        if index is None or closed[index] != last:
+            return None
+
+        new = closed[index + 1 :]
+        if state.count + len(new) > ANCHOR_SPAN * len(closed):
+            return None
+        step = timeframe_seconds(timeframe)
+        if step is not None:
+            prev = last.timestamp
+            for candle in new:
+                if (candle.timestamp - prev).total_seconds() != step:
+                    return None
+                prev = candle.timestamp
+        return new
+
+    def reset(
+        self,
+        exchange: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> int:
+        """
+        Drop stored states.
+
+        Returns:
+            Number of series removed
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._states
+                if (exchange is None or key[0] == exchange)
+                and (symbol is None or key[1] == symbol)
+            ]
+            for key in keys:
+                self._states.pop(key)
+        return len(keys)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "series": len(self._states),
+            "incremental_updates": self.incremental_updates,
+            "full_recomputes": self.full_recomputes,
+            "candles_ingested": self.candles_ingested,
+        }
+
+
+_engines: dict[str, StreamingIndicatorEngine] = {}
+
+
+def get_streaming_indicator_engine(
+    indicator_config: Optional[dict] = None,
+) -> StreamingIndicatorEngine:
+    """Get the process-wide engine for an indicator configuration"""
+    key = json.dumps(indicator_config or {}, sort_keys=True, default=str)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = StreamingIndicatorEngine(indicator_config)
+        _engines[key] = engine
+    return engine
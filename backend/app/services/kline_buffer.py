@@ -0,0 +1,344 @@
+"""
+Rolling K-line buffers.
+
+Re-fetching a whole K-line window (up to ``TIMEFRAME_LIMITS`` candles) every
+time a cached copy expires is wasteful: between two polls only the forming
+candle changed and perhaps one or two new candles opened.
+``KlineBufferStore`` keeps one ``KlineRingBuffer`` per (exchange, symbol,
+timeframe) instead:
+
+- The first request warms the buffer with one full fetch
+- Later refreshes fetch only the candles from the newest buffered one
+  onwards: the still-forming candle is patched in place, newer candles are
+  appended and the oldest fall off the end
+- Any ``limit`` up to the buffer capacity is served from memory, as a
+  ``KlineSeries`` view of the buffer's array (no per-candle objects)
+
+A buffer is refreshed when its cache TTL has elapsed or the newest buffered
+candle has closed.  When a delta fetch does not overlap the buffer (the
+process was idle for longer than the buffer spans) it is warmed again.
+
+Concurrent requests for the same series share one exchange call; a request
+for more candles than a running refresh fetches waits for it and then grows
+the buffer.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from typing import Any, Awaitable, Callable, Optional
+
+import numpy as np
+
+from ..traders.base import OHLCV, KlineSeries
+from .indicator_stream import timeframe_seconds
+from .lru_cache import LRUCache
+from .market_codec import decode_kline_series, encode_klines
+
+logger = logging.getLogger(__name__)
+
+KlineFetcher = Callable[[int], Awaitable[Sequence[OHLCV]]]
+
+
+class KlineRingBuffer:
+    """Newest ``capacity`` candles of one series, oldest first"""
+
+    __slots__ = ("capacity", "step_ms", "fetched_at", "_data", "_utc")
+
+    def __init__(self, capacity: int, timeframe: str):
+        self.capacity = capacity
+        seconds = timeframe_seconds(timeframe)
+        self.step_ms = seconds * 1000 if seconds else None
+        self.fetched_at = 0.0  # Unix time of the last exchange fetch
+        # Rows of [timestamp_ms, open, high, low, close, volume]
+        self._data = np.empty((0, 6))
+        self._utc = False
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def last_open_ms(self) -> Optional[int]:
+        return int(self._data[-1, 0]) if len(self._data) else None
+
+    def replace(self, klines: Sequence[OHLCV], fetched_at: float) -> None:
+        """Fill the buffer from a full fetch"""
+        series = KlineSeries.coerce(klines)
+        data = series.values
+        data = data[np.argsort(data[:, 0], kind="stable")]
+        self._data = data[-self.capacity :]
+        self._utc = series.utc
+        self.fetched_at = fetched_at
+
+    def merge(self, klines: Sequence[OHLCV], fetched_at: float) -> bool:
+        """
+        Patch and extend the buffer with a delta fetch.
+
+        Returns False, leaving the buffer unchanged, when the fetch does not
+        reach back to the newest buffered candle.
+        """
+        if not len(self._data) or not klines:
+            return False
+        delta = KlineSeries.coerce(klines).values
+        delta = delta[np.argsort(delta[:, 0], kind="stable")]
+        last = self._data[-1, 0]
+        if delta[0, 0] > last:
+            return False
+
+        # Revisions of buffered candles (usually the formerly forming one)
+        revised = delta[delta[:, 0] <= last]
+        positions = np.searchsorted(self._data[:, 0], revised[:, 0])
+        known = self._data[positions, 0] == revised[:, 0]
+        data = self._data.copy()
+        data[positions[known]] = revised[known]
+
+        appended = delta[delta[:, 0] > last]
+        if len(appended):
+            data = np.concatenate((data, appended))[-self.capacity :]
+        self._data = data
+        self.fetched_at = fetched_at
+        return True
+
+    def tail(self, limit: int) -> KlineSeries:
+        """The newest ``limit`` candles, oldest first"""
+        skip = max(len(self._data) - limit, 0)
+        return KlineSeries(self._data[skip:], self._utc)
+
+    def is_stale(self, now: float, ttl: int) -> bool:
+        """True if the buffer is older than ``ttl`` or its newest candle closed"""
+        if not len(self._data) or now - self.fetched_at >= ttl:
+            return True
+        return self.step_ms is not None and now * 1000 >= (
+            self.last_open_ms + self.step_ms
+        )
+
+    def delta_limit(self, now: float) -> Optional[int]:
+        """
+        Candles to fetch to reach back to the newest buffered one, or None if
+        a full fetch is needed.
+        """
+        if not len(self._data) or self.step_ms is None:
+            return None
+        elapsed = max(int(now * 1000) - self.last_open_ms, 0)
+        # Newest buffered candle, every candle opened since, one spare for
+        # clock skew between us and the exchange
+        limit = elapsed // self.step_ms + 2
+        return limit if limit < self.capacity else None
+
+
+class KlineBufferStore:
+    """
+    K-line ring buffers per (exchange, symbol, timeframe).
+
+    Usage:
+        buffers = get_kline_buffers()
+        klines = await buffers.get_klines(
+            "binance", "BTC/USDT", "1h", limit=168, ttl=1800,
+            fetch=lambda n: trader.get_klines("BTC/USDT", "1h", n),
+        )
+
+    At most ``max_series`` buffers are kept, least recently used first out.
+    """
+
+    MAX_SERIES = 4096
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        self.max_series = max_series
+        # (exchange, symbol, timeframe) -> KlineRingBuffer
+        self._buffers = LRUCache(max_series)
+        # key -> (refresh task, capacity it fetches)
+        self._inflight: dict[tuple[str, str, str], tuple[asyncio.Future, int]] = {}
+
+        # Metrics
+        self.memory_hits = 0
+        self.full_fetches = 0
+        self.delta_fetches = 0
+        self.candles_fetched = 0
+
+    async def get_klines(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        ttl: int,
+        fetch: KlineFetcher,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+        redis_key: Optional[str] = None,
+    ) -> Sequence[OHLCV]:
+        """
+        The newest ``limit`` candles of a series, oldest first, as a
+        ``KlineSeries`` view of the buffer.
+
+        Args:
+            exchange: Exchange name (part of the buffer key)
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            limit: Number of candles wanted
+            ttl: Seconds before a refresh of the forming candle
+            fetch: Async callable fetching the newest ``n`` candles
+            redis_getter: Async callable returning the Redis service; buffers
+                          are snapshotted there for other worker processes
+                          (None = in-process only)
+            redis_key: Key of the Redis snapshot
+        """
+        key = (exchange, symbol, timeframe)
+        buffer = self._buffers.get(key)
+        if (
+            buffer is not None
+            and buffer.capacity >= limit
+            and not buffer.is_stale(time.time(), ttl)
+        ):
+            self.memory_hits += 1
+            return buffer.tail(limit)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[1] < limit:
+            # A refresh sized for fewer candles is running: let it land,
+            # then grow the buffer from there
+            await asyncio.shield(inflight[0])
+            return await self.get_klines(
+                exchange, symbol, timeframe, limit, ttl, fetch, redis_getter, redis_key
+            )
+        if inflight is None:
+            task = asyncio.ensure_future(
+                self._refresh(key, limit, ttl, fetch, redis_getter, redis_key)
+            )
+            inflight = (task, limit)
+            self._inflight[key] = inflight
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        buffer = await asyncio.shield(inflight[0])
+        return buffer.tail(limit) if buffer is not None else KlineSeries([])
+
+    async def _refresh(
+        self,
+        key: tuple[str, str, str],
+        limit: int,
+        ttl: int,
+        fetch: KlineFetcher,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]],
+        redis_key: Optional[str],
+    ) -> Optional[KlineRingBuffer]:
+        buffer = self._buffers.get(key)
+        full = False
+        if buffer is None:
+            buffer = KlineRingBuffer(limit, key[2])
+            if redis_getter is not None and redis_key:
+                await self._load_snapshot(buffer, redis_getter, redis_key)
+                if len(buffer) and not buffer.is_stale(time.time(), ttl):
+                    self._store(key, buffer)
+                    return buffer
+        elif buffer.capacity < limit:
+            # Grow: older candles than the buffer holds are needed
+            buffer = KlineRingBuffer(limit, key[2])
+            full = True
+
+        now = time.time()
+        delta = None if full else buffer.delta_limit(now)
+        merged = False
+        if delta is not None:
+            klines = await fetch(delta)
+            self.delta_fetches += 1
+            self.candles_fetched += len(klines)
+            if not klines:
+                # Exchange unavailable: keep serving the buffered candles
+                self._store(key, buffer)
+                return buffer
+            merged = buffer.merge(klines, now)
+
+        if not merged:
+            klines = await fetch(buffer.capacity)
+            self.full_fetches += 1
+            self.candles_fetched += len(klines)
+            if not klines:
+                if len(buffer):
+                    self._store(key, buffer)
+                    return buffer
+                return self._buffers.get(key)
+            buffer.replace(klines, now)
+
+        self._store(key, buffer)
+        if redis_getter is not None and redis_key:
+            await self._save_snapshot(buffer, ttl, redis_getter, redis_key)
+        return buffer
+
+    def _store(self, key: tuple[str, str, str], buffer: KlineRingBuffer) -> None:
+        self._buffers.put(key, buffer)
+
+    @staticmethod
+    async def _load_snapshot(
+        buffer: KlineRingBuffer,
+        redis_getter: Callable[[], Awaitable[Any]],
+        redis_key: str,
+    ) -> None:
+        try:
+            redis = await redis_getter()
+            raw = await redis.get_bytes(redis_key)
+            if raw:
+                klines, fetched_at = decode_kline_series(raw)
+                buffer.replace(klines, fetched_at)
+        except Exception as e:
+            logger.debug(f"Kline snapshot read failed for {redis_key}: {e}")
+
+    @staticmethod
+    async def _save_snapshot(
+        buffer: KlineRingBuffer,
+        ttl: int,
+        redis_getter: Callable[[], Awaitable[Any]],
+        redis_key: str,
+    ) -> None:
+        try:
+            redis = await redis_getter()
+            snapshot = encode_klines(buffer.tail(buffer.capacity), buffer.fetched_at)
+            # Freshness is judged by fetched_at; the snapshot stays useful as
+            # a delta base for as long as the window it covers
+            if buffer.step_ms:
+                ttl = max(ttl, buffer.capacity * buffer.step_ms // 1000)
+            await redis.set_bytes(redis_key, snapshot, ttl=ttl)
+        except Exception as e:
+            logger.debug(f"Failed to cache klines for {redis_key}: {e}")
+
+    def reset(
+        self,
+        exchange: Optional[str] = None,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+    ) -> int:
+        """
+        Drop buffers.
+
+        Returns:
+            Number of buffers removed
+        """
+        keys = [
+            key
+            for key in self._buffers
+            if (exchange is None or key[0] == exchange)
+            and (symbol is None or key[1] == symbol)
+            and (timeframe is None or key[2] == timeframe)
+        ]
+        for key in keys:
+            self._buffers.pop(key)
+        return len(keys)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "series": len(self._buffers),
+            "memory_hits": self.memory_hits,
+            "full_fetches": self.full_fetches,
+            "delta_fetches": self.delta_fetches,
+            "candles_fetched": self.candles_fetched,
+        }
+
+
+# Process-wide instance shared by every DataAccessLayer
+_kline_buffers: Optional[KlineBufferStore] = None
+
+
+def get_kline_buffers() -> KlineBufferStore:
+    """Get the process-wide K-line buffer store"""
+    global _kline_buffers
+    if _kline_buffers is None:
+        _kline_buffers = KlineBufferStore()
+    return _kline_buffers
@@ -0,0 +1,117 @@
+"""
+K-line resampling.
+
+Higher timeframes can be derived from one finer-grained series instead of
+being fetched one by one: a 4h candle is the first open, highest high,
+lowest low, last close and summed volume of the sixteen 15m candles it
+spans.  Deriving them locally turns one exchange call per timeframe into
+one call per symbol, and keeps every timeframe consistent with the others
+(they are all cut from the same candles).
+
+Buckets follow the exchange's own sessions so resampled candles open when
+the exchange's native ones do:
+
+- Intraday and daily candles open on multiples of their length since the
+  Unix epoch (00:00 UTC for daily)
+- Weekly candles open on Monday
+- OKX opens 6h and longer candles on Hong Kong time (UTC+8)
+
+Usage:
+    base = await trader.get_klines("BTC/USDT", "15m", 1000)
+    candles_4h = resample_klines(base, "4h", exchange="binanceusdm")
+"""
+
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from ..traders.base import OHLCV, KlineSeries
+from .indicator_stream import timeframe_seconds
+
+# The Unix epoch was a Thursday; weekly candles open on Monday
+_WEEK = 7 * 86400
+_MONDAY_OFFSET = 4 * 86400
+
+# exchange -> (shortest timeframe in seconds the session applies to,
+#              session start relative to 00:00 UTC in seconds)
+EXCHANGE_SESSIONS: dict[str, tuple[int, int]] = {
+    "okx": (6 * 3600, -8 * 3600),
+}
+
+
+def session_offset(exchange: Optional[str], timeframe: str) -> int:
+    """
+    Seconds between the epoch-aligned grid of ``timeframe`` and the open
+    of the exchange's candles.
+    """
+    seconds = timeframe_seconds(timeframe)
+    if seconds is None:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    offset = 0
+    session = EXCHANGE_SESSIONS.get(exchange or "")
+    if session is not None and seconds >= session[0]:
+        offset = session[1]
+    if seconds % _WEEK == 0:
+        offset += _MONDAY_OFFSET
+    return offset % seconds
+
+
+def can_resample(base: str, timeframe: str, exchange: Optional[str] = None) -> bool:
+    """True if every ``timeframe`` candle is made of whole ``base`` candles"""
+    base_seconds = timeframe_seconds(base)
+    seconds = timeframe_seconds(timeframe)
+    if not base_seconds or not seconds or seconds <= base_seconds:
+        return False
+    if seconds % base_seconds:
+        return False
+    offset = session_offset(exchange, timeframe) - session_offset(exchange, base)
+    return offset % base_seconds == 0
+
+
+def resample_klines(
+    klines: Sequence[OHLCV],
+    timeframe: str,
+    exchange: Optional[str] = None,
+) -> KlineSeries:
+    """
+    Aggregate a K-line series, oldest first, into ``timeframe`` candles.
+
+    The newest candle is still forming if its bucket is not yet complete,
+    like the newest candle an exchange returns.  A leading bucket the
+    series only covers in part is dropped, since its open would be wrong.
+
+    Args:
+        klines: Base series (KlineSeries or list of OHLCV), oldest first
+        timeframe: Target timeframe, a multiple of the base timeframe
+        exchange: Exchange name, selecting its session alignment
+    """
+    series = KlineSeries.coerce(klines)
+    data = series.values
+    if not len(data):
+        return KlineSeries([], series.utc)
+
+    step = timeframe_seconds(timeframe) * 1000
+    offset = session_offset(exchange, timeframe) * 1000
+    timestamps = data[:, 0].astype(np.int64)
+    buckets = (timestamps - offset) // step * step + offset
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    if buckets[0] != timestamps[0]:
+        if len(starts) == 1:
+            return KlineSeries([], series.utc)
+        first = starts[1]
+        data, buckets, starts = data[first:], buckets[first:], starts[1:] - first
+    ends = np.r_[starts[1:], len(data)] - 1
+
+    candles = np.column_stack(
+        (
+            buckets[starts],
+            data[starts, 1],
+            np.maximum.reduceat(data[:, 2], starts),
+            np.minimum.reduceat(data[:, 3], starts),
+            data[ends, 4],
+            np.add.reduceat(data[:, 5], starts),
+        )
+    )
+    return KlineSeries(candles, series.utc)
@@ -0,0 +1,198 @@
+"""
+In-process LRU and two-tier (in-process + Redis) caches.
+
+- ``LRUCache``: bounded map evicting the least recently used entry, with
+  an optional lifetime per entry.  Used for prompt text, K-line buffers and
+  indicator states.
+- ``TieredCache``: an ``LRUCache`` (L1) in front of Redis (L2), with hit
+  and miss counters.  A Redis hit is promoted to L1; Redis failures are
+  logged and treated as misses.  ``IndicatorCache`` and ``ResponseCache``
+  build on it and only define their keys and Redis encoding.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used map with optional per-entry TTL.
+
+    Expired entries are dropped when they are next read.  Iteration yields
+    keys least recently used first.
+
+    Usage:
+        cache = LRUCache(max_entries=256)
+        cache.put(key, value, ttl=60)
+        value = cache.get(key)  # None on a miss or once expired
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (monotonic expiry or None, value), least recently used first
+        self._data: OrderedDict[Hashable, tuple[Optional[float], Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Value under ``key`` (marked most recently used), or None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> list[Any]:
+        """
+        Store ``value``, evicting the least recently used entries if full.
+
+        Returns:
+            Values evicted to make room (for releasing what they hold)
+        """
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        evicted = []
+        while len(self._data) > self.max_entries:
+            evicted.append(self._data.popitem(last=False)[1][1])
+        return evicted
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove and return the value under ``key`` (None if absent)"""
+        entry = self._data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+class TieredCache:
+    """
+    L1 ``LRUCache`` with per-entry TTL in front of Redis.
+
+    Subclasses override ``_redis_key``, ``_to_redis`` and ``_from_redis``
+    to namespace keys and convert L1 values to and from what Redis stores,
+    and ``_record`` to export hit / miss metrics.
+    """
+
+    # Cache name used in log messages
+    label = "Cache"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = LRUCache(max_entries)
+
+        # Metrics
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _redis_key(self, key: str) -> str:
+        return key
+
+    def _to_redis(self, value: Any) -> Any:
+        return value
+
+    def _from_redis(self, data: Any) -> Any:
+        """L1 value of what Redis returned (None = unusable)"""
+        return data
+
+    def _record(self, hit: bool) -> None:
+        """Called once per lookup"""
+
+    async def lookup(
+        self,
+        key: str,
+        ttl: int,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Cached value, or None on a miss.
+
+        Args:
+            key: Cache key
+            ttl: Lifetime in seconds of an L2 hit promoted to L1
+            redis_getter: Async callable returning the Redis service
+                          (None = in-process cache only)
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            return self._hit(value)
+
+        if redis_getter is not None:
+            try:
+                redis = await redis_getter()
+                data = await redis.get(self._redis_key(key))
+                if data is not None:
+                    value = self._from_redis(data)
+            except Exception as e:
+                logger.debug(f"{self.label} read failed for {key}: {e}")
+
+            if value is not None:
+                self.redis_hits += 1
+                self._entries.put(key, value, ttl)
+                self._record(True)
+                return value
+
+            # Another caller may have filled L1 while Redis was awaited
+            value = self._entries.get(key)
+            if value is not None:
+                return self._hit(value)
+
+        self.misses += 1
+        self._record(False)
+        return None
+
+    def _hit(self, value: Any) -> Any:
+        self.memory_hits += 1
+        self._record(True)
+        return value
+
+    async def store(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> None:
+        """Cache ``value`` for ``ttl`` seconds in both tiers"""
+        self._entries.put(key, value, ttl)
+        if redis_getter is None:
+            return
+        try:
+            redis = await redis_getter()
+            await redis.set(self._redis_key(key), self._to_redis(value), ttl=ttl)
+        except Exception as e:
+            logger.debug(f"{self.label} write failed for {key}: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-process entries"""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        hits = self.memory_hits + self.redis_hits
+        requests = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": hits / requests if requests else 0,
+        }
@@ -0,0 +1,215 @@
+"""
+Binary codec for cached market series.
+
+K-lines and funding history used to be cached as JSON lists of dicts with
+ISO timestamp strings, so every read parsed the JSON and ran
+``datetime.fromisoformat`` once per entry.  They are now cached as packed
+little-endian records behind a small versioned header:
+
+    magic "BK" | version u8 | kind u8 | flags u8 | meta f64 | records
+
+- K-line records: int64 open time (ms since epoch) + 5 x float64 OHLCV,
+  48 bytes per candle
+- Funding records: int64 time (ms since epoch) + float64 rate, 16 bytes
+
+``meta`` is a per-value float (the fetch time of a K-line buffer snapshot,
+otherwise 0).  Payloads above ``COMPRESS_MIN_BYTES`` are zlib-compressed when
+that makes them smaller.  Timestamps come back as naive UTC datetimes, or
+aware UTC ones if the encoded values were timezone-aware.
+
+Values that do not start with the magic are decoded as the legacy JSON
+format, so keys written before the switch keep working until rewritten.
+"""
+
+import json
+import struct
+import zlib
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from ..traders.base import OHLCV, FundingRate, KlineSeries
+
+MAGIC = b"BK"
+VERSION = 1
+
+KIND_KLINES = 1
+KIND_FUNDING = 2
+
+FLAG_ZLIB = 0x01
+FLAG_UTC = 0x02  # timestamps were timezone-aware
+
+COMPRESS_MIN_BYTES = 4096
+
+_HEADER = struct.Struct("<2sBBBd")
+
+KLINE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+FUNDING_DTYPE = np.dtype([("timestamp", "<i8"), ("rate", "<f8")])
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=UTC)
+_MS = timedelta(milliseconds=1)
+
+
+def is_binary(raw: Optional[bytes]) -> bool:
+    """True if ``raw`` was written by this codec (any version)"""
+    return bool(raw) and raw[:2] == MAGIC
+
+
+def _to_ms(timestamp: datetime) -> int:
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch) // _MS
+
+
+def _to_datetimes(ms: np.ndarray, utc: bool) -> list[datetime]:
+    timestamps = ms.astype("datetime64[ms]").tolist()
+    if utc:
+        return [ts.replace(tzinfo=UTC) for ts in timestamps]
+    return timestamps
+
+
+def _pack(kind: int, records: np.ndarray, utc: bool, meta: float) -> bytes:
+    payload = records.tobytes()
+    flags = FLAG_UTC if utc else 0
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, VERSION, kind, flags, meta) + payload
+
+
+def _unpack(raw: bytes, kind: int, dtype: np.dtype) -> tuple[np.ndarray, bool, float]:
+    magic, version, raw_kind, flags, meta = _HEADER.unpack_from(raw)
+    if magic != MAGIC or version != VERSION or raw_kind != kind:
+        raise ValueError(
+            f"Unsupported market codec value (version {version}, kind {raw_kind})"
+        )
+    payload = memoryview(raw)[_HEADER.size :]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return np.frombuffer(payload, dtype=dtype), bool(flags & FLAG_UTC), meta
+
+
+# ==================== K-lines ====================
+
+
+def encode_klines(klines: Sequence, meta: float = 0.0) -> bytes:
+    """
+    Pack candles (any objects with ``timestamp`` and OHLCV attributes).
+
+    Args:
+        klines: Candles or a KlineSeries, in the order they should be decoded
+        meta: Float stored alongside (e.g. the fetch time of a snapshot)
+    """
+    records = np.empty(len(klines), dtype=KLINE_DTYPE)
+    if isinstance(klines, KlineSeries):
+        records["timestamp"] = klines.timestamps_ms
+        for i, name in enumerate(KlineSeries.COLUMNS[1:], start=1):
+            records[name] = klines.values[:, i]
+        return _pack(KIND_KLINES, records, klines.utc, meta)
+
+    records["timestamp"] = [_to_ms(k.timestamp) for k in klines]
+    for name in ("open", "high", "low", "close", "volume"):
+        records[name] = [getattr(k, name) for k in klines]
+    utc = bool(klines) and klines[0].timestamp.tzinfo is not None
+    return _pack(KIND_KLINES, records, utc, meta)
+
+
+def decode_klines(
+    raw: bytes,
+    candle_type: Callable[..., Any] = OHLCV,
+) -> tuple[list, float]:
+    """
+    Candles and ``meta`` of an encoded value.
+
+    Legacy JSON values (a list of K-line dicts, or a ``{"fetched_at",
+    "candles"}`` snapshot) are accepted as well; their ``meta`` is the
+    snapshot's ``fetched_at`` or 0.
+
+    Args:
+        raw: Encoded value
+        candle_type: Candle class, called with (timestamp, open, high, low,
+                     close, volume)
+    """
+    if not is_binary(raw):
+        return _decode_legacy_klines(json.loads(raw), candle_type)
+    records, utc, meta = _unpack(raw, KIND_KLINES, KLINE_DTYPE)
+    columns = [
+        records[name].tolist() for name in ("open", "high", "low", "close", "volume")
+    ]
+    timestamps = _to_datetimes(records["timestamp"], utc)
+    return list(map(candle_type, timestamps, *columns)), meta
+
+
+def decode_kline_series(raw: bytes) -> tuple[KlineSeries, float]:
+    """
+    Like ``decode_klines``, but returns a ``KlineSeries`` without building
+    a candle object per record.
+    """
+    if not is_binary(raw):
+        klines, meta = decode_klines(raw)
+        return KlineSeries.from_candles(klines), meta
+    records, utc, meta = _unpack(raw, KIND_KLINES, KLINE_DTYPE)
+    data = np.empty((len(records), 6))
+    for i, name in enumerate(KlineSeries.COLUMNS):
+        data[:, i] = records[name]
+    return KlineSeries(data, utc), meta
+
+
+def _decode_legacy_klines(
+    data: Any, candle_type: Callable[..., Any]
+) -> tuple[list, float]:
+    meta = 0.0
+    if isinstance(data, dict):
+        meta = float(data.get("fetched_at", 0.0))
+        data = data.get("candles", [])
+    return [
+        candle_type(
+            datetime.fromisoformat(k["timestamp"]),
+            k["open"],
+            k["high"],
+            k["low"],
+            k["close"],
+            k["volume"],
+        )
+        for k in data
+    ], meta
+
+
+# ==================== Funding ====================
+
+
+def encode_funding(history: list[FundingRate]) -> bytes:
+    """Pack a funding rate history"""
+    records = np.empty(len(history), dtype=FUNDING_DTYPE)
+    records["timestamp"] = [_to_ms(f.timestamp) for f in history]
+    records["rate"] = [f.rate for f in history]
+    utc = bool(history) and history[0].timestamp.tzinfo is not None
+    return _pack(KIND_FUNDING, records, utc, 0.0)
+
+
+def decode_funding(raw: bytes) -> list[FundingRate]:
+    """Funding rate history of an encoded (or legacy JSON) value"""
+    if not is_binary(raw):
+        return [
+            FundingRate(
+                timestamp=datetime.fromisoformat(f["timestamp"]),
+                rate=f["rate"],
+            )
+            for f in json.loads(raw)
+        ]
+    records, utc, _ = _unpack(raw, KIND_FUNDING, FUNDING_DTYPE)
+    timestamps = _to_datetimes(records["timestamp"], utc)
+    return list(map(FundingRate, timestamps, records["rate"].tolist()))
@@ -0,0 +1,352 @@
+"""
+Market Context Builder - Candle-close-aligned market context precomputation.
+
+Without it every agent's ``StrategyEngine.run_cycle`` builds its own market
+contexts (tickers, K-lines, funding, indicators) on demand, so agents that
+run at the top of the same minute all hit the exchange at once.
+
+The builder keeps one *feed* per (exchange, timeframes, indicator config)
+holding the union of symbols of the running agents that share it.  Shortly
+after each close of the feed's shortest timeframe it builds the contexts of
+every symbol once and publishes them in-process; ``DataAccessLayer.
+get_market_contexts`` then only looks them up and refreshes the tickers.
+Exchange calls for K-lines and funding scale with distinct symbols rather
+than with agents.
+
+Lookups that arrive after a close but before the feed is rebuilt wait for
+(or start) that one build instead of building their own.
+
+Usage:
+    builder = get_market_context_builder()
+    await builder.start()
+    builder.register("agent-1", trader, AIStrategyConfig(**strategy.config))
+
+    contexts = await builder.get_contexts(
+        "binance", ["15m", "1h"], config_hash, ["BTC", "ETH"]
+    )  # None if no feed covers the request
+
+    builder.unregister_agent("agent-1")
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from ..models.market_context import MarketContext
+from .indicator_cache import indicator_config_hash
+from .indicator_stream import timeframe_seconds
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after a candle close before building, so the exchange has
+# opened the new candle
+SETTLE_SECONDS = 2.0
+# Poll interval while no feed is registered
+IDLE_INTERVAL = 5.0
+# Step used for timeframes timeframe_seconds() does not know
+DEFAULT_STEP = 60
+
+# (exchange, timeframes, indicator config hash, base timeframe)
+FeedKey = tuple[str, tuple[str, ...], str, Optional[str]]
+
+
+@dataclass
+class ContextFeed:
+    """Symbols of agents sharing exchange, timeframes, base timeframe and indicator config"""
+
+    key: FeedKey
+    step: int  # Seconds of the shortest timeframe
+    # agent_id -> (trader, symbols)
+    agents: dict[str, tuple[Any, frozenset[str]]] = field(default_factory=dict)
+    dal: Any = None
+    dal_owner: Optional[str] = None
+    contexts: dict[str, MarketContext] = field(default_factory=dict)
+    built_for: Optional[int] = None  # Candle close (Unix seconds) of contexts
+    building: Optional[asyncio.Future] = None
+    last_build_ms: float = 0.0
+
+    @property
+    def symbols(self) -> set[str]:
+        return set().union(*(symbols for _, symbols in self.agents.values()))
+
+    def boundary(self, now: float) -> int:
+        """Latest close of the shortest timeframe at ``now``"""
+        return int(now // self.step) * self.step
+
+
+class MarketContextBuilder:
+    """
+    Builds market contexts once per candle close for all registered agents.
+
+    Contexts are built with a ``DataAccessLayer`` around the trader of one
+    of the feed's agents (public market data is the same for all of them).
+    """
+
+    def __init__(self, settle_seconds: float = SETTLE_SECONDS):
+        self._settle_seconds = settle_seconds
+        self._feeds: dict[FeedKey, ContextFeed] = {}
+        self._agent_feeds: dict[str, FeedKey] = {}
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._builds = 0
+        self._build_errors = 0
+        self._hits = 0
+        self._misses = 0
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    async def start(self) -> bool:
+        """Start the background build loop."""
+        if self._running:
+            return True
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("MarketContextBuilder started")
+        return True
+
+    async def stop(self) -> None:
+        """Stop the background build loop."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info(f"MarketContextBuilder stopped (builds={self._builds})")
+
+    async def _run(self) -> None:
+        """Sleep until the next candle close of any feed, then build"""
+        while self._running:
+            try:
+                now = time.time()
+                if not self._feeds:
+                    await asyncio.sleep(IDLE_INTERVAL)
+                    continue
+                next_close = min(
+                    feed.boundary(now) + feed.step for feed in self._feeds.values()
+                )
+                await asyncio.sleep(max(next_close - now, 0) + self._settle_seconds)
+                await self.build_due()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Market context build loop error: {e}")
+                await asyncio.sleep(IDLE_INTERVAL)
+
+    # =========================================================================
+    # Registration
+    # =========================================================================
+
+    def register(self, agent_id: str, trader, config) -> FeedKey:
+        """
+        Subscribe an agent's symbols.
+
+        Args:
+            agent_id: Agent ID
+            trader: The agent's exchange trader
+            config: Strategy config with ``symbols``, ``timeframes``,
+                    ``base_timeframe`` and ``indicators`` (as passed to
+                    DataAccessLayer)
+
+        Returns:
+            Key of the feed the agent joined
+        """
+        self.unregister_agent(agent_id)
+
+        key = self.feed_key(
+            trader.exchange_name,
+            config.timeframes,
+            config.indicators,
+            config.base_timeframe,
+        )
+        feed = self._feeds.get(key)
+        if feed is None:
+            steps = [timeframe_seconds(tf) or DEFAULT_STEP for tf in config.timeframes]
+            feed = ContextFeed(key=key, step=min(steps, default=DEFAULT_STEP))
+            self._feeds[key] = feed
+        added = frozenset(config.symbols) - feed.symbols
+        feed.agents[agent_id] = (trader, frozenset(config.symbols))
+        self._agent_feeds[agent_id] = key
+        if feed.dal is None:
+            self._attach_dal(feed, agent_id, config)
+        if added:
+            # The published contexts no longer cover the feed
+            feed.built_for = None
+        logger.debug(f"Registered agent {agent_id} for market contexts: {key}")
+        return key
+
+    def unregister_agent(self, agent_id: str) -> None:
+        """Drop an agent's subscription (call when the agent stops)."""
+        key = self._agent_feeds.pop(agent_id, None)
+        feed = self._feeds.get(key) if key else None
+        if feed is None:
+            return
+        feed.agents.pop(agent_id, None)
+        if not feed.agents:
+            del self._feeds[key]
+            return
+        for symbol in set(feed.contexts) - feed.symbols:
+            del feed.contexts[symbol]
+        if feed.dal_owner == agent_id:
+            # Its trader may be closed: build with another agent's trader
+            owner, (trader, _) = next(iter(feed.agents.items()))
+            feed.dal = self._make_dal(trader, feed.dal.config)
+            feed.dal_owner = owner
+
+    @staticmethod
+    def feed_key(
+        exchange: str,
+        timeframes: list[str],
+        indicators: dict,
+        base_timeframe: Optional[str] = None,
+    ) -> FeedKey:
+        return (
+            exchange,
+            tuple(timeframes),
+            indicator_config_hash(indicators),
+            base_timeframe,
+        )
+
+    def _attach_dal(self, feed: ContextFeed, agent_id: str, config) -> None:
+        trader, _ = feed.agents[agent_id]
+        feed.dal = self._make_dal(trader, config)
+        feed.dal_owner = agent_id
+
+    @staticmethod
+    def _make_dal(trader, config):
+        from .data_access_layer import DataAccessLayer
+
+        return DataAccessLayer(trader=trader, config=config)
+
+    # =========================================================================
+    # Building & Lookup
+    # =========================================================================
+
+    async def build_due(self) -> int:
+        """
+        Build every feed whose contexts predate the latest candle close.
+
+        Returns:
+            Number of feeds built
+        """
+        now = time.time()
+        due = [
+            feed
+            for feed in self._feeds.values()
+            if feed.built_for != feed.boundary(now)
+        ]
+        await asyncio.gather(*(self._ensure_built(feed, now) for feed in due))
+        return len(due)
+
+    async def _ensure_built(self, feed: ContextFeed, now: float) -> None:
+        """Build ``feed`` for the close at ``now`` unless already done"""
+        boundary = feed.boundary(now)
+        if feed.built_for == boundary:
+            return
+        if feed.building is None or feed.building.done():
+            feed.building = asyncio.ensure_future(self._build(feed, boundary))
+        await asyncio.shield(feed.building)
+
+    async def _build(self, feed: ContextFeed, boundary: int) -> None:
+        started = time.perf_counter()
+        symbols = sorted(feed.symbols)
+        try:
+            contexts = await feed.dal.build_market_contexts(symbols, list(feed.key[1]))
+        except Exception as e:
+            self._build_errors += 1
+            logger.warning(f"Failed to build market contexts for {feed.key}: {e}")
+            return
+        feed.contexts = contexts
+        feed.built_for = boundary
+        feed.last_build_ms = round((time.perf_counter() - started) * 1000, 2)
+        self._builds += 1
+        logger.debug(
+            f"Built {len(symbols)} market contexts for {feed.key} "
+            f"in {feed.last_build_ms}ms"
+        )
+
+    async def get_contexts(
+        self,
+        exchange: str,
+        timeframes: list[str],
+        config_hash: str,
+        symbols: list[str],
+        base_timeframe: Optional[str] = None,
+    ) -> Optional[dict[str, MarketContext]]:
+        """
+        Published contexts for the latest candle close.
+
+        Waits for the feed's build if the latest close has not been built
+        yet.  Returns None if no feed covers every requested symbol.
+        """
+        feed = self._feeds.get(
+            (exchange, tuple(timeframes), config_hash, base_timeframe)
+        )
+        if feed is None or not set(symbols) <= feed.symbols:
+            self._misses += 1
+            return None
+        now = time.time()
+        await self._ensure_built(feed, now)
+        if feed.built_for != feed.boundary(now) or not all(
+            symbol in feed.contexts for symbol in symbols
+        ):
+            self._misses += 1
+            return None
+        self._hits += 1
+        return {symbol: feed.contexts[symbol] for symbol in symbols}
+
+    # =========================================================================
+    # Status & Metrics
+    # =========================================================================
+
+    def get_stats(self) -> dict:
+        """Get builder statistics."""
+        return {
+            "running": self._running,
+            "feeds": [
+                {
+                    "exchange": feed.key[0],
+                    "timeframes": list(feed.key[1]),
+                    "base_timeframe": feed.key[3],
+                    "symbols": sorted(feed.symbols),
+                    "agents": len(feed.agents),
+                    "built_for": feed.built_for,
+                    "last_build_ms": feed.last_build_ms,
+                }
+                for feed in self._feeds.values()
+            ],
+            "builds": self._builds,
+            "build_errors": self._build_errors,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+# =============================================================================
+# Singleton Instance
+# =============================================================================
+
+_market_context_builder: Optional[MarketContextBuilder] = None
+
+
+def get_market_context_builder() -> MarketContextBuilder:
+    """Get or create the market context builder singleton."""
+    global _market_context_builder
+    if _market_context_builder is None:
+        _market_context_builder = MarketContextBuilder()
+    return _market_context_builder
+
+
+def reset_market_context_builder() -> None:
+    """Reset the market context builder (for testing)."""
+    global _market_context_builder
+    _market_context_builder = None
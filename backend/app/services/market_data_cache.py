@@ -11,10 +11,12 @@ Provides:
 import json
 import logging
 from datetime import UTC, datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from ..core.config import get_settings
 from ..services.redis_service import get_redis_service
+from ..traders.base import OHLCV
+from .market_codec import decode_klines, encode_klines, is_binary
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +57,8 @@ class MarketDataCache:
         start_time: datetime,
         end_time: datetime,
         exchange: str = "binance",
-    ) -> Optional[list[dict]]:
+        candle_type: Callable[..., Any] = OHLCV,
+    ) -> Optional[list]:
         """
         Get cached K-line data.
 
@@ -65,9 +68,10 @@ class MarketDataCache:
             start_time: Start of data range
             end_time: End of data range
             exchange: Exchange name
+            candle_type: Candle class to build (see ``decode_klines``)
 
         Returns:
-            List of K-line dicts or None if not cached
+            List of candles or None if not cached
         """
         redis = await self._get_redis()
 
@@ -75,9 +79,15 @@ class MarketDataCache:
         key = self._kline_key(symbol, timeframe, exchange, start_time, end_time)
 
         try:
-            data = await redis.get(key)
-            if data:
-                return json.loads(data)
+            raw = await redis.get_bytes(key)
+            if raw:
+                klines, _ = decode_klines(raw, candle_type)
+                if not is_binary(raw):
+                    # Rewrite keys cached in the legacy JSON format
+                    await redis.set_bytes(
+                        key, encode_klines(klines), ttl=self.KLINE_TTL
+                    )
+                return klines
         except Exception as e:
             logger.warning(f"Failed to get klines from cache: {e}")
 
@@ -89,7 +99,7 @@ class MarketDataCache:
         timeframe: str,
         start_time: datetime,
         end_time: datetime,
-        klines: list[dict],
+        klines: list,
         exchange: str = "binance",
         ttl: int = None,
     ) -> bool:
@@ -101,7 +111,7 @@ class MarketDataCache:
             timeframe: Candle timeframe
             start_time: Start of data range
             end_time: End of data range
-            klines: List of K-line dicts
+            klines: Candles (objects with timestamp and OHLCV attributes)
             exchange: Exchange name
             ttl: Cache TTL in seconds (default: KLINE_TTL)
 
@@ -114,7 +124,7 @@ class MarketDataCache:
         ttl = ttl or self.KLINE_TTL
 
         try:
-            await redis.set(key, json.dumps(klines), ex=ttl)
+            await redis.set_bytes(key, encode_klines(klines), ttl=ttl)
             return True
         except Exception as e:
             logger.warning(f"Failed to cache klines: {e}")
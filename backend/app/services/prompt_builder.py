@@ -5,21 +5,43 @@ Constructs system and user prompts following the 8-section structure
 inspired by NoFx's Strategy Studio.
 
 Supports bilingual prompts (en/zh) via prompt_templates.
+
+Rendered text is memoized at module level:
+- System prompts by a hash of everything they depend on (strategy config,
+  trading mode, max positions), so editing a strategy yields a new key
+- Indicator and recent K-line sections by the values they show, which
+  only change at candle close; entries hold text only and stay few
 """
 
+import hashlib
 from datetime import UTC, datetime
-from typing import Optional
+from typing import Callable, Optional
 
 from ..models.decision import get_decision_json_schema
 from ..models.market_context import MarketContext, TechnicalIndicators
 from ..models.strategy import StrategyConfig, TradingMode
 from ..traders.base import AccountState, MarketData
+from .lru_cache import LRUCache
 from .prompt_templates import (
     get_system_templates,
     get_user_templates,
     translate_signal,
 )
 
+# config hash -> system prompt
+_system_prompts = LRUCache(max_entries=256)
+# (language, kind, rendered values) -> section text
+_sections = LRUCache(max_entries=256)
+
+# K-lines shown in the recent candles section
+RECENT_KLINES = 5
+
+
+def clear_prompt_caches() -> None:
+    """Drop all memoized prompt text (tests, template reloads)."""
+    _system_prompts.clear()
+    _sections.clear()
+
 
 class PromptBuilder:
     """
@@ -68,6 +90,30 @@ class PromptBuilder:
         self.language = getattr(config, "language", "en") or "en"
         self._sys = get_system_templates(self.language)
         self._usr = get_user_templates(self.language)
+        self._system_prompt_key: Optional[str] = None
+
+    @property
+    def system_prompt_key(self) -> Optional[str]:
+        """
+        Hash of every input of the system prompt, computed on first use.
+
+        The config is treated as immutable for the builder's lifetime.
+        None when the config cannot be serialized (not a pydantic model).
+        """
+        if self._system_prompt_key is None:
+            dump = getattr(self.config, "model_dump_json", None)
+            if not callable(dump):
+                return None
+            payload = "|".join(
+                (
+                    dump(),
+                    self.trading_mode.value,
+                    str(self.max_positions),
+                    self.language,
+                )
+            )
+            self._system_prompt_key = hashlib.sha256(payload.encode()).hexdigest()
+        return self._system_prompt_key
 
     # ==================== System Prompt ====================
 
@@ -82,9 +128,25 @@ class PromptBuilder:
 
         Note: custom_prompt is deprecated and no longer used in either mode.
 
+        The result is memoized by ``system_prompt_key``; it depends only on
+        the strategy config, so every cycle reuses the same text.
+
         Returns:
             Complete system prompt string
         """
+        key = self.system_prompt_key
+        if key is not None:
+            cached = _system_prompts.get(key)
+            if cached is not None:
+                return cached
+
+        prompt = self._render_system_prompt()
+        if key is not None:
+            _system_prompts.put(key, prompt)
+        return prompt
+
+    def _render_system_prompt(self) -> str:
+        """Render the system prompt sections (see ``build_system_prompt``)."""
         prompt_mode = getattr(self.config, "prompt_mode", "simple") or "simple"
         sections = []
         t = self._sys
@@ -407,16 +469,77 @@ Timestamp: {now.strftime('%Y-%m-%d %H:%M:%S')} UTC
         for tf in sorted(ctx.indicators.keys(), key=self._timeframe_sort_key):
             ind = ctx.indicators[tf]
             lines.append(f"\n**{tf.upper()} {u['timeframe_analysis']}:**")
-            lines.append(self._format_technical_indicators(ind))
+            lines.append(
+                self._cached_section(
+                    self._indicators_key(ind),
+                    lambda: self._format_technical_indicators(ind),
+                )
+            )
+
+        # Support/resistance merged across timeframes
+        if any(ctx.key_levels.values()):
+            lines.append(f"\n**{u['key_levels']}:**")
+            for side in ("support", "resistance"):
+                levels = ctx.key_levels.get(side)
+                if levels:
+                    parts = [
+                        f"${level['price']:,.2f} ({', '.join(level['timeframes'])})"
+                        for level in levels
+                    ]
+                    lines.append(f"- {u[side]}: {', '.join(parts)}")
 
         # Recent K-lines summary (use the primary timeframe)
         primary_tf = self._get_primary_timeframe(list(ctx.klines.keys()))
         if primary_tf and ctx.klines.get(primary_tf):
+            klines = ctx.klines[primary_tf]
             lines.append(f"\n**{u['recent_candles']} ({primary_tf}):**")
-            lines.append(self._format_recent_klines(ctx.klines[primary_tf], limit=5))
+            lines.append(
+                self._cached_section(
+                    self._klines_key(klines, RECENT_KLINES),
+                    lambda: self._format_recent_klines(klines, limit=RECENT_KLINES),
+                )
+            )
 
         return "\n".join(lines)
 
+    def _cached_section(self, key: tuple, render: Callable[[], str]) -> str:
+        """
+        Section text for ``key`` (the values it renders), rendered once per
+        language.
+
+        Indicators and recent K-lines only change at candle close, so agents
+        and cycles showing the same values share the text.
+        """
+        key = (self.language, *key)
+        text = _sections.get(key)
+        if text is None:
+            text = render()
+            _sections.put(key, text)
+        return text
+
+    @staticmethod
+    def _indicators_key(ind: TechnicalIndicators) -> tuple:
+        """Values ``_format_technical_indicators`` renders"""
+        return (
+            "ind",
+            tuple(sorted(ind.ema.items())),
+            ind.rsi,
+            tuple(sorted(ind.macd.items())),
+            ind.atr,
+            tuple(sorted(ind.bollinger.items())),
+            ind.trend_strength,
+        )
+
+    @staticmethod
+    def _klines_key(klines: list, limit: int) -> tuple:
+        """Open time and prices of the candles ``_format_recent_klines`` renders"""
+        return (
+            "klines",
+            tuple(
+                (k.timestamp, k.open, k.high, k.low, k.close) for k in klines[-limit:]
+            ),
+        )
+
     def _format_technical_indicators(self, ind: TechnicalIndicators) -> str:
         """Format technical indicators into readable text."""
         lines = []
@@ -459,6 +582,11 @@ Timestamp: {now.strftime('%Y-%m-%d %H:%M:%S')} UTC
             )
 
         u = self._usr
+
+        # Trend strength
+        if ind.trend_strength is not None:
+            lines.append(f"- {u['trend_strength']} (ADX): {ind.trend_strength:.1f}")
+
         return "\n".join(lines) if lines else f"- {u['no_indicators']}"
 
     def _format_recent_klines(self, klines: list, limit: int = 5) -> str:
@@ -292,6 +292,10 @@ USER_TEMPLATES: dict[str, dict[str, Any]] = {
         "recent_candles": "Recent Candles",
         "no_indicators": "No indicators available",
         "no_kline_data": "No K-line data available",
+        "trend_strength": "Trend Strength",
+        "key_levels": "Key Levels",
+        "support": "Support",
+        "resistance": "Resistance",
         # Recent trades
         "recent_trades": "## Recent Closed Trades (Last 10)",
         # Task section (basic)
@@ -358,6 +362,10 @@ USER_TEMPLATES: dict[str, dict[str, Any]] = {
         "recent_candles": "近期 K 线",
         "no_indicators": "暂无指标数据",
         "no_kline_data": "暂无 K 线数据",
+        "trend_strength": "趋势强度",
+        "key_levels": "关键价位",
+        "support": "支撑",
+        "resistance": "阻力",
         # Recent trades
         "recent_trades": "## 近期平仓记录（最近 10 笔）",
         # Task section (basic)
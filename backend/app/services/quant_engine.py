@@ -15,9 +15,11 @@ from abc import ABC, abstractmethod
 from datetime import UTC, datetime
 from typing import Optional
 
-from ..traders.base import BaseTrader, OrderResult, TradeError
+from ..traders.base import BaseTrader, KlineSeries, OrderResult, TradeError
+from . import indicator_series
 from .agent_position_service import AgentPositionService
 from .execution_result import make_execution_result
+from .indicator_series import latest_value
 from .trade_execution_service import TradeExecutionService
 
 logger = logging.getLogger(__name__)
@@ -876,30 +878,11 @@ class RSIEngine(QuantEngineBase):
             if len(klines) < period + 1:
                 return None
 
-            # Extract closing prices
-            closes = [k.close for k in klines]
-
-            # Calculate price changes
-            deltas = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
-
-            # Separate gains and losses
-            gains = [d if d > 0 else 0 for d in deltas]
-            losses = [-d if d < 0 else 0 for d in deltas]
-
-            # Calculate average gain/loss using EMA method
-            avg_gain = sum(gains[:period]) / period
-            avg_loss = sum(losses[:period]) / period
-
-            for i in range(period, len(gains)):
-                avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-                avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-
-            if avg_loss == 0:
-                return 100.0
-
-            rs = avg_gain / avg_loss
-            rsi = 100.0 - (100.0 / (1.0 + rs))
-            return round(rsi, 2)
+            if isinstance(klines, KlineSeries):
+                closes = klines.closes
+            else:
+                closes = [k.close for k in klines]
+            return latest_value(indicator_series.rsi(closes, period), 2)
 
         except Exception as e:
             logger.warning(f"RSI calculation failed: {e}")
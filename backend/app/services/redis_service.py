@@ -306,6 +306,23 @@ class RedisService:
         except json.JSONDecodeError:
             return value
 
+    async def set_bytes(
+        self, key: str, value: bytes, ttl: Optional[int] = None
+    ) -> bool:
+        """Set a binary cache value (stored as is, no JSON)"""
+        cache_key = f"{self.PREFIX_CACHE}{key}"
+
+        if ttl:
+            await self.redis.setex(cache_key, ttl, value)
+        else:
+            await self.redis.set(cache_key, value)
+
+        return True
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a cached value as raw bytes"""
+        return await self.redis.get(f"{self.PREFIX_CACHE}{key}")
+
     async def delete(self, key: str) -> bool:
         """Delete a cached value"""
         cache_key = f"{self.PREFIX_CACHE}{key}"
@@ -9,6 +9,7 @@ Coordinates:
 - Logging and audit trail
 """
 
+import asyncio
 import logging
 import time
 import uuid
@@ -25,8 +26,16 @@ from ..models.decision import ActionType, DecisionResponse
 from ..models.debate import ConsensusMode, DebateConfig, DebateResult
 from ..models.market_context import MarketContext
 from ..models.strategy import AIStrategyConfig, TradingMode
+from ..monitoring.metrics import get_metrics_collector
 from ..traders.base import AccountState, BaseTrader, MarketData, OrderResult
-from .ai import BaseAIClient, get_ai_client, resolve_provider_credentials
+from .ai import (
+    AIResponse,
+    BaseAIClient,
+    CachedAIClient,
+    get_ai_client,
+    get_response_cache,
+    resolve_provider_credentials,
+)
 from ..core.security import get_crypto_service
 from .data_access_layer import DataAccessLayer
 from .debate_engine import DebateEngine
@@ -38,7 +47,11 @@ from .trade_execution_service import TradeExecutionService
 from .prompt_builder import PromptBuilder
 from .notifications import get_notification_service
 from .execution_result import make_execution_result
-from ..api.websocket import publish_decision, publish_position_update
+from ..api.websocket import (
+    publish_decision,
+    publish_decision_stream,
+    publish_position_update,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +65,9 @@ class StrategyExecutionError(Exception):
 # Minimum position size in USD to avoid exchange rejections due to min order size
 MIN_POSITION_SIZE_USD = 10.0
 
+# Minimum interval between streamed-response websocket messages (seconds)
+STREAM_PUBLISH_INTERVAL = 0.25
+
 
 class StrategyEngine:
     """
@@ -218,6 +234,13 @@ class StrategyEngine:
         if base_url:
             kwargs["base_url"] = base_url
         self.ai_client = get_ai_client(model_id, **kwargs)
+        # Mock agents cloned from one template often send identical prompts
+        if (
+            self._settings.ai_response_cache_enabled
+            and self.agent
+            and self.agent.execution_mode == "mock"
+        ):
+            self.ai_client = CachedAIClient(self.ai_client, get_response_cache())
 
     async def run_cycle(self) -> dict:
         """
@@ -237,6 +260,7 @@ class StrategyEngine:
             "error": None,
             "latency_ms": 0,
             "tokens_used": 0,
+            "cached_tokens": 0,
             "decision_record_id": None,
         }
 
@@ -246,6 +270,7 @@ class StrategyEngine:
         raw_response = ""
         decision = None
         debate_result: Optional[DebateResult] = None
+        execution_results: Optional[list[dict]] = None
 
         # Resolve AI client from DB if not provided
         if self.ai_client is None:
@@ -329,6 +354,9 @@ class StrategyEngine:
                     market_contexts=market_contexts,
                 )
                 result["enhanced_context"] = True
+                context_latency = time.time() - start_time
+                result["context_latency_ms"] = int(context_latency * 1000)
+                get_metrics_collector().track_context_latency(context_latency)
             else:
                 # Fallback to basic market data
                 market_data = await self._get_market_data()
@@ -365,6 +393,9 @@ class StrategyEngine:
                 result["tokens_used"] = sum(
                     p.tokens_used for p in debate_result.participants
                 )
+                result["cached_tokens"] = sum(
+                    p.cached_tokens for p in debate_result.participants
+                )
                 result["debate"] = {
                     "models": [p.model_id for p in debate_result.participants],
                     "successful": debate_result.successful_participants,
@@ -378,28 +409,50 @@ class StrategyEngine:
                 self._update_parser_market_data(market_contexts)
                 self.decision_parser._validate_decisions(decision)
             else:
-                # Single model decision
-                ai_response = await self.ai_client.generate(
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
-                )
-                result["tokens_used"] = ai_response.tokens_used
-                raw_response = ai_response.content
-
                 # Inject market prices & ATR into parser so it can auto-fill
                 # missing SL/TP on open decisions.
                 self._update_parser_market_data(market_contexts)
 
-                decision = self.decision_parser.parse(raw_response)
+                # Single model decision
+                if self._should_stream():
+                    ai_response, early_decision, execution_results = (
+                        await self._generate_streaming(
+                            system_prompt, user_prompt, account_state
+                        )
+                    )
+                else:
+                    ai_response = await self.ai_client.generate(
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                    )
+                    early_decision = None
+                result["tokens_used"] = ai_response.tokens_used
+                result["cached_tokens"] = ai_response.cached_tokens
+                if ai_response.cached_tokens:
+                    get_metrics_collector().track_ai_cached_tokens(
+                        ai_response.model, ai_response.cached_tokens
+                    )
+                raw_response = ai_response.content
+
+                if early_decision is None:
+                    decision = self.decision_parser.parse(raw_response)
+                else:
+                    # Record exactly the decisions that were acted on
+                    try:
+                        decision = self.decision_parser.parse(raw_response)
+                        decision.decisions = early_decision.decisions
+                    except DecisionParseError:
+                        decision = early_decision
 
             self._last_decision = decision
             result["decision"] = decision
 
-            # 7. Execute decisions (if enabled)
+            # 7. Execute decisions (if enabled; streamed ones already ran)
             if self.auto_execute:
-                execution_results = await self._execute_decisions(
-                    decision, account_state
-                )
+                if execution_results is None:
+                    execution_results = await self._execute_decisions(
+                        decision, account_state
+                    )
                 result["executed"] = execution_results
 
             result["success"] = True
@@ -439,6 +492,7 @@ class StrategyEngine:
                 decision=decision,
                 execution_results=result.get("executed", []),
                 tokens_used=result["tokens_used"],
+                cached_tokens=result["cached_tokens"],
                 latency_ms=result["latency_ms"],
                 debate_result=debate_result,
                 market_contexts=market_contexts,
@@ -479,6 +533,128 @@ class StrategyEngine:
 
         return result
 
+    def _should_stream(self) -> bool:
+        """Whether the single-model call should stream its response"""
+        return bool(self._settings.ai_stream_decisions) and isinstance(
+            self.ai_client, BaseAIClient
+        )
+
+    async def _generate_streaming(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        account_state: AccountState,
+    ) -> tuple[AIResponse, Optional[DecisionResponse], Optional[list[dict]]]:
+        """
+        Stream the AI response and act on decisions as soon as they close.
+
+        The ``decisions`` array is validated and handed to
+        ``_execute_decisions`` the moment it closes, while the remaining
+        output keeps streaming to the websocket for display.
+
+        If the stream fails after the decisions were handed to execution
+        (a dropped connection, no final chunk), the orders stand: the text
+        received so far is returned as the response so the cycle records
+        what was executed.
+
+        Returns:
+            (ai_response, early_decision, execution_results); the last two
+            are None when no decisions could be extracted before the end
+        """
+        stream = self.decision_parser.stream()
+        early_decision: Optional[DecisionResponse] = None
+        execution_task: Optional[asyncio.Task] = None
+        ai_response: Optional[AIResponse] = None
+        pending: list[str] = []
+        last_publish = time.monotonic()
+        stream_error: Optional[Exception] = None
+
+        try:
+            async for chunk in self.ai_client.generate_stream(
+                system_prompt, user_prompt
+            ):
+                if chunk.response is not None:
+                    ai_response = chunk.response
+                if not chunk.content:
+                    continue
+
+                pending.append(chunk.content)
+                try:
+                    early = stream.feed(chunk.content)
+                except DecisionParseError as e:
+                    logger.warning(
+                        f"Streamed decisions invalid for strategy "
+                        f"{self.strategy.id}, waiting for full response: {e.message}"
+                    )
+                    early = None
+
+                if early is not None:
+                    early_decision = early
+                    if self.auto_execute:
+                        logger.info(
+                            f"Strategy {self.strategy.id}: executing "
+                            f"{len(early.decisions)} streamed decisions "
+                            f"after {len(stream.text)} chars"
+                        )
+                        execution_task = asyncio.create_task(
+                            self._execute_decisions(early, account_state)
+                        )
+                        await asyncio.sleep(0)  # Let the orders go out now
+
+                if time.monotonic() - last_publish >= STREAM_PUBLISH_INTERVAL:
+                    await self._publish_decision_stream("".join(pending))
+                    pending.clear()
+                    last_publish = time.monotonic()
+
+            if pending:
+                await self._publish_decision_stream("".join(pending))
+        except Exception as e:
+            if execution_task is None:
+                raise
+            stream_error = e
+        finally:
+            # Orders may already be in flight; never abandon them
+            execution_results = await execution_task if execution_task else None
+
+        if ai_response is None:
+            if execution_task is None:
+                raise StrategyExecutionError("AI stream ended without a response")
+            reason = stream_error or "AI stream ended without a response"
+            logger.warning(
+                f"Strategy {self.strategy.id}: AI stream failed after its "
+                f"decisions were executed, recording the partial response: {reason}"
+            )
+            ai_response = AIResponse(
+                content=stream.text,
+                model=self.ai_client.config.model,
+                provider=self.ai_client.provider,
+                tokens_used=0,
+                input_tokens=0,
+                output_tokens=0,
+                stop_reason="error",
+            )
+
+        return ai_response, early_decision, execution_results
+
+    async def _publish_decision_stream(self, delta: str) -> None:
+        """Forward streamed AI output to the websocket for live display"""
+        try:
+            user_id = (
+                str(self.agent.user_id)
+                if self.agent
+                else (str(self.strategy.user_id) if self.strategy.user_id else None)
+            )
+            if not user_id:
+                return
+
+            await publish_decision_stream(
+                user_id=user_id,
+                strategy_id=str(self.strategy.id),
+                delta=delta,
+            )
+        except Exception as e:
+            logger.debug(f"Failed to publish decision stream: {e}")
+
     async def _publish_decision_update(
         self,
         result: dict,
@@ -660,6 +836,7 @@ class StrategyEngine:
         debate_result: Optional[DebateResult] = None,
         market_contexts: Optional[dict] = None,
         account_state: Optional[AccountState] = None,
+        cached_tokens: int = 0,
     ) -> Optional[uuid.UUID]:
         """
         Save decision record to database.
@@ -675,6 +852,7 @@ class StrategyEngine:
             debate_result: Optional debate result if debate mode was used
             market_contexts: Optional dict of symbol -> MarketContext used for this decision
             account_state: Optional account state at the time of the decision
+            cached_tokens: Input tokens served from the provider prompt cache
 
         Returns:
             UUID of saved record, or None if no db_session
@@ -724,6 +902,7 @@ class StrategyEngine:
                     "confidence": p.overall_confidence,
                     "latency_ms": p.latency_ms,
                     "tokens_used": p.tokens_used,
+                    "cached_tokens": p.cached_tokens,
                     "error": p.error,
                     # 原始响应 - 用于调试和异常分析
                     "raw_response": p.raw_response,
@@ -809,6 +988,7 @@ class StrategyEngine:
             overall_confidence=decision.overall_confidence if decision else 0,
             ai_model=ai_model_label,
             tokens_used=tokens_used,
+            cached_tokens=cached_tokens,
             latency_ms=latency_ms,
             market_snapshot=market_snapshot,
             account_snapshot=account_snapshot_data,
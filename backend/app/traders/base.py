@@ -7,11 +7,14 @@ Each exchange (Hyperliquid, Binance, etc.) implements this interface.
 
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Literal, Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -448,6 +451,165 @@ class OHLCV:
         )
 
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=UTC)
+_MS = timedelta(milliseconds=1)
+
+
+class KlineSeries(Sequence):
+    """
+    Read-only K-line list backed by one NumPy array.
+
+    Rows are ``[timestamp_ms, open, high, low, close, volume]``, the layout of
+    ccxt ``fetch_ohlcv``.  The column properties (``closes``, ``highs``, ...)
+    are views into that array and slices are views too; ``OHLCV`` objects are
+    only built when an item is indexed or iterated.  Accepted wherever a
+    ``list[OHLCV]`` is, and equal to a list holding the same candles.
+
+    Usage:
+        klines = KlineSeries.from_ccxt(await exchange.fetch_ohlcv(...))
+        rsi = indicator_series.rsi(klines.closes, 14)
+        last = klines[-1]  # OHLCV
+    """
+
+    __slots__ = ("_data", "_utc")
+
+    COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, data, utc: bool = False):
+        """
+        Args:
+            data: Rows of [timestamp_ms, open, high, low, close, volume]
+            utc: Materialize timezone-aware UTC timestamps (naive UTC otherwise,
+                 like ``OHLCV.from_ccxt``)
+        """
+        array = np.asarray(data, dtype=np.float64)
+        if array.size == 0:
+            array = np.empty((0, 6))
+        elif array.ndim != 2 or array.shape[1] != 6:
+            raise ValueError(
+                "K-line rows must be [timestamp_ms, open, high, low, close, volume]"
+            )
+        array = array.view()
+        array.flags.writeable = False
+        self._data = array
+        self._utc = utc
+
+    @classmethod
+    def from_ccxt(cls, rows: list) -> "KlineSeries":
+        """Wrap ccxt ``fetch_ohlcv`` rows"""
+        return cls(rows)
+
+    @classmethod
+    def from_candles(cls, candles) -> "KlineSeries":
+        """Pack candles (objects with ``timestamp`` and OHLCV attributes)"""
+        candles = list(candles)
+        utc = bool(candles) and candles[0].timestamp.tzinfo is not None
+        epoch = _EPOCH_UTC if utc else _EPOCH
+        return cls(
+            [
+                (
+                    (c.timestamp - epoch) // _MS,
+                    c.open,
+                    c.high,
+                    c.low,
+                    c.close,
+                    c.volume,
+                )
+                for c in candles
+            ],
+            utc=utc,
+        )
+
+    @classmethod
+    def coerce(cls, klines) -> "KlineSeries":
+        """``klines`` itself if already a KlineSeries, else packed into one"""
+        if isinstance(klines, cls):
+            return klines
+        return cls.from_candles(klines)
+
+    # ==================== Sequence ====================
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return KlineSeries(self._data[index], self._utc)
+        return self._candle(self._data[index].tolist())
+
+    def __iter__(self):
+        for row in self._data.tolist():
+            yield self._candle(row)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, KlineSeries):
+            return self._utc == other._utc and np.array_equal(self._data, other._data)
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"KlineSeries({len(self)} candles)"
+
+    def _candle(self, row: list) -> OHLCV:
+        timestamp = _EPOCH + timedelta(milliseconds=row[0])
+        if self._utc:
+            timestamp = timestamp.replace(tzinfo=UTC)
+        return OHLCV(timestamp, row[1], row[2], row[3], row[4], row[5])
+
+    # ==================== Columns ====================
+
+    @property
+    def values(self) -> np.ndarray:
+        """The backing (read-only) array, one row per candle"""
+        return self._data
+
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        """Open times in epoch milliseconds (int64 copy)"""
+        return self._data[:, 0].astype(np.int64)
+
+    @property
+    def timestamps(self) -> list[datetime]:
+        """Open times as datetimes (as ``OHLCV.timestamp`` would hold them)"""
+        timestamps = self.timestamps_ms.astype("datetime64[ms]").tolist()
+        if self._utc:
+            return [ts.replace(tzinfo=UTC) for ts in timestamps]
+        return timestamps
+
+    @property
+    def opens(self) -> np.ndarray:
+        return self._data[:, 1]
+
+    @property
+    def highs(self) -> np.ndarray:
+        return self._data[:, 2]
+
+    @property
+    def lows(self) -> np.ndarray:
+        return self._data[:, 3]
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self._data[:, 4]
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self._data[:, 5]
+
+    @property
+    def utc(self) -> bool:
+        """True if materialized timestamps are timezone-aware (UTC)"""
+        return self._utc
+
+    def to_list(self) -> list[OHLCV]:
+        """Materialize every candle"""
+        return list(self)
+
+
 @dataclass
 class FundingRate:
     """Funding rate data point"""
@@ -605,6 +767,11 @@ class BaseTrader(ABC):
 
     # ==================== K-line / OHLCV Data ====================
 
+    @property
+    def max_kline_limit(self) -> int:
+        """Most candles one ``get_klines`` call returns"""
+        return 1000
+
     async def get_klines(
         self,
         symbol: str,
@@ -620,7 +787,7 @@ class BaseTrader(ABC):
             limit: Number of candles to fetch (default: 100)
 
         Returns:
-            List of OHLCV objects
+            List of OHLCV objects (exchange adapters return a KlineSeries)
 
         Note: Default implementation returns empty list. Override in subclasses
         that support K-line data fetching.
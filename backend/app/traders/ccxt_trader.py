@@ -19,9 +19,9 @@ from .base import (
     AccountState,
     BaseTrader,
     FundingRate,
+    KlineSeries,
     MarketData,
     MarketType,
-    OHLCV,
     OrderResult,
     Position,
     TradeError,
@@ -577,27 +577,30 @@ class CCXTTrader(BaseTrader):
     # K-lines / OHLCV
     # ------------------------------------------------------------------
 
+    @property
+    def max_kline_limit(self) -> int:
+        return _KLINE_MAX.get(self._exchange_id, 1000)
+
     async def get_klines(
         self,
         symbol: str,
         timeframe: str = "1h",
         limit: int = 100,
-    ) -> list[OHLCV]:
+    ) -> KlineSeries:
         self._ensure_initialized()
         ccxt_symbol = self._to_ccxt_symbol(symbol)
-        max_limit = _KLINE_MAX.get(self._exchange_id, 1000)
         try:
             data = await self._exchange.fetch_ohlcv(
                 ccxt_symbol,
                 timeframe=timeframe,
-                limit=min(limit, max_limit),
+                limit=min(limit, self.max_kline_limit),
             )
             if not data:
-                return []
-            return [OHLCV.from_ccxt(c) for c in data]
+                return KlineSeries([])
+            return KlineSeries.from_ccxt(data)
         except Exception as e:
             logger.warning(f"Failed to get klines for {symbol} ({timeframe}): {e}")
-            return []
+            return KlineSeries([])
 
     async def get_funding_history(
         self,
@@ -29,8 +29,8 @@ from .base import (
     AccountState,
     BaseTrader,
     FundingRate,
+    KlineSeries,
     MarketData,
-    OHLCV,
     OrderResult,
     Position,
     TradeError,
@@ -414,10 +414,10 @@ class MockTrader(BaseTrader):
         symbol: str,
         timeframe: str = "1h",
         limit: int = 100,
-    ) -> list[OHLCV]:
+    ) -> KlineSeries:
         """Fetch K-line data from public API."""
         if not self._ccxt:
-            return []
+            return KlineSeries([])
 
         ccxt_symbol = self._to_ccxt_symbol(symbol)
         try:
@@ -427,11 +427,11 @@ class MockTrader(BaseTrader):
                 limit=min(limit, 1000),
             )
             if not data:
-                return []
-            return [OHLCV.from_ccxt(c) for c in data]
+                return KlineSeries([])
+            return KlineSeries.from_ccxt(data)
         except Exception as e:
             logger.warning(f"Failed to get klines for {symbol}: {e}")
-            return []
+            return KlineSeries([])
 
     async def get_funding_history(
         self,
@@ -22,7 +22,9 @@ from .lifecycle import (
     release_ownership,
     acquire_execution_lock,
     release_execution_lock,
+    register_market_context_feed,
     register_price_prefetch_symbols,
+    unregister_market_context_feed,
     unregister_price_prefetch_symbols,
 )
 from ..core.config import get_settings
@@ -555,6 +557,14 @@ class AIWorkerBackend(BaseWorkerBackend):
                 ):
                     self._prefetch_registered.add(agent_id)
 
+                # Precompute market contexts at candle close, shared with
+                # other agents watching the same symbols.
+                await register_market_context_feed(
+                    agent_id=agent_id,
+                    trader=trader,
+                    strategy_config=strategy.config,
+                )
+
                 mode = "mock" if agent.execution_mode == "mock" else "live"
                 logger.info(f"Started AI worker for agent {agent_id} ({mode} mode)")
                 return True
@@ -580,6 +590,7 @@ class AIWorkerBackend(BaseWorkerBackend):
         if agent_id in self._prefetch_registered:
             await unregister_price_prefetch_symbols(agent_id)
             self._prefetch_registered.discard(agent_id)
+        await unregister_market_context_feed(agent_id)
         return True
 
     async def trigger_execution(
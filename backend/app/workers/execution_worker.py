@@ -36,7 +36,9 @@ from ..services.worker_heartbeat import (
     clear_heartbeat,
 )
 from .lifecycle import (
+    register_market_context_feed,
     register_price_prefetch_symbols,
+    unregister_market_context_feed,
     unregister_price_prefetch_symbols,
 )
 from ..services.strategy_engine import StrategyEngine
@@ -515,6 +517,14 @@ class WorkerManager:
                 ):
                     self._prefetch_registered.add(agent_id)
 
+                # Precompute market contexts at candle close, shared with
+                # other agents watching the same symbols.
+                await register_market_context_feed(
+                    agent_id=agent_id,
+                    trader=trader,
+                    strategy_config=strategy.config,
+                )
+
                 mode = "mock" if agent.execution_mode == "mock" else "live"
                 logger.info(f"Started worker for agent {agent_id} ({mode} mode)")
                 return True
@@ -557,6 +567,7 @@ class WorkerManager:
         if agent_id in self._prefetch_registered:
             await unregister_price_prefetch_symbols(agent_id)
             self._prefetch_registered.discard(agent_id)
+        await unregister_market_context_feed(agent_id)
         return True
 
     # Backward compatibility aliases
@@ -426,6 +426,56 @@ async def unregister_price_prefetch_symbols(agent_id: str) -> None:
         )
 
 
+async def register_market_context_feed(
+    agent_id: str,
+    trader,
+    strategy_config: Optional[dict],
+) -> bool:
+    """
+    Register an AI agent's symbols with the MarketContextBuilder, so its
+    market contexts are precomputed at each candle close.
+
+    Returns:
+        True if the agent was registered.
+    """
+    if trader is None:
+        return False
+
+    try:
+        from ..models.strategy import AIStrategyConfig
+        from ..services.market_context_builder import get_market_context_builder
+
+        config = (
+            AIStrategyConfig(**strategy_config)
+            if strategy_config
+            else AIStrategyConfig()
+        )
+        if not config.symbols:
+            return False
+
+        builder = get_market_context_builder()
+        await builder.start()
+        builder.register(agent_id, trader, config)
+        return True
+    except Exception as e:
+        logger.warning(
+            f"Failed to register market context feed for agent {agent_id}: {e}"
+        )
+        return False
+
+
+async def unregister_market_context_feed(agent_id: str) -> None:
+    """Unregister an agent from the MarketContextBuilder."""
+    try:
+        from ..services.market_context_builder import get_market_context_builder
+
+        get_market_context_builder().unregister_agent(agent_id)
+    except Exception as e:
+        logger.warning(
+            f"Failed to unregister market context feed for agent {agent_id}: {e}"
+        )
+
+
 async def clear_heartbeats_for_quant_strategies() -> int:
     """
     Clear heartbeats for all active quant strategies on startup.
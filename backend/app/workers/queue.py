@@ -6,6 +6,7 @@ distributed task queue without needing to manage workers directly.
 """
 
 import logging
+import uuid
 from datetime import timedelta
 from typing import Any, Optional
 
@@ -14,10 +15,19 @@ from arq.connections import RedisSettings
 from arq.jobs import Job
 
 from ..core.config import get_settings
+from ..services.backtest_jobs import (
+    FINAL_STATUSES,
+    BacktestJobStatus,
+    BacktestJobStore,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class BacktestLimitExceeded(Exception):
+    """User already has the maximum number of queued/running backtests"""
+
+
 class TaskQueueService:
     """
     Service for interacting with the ARQ task queue.
@@ -238,6 +248,120 @@ class TaskQueueService:
             logger.error(f"Failed to trigger execution for agent {agent_id}: {e}")
             return None
 
+    # ==================== Backtest Tasks ====================
+
+    async def submit_backtest(
+        self,
+        user_id: str,
+        kind: str,
+        params: dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Queue a backtest for execution by a worker.
+
+        Args:
+            user_id: Owner of the backtest
+            kind: ``strategy`` (saved strategy), ``quick`` (inline config),
+                ``sweep`` or ``walk_forward``
+            params: JSON-serializable backtest request parameters
+
+        Returns:
+            Job ID if queued, None if the queue is unavailable
+
+        Raises:
+            BacktestLimitExceeded: If the user is at the concurrency cap
+        """
+        settings = get_settings()
+        job_id = f"backtest:{uuid.uuid4().hex}"
+        store = BacktestJobStore(self.redis)
+
+        if not await store.create(
+            job_id,
+            user_id,
+            kind,
+            max_active=settings.backtest_max_concurrent_jobs_per_user,
+            active_ttl=settings.backtest_job_timeout * 2,
+        ):
+            raise BacktestLimitExceeded(
+                f"At most {settings.backtest_max_concurrent_jobs_per_user} "
+                "backtests can run at the same time"
+            )
+
+        try:
+            job = await self.redis.enqueue_job(
+                "run_backtest_job",
+                job_id,
+                user_id,
+                kind,
+                params,
+                _job_id=job_id,
+                _queue_name=self.QUEUE_NAME,
+            )
+            if job is None:
+                raise RuntimeError("duplicate job id")
+            logger.info(f"Queued backtest {job_id} for user {user_id}")
+            return job_id
+        except Exception as e:
+            logger.error(f"Failed to queue backtest for user {user_id}: {e}")
+            await store.finish(job_id, user_id, BacktestJobStatus.FAILED, error=str(e))
+            return None
+
+    async def get_backtest_job(
+        self, job_id: str, user_id: str
+    ) -> Optional[dict[str, Any]]:
+        """
+        Get a backtest job's status document.
+
+        Returns:
+            Job dict, or None if missing or owned by another user
+        """
+        job = await BacktestJobStore(self.redis).get(job_id)
+        if job is None or job.get("user_id") != user_id:
+            return None
+        return job
+
+    async def list_backtest_jobs(self, user_id: str) -> list[dict[str, Any]]:
+        """Get the user's queued and running backtests"""
+        store = BacktestJobStore(self.redis)
+        jobs = []
+        for job_id in await store.active_jobs(user_id):
+            job = await store.get(job_id)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    async def cancel_backtest(self, job_id: str, user_id: str) -> bool:
+        """
+        Cancel a queued or running backtest.
+
+        Queued jobs are aborted before they start; running jobs see the
+        cancellation flag at their next progress update.
+
+        Returns:
+            True if the job exists, belongs to the user and was not finished
+        """
+        store = BacktestJobStore(self.redis)
+        job = await store.get(job_id)
+        if job is None or job.get("user_id") != user_id:
+            return False
+        if job.get("status") in FINAL_STATUSES:
+            return False
+
+        await store.request_cancel(job_id)
+        if job.get("status") == BacktestJobStatus.QUEUED.value:
+            try:
+                await Job(job_id, self.redis, _queue_name=self.QUEUE_NAME).abort(
+                    timeout=0
+                )
+            except Exception:
+                pass  # Job may already have been picked up
+            job = await store.finish(job_id, user_id, BacktestJobStatus.CANCELLED)
+            if job:
+                await store.publish(job)
+
+        logger.info(f"Cancellation requested for backtest {job_id}")
+        return True
+
     # ==================== Job Status ====================
 
     async def get_job_status(self, job_id: str) -> Optional[dict[str, Any]]:
@@ -11,13 +11,15 @@ Architecture (v2 - Agent-based):
 - Heartbeat tracking for crash recovery
 """
 
+import asyncio
 import logging
 import uuid
 from datetime import UTC, datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 from arq import ArqRedis
 from arq.jobs import Job
+from arq.worker import func
 
 from ..core.config import get_settings
 from ..db.database import AsyncSessionLocal
@@ -1198,6 +1200,319 @@ async def reconcile_positions(ctx: dict) -> dict[str, Any]:
     return total_summary
 
 
+# ==================== Backtest Jobs ====================
+
+
+async def _resolve_backtest_ai_clients(
+    session, user_id: str, params: dict[str, Any]
+) -> tuple[Any, Any]:
+    """Build the decision and analysis AI clients of a queued backtest."""
+    from ..core.security import get_crypto_service
+    from ..services.ai import get_ai_client, resolve_provider_credentials
+
+    model_id = params.get("ai_model")
+    if not model_id:
+        if params.get("use_ai"):
+            raise ValueError("AI model is required when use_ai is enabled")
+        return None, None
+
+    api_key, base_url = await resolve_provider_credentials(
+        session, get_crypto_service(), uuid.UUID(user_id), model_id
+    )
+    is_custom = "custom" in (model_id.split(":")[0] if ":" in model_id else "").lower()
+    if not api_key and not is_custom:
+        if params.get("use_ai"):
+            raise ValueError("No API key configured for the selected AI model")
+        return None, None
+
+    kwargs = {"api_key": api_key or ""}
+    if base_url:
+        kwargs["base_url"] = base_url
+    client = get_ai_client(model_id, **kwargs)
+    return (client if params.get("use_ai") else None), client
+
+
+async def _run_backtest_search(
+    kind: str,
+    params: dict[str, Any],
+    progress_callback: Callable[[int, int], Awaitable[None]],
+) -> dict[str, Any]:
+    """
+    Run a queued parameter sweep or walk-forward optimization.
+
+    ``progress_callback`` is awaited with (runs done, total runs) after each
+    backtest run and may raise ``BacktestCancelled`` to stop the search.
+    """
+    from ..backtest import DataProvider
+    from ..backtest.robustness import WalkForwardOptimizer, walk_forward_windows
+    from ..backtest.sweep import ParameterSweep, expand_grid
+    from ..models.decision import RiskControls
+    from ..models.strategy import StrategyConfig
+
+    data_provider = DataProvider(exchange=params["exchange"], columnar=True)
+    await data_provider.initialize()
+    try:
+        await data_provider.load_data(
+            symbols=params["symbols"],
+            start_date=datetime.fromisoformat(params["start_date"]),
+            end_date=datetime.fromisoformat(params["end_date"]),
+            timeframe=params["timeframe"],
+        )
+    finally:
+        await data_provider.close()
+    store = data_provider.get_store()
+    if store is None or not len(store):
+        raise ValueError("No data to backtest")
+
+    config = StrategyConfig(
+        symbols=params["symbols"],
+        risk_controls=RiskControls(
+            max_leverage=params["max_leverage"],
+            max_position_ratio=params["max_position_ratio"],
+        ),
+    ).model_dump()
+
+    if kind == "sweep":
+        sweep = ParameterSweep(
+            store,
+            strategy_config=config,
+            strategy_name="Parameter Sweep",
+            initial_balance=params["initial_balance"],
+            intrabar_policy=params.get("intrabar_policy", "stop_first"),
+        )
+        result = await sweep.run(
+            params["grid"],
+            rank_by=params["rank_by"],
+            progress_callback=progress_callback,
+        )
+        return result.to_dict()
+
+    # The window count is only known once the candles are loaded
+    windows = len(
+        walk_forward_windows(
+            len(store),
+            params["in_sample_bars"],
+            params["out_of_sample_bars"],
+            params.get("step_bars"),
+        )
+    )
+    evaluations = len(expand_grid(params["grid"])) * windows
+    limit = get_settings().backtest_sweep_max_combinations
+    if evaluations > limit:
+        raise ValueError(
+            f"Walk-forward needs {evaluations} backtest runs; the limit is {limit}"
+        )
+
+    optimizer = WalkForwardOptimizer(
+        store,
+        strategy_config=config,
+        strategy_name="Walk-Forward",
+        initial_balance=params["initial_balance"],
+        intrabar_policy=params.get("intrabar_policy", "stop_first"),
+    )
+    result = await optimizer.run(
+        params["grid"],
+        in_sample_bars=params["in_sample_bars"],
+        out_of_sample_bars=params["out_of_sample_bars"],
+        step_bars=params.get("step_bars"),
+        rank_by=params["rank_by"],
+        monte_carlo_simulations=params.get("monte_carlo_simulations", 0),
+        seed=params.get("seed"),
+        progress_callback=progress_callback,
+    )
+    return result.to_dict()
+
+
+async def run_backtest_job(
+    ctx: dict,
+    job_id: str,
+    user_id: str,
+    kind: str,
+    params: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Run a queued backtest and persist its result.
+
+    Progress (candles processed, equity) is written to the job document and
+    published for websocket delivery; the job stops at the next progress
+    update once cancellation is requested.  Sweeps and walk-forward runs
+    report progress (and see cancellation) after each backtest run; their
+    results are not backtest records and are stored inline in the job
+    document.
+
+    Args:
+        ctx: ARQ context
+        job_id: Backtest job ID (also the ARQ job ID)
+        user_id: Owner of the backtest
+        kind: ``strategy`` (saved strategy), ``quick`` (inline config),
+            ``sweep`` or ``walk_forward``
+        params: Backtest request parameters (JSON form)
+
+    Returns:
+        Dict with final status and persisted result ID
+    """
+    from ..backtest import BacktestCancelled, BacktestEngine, DataProvider
+    from ..db.models import StrategyDB
+    from ..db.repositories.backtest import BacktestRepository
+    from ..models.decision import RiskControls
+    from ..models.strategy import StrategyConfig
+    from ..services.backtest_jobs import BacktestJobStatus, BacktestJobStore
+
+    store = BacktestJobStore(ctx["redis"])
+    job = await store.update(
+        job_id,
+        status=BacktestJobStatus.RUNNING.value,
+        started_at=datetime.now(UTC).isoformat(),
+    )
+    if job is None:
+        logger.warning(f"Backtest job {job_id} has no status document, skipping")
+        return {"job_id": job_id, "status": BacktestJobStatus.FAILED.value}
+    await store.publish(job)
+
+    async def on_progress(processed: int, total: int, equity: float) -> None:
+        if await store.is_cancel_requested(job_id):
+            raise BacktestCancelled(job_id)
+        job = await store.update(
+            job_id,
+            candles_processed=processed,
+            total_candles=total,
+            progress=round(processed / total * 100, 1) if total else 100.0,
+            equity=round(equity, 2),
+        )
+        if job:
+            await store.publish(job)
+
+    async def on_search_progress(done: int, total: int) -> None:
+        if await store.is_cancel_requested(job_id):
+            raise BacktestCancelled(job_id)
+        job = await store.update(
+            job_id, progress=round(min(done / total, 1.0) * 100, 1)
+        )
+        if job:
+            await store.publish(job)
+
+    engine = None
+    final_status = BacktestJobStatus.FAILED
+    fields: dict[str, Any] = {}
+    try:
+        if kind in ("sweep", "walk_forward"):
+            result = await _run_backtest_search(kind, params, on_search_progress)
+            final_status = BacktestJobStatus.COMPLETED
+            fields = {"result": result, "progress": 100.0}
+            logger.info(f"Backtest job {job_id} completed")
+            return {"job_id": job_id, "status": final_status.value, "result_id": None}
+
+        async with AsyncSessionLocal() as session:
+            start_date = datetime.fromisoformat(params["start_date"])
+            end_date = datetime.fromisoformat(params["end_date"])
+            ai_client = analysis_ai_client = None
+
+            if kind == "strategy":
+                strategy = await StrategyRepository(session).get_by_id(
+                    uuid.UUID(params["strategy_id"]), user_id
+                )
+                if not strategy:
+                    raise ValueError("Strategy not found")
+                config = (
+                    StrategyConfig(**strategy.config)
+                    if strategy.config
+                    else StrategyConfig()
+                )
+                symbols = params.get("symbols") or config.symbols
+                ai_client, analysis_ai_client = await _resolve_backtest_ai_clients(
+                    session, user_id, params
+                )
+                strategy_id = strategy.id
+            elif kind == "quick":
+                symbols = params["symbols"]
+                config = StrategyConfig(
+                    symbols=symbols,
+                    risk_controls=RiskControls(
+                        max_leverage=params["max_leverage"],
+                        max_position_ratio=params["max_position_ratio"],
+                    ),
+                )
+                strategy = StrategyDB(
+                    id=uuid.UUID("00000000-0000-0000-0000-000000000000"),
+                    user_id=user_id,
+                    type="ai",
+                    name="Quick Backtest",
+                    description="Temporary backtest",
+                    symbols=symbols,
+                    config=config.model_dump(),
+                )
+                strategy_id = None
+            else:
+                raise ValueError(f"Unknown backtest kind: {kind}")
+
+            data_provider = DataProvider(exchange=params["exchange"])
+            await data_provider.initialize()
+            engine = BacktestEngine(
+                strategy=strategy,
+                initial_balance=params["initial_balance"],
+                start_date=start_date,
+                end_date=end_date,
+                data_provider=data_provider,
+                use_ai=bool(params.get("use_ai")),
+                ai_client=ai_client,
+                analysis_ai_client=analysis_ai_client,
+                progress_callback=on_progress,
+                intrabar_policy=params.get("intrabar_policy", "stop_first"),
+                intrabar_timeframe=params.get("intrabar_timeframe"),
+                ai_replay=params.get("ai_replay"),
+            )
+            await data_provider.load_data(
+                symbols=symbols,
+                start_date=start_date,
+                end_date=end_date,
+                timeframe=params["timeframe"],
+            )
+
+            result = await engine.run()
+
+            record = await BacktestRepository(session).create_from_result(
+                user_id=uuid.UUID(user_id),
+                strategy_id=strategy_id,
+                result=result,
+                symbols=symbols,
+                exchange=params["exchange"],
+                timeframe=params["timeframe"],
+                use_ai=bool(params.get("use_ai")),
+            )
+            await session.commit()
+
+        final_status = BacktestJobStatus.COMPLETED
+        fields = {"result_id": str(record.id), "progress": 100.0}
+        logger.info(f"Backtest job {job_id} completed: result {record.id}")
+
+    except BacktestCancelled:
+        final_status = BacktestJobStatus.CANCELLED
+        logger.info(f"Backtest job {job_id} cancelled")
+    except asyncio.CancelledError:
+        # Aborted by ARQ (or worker shutdown): record and propagate
+        final_status = BacktestJobStatus.CANCELLED
+        logger.info(f"Backtest job {job_id} aborted")
+        raise
+    except Exception as e:
+        fields = {"error": str(e)}
+        logger.exception(f"Backtest job {job_id} failed: {e}")
+    finally:
+        if engine is not None:
+            try:
+                await engine.cleanup()
+            except Exception:
+                pass
+        job = await store.finish(job_id, user_id, final_status, **fields)
+        if job:
+            await store.publish(job)
+
+    return {
+        "job_id": job_id,
+        "status": final_status.value,
+        "result_id": fields.get("result_id"),
+    }
+
+
 # ==================== Worker Startup/Shutdown ====================
 
 
@@ -1222,6 +1537,21 @@ async def shutdown(ctx: dict) -> None:
 # ==================== Worker Settings ====================
 
 
+def _backtest_job_function():
+    """
+    ``run_backtest_job`` with its own timeout and no retries.
+
+    Backtests outlive the 5 minute default job timeout, and a retry would
+    rerun a job whose status has already been recorded.
+    """
+    return func(
+        run_backtest_job,
+        name="run_backtest_job",
+        timeout=get_settings().backtest_job_timeout,
+        max_tries=1,
+    )
+
+
 def get_worker_settings() -> dict:
     """
     Get ARQ worker settings.
@@ -1245,6 +1575,8 @@ def get_worker_settings() -> dict:
             sync_active_strategies,
             reconcile_positions,
             create_daily_snapshots,
+            # Backtests
+            _backtest_job_function(),
         ],
         "on_startup": startup,
         "on_shutdown": shutdown,
@@ -1260,6 +1592,7 @@ def get_worker_settings() -> dict:
         "retry_delay": 60,  # 1 minute between retries
         "health_check_interval": 30,  # Health check every 30 seconds
         "queue_name": "bitrun:tasks",
+        "allow_abort_jobs": True,  # Backtest cancellation
         "cron_jobs": [
             # Sync agents every 5 minutes (handles heartbeat recovery)
             {
@@ -1300,6 +1633,8 @@ class WorkerSettings:
         sync_active_strategies,
         reconcile_positions,
         create_daily_snapshots,
+        # Backtests
+        _backtest_job_function(),
     ]
 
     on_startup = startup
@@ -1311,6 +1646,7 @@ class WorkerSettings:
     retry_delay = 60
     health_check_interval = 30
     queue_name = "bitrun:tasks"
+    allow_abort_jobs = True
 
     @staticmethod
     def redis_settings():
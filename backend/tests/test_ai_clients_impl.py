@@ -602,3 +602,217 @@ class TestCredentialResolution:
 
         assert api_key == "my-api-key"
         assert base_url is None
+
+
+# ============================================================================
+# Streaming Tests
+# ============================================================================
+
+def _make_stream_event(content=None, finish_reason=None, usage=None, model="gpt-4o"):
+    """Create a mock OpenAI chat completion chunk."""
+    event = MagicMock()
+    event.model = model
+    event.usage = usage
+    if content is None and finish_reason is None:
+        event.choices = []
+    else:
+        event.choices = [MagicMock()]
+        event.choices[0].delta.content = content
+        event.choices[0].finish_reason = finish_reason
+    return event
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class TestGenerateStream:
+    """Tests for generate_stream (OpenAI-compatible streaming and fallback)."""
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_yields_deltas_then_response(self):
+        """Test deltas are yielded and the final chunk carries the full response."""
+        mock_openai, mock_async_client = _make_mock_openai()
+        usage = MagicMock(prompt_tokens=12, completion_tokens=3)
+        events = [
+            _make_stream_event('{"a"'),
+            _make_stream_event(": 1}", finish_reason="stop"),
+            _make_stream_event(usage=usage),
+        ]
+        mock_async_client.chat.completions.create = AsyncMock(
+            return_value=_aiter(events)
+        )
+
+        with patch("app.services.ai.openai_client._get_openai", return_value=mock_openai):
+            client = OpenAIClient(AIClientConfig(api_key="sk-test", model="gpt-4o"))
+            chunks = [c async for c in client.generate_stream("sys", "usr")]
+
+        assert [c.content for c in chunks] == ['{"a"', ": 1}", ""]
+        assert all(c.response is None for c in chunks[:-1])
+        response = chunks[-1].response
+        assert response.content == '{"a": 1}'
+        assert response.stop_reason == "stop"
+        assert response.tokens_used == 15
+
+        call_kwargs = mock_async_client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["stream_options"] == {"include_usage": True}
+        assert call_kwargs["response_format"] == {"type": "json_object"}
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_maps_errors(self):
+        """Test SDK errors raised while streaming map to AIClientError types."""
+        mock_openai, mock_async_client = _make_mock_openai()
+        mock_async_client.chat.completions.create = AsyncMock(
+            side_effect=mock_openai.RateLimitError("slow down")
+        )
+
+        with patch("app.services.ai.openai_client._get_openai", return_value=mock_openai):
+            client = OpenAIClient(AIClientConfig(api_key="sk-test", model="gpt-4o"))
+            with pytest.raises(AIRateLimitError):
+                async for _ in client.generate_stream("sys", "usr"):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_default_stream_falls_back_to_generate(self):
+        """Test providers without streaming yield the whole response once."""
+        client = ConcreteAIClient(AIClientConfig(api_key="test", model="test"))
+        response = AIResponse(
+            content="{}",
+            model="test",
+            provider=AIProvider.CUSTOM,
+            tokens_used=2,
+            input_tokens=1,
+            output_tokens=1,
+        )
+        client.generate = AsyncMock(return_value=response)
+
+        chunks = [c async for c in client.generate_stream("sys", "usr")]
+
+        assert len(chunks) == 1
+        assert chunks[0].content == "{}"
+        assert chunks[0].response is response
+
+
+# ============================================================================
+# Prompt Caching Tests
+# ============================================================================
+
+class TestPromptCaching:
+    """Tests for prompt-prefix cache hints and cached-token reporting."""
+
+    def test_cached_prompt_tokens_openai_style(self):
+        from app.services.ai.base import cached_prompt_tokens
+
+        usage = MagicMock()
+        usage.prompt_tokens_details.cached_tokens = 1024
+        assert cached_prompt_tokens(usage) == 1024
+
+    def test_cached_prompt_tokens_deepseek_style(self):
+        from types import SimpleNamespace
+
+        from app.services.ai.base import cached_prompt_tokens
+
+        usage = SimpleNamespace(prompt_tokens=2000, prompt_cache_hit_tokens=1536)
+        assert cached_prompt_tokens(usage) == 1536
+        assert cached_prompt_tokens(SimpleNamespace(prompt_tokens=10)) == 0
+        assert cached_prompt_tokens(None) == 0
+
+    @pytest.mark.asyncio
+    async def test_openai_generate_reports_cached_tokens_and_cache_key(self):
+        from app.services.ai.base import prompt_cache_key
+
+        mock_openai, mock_async_client = _make_mock_openai()
+        mock_resp = _make_mock_response()
+        mock_resp.usage.prompt_tokens_details.cached_tokens = 8
+        mock_async_client.chat.completions.create = AsyncMock(return_value=mock_resp)
+
+        with patch("app.services.ai.openai_client._get_openai", return_value=mock_openai):
+            client = OpenAIClient(AIClientConfig(api_key="sk-test", model="gpt-4o"))
+            response = await client.generate("static system prompt", "usr")
+
+        assert response.cached_tokens == 8
+        call_kwargs = mock_async_client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["extra_body"] == {
+            "prompt_cache_key": prompt_cache_key("static system prompt")
+        }
+        assert prompt_cache_key("static system prompt") == prompt_cache_key(
+            "static system prompt"
+        )
+
+
+class TestGeminiContextCache:
+    """Tests for GeminiClient's server-side CachedContent lifecycle."""
+
+    PROMPT = "x" * 20000
+
+    def _client(self, mock_genai):
+        from app.services.ai.gemini_client import GeminiClient
+
+        with patch(
+            "app.services.ai.gemini_client._get_genai", return_value=mock_genai
+        ):
+            return GeminiClient(AIClientConfig(api_key="key", model="gemini-2.0-flash"))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_create(self):
+        import asyncio
+        import time
+
+        def create(**kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+
+        mock_genai = MagicMock()
+        mock_genai.caching.CachedContent.create.side_effect = create
+        client = self._client(mock_genai)
+
+        with patch(
+            "app.services.ai.gemini_client._get_genai", return_value=mock_genai
+        ):
+            results = await asyncio.gather(
+                *(client._get_cached_content(self.PROMPT) for _ in range(3))
+            )
+
+        assert mock_genai.caching.CachedContent.create.call_count == 1
+        assert results[0] is results[1] is results[2]
+
+    @pytest.mark.asyncio
+    async def test_refreshed_content_deletes_superseded(self):
+        import time
+
+        from app.services.ai.gemini_client import CACHE_TTL
+
+        mock_genai = MagicMock()
+        old, new = MagicMock(), MagicMock()
+        mock_genai.caching.CachedContent.create.side_effect = [old, new]
+        client = self._client(mock_genai)
+
+        with patch(
+            "app.services.ai.gemini_client._get_genai", return_value=mock_genai
+        ):
+            assert await client._get_cached_content(self.PROMPT) is old
+            later = time.monotonic() + CACHE_TTL.total_seconds() * 0.95
+            with patch("time.monotonic", return_value=later):
+                assert await client._get_cached_content(self.PROMPT) is new
+
+        old.delete.assert_called_once_with()
+        new.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_evicted_content_deleted(self):
+        mock_genai = MagicMock()
+        first, second = MagicMock(), MagicMock()
+        mock_genai.caching.CachedContent.create.side_effect = [first, second]
+        with patch("app.services.ai.gemini_client.CACHE_MAX_ENTRIES", 1):
+            client = self._client(mock_genai)
+
+        with patch(
+            "app.services.ai.gemini_client._get_genai", return_value=mock_genai
+        ):
+            await client._get_cached_content(self.PROMPT)
+            await client._get_cached_content(self.PROMPT + "y")
+
+        first.delete.assert_called_once_with()
+        second.delete.assert_not_called()
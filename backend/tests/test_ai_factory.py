@@ -4,6 +4,7 @@ Tests for AI Client Factory and Base Classes.
 Covers: AIClientFactory, BaseAIClient, ModelInfo, AIClientConfig
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -595,3 +596,142 @@ class TestAIProvider:
         """Test invalid provider string"""
         with pytest.raises(ValueError):
             AIProvider("invalid")
+
+
+# ============================================================================
+# Client Pool Tests
+# ============================================================================
+
+class _FakeTransport:
+    """Inner transport answering chat completions; the first request opens a connection."""
+
+    def __init__(self):
+        import httpx
+
+        self.httpx = httpx
+        self.requests = 0
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        trace = request.extensions.get("trace")
+        if trace is not None and self.requests == 1:
+            await trace("connection.connect_tcp.started", {})
+            await trace("connection.start_tls.complete", {})
+        return self.httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "deepseek-chat",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "{}"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+            },
+        )
+
+    async def aclose(self):
+        pass
+
+
+class TestClientPool:
+    """Tests for pooled AI clients"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        clear_client_cache()
+        yield
+        clear_client_cache()
+
+    @pytest.mark.asyncio
+    async def test_clients_share_pool_per_endpoint_and_key(self):
+        from app.services.ai import factory
+
+        first = get_ai_client("deepseek:deepseek-chat", api_key="key-a")
+        assert get_ai_client("deepseek:deepseek-chat", api_key="key-a") is first
+        other_model = get_ai_client("deepseek:deepseek-reasoner", api_key="key-a")
+        other_key = get_ai_client("deepseek:deepseek-chat", api_key="key-b")
+
+        assert other_model is not first
+        assert other_model.config.http_client is first.config.http_client
+        assert other_key.config.http_client is not first.config.http_client
+        assert len(factory._CLIENT_CACHE) == 2
+        assert all("key-a" not in str(key) for key in factory._CLIENT_CACHE)
+
+    def test_no_pool_outside_event_loop(self):
+        from app.services.ai import factory
+
+        client = get_ai_client("deepseek:deepseek-chat", api_key="key-a")
+        assert client.config.http_client is None
+        assert factory._CLIENT_CACHE == {}
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_connection_and_report_setup(self):
+        from app.services.ai import factory
+
+        client = get_ai_client("deepseek:deepseek-chat", api_key="key-a")
+        pooled = next(iter(factory._CLIENT_CACHE.values()))
+        inner = _FakeTransport()
+        pooled.transport._transport = inner
+
+        with patch("app.services.ai.client_pool._track") as track:
+            for _ in range(3):
+                response = await client.generate("system", "user")
+                assert response.content == "{}"
+
+        assert inner.requests == 3
+        setups = [call.args[1] for call in track.call_args_list]
+        assert setups[0] > 0 and setups[1:] == [0.0, 0.0]
+        stats = factory.get_client_pool_stats()[0]
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_limit(self, monkeypatch):
+        import httpx
+
+        from app.services.ai import client_pool
+
+        monkeypatch.setattr(client_pool, "_limiters", {})
+        monkeypatch.setattr(client_pool, "_settings", lambda: (300, 1, {}))
+        http = httpx.AsyncClient(
+            transport=client_pool.PooledTransport(AIProvider.QWEN, _FakeTransport())
+        )
+
+        async with http.stream("GET", "https://example.test/a") as first:
+            second = asyncio.create_task(http.get("https://example.test/b"))
+            await asyncio.sleep(0.05)
+            assert not second.done()  # Waits for the first body to close
+        assert (await second).status_code == 200
+        await http.aclose()
+
+    @pytest.mark.asyncio
+    async def test_idle_entries_evicted(self):
+        from app.services.ai import factory
+
+        get_ai_client("deepseek:deepseek-chat", api_key="key-a")
+        pooled = next(iter(factory._CLIENT_CACHE.values()))
+        assert factory.evict_idle_clients() == 0
+
+        pooled.transport.last_used -= 3600
+        assert factory.evict_idle_clients() == 1
+        assert factory._CLIENT_CACHE == {}
+        await asyncio.sleep(0)
+        assert pooled.http_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_close_client_pools(self):
+        from app.services.ai import factory
+
+        get_ai_client("deepseek:deepseek-chat", api_key="key-a")
+        pooled = next(iter(factory._CLIENT_CACHE.values()))
+
+        await factory.close_client_pools()
+        assert factory._CLIENT_CACHE == {}
+        assert pooled.http_client.is_closed
@@ -0,0 +1,174 @@
+"""
+Tests for app.services.ai.response_cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.ai.base import (
+    AIClientConfig,
+    AIProvider,
+    AIResponse,
+    AIStreamChunk,
+    BaseAIClient,
+)
+from app.services.ai.response_cache import (
+    CachedAIClient,
+    ResponseCache,
+    normalize_prompt,
+    response_cache_key,
+)
+
+
+class _FakeClient(BaseAIClient):
+    def __init__(self, content='{"decisions": []}', delay=0.0):
+        super().__init__(AIClientConfig(api_key="k", model="deepseek-chat"))
+        self.content = content
+        self.delay = delay
+        self.calls = 0
+
+    @property
+    def provider(self) -> AIProvider:
+        return AIProvider.DEEPSEEK
+
+    async def generate(self, system_prompt, user_prompt, json_mode=True):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AIResponse(
+            content=self.content,
+            model="deepseek-chat",
+            provider=self.provider,
+            tokens_used=150,
+            input_tokens=100,
+            output_tokens=50,
+            stop_reason="stop",
+        )
+
+    async def generate_stream(self, system_prompt, user_prompt, json_mode=True):
+        response = await self.generate(system_prompt, user_prompt, json_mode)
+        yield AIStreamChunk(content=response.content[:5])
+        yield AIStreamChunk(content=response.content[5:], response=response)
+
+    async def test_connection(self) -> bool:
+        return True
+
+
+USER = "Market Data\nTimestamp: 2024-01-15 12:00:00 UTC\nBTC  $50,000"
+
+
+class TestKeys:
+    def test_wall_clock_header_and_whitespace_ignored(self):
+        later = "Market Data\nTimestamp: 2024-01-15 12:00:07 UTC\nBTC $50,000\n"
+        assert normalize_prompt(USER) == normalize_prompt(later)
+        assert response_cache_key("m", "sys", USER) == response_cache_key(
+            "m", "sys  ", later
+        )
+
+    def test_model_prompt_and_mode_change_key(self):
+        key = response_cache_key("m", "sys", USER)
+        assert key != response_cache_key("other", "sys", USER)
+        assert key != response_cache_key("m", "sys2", USER)
+        assert key != response_cache_key("m", "sys", USER.replace("50", "51"))
+        assert key != response_cache_key("m", "sys", USER, json_mode=False)
+
+
+class TestCachedAIClient:
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_answered_from_cache(self):
+        inner = _FakeClient()
+        client = CachedAIClient(inner, ResponseCache("t:", ttl=60))
+
+        first = await client.generate("sys", USER)
+        second = await client.generate("sys", USER.replace("12:00:00", "12:00:03"))
+
+        assert inner.calls == 1
+        assert second.content == first.content
+        assert first.tokens_used == 150
+        assert second.tokens_used == 0
+        assert client.cache.get_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_share_one_request(self):
+        inner = _FakeClient(delay=0.01)
+        client = CachedAIClient(inner, ResponseCache("t:", ttl=60))
+
+        responses = await asyncio.gather(
+            *(client.generate("sys", USER) for _ in range(5))
+        )
+
+        assert inner.calls == 1
+        assert {r.content for r in responses} == {inner.content}
+        assert sum(r.tokens_used for r in responses) == 150
+
+    @pytest.mark.asyncio
+    async def test_failed_request_not_cached(self):
+        inner = _FakeClient()
+        inner.generate = AsyncMock(side_effect=RuntimeError("boom"))
+        client = CachedAIClient(inner, ResponseCache("t:", ttl=60))
+
+        with pytest.raises(RuntimeError):
+            await client.generate("sys", USER)
+        assert client.cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_size_limits(self):
+        cache = ResponseCache("t:", ttl=60, max_entries=2, max_chars=10)
+        client = CachedAIClient(_FakeClient(content="x" * 11), cache)
+        await client.generate("sys", USER)
+        assert cache.get_stats()["entries"] == 0
+
+        client.client.content = "ok"
+        for i in range(3):
+            await client.generate("sys", f"{USER} {i}")
+        assert cache.get_stats()["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_miss_cached_then_replayed_whole(self):
+        inner = _FakeClient()
+        client = CachedAIClient(inner, ResponseCache("t:", ttl=60))
+
+        streamed = [c async for c in client.generate_stream("sys", USER)]
+        replayed = [c async for c in client.generate_stream("sys", USER)]
+
+        assert len(streamed) == 2
+        assert inner.calls == 1
+        assert len(replayed) == 1
+        assert replayed[0].content == inner.content
+        assert replayed[0].response.tokens_used == 0
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_processes(self):
+        store = {}
+        redis = AsyncMock()
+        redis.get.side_effect = lambda key: store.get(key)
+        redis.set.side_effect = lambda key, value, ttl=None: store.__setitem__(
+            key, value
+        )
+
+        async def getter():
+            return redis
+
+        first = CachedAIClient(_FakeClient(), ResponseCache("t:", 60, redis_getter=getter))
+        await first.generate("sys", USER)
+        assert redis.set.call_args.kwargs["ttl"] == 60
+
+        inner = _FakeClient()
+        second = CachedAIClient(inner, ResponseCache("t:", 60, redis_getter=getter))
+        response = await second.generate("sys", USER)
+
+        assert inner.calls == 0
+        assert response.content == inner.content
+        assert response.provider == AIProvider.DEEPSEEK
+        assert second.cache.get_stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_provider(self):
+        async def getter():
+            raise ConnectionError("redis down")
+
+        inner = _FakeClient()
+        client = CachedAIClient(inner, ResponseCache("t:", 60, redis_getter=getter))
+        response = await client.generate("sys", USER)
+        assert response.tokens_used == 150
@@ -17,7 +17,7 @@ os.environ.setdefault("DATA_ENCRYPTION_KEY", _VALID_AES_KEY)
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 from app.api.main import create_app
@@ -398,6 +398,102 @@ class TestBacktestEndpoints:
         )
         assert response.status_code == 422
 
+    @pytest.mark.asyncio
+    async def test_sweep_rejects_unknown_parameter(self, authenticated_client):
+        """Test parameter sweep grid validation."""
+        client, user_id = authenticated_client
+
+        response = await client.post(
+            "/api/backtest/sweep",
+            json={
+                "start_date": "2024-01-01T00:00:00",
+                "end_date": "2024-02-01T00:00:00",
+                "grid": {"unknown_param": [1, 2]},
+            },
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_sweep_is_queued(self, authenticated_client):
+        """Test parameter sweeps run as background jobs."""
+        client, user_id = authenticated_client
+        queue = MagicMock()
+        queue.submit_backtest = AsyncMock(return_value="backtest:1")
+        queue.get_backtest_job = AsyncMock(
+            return_value={"job_id": "backtest:1", "kind": "sweep", "status": "queued"}
+        )
+
+        with patch(
+            "app.workers.queue.get_task_queue_service",
+            new=AsyncMock(return_value=queue),
+        ):
+            response = await client.post(
+                "/api/backtest/sweep",
+                json={
+                    "start_date": "2024-01-01T00:00:00",
+                    "end_date": "2024-02-01T00:00:00",
+                    "grid": {"sma_period": [10, 20]},
+                },
+            )
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "backtest:1"
+        args = queue.submit_backtest.call_args[0]
+        assert args[1] == "sweep"
+        assert args[2]["grid"] == {"sma_period": [10.0, 20.0]}
+
+    @pytest.mark.asyncio
+    async def test_walk_forward_requires_windows(self, authenticated_client):
+        """Test walk-forward request validation."""
+        client, user_id = authenticated_client
+
+        response = await client.post(
+            "/api/backtest/walk-forward",
+            json={
+                "start_date": "2024-01-01T00:00:00",
+                "end_date": "2024-02-01T00:00:00",
+                "grid": {"sma_period": [10, 20]},
+            },
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_quick_backtest_async_limit(self, authenticated_client):
+        """Test background backtests over the per-user cap are rejected."""
+        from app.workers.queue import BacktestLimitExceeded
+
+        client, user_id = authenticated_client
+        queue = MagicMock()
+        queue.submit_backtest = AsyncMock(
+            side_effect=BacktestLimitExceeded("At most 2 backtests")
+        )
+
+        with patch(
+            "app.workers.queue.get_task_queue_service",
+            new=AsyncMock(return_value=queue),
+        ):
+            response = await client.post(
+                "/api/backtest/quick/async",
+                json={
+                    "start_date": "2024-01-01T00:00:00",
+                    "end_date": "2024-02-01T00:00:00",
+                },
+            )
+        assert response.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_get_backtest_job_not_found(self, authenticated_client):
+        """Test job status of another user's or unknown job."""
+        client, user_id = authenticated_client
+        queue = MagicMock()
+        queue.get_backtest_job = AsyncMock(return_value=None)
+
+        with patch(
+            "app.workers.queue.get_task_queue_service",
+            new=AsyncMock(return_value=queue),
+        ):
+            response = await client.get("/api/backtest/jobs/backtest:missing")
+        assert response.status_code == 404
+
 
 class TestDashboardEndpoints:
     """Tests for dashboard endpoints."""
@@ -4,14 +4,17 @@ Tests for backtest engine and simulator.
 Covers: BacktestEngine, SimulatedTrader, SimulatedPosition, Trade
 """
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 import pytest_asyncio
 
 from app.backtest.simulator import SimulatedPosition, SimulatedTrader, Trade
 from app.backtest.engine import BacktestEngine, BacktestResult
+from app.backtest.vectorized import RuleStrategy
 
 
 # ============================================================================
@@ -1322,6 +1325,8 @@ class TestBacktestEngine:
             account_state.equity = 10000
             account_state.position_count = 1
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader._positions = {"BTC": MagicMock()}
             mock_trader.close_position = AsyncMock()
@@ -1404,6 +1409,46 @@ class TestBacktestEngine:
                     assert mock_ai_client.generate.called
                     assert isinstance(result, BacktestResult)
 
+    @pytest.mark.asyncio
+    async def test_backtest_ai_replay_reuses_outputs(self, mock_strategy, mock_data_provider):
+        """A re-run with ai_replay answers identical prompts without the model"""
+        from app.services.ai import AIClientConfig, AIProvider, AIResponse, ResponseCache
+
+        mock_ai_client = AsyncMock()
+        mock_ai_client.provider = AIProvider.DEEPSEEK
+        mock_ai_client.config = AIClientConfig(api_key="k", model="deepseek-chat")
+        mock_ai_client.generate = AsyncMock(
+            return_value=AIResponse(
+                content='{"chain_of_thought": "test", "decisions": [], "overall_confidence": 70}',
+                model="deepseek-chat",
+                provider=AIProvider.DEEPSEEK,
+                tokens_used=10,
+                input_tokens=8,
+                output_tokens=2,
+            )
+        )
+        mock_pb = MagicMock()
+        mock_pb.build_system_prompt = MagicMock(return_value="system prompt")
+        mock_pb.build_user_prompt = MagicMock(return_value="user prompt")
+
+        with patch(
+            "app.backtest.engine.get_replay_cache",
+            return_value=ResponseCache("test:", ttl=60),
+        ), patch("app.backtest.engine.PromptBuilder", return_value=mock_pb):
+            for _ in range(2):
+                engine = BacktestEngine(
+                    strategy=mock_strategy,
+                    initial_balance=10000,
+                    data_provider=mock_data_provider,
+                    use_ai=True,
+                    ai_client=mock_ai_client,
+                    ai_replay=True,
+                )
+                await engine.run()
+
+        assert mock_ai_client.generate.await_count == 1
+        assert len(engine._decisions) > 1
+
     @pytest.mark.asyncio
     async def test_backtest_ai_decision_error_handling(self, mock_strategy, mock_data_provider):
         """Test that AI decision errors don't crash backtest"""
@@ -1496,6 +1541,8 @@ class TestBacktestEngine:
             account_state.available_balance = 10000
             account_state.position_count = 0
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader._positions = {}
             mock_trader.get_position = AsyncMock(return_value=None)
@@ -1596,6 +1643,8 @@ class TestBacktestEngine:
             account_state.available_balance = 10000
             account_state.position_count = 0
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader.open_long = AsyncMock()
             mock_trader.get_trades = MagicMock(return_value=[])
@@ -1693,6 +1742,8 @@ class TestBacktestEngine:
             account_state.equity = 10000
             account_state.available_balance = 10000
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader._positions = {}
             mock_trader.open_short = AsyncMock()
@@ -1777,6 +1828,8 @@ class TestBacktestEngine:
             account_state = MagicMock()
             account_state.equity = 10000
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader._positions = {}
             mock_trader.close_position = AsyncMock()
@@ -1861,6 +1914,8 @@ class TestBacktestEngine:
             account_state = MagicMock()
             account_state.equity = 10000
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader._positions = {}
             mock_trader.open_long = AsyncMock()
@@ -1941,6 +1996,8 @@ class TestBacktestEngine:
             account_state = MagicMock()
             account_state.equity = 10000
             mock_trader.get_account_state = AsyncMock(return_value=account_state)
+            mock_trader.last_equity = account_state.equity
+            mock_trader.position_count = account_state.position_count
             mock_trader.balance = 10000
             mock_trader._positions = {}
             # open_long raises exception
@@ -2223,10 +2280,8 @@ class TestBacktestEngine:
             
             # Set equity curve with varying values (including losses)
             base_time = datetime(2024, 1, 1)
-            engine._equity_curve = [
-                {"timestamp": (base_time + timedelta(hours=i)).isoformat(), "equity": 10000 - i * 10}
-                for i in range(50)
-            ]
+            for i in range(50):
+                engine._equity.update(base_time + timedelta(hours=i), 10000 - i * 10)
             
             # Mock trader
             engine.trader = MagicMock()
@@ -2269,10 +2324,8 @@ class TestBacktestEngine:
             )
             
             base_time = datetime(2024, 1, 1)
-            engine._equity_curve = [
-                {"timestamp": (base_time + timedelta(hours=i)).isoformat(), "equity": 10000 + i * 10}
-                for i in range(100)
-            ]
+            for i in range(100):
+                engine._equity.update(base_time + timedelta(hours=i), 10000 + i * 10)
             
             engine.trader = MagicMock()
             engine.trader.balance = 11000
@@ -2315,10 +2368,8 @@ class TestBacktestEngine:
             )
             
             base_time = datetime(2024, 1, 1)
-            engine._equity_curve = [
-                {"timestamp": (base_time + timedelta(hours=i)).isoformat(), "equity": 10000}
-                for i in range(10)
-            ]
+            for i in range(10):
+                engine._equity.update(base_time + timedelta(hours=i), 10000)
             
             engine.trader = MagicMock()
             engine.trader.balance = 12000
@@ -2362,10 +2413,8 @@ class TestBacktestEngine:
             base_time = datetime(2024, 1, 1)
             # Equity goes up then down
             equities = [10000, 11000, 12000, 11500, 11000, 10500]
-            engine._equity_curve = [
-                {"timestamp": (base_time + timedelta(hours=i)).isoformat(), "equity": equities[i]}
-                for i in range(len(equities))
-            ]
+            for i in range(len(equities)):
+                engine._equity.update(base_time + timedelta(hours=i), equities[i])
             
             engine.trader = MagicMock()
             engine.trader.balance = 10500
@@ -2410,14 +2459,15 @@ class TestBacktestEngine:
             )
             
             # Create equity curve spanning multiple months
-            engine._equity_curve = [
-                {"timestamp": "2024-01-01T00:00:00", "equity": 10000},
-                {"timestamp": "2024-01-15T00:00:00", "equity": 10500},
-                {"timestamp": "2024-01-31T00:00:00", "equity": 11000},
-                {"timestamp": "2024-02-01T00:00:00", "equity": 11000},
-                {"timestamp": "2024-02-15T00:00:00", "equity": 11500},
-                {"timestamp": "2024-02-28T00:00:00", "equity": 12000},
-            ]
+            for day, equity in [
+                ((1, 1), 10000),
+                ((1, 15), 10500),
+                ((1, 31), 11000),
+                ((2, 1), 11000),
+                ((2, 15), 11500),
+                ((2, 28), 12000),
+            ]:
+                engine._equity.update(datetime(2024, *day), equity)
             
             engine.trader = MagicMock()
             engine.trader.balance = 12000
@@ -2720,6 +2770,44 @@ class TestBacktestEngine:
             assert not engine.trader.open_long.called
             assert not engine.trader.open_short.called
 
+    @pytest.mark.asyncio
+    async def test_rule_based_sma_matches_full_recompute(self, mock_strategy):
+        """Rolling SMA equals the mean of the 20 closes before the cursor"""
+        with patch("app.backtest.engine.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                simulator_maker_fee=0.0002,
+                simulator_taker_fee=0.0005,
+                simulator_default_slippage=0.001,
+            )
+
+            base_time = datetime(2024, 1, 1)
+            candles = [
+                MagicMock(close=50000 + (i * 37) % 500, timestamp=base_time + timedelta(hours=i))
+                for i in range(60)
+            ]
+
+            engine = BacktestEngine(
+                strategy=mock_strategy,
+                initial_balance=10000,
+                data_provider=MagicMock(),
+                use_ai=False,
+            )
+
+            for hour in (5, 20, 21, 33, 59):
+                idx = engine._advance_cursor("BTC", candles, base_time + timedelta(hours=hour))
+                assert idx == hour
+                if idx >= 20:
+                    expected = sum(c.close for c in candles[idx - 20 : idx]) / 20
+                    assert engine._sma_sums["BTC"] / 20 == pytest.approx(expected)
+
+            # Past the last candle there is no current candle
+            assert engine._advance_cursor("BTC", candles, base_time + timedelta(hours=99)) == -1
+
+            # Going back in time rewinds the cursor
+            assert engine._advance_cursor("BTC", candles, base_time + timedelta(hours=25)) == 25
+            expected = sum(c.close for c in candles[5:25]) / 20
+            assert engine._sma_sums["BTC"] / 20 == pytest.approx(expected)
+
     def test_backtest_engine_requires_ai_client_when_use_ai_true(self, mock_strategy):
         """Test that BacktestEngine raises error when use_ai=True but no ai_client"""
         with patch("app.backtest.engine.get_settings") as mock_settings:
@@ -2736,3 +2824,1364 @@ class TestBacktestEngine:
                     use_ai=True,
                     ai_client=None,  # No AI client
                 )
+
+
+# ============================================================================
+# ColumnarCandleStore Tests
+# ============================================================================
+
+class TestColumnarCandleStore:
+    """Tests for the NumPy-backed columnar candle store"""
+
+    @staticmethod
+    def _candles(start, count, step_hours=1, base=100.0):
+        from app.backtest.data_provider import OHLCV
+
+        return [
+            OHLCV(
+                timestamp=start + timedelta(hours=i * step_hours),
+                open=base + i,
+                high=base + i + 2,
+                low=base + i - 2,
+                close=base + i + 1,
+                volume=10.0 + i,
+            )
+            for i in range(count)
+        ]
+
+    def test_aligns_symbols_on_shared_index(self):
+        """Symbols with different coverage share one timestamp index"""
+        from app.backtest.columnar import ColumnarCandleStore
+
+        base_time = datetime(2024, 1, 1)
+        store = ColumnarCandleStore.from_candles({
+            "BTC": self._candles(base_time, 4),
+            "ETH": self._candles(base_time + timedelta(hours=2), 4, base=10.0),
+        })
+
+        assert len(store) == 6
+        assert store.timestamps.dtype.name == "int64"
+        assert store.column("BTC", "close").dtype.name == "float64"
+        assert store.present("BTC").tolist() == [True, True, True, True, False, False]
+        assert store.present("ETH").tolist() == [False, False, True, True, True, True]
+        assert store.price_at("ETH", 0) is None
+        assert store.price_at("ETH", 2) == 11.0
+
+    def test_snapshots_match_materialized_provider(self):
+        """Snapshot views expose the same data as list-based snapshots"""
+        from app.backtest.columnar import ColumnarCandleStore
+        from app.backtest.data_provider import DataProvider
+
+        base_time = datetime(2024, 1, 1)
+        data = {
+            "BTC": self._candles(base_time, 5),
+            "ETH": self._candles(base_time + timedelta(hours=1), 3, step_hours=2),
+        }
+
+        provider = DataProvider(use_cache=False)
+        provider._data = data
+        provider._build_snapshots()
+        expected = provider.iterate()
+
+        views = ColumnarCandleStore.from_candles(data).snapshots()
+
+        assert len(views) == len(expected)
+        for view, snapshot in zip(views, expected):
+            assert view.timestamp == snapshot.timestamp
+            assert view.prices == snapshot.prices
+            assert view.candles == snapshot.candles
+            assert view.get_price("ETH") == snapshot.get_price("ETH")
+
+    def test_candle_sequence_is_lazy_list_replacement(self):
+        """Per-symbol candles support len, indexing and slicing"""
+        from app.backtest.columnar import ColumnarCandleStore
+
+        base_time = datetime(2024, 1, 1)
+        candles = self._candles(base_time, 10)
+        store = ColumnarCandleStore.from_candles({"BTC": candles})
+
+        view = store.candles("BTC")
+        assert len(view) == 10
+        assert view[3] == candles[3]
+        assert view[-1] == candles[-1]
+        assert view[2:5] == candles[2:5]
+        assert view.closes.tolist() == [c.close for c in candles]
+        assert len(store.candles("DOGE")) == 0
+
+    def test_preserves_timezone(self):
+        """Timezone-aware input round-trips through epoch milliseconds"""
+        from app.backtest.columnar import ColumnarCandleStore
+
+        base_time = datetime(2024, 1, 1, tzinfo=UTC)
+        store = ColumnarCandleStore.from_candles({"BTC": self._candles(base_time, 2)})
+
+        assert store.timestamp_at(1) == base_time + timedelta(hours=1)
+
+    @pytest.mark.asyncio
+    async def test_data_provider_columnar_load(self):
+        """DataProvider(columnar=True) exposes the store through its API"""
+        from app.backtest.columnar import SnapshotView
+        from app.backtest.data_provider import DataProvider
+
+        base_time = datetime(2024, 1, 1)
+        provider = DataProvider(use_cache=False, columnar=True)
+        provider._exchange = MagicMock()
+        provider._fetch_ohlcv = AsyncMock(return_value=self._candles(base_time, 24))
+
+        total = await provider.load_data(
+            symbols=["BTC"],
+            start_date=base_time,
+            end_date=base_time + timedelta(days=1),
+        )
+
+        assert total == 24
+        assert provider._data == {}
+        assert provider.get_store() is not None
+        assert provider.get_symbols() == ["BTC"]
+        snapshots = provider.iterate()
+        assert len(snapshots) == 24
+        assert isinstance(snapshots[0], SnapshotView)
+        assert provider.get_date_range() == (base_time, base_time + timedelta(hours=23))
+        assert provider.get_data("BTC")[0].close == 101.0
+
+    @pytest.mark.asyncio
+    async def test_engine_runs_on_columnar_provider(self):
+        """Columnar and list-based providers give identical backtests"""
+        from app.backtest.columnar import ColumnarCandleStore
+        from app.backtest.data_provider import DataProvider, OHLCV
+
+        base_time = datetime(2024, 1, 1)
+        candles = [
+            OHLCV(
+                timestamp=base_time + timedelta(hours=i),
+                open=100 + (i % 7) * 3,
+                high=104 + (i % 7) * 3,
+                low=97 + (i % 7) * 3,
+                close=100 + (i % 7) * 3 + (i % 3),
+                volume=1.0,
+            )
+            for i in range(60)
+        ]
+        strategy = MagicMock()
+        strategy.name = "Columnar"
+        strategy.config = {
+            "symbols": ["BTC"],
+            "risk_controls": {"max_leverage": 5, "max_position_ratio": 0.5},
+        }
+
+        list_provider = DataProvider(use_cache=False)
+        list_provider._data = {"BTC": candles}
+        list_provider._build_snapshots()
+
+        columnar_provider = DataProvider(use_cache=False, columnar=True)
+        columnar_provider._store = ColumnarCandleStore.from_candles({"BTC": candles})
+
+        results = []
+        for provider in (list_provider, columnar_provider):
+            engine = BacktestEngine(
+                strategy=strategy,
+                initial_balance=10000,
+                start_date=base_time,
+                end_date=base_time + timedelta(hours=60),
+                data_provider=provider,
+            )
+            results.append(await engine.run())
+
+        assert results[0].final_balance == results[1].final_balance
+        assert results[0].total_trades == results[1].total_trades
+        assert results[0].equity_curve == results[1].equity_curve
+
+
+# ============================================================================
+# Rule-based Backtest Scaling Benchmark
+# ============================================================================
+
+class TestRuleBasedScaling:
+    """The rule-based backtest must be linear in the number of candles"""
+
+    class _CountingCandles(list):
+        """List that counts element reads"""
+
+        reads = 0
+
+        def __getitem__(self, index):
+            type(self).reads += 1
+            return super().__getitem__(index)
+
+        def __iter__(self):
+            for item in super().__iter__():
+                type(self).reads += 1
+                yield item
+
+    @staticmethod
+    def _provider(count, candle_cls=list):
+        from app.backtest.data_provider import DataProvider, OHLCV
+
+        base_time = datetime(2024, 1, 1)
+        candles = candle_cls(
+            OHLCV(
+                timestamp=base_time + timedelta(minutes=15 * i),
+                open=100 + (i % 40),
+                high=101 + (i % 40),
+                low=99 + (i % 40),
+                close=100 + (i % 40),
+                volume=1.0,
+            )
+            for i in range(count)
+        )
+        provider = DataProvider(use_cache=False)
+        provider._data = {"BTC": candles}
+        provider._build_snapshots()
+        return provider
+
+    @staticmethod
+    def _engine(provider):
+        strategy = MagicMock()
+        strategy.name = "Scaling"
+        strategy.config = {
+            "symbols": ["BTC"],
+            "risk_controls": {"max_leverage": 3, "max_position_ratio": 0.2},
+        }
+        return BacktestEngine(
+            strategy=strategy,
+            initial_balance=10000,
+            data_provider=provider,
+        )
+
+    @pytest.mark.asyncio
+    async def test_candle_reads_grow_linearly(self):
+        """Candle reads per step stay constant as history grows"""
+        reads = []
+        for count in (500, 2000):
+            self._CountingCandles.reads = 0
+            provider = self._provider(count, candle_cls=self._CountingCandles)
+            await self._engine(provider).run()
+            reads.append(self._CountingCandles.reads)
+
+        # 4x the candles -> ~4x the reads (quadratic scan would be ~16x)
+        assert reads[1] / reads[0] < 4.5
+
+    @pytest.mark.asyncio
+    async def test_progress_callback(self):
+        """Progress is reported at the interval and on the last candle"""
+        calls = []
+
+        async def on_progress(processed, total, equity):
+            calls.append((processed, total, equity))
+
+        engine = self._engine(self._provider(250))
+        engine.progress_callback = on_progress
+        engine.progress_interval = 100
+        await engine.run()
+
+        assert [c[0] for c in calls] == [100, 200, 250]
+        assert all(c[1] == 250 for c in calls)
+        assert calls[0][2] > 0
+
+    @pytest.mark.asyncio
+    async def test_progress_callback_cancels(self):
+        """Raising BacktestCancelled from the callback stops the run"""
+        from app.backtest import BacktestCancelled
+
+        async def cancel(processed, total, equity):
+            raise BacktestCancelled("stop")
+
+        engine = self._engine(self._provider(250))
+        engine.progress_callback = cancel
+        with pytest.raises(BacktestCancelled):
+            await engine.run()
+        assert engine._candles_processed < 250
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_runtime_scales_linearly(self):
+        """Benchmark: wall time for 4x the candles is far below 16x"""
+        import time
+
+        timings = []
+        for count in (2000, 8000):
+            engine = self._engine(self._provider(count))
+            start = time.perf_counter()
+            await engine.run()
+            timings.append(time.perf_counter() - start)
+
+        assert timings[1] / timings[0] < 8
+
+
+# ============================================================================
+# Vectorized Backtest Tests
+# ============================================================================
+
+class _FirstBarLong(RuleStrategy):
+    """Rule that only signals long on the first bar"""
+
+    name = "first_bar_long"
+
+    def signals(self, bars):
+        out = np.zeros(len(bars["close"]), dtype=np.int8)
+        out[0] = 1
+        return out
+
+
+class TestVectorizedBacktester:
+    """Tests for the vectorized rule-strategy backtest mode"""
+
+    @staticmethod
+    def _random_walk(symbols=("BTC",), count=600, wick=0.0, seed=7):
+        import random
+
+        from app.backtest.data_provider import OHLCV
+
+        rng = random.Random(seed)
+        data = {}
+        base_time = datetime(2024, 1, 1)
+        for symbol in symbols:
+            price = 100.0
+            candles = []
+            for i in range(count):
+                price *= 1 + rng.gauss(0, 0.01)
+                candles.append(OHLCV(
+                    timestamp=base_time + timedelta(hours=i),
+                    open=price,
+                    high=price * (1 + wick),
+                    low=price * (1 - wick),
+                    close=price,
+                    volume=1.0,
+                ))
+            data[symbol] = candles
+        return data
+
+    @staticmethod
+    def _strategy(symbols):
+        strategy = MagicMock()
+        strategy.name = "Vectorized"
+        strategy.config = {
+            "symbols": list(symbols),
+            "risk_controls": {"max_leverage": 3, "max_position_ratio": 0.2},
+        }
+        return strategy
+
+    @pytest.mark.asyncio
+    async def test_matches_event_engine_without_wicks(self):
+        """With flat candles the vectorized path reproduces BacktestEngine.run"""
+        from app.backtest.data_provider import DataProvider
+
+        symbols = ("BTC", "ETH")
+        provider = DataProvider(use_cache=False)
+        provider._data = self._random_walk(symbols)
+        provider._build_snapshots()
+        strategy = self._strategy(symbols)
+
+        reference = await BacktestEngine(strategy=strategy, data_provider=provider).run()
+        fast = await BacktestEngine(
+            strategy=strategy, data_provider=provider
+        ).run_vectorized()
+
+        assert fast.total_trades == reference.total_trades > 0
+        assert fast.final_balance == pytest.approx(reference.final_balance)
+        assert fast.total_fees == pytest.approx(reference.total_fees)
+        assert fast.max_drawdown_percent == pytest.approx(reference.max_drawdown_percent)
+        assert fast.sharpe_ratio == pytest.approx(reference.sharpe_ratio)
+        assert fast.equity.tolist() == pytest.approx(
+            [p["equity"] for p in reference.equity_curve]
+        )
+        assert [t.exit_reason for t in fast.trades] == [
+            t.exit_reason for t in reference.trades
+        ]
+
+    def _single_trade_store(self, highs, lows, opens=None):
+        """Store where bar 0 gives a long signal and later bars only move intrabar"""
+        from app.backtest.columnar import ColumnarCandleStore
+        from app.backtest.data_provider import OHLCV
+
+        base_time = datetime(2024, 1, 1)
+        opens = opens or [100.0] * len(highs)
+        candles = [
+            OHLCV(base_time + timedelta(hours=i), opens[i], highs[i], lows[i], 100.0, 1.0)
+            for i in range(len(highs))
+        ]
+        return ColumnarCandleStore.from_candles({"BTC": candles})
+
+    def test_stop_loss_hit_by_wick(self):
+        """A wick through the stop closes the trade at the stop price"""
+        from app.backtest.vectorized import VectorizedBacktester
+
+        store = self._single_trade_store(
+            highs=[100, 101, 101, 101], lows=[100, 99, 96, 99]
+        )
+        result = VectorizedBacktester(
+            _FirstBarLong(), slippage=0.0
+        ).run(store)
+
+        assert result.total_trades == 1
+        trade = result.trades[0]
+        assert trade.exit_reason == "stop_loss"
+        assert trade.exit_price == pytest.approx(97.0)
+        assert trade.closed_at == datetime(2024, 1, 1, 2)
+
+    def test_stop_checked_before_take_profit_in_same_bar(self):
+        """When one bar spans both levels the stop wins"""
+        from app.backtest.vectorized import VectorizedBacktester
+
+        store = self._single_trade_store(highs=[100, 107, 100], lows=[100, 96, 100])
+        result = VectorizedBacktester(_FirstBarLong(), slippage=0.0).run(store)
+
+        assert result.trades[0].exit_reason == "stop_loss"
+
+    def test_gap_through_take_profit_fills_at_open(self):
+        """A gap beyond the take-profit fills at the bar's open"""
+        from app.backtest.vectorized import VectorizedBacktester
+
+        store = self._single_trade_store(
+            highs=[100, 110, 100], lows=[100, 107, 100], opens=[100, 108, 100]
+        )
+        result = VectorizedBacktester(_FirstBarLong(), slippage=0.0).run(store)
+
+        trade = result.trades[0]
+        assert trade.exit_reason == "take_profit"
+        assert trade.exit_price == 108
+
+    def test_atr_based_stops(self):
+        """ATR multiples replace percentage stops when configured"""
+        import numpy as np
+
+        from app.backtest.vectorized import SMAMomentumRule
+
+        bars = {
+            "high": np.array([11.0, 12.0, 13.0, 14.0]),
+            "low": np.array([9.0, 10.0, 11.0, 12.0]),
+            "close": np.array([10.0, 11.0, 12.0, 13.0]),
+        }
+        rule = SMAMomentumRule(sl_atr_mult=1.5, atr_period=2)
+        sl, tp = rule.stop_distances(bars)
+
+        assert np.isnan(sl[1])
+        assert sl[2] == pytest.approx(3.0)  # ATR(2) = 2.0
+        assert tp[2] == pytest.approx(12.0 * 0.06)
+
+    @pytest.mark.parametrize("name", [
+        "sma_momentum", "ema_cross", "rsi_reversion", "macd", "bollinger_reversion",
+    ])
+    def test_builtin_rules_run(self, name):
+        """Every registered rule produces a consistent result"""
+        from app.backtest.columnar import ColumnarCandleStore
+        from app.backtest.vectorized import VectorizedBacktester, create_rule
+
+        store = ColumnarCandleStore.from_candles(self._random_walk(count=400, wick=0.004))
+        result = VectorizedBacktester(
+            create_rule(name), max_leverage=2, max_position_ratio=0.3
+        ).run(store)
+
+        assert result.rule == name
+        assert len(result.equity) == len(store)
+        assert result.final_balance == pytest.approx(
+            result.initial_balance + sum(t.pnl for t in result.trades)
+        )
+        assert result.to_dict()["total_trades"] == result.total_trades
+
+    def test_create_rule_unknown(self):
+        """Unknown rule names are rejected"""
+        from app.backtest.vectorized import create_rule
+
+        with pytest.raises(ValueError, match="Unknown rule strategy"):
+            create_rule("nope")
+
+
+# ============================================================================
+# Parameter Sweep Tests
+# ============================================================================
+
+class TestOHLCVHistoryStore:
+    """On-disk OHLCV history with gap filling"""
+
+    BASE = datetime(2024, 1, 1)
+
+    @staticmethod
+    def _exchange_candles(start, end):
+        """Fake exchange: hourly candles with timestamps in [start, end]"""
+        from app.backtest.data_provider import OHLCV
+
+        candles = []
+        base = TestOHLCVHistoryStore.BASE
+        ts = base + timedelta(hours=-((base - start) // timedelta(hours=1)))
+        while ts <= end:
+            hours = (ts - TestOHLCVHistoryStore.BASE).total_seconds() / 3600
+            price = 100 + hours
+            candles.append(OHLCV(ts, price, price + 1, price - 1, price, 1))
+            ts += timedelta(hours=1)
+        return candles
+
+    def _provider(self, tmp_path, columnar=False):
+        from app.backtest.data_provider import DataProvider
+
+        provider = DataProvider(data_dir=str(tmp_path), columnar=columnar)
+        provider._exchange = MagicMock(markets={})
+        calls = []
+
+        async def fetch(symbol, timeframe, start, end):
+            calls.append((start, end))
+            return self._exchange_candles(start, end), None
+
+        provider._fetch_ohlcv_range = fetch
+        return provider, calls
+
+    def test_interval_arithmetic(self):
+        from app.backtest.history_store import merge_intervals, subtract_intervals
+
+        assert merge_intervals([(10, 20), (0, 5), (6, 8), (18, 30)]) == [
+            (0, 8),
+            (10, 30),
+        ]
+        assert subtract_intervals(0, 40, [(5, 10), (20, 30)]) == [
+            (0, 4),
+            (11, 19),
+            (31, 40),
+        ]
+        assert subtract_intervals(6, 9, [(5, 10)]) == []
+
+    def test_write_read_roundtrip(self, tmp_path):
+        """Newer candles replace stored ones and coverage merges"""
+        from app.backtest.columnar import candles_to_columns, datetime_to_ms
+        from app.backtest.history_store import OHLCVHistoryStore
+
+        store = OHLCVHistoryStore(str(tmp_path))
+        first = self._exchange_candles(self.BASE, self.BASE + timedelta(hours=9))
+        second = self._exchange_candles(
+            self.BASE + timedelta(hours=5), self.BASE + timedelta(hours=14)
+        )
+        second[0].close = 999.0
+        start, mid, end = (
+            datetime_to_ms(c.timestamp) for c in (first[0], second[0], second[-1])
+        )
+
+        first_end = datetime_to_ms(first[-1].timestamp)
+        store.write(
+            "binance", "BTC/USDT", "1h", start, first_end, candles_to_columns(first)
+        )
+        store.write("binance", "BTC/USDT", "1h", mid, end, candles_to_columns(second))
+
+        columns = store.read("binance", "BTC/USDT", "1h", start, end)
+        assert len(columns["timestamp"]) == 15
+        assert columns["close"][5] == 999.0
+        assert store.coverage("binance", "BTC/USDT", "1h") == [(start, end)]
+        assert store.missing("binance", "BTC/USDT", "1h", start, end) == []
+
+    @pytest.mark.asyncio
+    async def test_overlapping_loads_fetch_only_gaps(self, tmp_path):
+        """Repeated and overlapping ranges only download what is missing"""
+        provider, calls = self._provider(tmp_path)
+        day = timedelta(days=1)
+
+        total = await provider.load_data(["BTC"], self.BASE, self.BASE + day)
+        assert total == 25
+        assert calls == [(self.BASE, self.BASE + day)]
+
+        # Same range again: served from disk
+        await provider.load_data(["BTC"], self.BASE, self.BASE + day)
+        assert len(calls) == 1
+
+        # Overlapping wider range: only the uncovered tails are fetched
+        total = await provider.load_data(
+            ["BTC"], self.BASE - day, self.BASE + 2 * day
+        )
+        assert total == 73
+        assert len(calls) == 3
+        assert calls[1][1] < self.BASE and calls[2][0] > self.BASE + day
+
+        candles = provider.get_data("BTC")
+        assert [c.timestamp for c in candles] == [
+            self.BASE - day + timedelta(hours=i) for i in range(73)
+        ]
+        assert candles[24].close == 100.0
+
+    @pytest.mark.asyncio
+    async def test_columnar_load_from_history(self, tmp_path):
+        provider, calls = self._provider(tmp_path, columnar=True)
+
+        total = await provider.load_data(
+            ["BTC"], self.BASE, self.BASE + timedelta(hours=9)
+        )
+
+        assert total == 10
+        assert provider.get_store().candles("BTC").closes.tolist() == [
+            100.0 + i for i in range(10)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_marked_covered(self, tmp_path):
+        """A failed page only marks the candles received before it"""
+        provider, calls = self._provider(tmp_path)
+
+        async def partial(symbol, timeframe, start, end):
+            # Page from 05:00 failed after 5 candles
+            from app.backtest.columnar import datetime_to_ms
+
+            failed_from = datetime_to_ms(start + timedelta(hours=5))
+            candles = self._exchange_candles(start, start + timedelta(hours=4))
+            return candles, failed_from
+
+        provider._fetch_ohlcv_range = partial
+        end = self.BASE + timedelta(hours=9)
+        assert await provider.load_data(["BTC"], self.BASE, end) == 5
+
+        recovered, retry_calls = self._provider(tmp_path)
+        assert await recovered.load_data(["BTC"], self.BASE, end) == 10
+        assert retry_calls == [(self.BASE + timedelta(hours=5), end)]
+
+
+class TestConcurrentFetch:
+    """Paged, concurrent OHLCV downloads with retry"""
+
+    BASE = datetime(2024, 1, 1)
+    HOUR_MS = 3600 * 1000
+
+    def _exchange(self, fail_first=0, error="Connection reset by peer"):
+        """Fake ccxt exchange serving hourly candles up to 2024-01-03"""
+        from app.backtest.columnar import datetime_to_ms
+
+        last = datetime_to_ms(self.BASE + timedelta(days=2))
+        state = {"in_flight": 0, "max_in_flight": 0, "failures": fail_first}
+
+        async def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            try:
+                await asyncio.sleep(0)
+                if state["failures"]:
+                    state["failures"] -= 1
+                    raise Exception(error)
+                first = -(-since // self.HOUR_MS) * self.HOUR_MS
+                return [
+                    [ts, 100.0, 101.0, 99.0, 100.0, 1.0]
+                    for ts in range(first, last + 1, self.HOUR_MS)
+                ][: min(limit, 10)]  # Exchange caps pages at 10 candles
+            finally:
+                state["in_flight"] -= 1
+
+        exchange = MagicMock(markets={})
+        exchange.fetch_ohlcv = AsyncMock(side_effect=fetch_ohlcv)
+        return exchange, state
+
+    def _provider(self, exchange, page_limit=24):
+        from app.backtest.data_provider import DataProvider
+
+        provider = DataProvider(use_cache=False)
+        provider._exchange = exchange
+        provider.PAGE_LIMITS = {provider.exchange_name: page_limit}
+        provider.FETCH_RETRY_BASE_DELAY = 0
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_range_without_duplicates(self):
+        """Pages are fetched concurrently and continue past short responses"""
+        exchange, state = self._exchange()
+        provider = self._provider(exchange)
+
+        candles, failed_from = await provider._fetch_ohlcv_range(
+            "BTC/USDT", "1h", self.BASE, self.BASE + timedelta(days=2)
+        )
+
+        assert failed_from is None
+        assert [c.timestamp for c in candles] == [
+            self.BASE + timedelta(hours=i) for i in range(49)
+        ]
+        assert state["max_in_flight"] > 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        exchange, state = self._exchange()
+        provider = self._provider(exchange, page_limit=5)
+        provider._request_slots = asyncio.Semaphore(2)
+
+        await provider._fetch_ohlcv_range(
+            "BTC/USDT", "1h", self.BASE, self.BASE + timedelta(days=2)
+        )
+
+        assert state["max_in_flight"] == 2
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self):
+        exchange, state = self._exchange(fail_first=2)
+        provider = self._provider(exchange, page_limit=100)
+
+        candles, failed_from = await provider._fetch_ohlcv_range(
+            "BTC/USDT", "1h", self.BASE, self.BASE + timedelta(hours=5)
+        )
+
+        assert failed_from is None
+        assert len(candles) == 6
+        assert provider.fetch_stats.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_page_is_reported(self):
+        """Permanent errors are not retried and mark where data stops"""
+        from app.backtest.columnar import datetime_to_ms
+
+        exchange, state = self._exchange(fail_first=1, error="Invalid symbol")
+        provider = self._provider(exchange)
+
+        candles, failed_from = await provider._fetch_ohlcv_range(
+            "BTC/USDT", "1h", self.BASE, self.BASE + timedelta(days=1)
+        )
+
+        assert failed_from == datetime_to_ms(self.BASE)
+        assert provider.fetch_stats.retries == 0
+        assert provider.fetch_stats.failed_requests == 1
+        assert len(candles) == 1  # Only the second page's single candle
+
+    @pytest.mark.asyncio
+    async def test_load_data_reports_throughput(self):
+        exchange, state = self._exchange()
+        provider = self._provider(exchange)
+
+        total = await provider.load_data(
+            ["BTC", "ETH", "SOL"], self.BASE, self.BASE + timedelta(days=1)
+        )
+
+        stats = provider.fetch_stats
+        assert total == 75
+        assert provider.get_symbols() == ["BTC", "ETH", "SOL"]
+        assert stats.candles == 75
+        assert stats.requests == 12  # 24h page = 3 capped requests, + 1 for 00:00
+        assert stats.to_dict()["candles_per_second"] > 0
+
+
+class TestParameterSweep:
+    """Tests for the process-pool parameter sweep"""
+
+    @staticmethod
+    def _store(count=300):
+        from app.backtest.columnar import ColumnarCandleStore
+
+        return ColumnarCandleStore.from_candles(
+            TestVectorizedBacktester._random_walk(("BTC", "ETH"), count=count)
+        )
+
+    def test_expand_grid(self):
+        """Grid expands to the cartesian product with coerced values"""
+        from app.backtest.sweep import expand_grid
+
+        combos = expand_grid({"max_leverage": [2.0, 5, 5], "sma_period": [10, 20]})
+
+        assert combos == [
+            {"max_leverage": 2, "sma_period": 10},
+            {"max_leverage": 2, "sma_period": 20},
+            {"max_leverage": 5, "sma_period": 10},
+            {"max_leverage": 5, "sma_period": 20},
+        ]
+        assert isinstance(combos[0]["max_leverage"], int)
+
+    @pytest.mark.parametrize("grid", [{"stop_loss": [0.1]}, {"max_leverage": []}])
+    def test_expand_grid_rejects_invalid(self, grid):
+        """Unknown parameters and empty value lists are rejected"""
+        from app.backtest.sweep import expand_grid
+
+        with pytest.raises(ValueError):
+            expand_grid(grid)
+
+    def test_rank_rows(self):
+        """Ratios rank descending, drawdown ascending, missing values last"""
+        from app.backtest.sweep import SweepRow, rank_rows
+
+        rows = [
+            SweepRow(params={"a": 1}, sharpe_ratio=0.5, max_drawdown_percent=10),
+            SweepRow(params={"a": 2}, sharpe_ratio=None, max_drawdown_percent=5),
+            SweepRow(params={"a": 3}, sharpe_ratio=1.5, max_drawdown_percent=20),
+            SweepRow(params={"a": 4}, error="boom"),
+        ]
+
+        by_sharpe = rank_rows(list(rows), "sharpe_ratio")
+        assert [r.params["a"] for r in by_sharpe] == [3, 1, 2, 4]
+        assert [r.rank for r in by_sharpe] == [1, 2, 3, 4]
+
+        by_drawdown = rank_rows(list(rows), "max_drawdown_percent")
+        assert [r.params["a"] for r in by_drawdown] == [2, 1, 3, 4]
+
+        with pytest.raises(ValueError):
+            rank_rows(rows, "win_rate")
+
+    def test_shared_store_round_trip(self):
+        """Attached store holds the same read-only arrays"""
+        from app.backtest.sweep import SharedCandleStore
+
+        store = self._store()
+        shared = SharedCandleStore(store)
+        try:
+            shm, attached = SharedCandleStore.attach(shared.spec)
+            assert attached.symbols == store.symbols
+            assert np.array_equal(attached.timestamps, store.timestamps)
+            close = attached.column("ETH", "close")
+            assert np.array_equal(close, store.column("ETH", "close"))
+            with pytest.raises(ValueError):
+                close[0] = 1.0
+            del attached, close
+            shm.close()
+        finally:
+            shared.close()
+
+    @pytest.mark.asyncio
+    async def test_evaluate_combination_applies_params(self):
+        """A combination matches a direct engine run with the same settings"""
+        from app.backtest.data_provider import DataProvider
+        from app.backtest.sweep import evaluate_combination
+
+        store = self._store()
+        metrics = await evaluate_combination(store, {
+            "strategy_name": "Sweep",
+            "config": {"symbols": ["BTC", "ETH"], "risk_controls": {"max_leverage": 1}},
+            "initial_balance": 10000,
+            "params": {"max_leverage": 4, "max_position_ratio": 0.3, "sma_period": 10},
+        })
+
+        strategy = self._strategy_for(max_leverage=4, max_position_ratio=0.3)
+        reference = await BacktestEngine(
+            strategy=strategy,
+            data_provider=DataProvider.from_store(store),
+            sma_period=10,
+        ).run()
+
+        assert metrics["total_trades"] == reference.total_trades
+        assert metrics["final_balance"] == pytest.approx(reference.final_balance)
+        assert metrics["sharpe_ratio"] == pytest.approx(reference.sharpe_ratio)
+
+    @staticmethod
+    def _strategy_for(**risk_controls):
+        strategy = MagicMock()
+        strategy.name = "Sweep"
+        strategy.config = {"symbols": ["BTC", "ETH"], "risk_controls": risk_controls}
+        return strategy
+
+    @pytest.mark.asyncio
+    async def test_pool_shutdown_does_not_block_event_loop(self):
+        """Clean exit joins workers in a thread; errors skip the join"""
+        import threading
+
+        from app.backtest.sweep import BacktestPool
+
+        calls = []
+
+        class FakeExecutor:
+            def __init__(self, **kwargs):
+                pass
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                calls.append((wait, cancel_futures, threading.current_thread()))
+
+        with patch("app.backtest.sweep.ProcessPoolExecutor", FakeExecutor):
+            async with BacktestPool(self._store(), 1):
+                pass
+            with pytest.raises(RuntimeError):
+                async with BacktestPool(self._store(), 1) as pool:
+                    shared = pool._shared
+                    raise RuntimeError("boom")
+
+        (wait, cancel, thread), (err_wait, err_cancel, _) = calls
+        assert wait and not cancel
+        assert thread is not threading.main_thread()
+        assert (err_wait, err_cancel) == (False, True)
+        # Shared block was unlinked on the error path too
+        with pytest.raises(FileNotFoundError):
+            shared.attach(shared.spec)
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_sweep_runs_in_process_pool(self):
+        """End-to-end sweep through worker processes returns ranked rows"""
+        from app.backtest.sweep import ParameterSweep
+
+        sweep = ParameterSweep(
+            self._store(),
+            strategy_config={"symbols": ["BTC", "ETH"]},
+            max_workers=2,
+        )
+        result = await sweep.run(
+            {"max_leverage": [1, 3], "sma_period": [10, 20]},
+            rank_by="calmar_ratio",
+        )
+
+        assert len(result.rows) == 4
+        assert all(row.error is None for row in result.rows)
+        assert [row.rank for row in result.rows] == [1, 2, 3, 4]
+        calmars = [r.calmar_ratio for r in result.rows if r.calmar_ratio is not None]
+        assert calmars == sorted(calmars, reverse=True)
+        assert result.to_dict()["combinations"] == 4
+
+
+# ============================================================================
+# Robustness (Walk-Forward / Monte-Carlo) Tests
+# ============================================================================
+
+class TestRobustness:
+    """Tests for walk-forward optimization and Monte-Carlo resampling"""
+
+    def test_walk_forward_windows(self):
+        """Windows roll by the out-of-sample size unless a step is given"""
+        from app.backtest.robustness import walk_forward_windows
+
+        assert walk_forward_windows(100, 50, 20) == [
+            (0, 50, 50, 70),
+            (20, 70, 70, 90),
+        ]
+        assert len(walk_forward_windows(100, 50, 20, step_bars=10)) == 4
+
+        with pytest.raises(ValueError, match="too short"):
+            walk_forward_windows(60, 50, 20)
+
+    def test_distribution_summary(self):
+        """None / NaN values are dropped; bands come from percentiles"""
+        from app.backtest.robustness import Distribution
+
+        dist = Distribution.from_values([None, float("nan")] + list(range(101)))
+
+        assert dist.count == 101
+        assert dist.mean == 50
+        assert dist.band(0.9) == pytest.approx((5.0, 95.0))
+        assert dist.to_dict()["percentiles"]["p50"] == 50
+        assert Distribution.from_values([None]).to_dict()["mean"] is None
+
+    def test_monte_carlo_shuffle_keeps_final_return(self):
+        """Shuffling trade order changes drawdown but not total return"""
+        from app.backtest.robustness import run_monte_carlo
+
+        pnls = [100, -250, 40, -60, 300, -120] * 5
+        result = run_monte_carlo(
+            pnls, initial_balance=10000, simulations=500, method="shuffle", seed=1
+        )
+
+        assert result.trades == 30
+        assert result.total_return_percent.std == pytest.approx(0.0)
+        assert result.total_return_percent.mean == pytest.approx(0.5)
+        assert result.max_drawdown_percent.std > 0
+        assert result.probability_of_loss == 0.0
+
+    def test_monte_carlo_bootstrap(self):
+        """Bootstrap is reproducible with a seed and accepts Trade objects"""
+        from app.backtest.robustness import run_monte_carlo
+
+        trades = [
+            Trade(
+                symbol="BTC", side="long", size=1, entry_price=100, exit_price=100,
+                leverage=1, pnl=pnl, pnl_percent=0,
+                opened_at=datetime(2024, 1, 1), closed_at=datetime(2024, 1, 2),
+            )
+            for pnl in (50, -30, 80, -40, 10)
+        ]
+        first = run_monte_carlo(trades, 1000, simulations=300, seed=42)
+        second = run_monte_carlo(
+            [{"pnl": t.pnl} for t in trades], 1000, simulations=300, seed=42
+        )
+
+        assert np.array_equal(
+            first.total_return_percent.values, second.total_return_percent.values
+        )
+        low, high = first.to_dict()["total_return_percent"]["band"]
+        assert low < first.total_return_percent.percentile(50) < high
+
+    def test_monte_carlo_ruin_is_absorbing(self):
+        """Paths that hit zero equity stay ruined"""
+        from app.backtest.robustness import run_monte_carlo
+
+        result = run_monte_carlo(
+            [-600, 700], initial_balance=500, simulations=200, seed=0
+        )
+
+        assert result.probability_of_ruin > 0
+        assert result.total_return_percent.values.min() == -100
+        assert result.max_drawdown_percent.values.max() <= 100
+
+    @pytest.mark.parametrize("kwargs", [
+        {"trades": [], "initial_balance": 100},
+        {"trades": [1.0], "initial_balance": 100, "method": "jackknife"},
+        {"trades": [1.0], "initial_balance": 100, "simulations": 0},
+    ])
+    def test_monte_carlo_rejects_invalid(self, kwargs):
+        from app.backtest.robustness import run_monte_carlo
+
+        with pytest.raises(ValueError):
+            run_monte_carlo(**kwargs)
+
+    def test_store_slice_is_a_view(self):
+        """Window slices share memory with the full store"""
+        store = TestParameterSweep._store(count=100)
+        window = store.slice(20, 50)
+
+        assert len(window) == 30
+        assert window.timestamps[0] == store.timestamps[20]
+        assert np.shares_memory(window.column("BTC", "close"), store.column("BTC", "close"))
+
+    @pytest.mark.asyncio
+    async def test_warmup_bars_prime_sma_without_trading(self):
+        """A short window trades from its first bar once the SMA is primed"""
+        from app.backtest.data_provider import DataProvider
+        from app.backtest.sweep import evaluate_combination
+
+        store = TestParameterSweep._store(count=300)
+        job = {
+            "strategy_name": "OOS",
+            "config": {"symbols": ["BTC", "ETH"]},
+            "initial_balance": 10000,
+            "params": {"sma_period": 20},
+        }
+        cold = await evaluate_combination(store, {**job, "bars": (180, 200)})
+        warm = await evaluate_combination(
+            store, {**job, "bars": (160, 200), "warmup": 20}
+        )
+        assert cold["total_trades"] == 0
+        assert warm["total_trades"] > 0
+
+        engine = BacktestEngine(
+            strategy=TestParameterSweep._strategy_for(),
+            data_provider=DataProvider.from_store(store.slice(160, 200)),
+            sma_period=20,
+            warmup_bars=20,
+        )
+        result = await engine.run()
+        assert len(result.equity_curve) == 20
+        assert result.equity_curve[0]["timestamp"] == store.timestamp_at(180).isoformat()
+        assert all(t.opened_at >= store.timestamp_at(180) for t in result.trades)
+
+    @pytest.mark.asyncio
+    async def test_run_yields_to_event_loop(self, monkeypatch):
+        """Other tasks keep running while a long backtest is in progress"""
+        import asyncio
+
+        from app.backtest.data_provider import DataProvider
+
+        monkeypatch.setattr(BacktestEngine, "YIELD_SECONDS", 0.0)
+        engine = BacktestEngine(
+            strategy=TestParameterSweep._strategy_for(),
+            data_provider=DataProvider.from_store(TestParameterSweep._store(count=300)),
+        )
+        ticks = 0
+        done = False
+
+        async def heartbeat():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(heartbeat())
+        await asyncio.sleep(0)
+        await engine.run()
+        done = True
+        await task
+        assert ticks >= 300
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_walk_forward_returns_distributions(self):
+        """End-to-end walk-forward through the process pool"""
+        from app.backtest.robustness import WalkForwardOptimizer
+
+        store = TestParameterSweep._store(count=600)
+        optimizer = WalkForwardOptimizer(
+            store, strategy_config={"symbols": ["BTC", "ETH"]}, max_workers=2
+        )
+        result = await optimizer.run(
+            {"sma_period": [10, 20]},
+            in_sample_bars=200,
+            out_of_sample_bars=100,
+            monte_carlo_simulations=200,
+            seed=3,
+        )
+
+        assert len(result.windows) == 4
+        assert result.evaluations == 4 * 2 + 4
+        for window in result.windows:
+            assert window.best_params in ({"sma_period": 10}, {"sma_period": 20})
+            assert window.out_of_sample.error is None
+            assert window.out_of_sample_start > window.in_sample_end
+        assert result.distributions["total_return_percent"].count == 4
+        assert result.monte_carlo is not None
+        assert result.monte_carlo.simulations == 200
+        payload = result.to_dict()
+        assert set(payload["distributions"]) >= {"sharpe_ratio", "max_drawdown_percent"}
+
+
+class TestIntrabarExits:
+    """SL/TP resolution against candle high/low"""
+
+    TS = datetime(2024, 1, 1, 1)
+
+    def _candle(self, open_, high, low, close, ts=None):
+        from app.backtest.data_provider import OHLCV
+
+        return OHLCV(ts or self.TS, open_, high, low, close, 1.0)
+
+    async def _trader(self, side="long", **kwargs):
+        trader = SimulatedTrader(initial_balance=10000, default_slippage=0, **kwargs)
+        trader.set_current_time(self.TS - timedelta(hours=1))
+        trader.set_prices({"BTC": 100.0})
+        if side == "long":
+            await trader.open_long("BTC", 1000, stop_loss=97.0, take_profit=106.0)
+        else:
+            await trader.open_short("BTC", 1000, stop_loss=103.0, take_profit=94.0)
+        trader.set_current_time(self.TS)
+        return trader
+
+    @pytest.mark.asyncio
+    async def test_wick_triggers_stop_at_level(self):
+        """A wick through the stop exits at the stop price, not the close"""
+        trader = await self._trader()
+        assert trader.has_exit_orders
+
+        await trader.set_candles({"BTC": self._candle(100, 101, 96, 100)})
+
+        (trade,) = trader.get_trades()
+        assert trade.exit_reason == "stop_loss"
+        assert trade.exit_price == 97.0
+        assert not trader.has_exit_orders
+        assert trader._current_prices["BTC"] == 100
+
+    @pytest.mark.asyncio
+    async def test_close_based_check_misses_wick(self):
+        """set_prices only sees the close"""
+        trader = await self._trader()
+        trader.set_prices({"BTC": 100.0})
+        assert trader.get_trades() == []
+
+    @pytest.mark.asyncio
+    async def test_short_take_profit_by_wick(self):
+        trader = await self._trader(side="short")
+
+        await trader.set_candles({"BTC": self._candle(100, 101, 93, 99)})
+
+        (trade,) = trader.get_trades()
+        assert trade.exit_reason == "take_profit"
+        assert trade.exit_price == 94.0
+
+    @pytest.mark.asyncio
+    async def test_gap_through_level_fills_at_open(self):
+        trader = await self._trader()
+        await trader.set_candles({"BTC": self._candle(95, 96, 90, 92)})
+        (trade,) = trader.get_trades()
+        assert (trade.exit_reason, trade.exit_price) == ("stop_loss", 95)
+
+        trader = await self._trader()
+        await trader.set_candles({"BTC": self._candle(108, 110, 96, 109)})
+        (trade,) = trader.get_trades()
+        assert (trade.exit_reason, trade.exit_price) == ("take_profit", 108)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "policy,open_,expected",
+        [
+            ("stop_first", 105, "stop_loss"),
+            ("target_first", 98, "take_profit"),
+            ("nearest_first", 105, "take_profit"),
+            ("nearest_first", 98, "stop_loss"),
+        ],
+    )
+    async def test_policy_when_both_levels_touched(self, policy, open_, expected):
+        trader = await self._trader(intrabar_policy=policy)
+
+        await trader.set_candles({"BTC": self._candle(open_, 107, 96, 100)})
+
+        (trade,) = trader.get_trades()
+        assert trade.exit_reason == expected
+        assert trade.exit_price == (97.0 if expected == "stop_loss" else 106.0)
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError, match="Unknown intrabar policy"):
+            SimulatedTrader(intrabar_policy="random")
+
+    @pytest.mark.asyncio
+    async def test_resolver_overrides_policy(self):
+        resolver = AsyncMock(return_value="take_profit")
+        trader = await self._trader(intrabar_resolver=resolver)
+
+        # Only one level touched: no drilldown
+        await trader.set_candles({"BTC": self._candle(100, 101, 99, 100)})
+        await trader.set_candles({"BTC": self._candle(100, 107, 96, 100)})
+
+        resolver.assert_awaited_once()
+        (trade,) = trader.get_trades()
+        assert trade.exit_reason == "take_profit"
+
+    @pytest.mark.asyncio
+    async def test_lower_timeframe_drilldown(self):
+        """The first lower-timeframe candle touching a level decides"""
+        from app.backtest.intrabar import LowerTimeframeResolver
+        from app.backtest.data_provider import DataProvider
+
+        provider = DataProvider(use_cache=False)
+        provider.timeframe = "1h"
+        minutes = [
+            self._candle(100, 101, 99, 100, self.TS),
+            self._candle(100, 107, 99, 105, self.TS + timedelta(minutes=1)),
+            self._candle(105, 105, 96, 97, self.TS + timedelta(minutes=2)),
+        ]
+        provider.fetch_candles = AsyncMock(return_value=minutes)
+        resolver = LowerTimeframeResolver(provider, lower_timeframe="1m")
+        trader = await self._trader(intrabar_resolver=resolver)
+
+        await trader.set_candles({"BTC": self._candle(100, 107, 96, 100)})
+
+        (trade,) = trader.get_trades()
+        assert trade.exit_reason == "take_profit"
+        provider.fetch_candles.assert_awaited_once_with(
+            "BTC", "1m", self.TS, self.TS + timedelta(milliseconds=3600000 - 1)
+        )
+        assert (resolver.drilldowns, resolver.resolved) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_drilldown_falls_back_when_still_ambiguous(self):
+        from app.backtest.intrabar import LowerTimeframeResolver
+        from app.backtest.data_provider import DataProvider
+
+        provider = DataProvider(use_cache=False)
+        provider.timeframe = "1h"
+        provider.fetch_candles = AsyncMock(
+            return_value=[self._candle(100, 107, 96, 100)]
+        )
+        resolver = LowerTimeframeResolver(provider, lower_timeframe="1m")
+        pos = SimulatedPosition(
+            symbol="BTC",
+            side="long",
+            size=10,
+            entry_price=100,
+            leverage=1,
+            opened_at=self.TS,
+            stop_loss=97.0,
+            take_profit=106.0,
+        )
+        assert await resolver(pos, self._candle(100, 107, 96, 100)) is None
+
+        # Not a lower timeframe: no fetch
+        provider.fetch_candles.reset_mock()
+        coarse = LowerTimeframeResolver(provider, lower_timeframe="4h")
+        assert await coarse(pos, self._candle(100, 107, 96, 100)) is None
+        provider.fetch_candles.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_engine_exits_on_wick(self):
+        """The rule-based stop (-3%) fires on a wick within the next candle"""
+        from app.backtest.data_provider import DataProvider, OHLCV
+
+        base = datetime(2024, 1, 1)
+        closes = [100.0] * 20 + [102.0, 102.0, 102.0]
+        candles = [
+            OHLCV(base + timedelta(hours=i), c, c, c, c, 1.0)
+            for i, c in enumerate(closes)
+        ]
+        # Entry at bar 20's close; bar 21 wicks below the stop and recovers
+        candles[21] = OHLCV(base + timedelta(hours=21), 102.0, 102.5, 90.0, 102.0, 1.0)
+        provider = DataProvider(use_cache=False)
+        provider._data = {"BTC": candles}
+        provider._build_snapshots()
+        strategy = MagicMock()
+        strategy.name = "wick"
+        strategy.config = {"symbols": ["BTC"]}
+
+        result = await BacktestEngine(strategy=strategy, data_provider=provider).run()
+
+        stops = [t for t in result.trades if t.exit_reason == "stop_loss"]
+        assert stops
+        assert stops[0].exit_price == pytest.approx(102.0 * 0.97)
+
+
+class TestEquityTracker:
+    """Streaming equity-curve metrics"""
+
+    def _tracker(self, equities, start=datetime(2024, 1, 1, tzinfo=UTC)):
+        from app.backtest.metrics import EquityTracker
+
+        tracker = EquityTracker()
+        for i, equity in enumerate(equities):
+            tracker.update(start + timedelta(hours=i), equity, equity, 0)
+        return tracker
+
+    def test_running_stats_match_statistics(self):
+        import statistics
+
+        from app.backtest.metrics import RunningStats
+
+        values = [0.01, -0.02, 0.005, 0.03, -0.01, 0.0]
+        stats = RunningStats()
+        for v in values:
+            stats.push(v)
+        assert stats.count == 6
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.stdev == pytest.approx(statistics.stdev(values))
+        assert RunningStats().variance == 0.0
+
+    def test_ratios_match_post_hoc_computation(self):
+        import statistics
+
+        rng = np.random.default_rng(1)
+        equities = list(10000 * np.cumprod(1 + rng.normal(0, 0.01, 500)))
+        tracker = self._tracker(equities)
+
+        returns = [b / a - 1 for a, b in zip(equities, equities[1:])]
+        downside = [r for r in returns if r < 0]
+        mean = statistics.mean(returns)
+        assert tracker.sharpe_ratio() == pytest.approx(
+            mean * 8760 / (statistics.stdev(returns) * 8760**0.5)
+        )
+        assert tracker.sortino_ratio() == pytest.approx(
+            mean * 8760 / (statistics.stdev(downside) * 8760**0.5)
+        )
+
+        peak = np.maximum.accumulate(equities)
+        assert tracker.max_drawdown == pytest.approx(
+            float(((peak - equities) / peak).max())
+        )
+
+    def test_flat_curve_has_no_ratios(self):
+        tracker = self._tracker([10000] * 10)
+        assert tracker.sharpe_ratio() is None
+        assert tracker.sortino_ratio() is None
+
+    def test_monthly_buckets(self):
+        from app.backtest.metrics import EquityTracker
+
+        tracker = EquityTracker()
+        points = [((1, 1), 100), ((1, 31), 110), ((2, 1), 110), ((2, 20), 99)]
+        for day, equity in points:
+            tracker.update(datetime(2024, *day), equity)
+        assert tracker.monthly_returns() == [
+            {"month": "2024-01", "return_percent": 10.0},
+            {"month": "2024-02", "return_percent": -10.0},
+        ]
+
+    def test_full_curve_round_trips_timestamps(self):
+        tracker = self._tracker([100.0, 101.0, 99.0])
+        curve = tracker.equity_curve()
+        assert curve[1] == {
+            "timestamp": datetime(2024, 1, 1, 1, tzinfo=UTC).isoformat(),
+            "equity": 101.0,
+            "balance": 101.0,
+            "positions": 0,
+        }
+        drawdown = tracker.drawdown_curve()
+        assert [p["drawdown_percent"] for p in drawdown] == [
+            0,
+            0,
+            round(2 / 101 * 100, 4),
+        ]
+
+    def test_downsampled_curve_keeps_endpoints_and_max_drawdown(self):
+        equities = [10000.0 + i for i in range(5000)]
+        equities[1234] = 12000.0  # spike (peak)
+        equities[1235] = 9000.0  # trough
+        tracker = self._tracker(equities)
+
+        curve = tracker.equity_curve(max_points=100)
+        drawdown = tracker.drawdown_curve(max_points=100)
+
+        assert len(curve) <= 100
+        assert len(drawdown) == len(curve)
+        values = [p["equity"] for p in curve]
+        assert values[0] == equities[0] and values[-1] == equities[-1]
+        assert 12000.0 in values and 9000.0 in values
+        assert max(p["drawdown_percent"] for p in drawdown) == pytest.approx(25.0)
+
+    def test_downsample_indices(self):
+        from app.backtest.metrics import downsample_indices, downsample_points
+
+        assert downsample_indices(5, 10) == [0, 1, 2, 3, 4]
+        indices = downsample_indices(1000, 10, keep=[333])
+        assert indices[0] == 0 and indices[-1] == 999 and 333 in indices
+        assert len(indices) <= 10
+        assert downsample_points(list(range(1000)), 10) == downsample_indices(1000, 10)
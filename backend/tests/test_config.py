@@ -9,7 +9,12 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.core.config import Settings, get_ccxt_proxy_config, get_settings
+from app.core.config import (
+    BACKEND_ROOT,
+    Settings,
+    get_ccxt_proxy_config,
+    get_settings,
+)
 
 
 class TestSettings:
@@ -115,6 +120,19 @@ class TestSettings:
         assert s.telegram_bot_token == ""
         assert s.discord_webhook_url == ""
 
+    def test_backtest_history_dir_resolved_against_backend_root(self, tmp_path):
+        assert Settings().backtest_history_dir == str(BACKEND_ROOT / "data" / "ohlcv")
+        assert (BACKEND_ROOT / "app" / "core" / "config.py").is_file()
+
+        s = Settings(backtest_history_dir="cache/ohlcv")
+        assert s.backtest_history_dir == str(BACKEND_ROOT / "cache" / "ohlcv")
+
+        s = Settings(backtest_history_dir=str(tmp_path))
+        assert s.backtest_history_dir == str(tmp_path)
+
+    def test_backtest_history_dir_empty_stays_disabled(self):
+        assert Settings(backtest_history_dir="").backtest_history_dir == ""
+
 
 class TestGetSettings:
     """Test get_settings function."""
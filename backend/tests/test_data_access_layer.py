@@ -9,6 +9,9 @@ Tests:
 - DataAccessLayer
 """
 
+import asyncio
+from dataclasses import replace
+
 import pytest
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -27,6 +30,22 @@ from app.services.data_access_layer import DataAccessLayer
 from app.traders.base import MarketData
 
 
+@pytest.fixture(autouse=True)
+def _fresh_kline_buffers(monkeypatch):
+    """Give each test its own K-line buffers and context builder instead of
+    the process-wide ones."""
+    from app.services.kline_buffer import KlineBufferStore
+    from app.services.market_context_builder import MarketContextBuilder
+
+    monkeypatch.setattr(
+        "app.services.data_access_layer.get_kline_buffers", KlineBufferStore
+    )
+    monkeypatch.setattr(
+        "app.services.data_access_layer.get_market_context_builder",
+        MarketContextBuilder,
+    )
+
+
 # ==================== OHLCV Tests ====================
 
 class TestOHLCV:
@@ -551,25 +570,26 @@ class TestDataAccessLayerExceptionPaths:
                 exchange_name="test",
             )
 
-        with patch.object(dal, "get_market_context", side_effect=_ctx_side_effect):
+        with patch.object(dal, "_fetch_context", side_effect=_ctx_side_effect):
             results = await dal.get_market_contexts(["BTC/USDT", "FAIL/USDT"])
             assert results["BTC/USDT"].current.mid_price == 100
             assert results["FAIL/USDT"].current.mid_price == 0.0
 
     @pytest.mark.asyncio
     async def test_klines_cache_hit(self, dal):
-        """Cache hit should return deserialized klines."""
+        """Redis snapshot warms the buffer; the delta fetch (empty here) keeps it."""
         import json
-        from datetime import datetime as dt
 
-        cached_data = json.dumps([{
+        cached_data = [{
             "timestamp": "2025-01-01T00:00:00",
             "open": 50000, "high": 51000, "low": 49000,
             "close": 50500, "volume": 100,
-        }])
+        }]
 
         with patch.object(dal, "_get_redis", new_callable=AsyncMock) as mock_redis:
-            mock_redis.return_value.get = AsyncMock(return_value=cached_data)
+            mock_redis.return_value.get_bytes = AsyncMock(
+                return_value=json.dumps(cached_data).encode()
+            )
 
             klines = await dal._get_klines_cached("BTC/USDT", "1h")
             assert len(klines) == 1
@@ -602,16 +622,37 @@ class TestDataAccessLayerExceptionPaths:
     @pytest.mark.asyncio
     async def test_funding_cache_hit(self, dal):
         """Funding cache hit returns deserialized FundingRate list."""
+        from app.services.market_codec import encode_funding
+        from app.traders.base import FundingRate
+
+        cached = encode_funding([FundingRate(datetime(2025, 1, 1), 0.001)])
+
+        with patch.object(dal, "_get_redis", new_callable=AsyncMock) as mock_redis:
+            mock_redis.return_value.get_bytes = AsyncMock(return_value=cached)
+
+            funding = await dal._get_funding_cached("BTC/USDT")
+            assert len(funding) == 1
+            assert funding[0].rate == 0.001
+            assert funding[0].timestamp == datetime(2025, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_funding_legacy_json_rewritten(self, dal):
+        """Funding cached as legacy JSON is decoded and rewritten in binary."""
         import json
 
+        from app.services.market_codec import decode_funding, is_binary
+
         cached = json.dumps([{"timestamp": "2025-01-01T00:00:00", "rate": 0.001}])
 
         with patch.object(dal, "_get_redis", new_callable=AsyncMock) as mock_redis:
-            mock_redis.return_value.get = AsyncMock(return_value=cached)
+            mock_redis.return_value.get_bytes = AsyncMock(return_value=cached.encode())
+            mock_redis.return_value.set_bytes = AsyncMock()
 
             funding = await dal._get_funding_cached("BTC/USDT")
-            assert len(funding) == 1
             assert funding[0].rate == 0.001
+            rewritten = mock_redis.return_value.set_bytes.call_args.args[1]
+            assert is_binary(rewritten)
+            assert decode_funding(rewritten) == funding
 
     @pytest.mark.asyncio
     async def test_funding_empty_exchange(self, dal):
@@ -629,6 +670,130 @@ class TestDataAccessLayerExceptionPaths:
             ind = await dal.get_indicators("BTC/USDT", "1h")
             assert ind is not None
 
+    @pytest.mark.asyncio
+    async def test_get_indicators_streams_new_candles(self, dal):
+        """Later polls only ingest new candles, matching a recompute from the anchor."""
+        from app.services.indicator_cache import IndicatorCache
+        from app.services.indicator_stream import StreamingIndicatorEngine
+
+        dal.indicator_stream = StreamingIndicatorEngine(dal.config.indicators)
+        dal.indicator_cache = IndicatorCache()
+        dal._get_redis = AsyncMock(side_effect=RuntimeError("no redis"))
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        history = [
+            OHLCV(base + timedelta(hours=i), 100 + i, 102 + i, 99 + i, 101 + (i % 7), 10)
+            for i in range(80)
+        ]
+        calc = IndicatorCalculator(dal.config.indicators)
+
+        for end in (60, 61, 65):
+            window = history[end - 60 : end]
+            with patch.object(
+                dal, "_get_klines_cached", new_callable=AsyncMock, return_value=window
+            ):
+                ind = await dal.get_indicators("BTC/USDT", "1h")
+            # Recursions run from the first fetch; structure from the window
+            assert ind == replace(
+                calc.calculate(history[:end]), **calc.calculate_structure(window)
+            )
+
+        stats = dal.indicator_stream.get_stats()
+        assert stats["full_recomputes"] == 1
+        assert stats["incremental_updates"] == 2
+        assert stats["candles_ingested"] == 64
+
+    @pytest.mark.asyncio
+    async def test_indicators_shared_across_agents(self, mock_trader):
+        """Agents with the same indicator config share one computation per candle."""
+        import fakeredis.aioredis
+
+        from app.services.indicator_cache import IndicatorCache
+        from app.services.redis_service import RedisService
+
+        redis = RedisService(fakeredis.aioredis.FakeRedis())
+        cache = IndicatorCache()
+        config = StrategyConfig(indicators={"ema_periods": [5, 10], "rsi_period": 7})
+        agents = [DataAccessLayer(trader=mock_trader, config=config) for _ in range(3)]
+        for agent in agents:
+            agent.indicator_cache = cache
+            agent._get_redis = AsyncMock(return_value=redis)
+
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        klines = [
+            OHLCV(base + timedelta(hours=i), 100 + i, 102 + i, 99 + i, 101 + (i % 5), 10)
+            for i in range(40)
+        ]
+        results = [
+            await agent._calculate_indicators("BTC/USDT", "1h", klines)
+            for agent in agents
+        ]
+        calc = IndicatorCalculator(config.indicators)
+        assert results[0] == replace(
+            calc.calculate(klines), **calc.calculate_structure(klines)
+        )
+        assert results[1] is results[0] and results[2] is results[0]
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["memory_hits"] == 2
+
+        # Another process only has Redis
+        other = IndicatorCache()
+        agents[0].indicator_cache = other
+        shared = await agents[0]._calculate_indicators("BTC/USDT", "1h", klines)
+        assert shared == results[0]
+        assert other.redis_hits == 1
+
+        # A different config is a different entry
+        dal = DataAccessLayer(trader=mock_trader, config=StrategyConfig())
+        dal.indicator_cache = cache
+        dal._get_redis = AsyncMock(return_value=redis)
+        await dal._calculate_indicators("BTC/USDT", "1h", klines)
+        assert cache.get_stats()["misses"] == 2
+
+        with patch.object(dal, "_get_redis", new_callable=AsyncMock) as mock_redis:
+            mock_redis.return_value.keys = AsyncMock(return_value=[])
+            stats = await dal.get_cache_stats()
+        assert stats["indicator_cache"]["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_market_contexts_computed_in_one_batch(self, mock_trader):
+        """Indicator misses of all symbols are computed together, off the event loop."""
+        from app.services.indicator_cache import IndicatorCache
+        from app.services.indicator_stream import StreamingIndicatorEngine
+
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        klines = [
+            OHLCV(base + timedelta(hours=i), 100 + i, 102 + i, 99 + i, 101 + (i % 5), 10)
+            for i in range(60)
+        ]
+        mock_trader.get_klines = AsyncMock(return_value=klines)
+        config = StrategyConfig(timeframes=["1h", "4h"])
+        dal = DataAccessLayer(trader=mock_trader, config=config)
+        dal.indicator_cache = IndicatorCache()
+        dal.indicator_stream = StreamingIndicatorEngine(config.indicators)
+        dal._get_redis = AsyncMock(side_effect=RuntimeError("no redis"))
+
+        with patch(
+            "app.services.data_access_layer.asyncio.to_thread",
+            wraps=asyncio.to_thread,
+        ) as to_thread:
+            contexts = await dal.get_market_contexts(["BTC/USDT", "ETH/USDT"])
+        assert to_thread.call_count == 1
+        calc = IndicatorCalculator(config.indicators)
+        expected = replace(calc.calculate(klines), **calc.calculate_structure(klines))
+        for context in contexts.values():
+            assert list(context.indicators) == ["1h", "4h"]
+            assert context.indicators["1h"] == expected
+            assert context.key_levels == calc.merge_support_resistance(
+                context.indicators, context.current.mid_price
+            )
+        assert dal.last_context_timings["symbols"] == 2
+        assert dal.last_context_timings["series_computed"] == 4
+        assert dal.last_context_timings["total_ms"] >= 0
+
+        # A second cycle on the same candles is served from the cache
+        await dal.get_market_contexts(["BTC/USDT", "ETH/USDT"])
+        assert dal.last_context_timings["series_computed"] == 0
+
     @pytest.mark.asyncio
     async def test_get_indicators_multi(self, dal):
         """get_indicators_multi returns dict of indicators."""
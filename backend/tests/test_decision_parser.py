@@ -1183,3 +1183,64 @@ class TestEnsureSlTp:
         # ETH: SL = 3000 - 150 = 2850, TP = 3000 + 300 = 3300
         assert result_eth.decisions[0].stop_loss == 2850.0
         assert result_eth.decisions[0].take_profit == 3300.0
+
+
+class TestDecisionStream:
+    """Tests for incremental decision extraction from streamed responses."""
+
+    def _feed_all(self, stream, text, size=7):
+        early = []
+        for i in range(0, len(text), size):
+            result = stream.feed(text[i : i + size])
+            if result is not None:
+                early.append((i + size, result))
+        return early
+
+    def test_decisions_available_before_stream_ends(self, sample_decision_response):
+        """Test the decisions are returned once, as soon as the array closes."""
+        data = dict(sample_decision_response, next_review_minutes=30)
+        text = json.dumps(data, indent=2)
+        stream = DecisionParser().stream()
+
+        early = self._feed_all(stream, text)
+
+        assert len(early) == 1
+        position, response = early[0]
+        assert position < len(text)
+        assert response.decisions[0].symbol == "BTC"
+        assert response.chain_of_thought == "Market shows bullish momentum..."
+        assert stream.fields["next_review_minutes"] == 30
+        assert stream.text == text
+
+    def test_strings_with_json_punctuation(self, sample_decision_response):
+        """Test braces, brackets and escaped quotes inside strings are ignored."""
+        data = dict(
+            sample_decision_response,
+            chain_of_thought='Range {low, high} = [48k, 52k], "breakout" \\ soon',
+        )
+        text = "```json\n" + json.dumps(data) + "\n```"
+        stream = DecisionParser().stream()
+
+        early = self._feed_all(stream, text, size=3)
+
+        assert len(early) == 1
+        assert early[0][1].chain_of_thought == data["chain_of_thought"]
+        assert stream.text == text
+
+    def test_risk_controls_applied(self, sample_decision_response):
+        """Test early decisions go through the same validation as parse()."""
+        parser = DecisionParser(risk_controls=RiskControls(max_leverage=2))
+        stream = parser.stream()
+
+        early = self._feed_all(stream, json.dumps(sample_decision_response))
+
+        assert early[0][1].decisions[0].leverage == 2
+
+    def test_bare_array_not_extracted_early(self, sample_decision_response):
+        """Test responses that are not a top-level object wait for parse()."""
+        text = json.dumps(sample_decision_response["decisions"])
+        parser = DecisionParser()
+        stream = parser.stream()
+
+        assert self._feed_all(stream, text) == []
+        assert parser.parse(stream.text).decisions[0].symbol == "BTC"
@@ -0,0 +1,133 @@
+"""
+Tests for app.services.indicator_cache.
+"""
+
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.market_context import TechnicalIndicators
+from app.services.indicator_cache import (
+    IndicatorCache,
+    _decode,
+    _encode,
+    get_indicator_cache,
+    indicator_cache_key,
+    indicator_config_hash,
+)
+from app.services.indicator_calculator import IndicatorCalculator
+from app.traders.base import OHLCV
+
+
+def _klines(count=40, close_offset=0.0):
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        OHLCV(base + timedelta(hours=i), 100 + i, 102 + i, 99 + i, 101 + i + close_offset, 10)
+        for i in range(count)
+    ]
+
+
+class TestKeys:
+    def test_config_hash_ignores_key_order(self):
+        a = {"ema_periods": [9, 21], "rsi_period": 14}
+        b = {"rsi_period": 14, "ema_periods": [9, 21]}
+        assert indicator_config_hash(a) == indicator_config_hash(b)
+        assert indicator_config_hash(a) != indicator_config_hash({"rsi_period": 7})
+        assert indicator_config_hash(None) == indicator_config_hash({})
+
+    def test_key_uses_close_time_of_last_candle(self):
+        klines = _klines()
+        key = indicator_cache_key("p:", "binance", "BTC/USDT", "1h", klines, "cfg")
+        close_ms = int((klines[-1].timestamp + timedelta(hours=1)).timestamp() * 1000)
+        assert key.startswith(f"p:binance:BTC/USDT:1h:{close_ms}:cfg:")
+
+    def test_forming_candle_change_changes_key(self):
+        klines = _klines()
+        moved = klines[:-1] + [
+            OHLCV(klines[-1].timestamp, 139, 141, 138, 140.5, 12)
+        ]
+        assert indicator_cache_key("p:", "x", "S", "1h", klines, "c") != (
+            indicator_cache_key("p:", "x", "S", "1h", moved, "c")
+        )
+
+
+def test_encode_decode_round_trip():
+    import json
+
+    indicators = IndicatorCalculator({"sma_periods": [5, 20]}).calculate(_klines(60))
+    restored = _decode(json.loads(json.dumps(_encode(indicators))))
+    assert restored == indicators
+    assert _decode(_encode(TechnicalIndicators())) == TechnicalIndicators()
+
+
+class TestIndicatorCache:
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_compute(self):
+        cache = IndicatorCache()
+        compute = lambda: TechnicalIndicators(rsi=50.0)  # noqa: E731
+        first = await cache.get_or_compute("k", compute, ttl=60)
+        second = await cache.get_or_compute("k", lambda: pytest.fail("recomputed"), ttl=60)
+        assert second is first
+        assert cache.get_stats()["memory_hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_recomputed(self, monkeypatch):
+        cache = IndicatorCache()
+        await cache.get_or_compute("k", TechnicalIndicators, ttl=60)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        await cache.get_or_compute("k", TechnicalIndicators, ttl=60)
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self):
+        cache = IndicatorCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            await cache.get_or_compute(key, TechnicalIndicators, ttl=60)
+        assert list(cache._entries) == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_redis_written_on_miss(self):
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=None)
+        cache = IndicatorCache()
+        value = TechnicalIndicators(ema={9: 1.5})
+        await cache.get_or_compute(
+            "k", lambda: value, ttl=300, redis_getter=AsyncMock(return_value=redis)
+        )
+        redis.set.assert_awaited_once_with("k", _encode(value), ttl=300)
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_promoted_to_memory(self):
+        value = TechnicalIndicators(ema={9: 1.5}, rsi=40.0)
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=_encode(value))
+        cache = IndicatorCache()
+        getter = AsyncMock(return_value=redis)
+
+        first = await cache.get_or_compute("k", lambda: pytest.fail("computed"), 60, getter)
+        second = await cache.get_or_compute("k", lambda: pytest.fail("computed"), 60, getter)
+
+        assert first == value
+        assert second is first
+        assert cache.redis_hits == 1
+        assert cache.memory_hits == 1
+        redis.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_compute(self):
+        cache = IndicatorCache()
+        getter = AsyncMock(side_effect=RuntimeError("Redis down"))
+        value = await cache.get_or_compute(
+            "k", lambda: TechnicalIndicators(rsi=1.0), 60, getter
+        )
+        assert value.rsi == 1.0
+        assert cache.misses == 1
+
+
+def test_get_indicator_cache_is_shared():
+    assert get_indicator_cache() is get_indicator_cache()
@@ -295,6 +295,128 @@ class TestSupportResistance:
         assert len(result["resistance"]) <= 3
 
 
+def _random_klines(count, seed):
+    import random
+
+    rng = random.Random(seed)
+    price = 100.0
+    klines = []
+    for i in range(count):
+        price = max(price + rng.uniform(-3, 3), 10)
+        high = price + rng.choice([0.0, 0.5, 1.0, rng.uniform(0, 2)])
+        low = price - rng.choice([0.0, 0.5, 1.0, rng.uniform(0, 2)])
+        klines.append(OHLCV(
+            timestamp=datetime(2024, 1, 1) + timedelta(hours=i),
+            open=price, high=high, low=low, close=price, volume=100,
+        ))
+    return klines
+
+
+def _reference_support_resistance(klines, lookback, threshold):
+    """The original neighbour scan with list-based level filtering."""
+    recent = klines[-lookback:]
+    price = recent[-1].close
+    supports, resistances = [], []
+    for i in range(1, len(recent) - 1):
+        if recent[i].low <= recent[i - 1].low and recent[i].low <= recent[i + 1].low:
+            supports.append(recent[i].low)
+        if recent[i].high >= recent[i - 1].high and recent[i].high >= recent[i + 1].high:
+            resistances.append(recent[i].high)
+
+    def filter_levels(levels):
+        if not levels:
+            return []
+        levels = sorted(set(levels))
+        kept = [levels[0]]
+        for level in levels[1:]:
+            if abs(level - kept[-1]) / kept[-1] > threshold:
+                kept.append(level)
+        return kept
+
+    supports = [v for v in filter_levels(supports) if v < price]
+    resistances = [v for v in filter_levels(resistances) if v > price]
+    return {
+        "support": sorted(supports, reverse=True)[:3],
+        "resistance": sorted(resistances)[:3],
+    }
+
+
+class TestMarketStructure:
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("lookback,threshold", [(20, 0.02), (60, 0.005), (150, 0.0)])
+    def test_support_resistance_matches_reference(self, seed, lookback, threshold):
+        klines = _random_klines(200, seed)
+        calc = IndicatorCalculator()
+        assert calc.identify_support_resistance(
+            klines, lookback, threshold
+        ) == _reference_support_resistance(klines, lookback, threshold)
+
+    def test_wider_pivot_window(self):
+        from app.services import indicator_series as series
+
+        lows = [5, 4, 3, 4, 2, 4, 5, 6, 1]
+        assert series.pivot_lows(lows, 1).tolist() == [
+            False, False, True, False, True, False, False, False, False
+        ]
+        # 3 is not the lowest within two candles (2 is)
+        assert series.pivot_lows(lows, 2).tolist() == [
+            False, False, False, False, True, False, False, False, False
+        ]
+        assert not series.pivot_highs([1, 2], 1).any()
+
+    def test_trend_strength_matches_reference(self):
+        from app.services import indicator_series as series
+        from app.services.indicator_series import latest_value
+
+        klines = _random_klines(120, 3)
+        highs = [k.high for k in klines]
+        lows = [k.low for k in klines]
+        closes = [k.close for k in klines]
+        plus_dm, minus_dm = [], []
+        for i in range(1, len(klines)):
+            up, down = highs[i] - highs[i - 1], lows[i - 1] - lows[i]
+            plus_dm.append(up if up > down and up > 0 else 0)
+            minus_dm.append(down if down > up and down > 0 else 0)
+        atr = latest_value(series.atr(highs, lows, closes, 14))
+        plus_di = sum(plus_dm[-20:]) / 20 / atr * 100
+        minus_di = sum(minus_dm[-20:]) / 20 / atr * 100
+        expected = round(abs(plus_di - minus_di) / (plus_di + minus_di) * 100, 2)
+
+        assert IndicatorCalculator().calculate_trend_strength(klines, 20) == expected
+
+    def test_calculate_structure_uses_config(self):
+        klines = _random_klines(200, 1)
+        calc = IndicatorCalculator({"sr_lookback": 100, "sr_threshold": 0.01})
+        structure = calc.calculate_structure(klines)
+        levels = calc.identify_support_resistance(klines, 100, 0.01)
+        assert structure["support"] == levels["support"]
+        assert structure["resistance"] == levels["resistance"]
+        assert structure["trend_strength"] == calc.calculate_trend_strength(klines, 20)
+
+    def test_merge_support_resistance(self):
+        from app.models.market_context import TechnicalIndicators
+
+        calc = IndicatorCalculator({"sr_threshold": 0.01})
+        merged = calc.merge_support_resistance(
+            {
+                "15m": TechnicalIndicators(support=[99.0, 95.0], resistance=[101.0]),
+                "1h": TechnicalIndicators(support=[98.5, 90.0], resistance=[110.0]),
+                "4h": TechnicalIndicators(support=[94.9, 80.0], resistance=[100.5]),
+            },
+            current_price=100.0,
+        )
+        assert merged["support"] == [
+            {"price": 98.75, "timeframes": ["15m", "1h"]},
+            {"price": 94.95, "timeframes": ["15m", "4h"]},
+            {"price": 90.0, "timeframes": ["1h"]},
+        ]
+        assert merged["resistance"] == [
+            {"price": 100.75, "timeframes": ["15m", "4h"]},
+            {"price": 110.0, "timeframes": ["1h"]},
+        ]
+        assert calc.merge_support_resistance({}, 0.0) == {"support": [], "resistance": []}
+
+
 class TestFullCalculation:
     def test_all_indicators(self):
         """Full integration test with enough data for all indicators."""
@@ -310,3 +432,159 @@ class TestFullCalculation:
         assert result.bollinger["middle"] > 0
         # volume_sma should be calculated
         assert result.volume_sma is not None
+
+
+class TestIndicatorSeries:
+    """indicator_series arrays end on the same values as the scalar methods."""
+
+    def _closes(self, count=120):
+        import math
+
+        return [100 + 10 * math.sin(i / 5) + i * 0.3 for i in range(count)]
+
+    def test_series_last_values_match_scalar(self):
+        from app.services import indicator_series as series
+
+        klines = _make_klines(self._closes())
+        closes = [k.close for k in klines]
+        highs = [k.high for k in klines]
+        lows = [k.low for k in klines]
+        result = IndicatorCalculator().calculate(klines)
+
+        for period, value in result.ema.items():
+            assert round(series.ema(closes, period, exact=True)[-1], 8) == value
+        for period, value in result.sma.items():
+            assert round(series.sma(closes, period)[-1], 8) == pytest.approx(value)
+        assert round(series.rsi(closes, 14, exact=True)[-1], 2) == result.rsi
+        assert (
+            round(series.atr(highs, lows, closes, 14, exact=True)[-1], 8) == result.atr
+        )
+        macd = series.macd(closes, 12, 26, 9, exact=True)
+        for key in ("macd", "signal", "histogram"):
+            assert round(macd[key][-1], 8) == pytest.approx(result.macd[key])
+        bands = series.bollinger(closes, 20, 2.0)
+        for key in ("upper", "middle", "lower"):
+            assert round(bands[key][-1], 8) == pytest.approx(result.bollinger[key])
+
+    def test_series_warmup_is_nan(self):
+        import math
+
+        from app.services import indicator_series as series
+
+        closes = self._closes(30)
+        values = series.rsi(closes, 14)
+        assert all(math.isnan(v) for v in values[:14])
+        assert not math.isnan(values[14])
+        assert all(math.isnan(v) for v in series.ema(closes[:5], 9))
+
+    def test_calculate_series_aligned_with_klines(self):
+        klines = _make_klines(self._closes(200))
+        calc = IndicatorCalculator()
+        result = calc.calculate_series(klines)
+
+        assert len(result) == 200
+        assert result.timestamps[0] == klines[0].timestamp
+        for values in [*result.ema.values(), result.rsi, result.atr, result.volume_sma]:
+            assert len(values) == 200
+        # Every prefix's scalar result is the series value at that index
+        exact = calc.calculate_series(klines, exact=True)
+        for n in (26, 60, 120):
+            scalar = calc.calculate(klines[:n])
+            assert calc.calculate_series(klines[:n], exact=True).latest() == scalar
+            assert round(exact.ema[21][n - 1], 8) == scalar.ema[21]
+            assert round(exact.rsi[n - 1], 2) == scalar.rsi
+            assert result.ema[21][n - 1] == pytest.approx(scalar.ema[21], rel=1e-9)
+            assert result.rsi[n - 1] == pytest.approx(scalar.rsi, abs=0.01)
+
+    def test_blocked_recurrences_match_exact_within_tolerance(self):
+        import numpy as np
+
+        from app.services import indicator_series as series
+
+        rng = np.random.default_rng(7)
+        closes = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+        highs, lows = closes * 1.002, closes * 0.998
+        rtol = series.RECURRENCE_RTOL
+
+        def check(fast, exact, scale=None):
+            assert np.array_equal(np.isnan(fast), np.isnan(exact))
+            known = ~np.isnan(exact)
+            bound = np.abs(exact[known]) if scale is None else scale
+            assert np.all(np.abs(fast[known] - exact[known]) <= rtol * bound)
+
+        for period in (1, 2, 9, 14, 55, 200):
+            check(series.ema(closes, period), series.ema(closes, period, exact=True))
+            check(series.rsi(closes, period), series.rsi(closes, period, exact=True))
+            check(
+                series.atr(highs, lows, closes, period),
+                series.atr(highs, lows, closes, period, exact=True),
+            )
+        fast, exact = series.macd(closes), series.macd(closes, exact=True)
+        for key in ("macd", "signal", "histogram"):
+            check(fast[key], exact[key], scale=closes.max())
+
+        stacked = np.stack([closes[:300], closes[:300] * 0.5])
+        np.testing.assert_allclose(
+            series.ema(stacked, 21), series.ema(stacked, 21, exact=True), rtol=rtol
+        )
+
+    def test_sma_window_sums_match_python_sum(self):
+        from app.services import indicator_series as series
+
+        closes = [0.1 * i + 1e-9 * (i % 7) for i in range(300)]
+        values = series.sma(closes, 20)
+        for i in range(19, 300):
+            assert values[i] == sum(closes[i - 19 : i + 1]) / 20
+
+    def test_disabled_indicators(self):
+        klines = _make_klines(self._closes(60))
+        calc = IndicatorCalculator({"rsi_period": 0, "atr_period": 0, "macd_fast": 0})
+        result = calc.calculate_series(klines)
+        assert result.rsi is None
+        assert result.atr is None
+        latest = result.latest()
+        assert latest.macd == {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
+        assert latest.rsi is None
+
+    def test_to_dict_replaces_warmup_nan(self):
+        klines = _make_klines(self._closes(30))
+        data = IndicatorCalculator().calculate_series(klines).to_dict()
+        assert data["timestamps"][0] == klines[0].timestamp.isoformat()
+        assert data["rsi"][:14] == [None] * 14
+        assert data["rsi"][14] is not None
+        assert data["ema"][55] == [None] * 30
+        assert data["macd"]["signal"] == [None] * 30
+
+    def test_calculate_batch_matches_calculate(self):
+        import math
+
+        calc = IndicatorCalculator()
+        klines_list = [
+            _make_klines([100 + 10 * math.sin(i / (3 + s)) + s for i in range(n)])
+            for s, n in enumerate([120, 120, 120, 80, 120, 5, 0])
+        ]
+        results = calc.calculate_batch(klines_list)
+        assert results == [calc.calculate(klines) for klines in klines_list]
+
+    def test_stacked_series_rows_match_single_series(self):
+        import numpy as np
+
+        from app.services import indicator_series as series
+
+        rows = [self._closes(100), [c * 1.5 for c in self._closes(100)]]
+        stacked = series.ema(np.array(rows), 21)
+        for row, closes in zip(stacked, rows):
+            np.testing.assert_array_equal(row, series.ema(closes, 21))
+
+    def test_kline_series_input_matches_list(self):
+        from app.traders.base import KlineSeries
+
+        klines = _make_klines(self._closes(150))
+        packed = KlineSeries.from_candles(klines)
+        calc = IndicatorCalculator()
+
+        assert calc.calculate(packed) == calc.calculate(klines)
+        assert calc.calculate_series(packed).timestamps == [k.timestamp for k in klines]
+        assert calc.calculate_batch([packed, klines[-80:]]) == calc.calculate_batch(
+            [klines, packed[-80:]]
+        )
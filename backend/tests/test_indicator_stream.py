@@ -0,0 +1,280 @@
+"""
+Tests for app.services.indicator_stream.
+
+Covers IndicatorState / StreamingIndicatorEngine: bit-compatibility with
+IndicatorCalculator, incremental ingestion, anchor, gap and revision rebuilds,
+batched updates and vectorized state restores.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import indicator_stream
+from app.services.indicator_calculator import IndicatorCalculator
+from app.services.indicator_stream import (
+    IndicatorState,
+    StreamingIndicatorEngine,
+    get_streaming_indicator_engine,
+    restore_states,
+    timeframe_seconds,
+)
+from app.traders.base import OHLCV
+
+CONFIGS = [
+    None,
+    {
+        "ema_periods": [3, 9],
+        "sma_periods": [5, 30],
+        "rsi_period": 6,
+        "macd_fast": 5,
+        "macd_slow": 13,
+        "macd_signal": 4,
+        "atr_period": 7,
+        "bollinger_period": 10,
+        "bollinger_std": 2.5,
+    },
+    # Fast period longer than slow, disabled RSI / ATR
+    {
+        "macd_fast": 20,
+        "macd_slow": 8,
+        "macd_signal": 3,
+        "rsi_period": 0,
+        "atr_period": 0,
+    },
+]
+
+
+def _random_klines(count, seed=1, start=datetime(2024, 1, 1), step_hours=1):
+    rng = random.Random(seed)
+    price = 100.0
+    klines = []
+    for i in range(count):
+        open_ = price
+        price *= 1 + rng.gauss(0, 0.02)
+        klines.append(
+            OHLCV(
+                timestamp=start + timedelta(hours=i * step_hours),
+                open=open_,
+                high=max(open_, price) * (1 + rng.random() * 0.01),
+                low=min(open_, price) * (1 - rng.random() * 0.01),
+                close=price,
+                volume=rng.uniform(10, 1000),
+            )
+        )
+    return klines
+
+
+class TestIndicatorState:
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_matches_full_recompute_at_every_length(self, config):
+        calc = IndicatorCalculator(config)
+        klines = _random_klines(120)
+        state = IndicatorState(calc)
+        for n, candle in enumerate(klines, start=1):
+            state.ingest(candle)
+            assert state.indicators() == calc.calculate(klines[:n]), n
+
+    def test_empty_state(self):
+        state = IndicatorState(IndicatorCalculator())
+        assert state.indicators() == IndicatorCalculator().calculate([])
+
+    def test_copy_is_independent(self):
+        calc = IndicatorCalculator()
+        klines = _random_klines(80)
+        state = IndicatorState(calc)
+        for candle in klines[:-1]:
+            state.ingest(candle)
+        before = state.indicators()
+
+        preview = state.copy()
+        preview.ingest(klines[-1])
+
+        assert preview.indicators() == calc.calculate(klines)
+        assert state.indicators() == before
+        assert state.count == 79
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_restored_states_match_ingestion(self, config, monkeypatch):
+        monkeypatch.setattr(indicator_stream, "RESTORE_MIN_SERIES", 1)
+        calc = IndicatorCalculator(config)
+        history = [_random_klines(90, seed=s) for s in range(4)]
+        closed_list = [klines[:80] for klines in history]
+        closed_list[3] = closed_list[3][:10]  # too short to seed: ingested
+
+        for state, closed, klines in zip(
+            restore_states(calc, closed_list), closed_list, history
+        ):
+            ingested = IndicatorState(calc)
+            for candle in closed:
+                ingested.ingest(candle)
+            assert state.indicators() == ingested.indicators()
+            assert state.count == len(closed)
+            # Later candles continue the restored recursions
+            for candle in klines[len(closed) :]:
+                state.ingest(candle)
+                ingested.ingest(candle)
+                assert state.indicators() == ingested.indicators()
+
+
+class TestStreamingIndicatorEngine:
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_sliding_fetches_match_anchored_history(self, config):
+        engine = StreamingIndicatorEngine(config)
+        calc = IndicatorCalculator(config)
+        klines = _random_klines(200, seed=3)
+
+        anchor = None
+        for end in range(60, 201):
+            fetch = klines[end - 60 : end]
+            # Re-anchored at the fetch once the state spans two fetch windows
+            if end in (60, 120, 180):
+                anchor = end - 60
+            history = klines[anchor:end]
+
+            # Polls within the candle: same closed candles, forming one moves
+            forming = fetch[-1]
+            early = OHLCV(forming.timestamp, forming.open, forming.high, forming.low,
+                          forming.open, forming.volume / 2)
+            assert engine.update("binance", "BTC/USDT", "1h", fetch[:-1] + [early]) == (
+                calc.calculate(history[:-1] + [early])
+            ), end
+
+            result = engine.update("binance", "BTC/USDT", "1h", fetch)
+            assert result == calc.calculate(history), end
+            # Trailing-window indicators only see the fetched window
+            window = calc.calculate(fetch)
+            assert result.sma == window.sma
+            assert result.bollinger == window.bollinger
+            assert result.volume_sma == window.volume_sma
+
+        assert engine.full_recomputes == 3
+        assert engine.incremental_updates == 2 * 141 - 3
+        # One candle per slide; each anchor restores its 59 closed candles
+        assert engine.candles_ingested == 3 * 59 + 138
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_growing_fetches_stay_incremental(self, config):
+        engine = StreamingIndicatorEngine(config)
+        calc = IndicatorCalculator(config)
+        klines = _random_klines(150, seed=3)
+
+        results = [
+            engine.update("binance", "BTC/USDT", "1h", klines[:end])
+            for end in range(60, 151)
+        ]
+
+        for end, result in zip(range(60, 151), results):
+            assert result == calc.calculate(klines[:end])
+        assert engine.full_recomputes == 1
+        assert engine.incremental_updates == len(results) - 1
+        # Each closed candle is ingested once; the forming one only previewed
+        assert engine.candles_ingested == 149
+
+    def test_repeated_fetch_ingests_nothing(self):
+        engine = StreamingIndicatorEngine()
+        klines = _random_klines(60)
+        first = engine.update("binance", "BTC/USDT", "1h", klines)
+        second = engine.update("binance", "BTC/USDT", "1h", klines)
+        assert first == second
+        assert engine.candles_ingested == 59
+
+    def test_gap_triggers_full_recompute(self):
+        engine = StreamingIndicatorEngine()
+        calc = IndicatorCalculator()
+        klines = _random_klines(200, seed=5)
+
+        engine.update("binance", "BTC/USDT", "1h", klines[:60])
+        # Agent was offline: the next fetch no longer overlaps
+        later = klines[100:160]
+        result = engine.update("binance", "BTC/USDT", "1h", later)
+
+        assert result == calc.calculate(later)
+        assert engine.full_recomputes == 2
+
+    def test_missing_candle_inside_fetch_triggers_rebuild(self):
+        engine = StreamingIndicatorEngine()
+        calc = IndicatorCalculator()
+        klines = _random_klines(80)
+
+        engine.update("binance", "BTC/USDT", "1h", klines[:60])
+        holey = klines[:65] + klines[66:70]
+        result = engine.update("binance", "BTC/USDT", "1h", holey)
+
+        assert result == calc.calculate(holey)
+        assert engine.full_recomputes == 2
+
+    def test_revised_candle_triggers_rebuild(self):
+        engine = StreamingIndicatorEngine()
+        calc = IndicatorCalculator()
+        klines = _random_klines(70)
+        engine.update("binance", "BTC/USDT", "1h", klines[:60])
+
+        # klines[58] was the last closed candle ingested; the exchange revises it
+        revised = list(klines[:61])
+        last = revised[-3]
+        revised[-3] = OHLCV(last.timestamp, last.open, last.high, last.low, 1.0, 1.0)
+        result = engine.update("binance", "BTC/USDT", "1h", revised)
+
+        assert result == calc.calculate(revised)
+        assert engine.full_recomputes == 2
+
+    def test_update_batch_matches_update(self, monkeypatch):
+        monkeypatch.setattr(indicator_stream, "RESTORE_MIN_SERIES", 2)
+        batch_engine = StreamingIndicatorEngine()
+        engine = StreamingIndicatorEngine()
+        history = {f"S{i}": _random_klines(100, seed=i) for i in range(5)}
+
+        for end in (60, 60, 61, 70):
+            fetched = {s: klines[end - 60 : end] for s, klines in history.items()}
+            results = batch_engine.update_batch("binance", "1h", fetched)
+            for symbol, klines in fetched.items():
+                assert results[symbol] == engine.update(
+                    "binance", symbol, "1h", klines
+                )
+        assert batch_engine.full_recomputes == engine.full_recomputes == 5
+        assert batch_engine.incremental_updates == engine.incremental_updates == 15
+
+    def test_series_are_keyed_by_exchange_symbol_timeframe(self):
+        engine = StreamingIndicatorEngine()
+        btc = _random_klines(60, seed=1)
+        eth = _random_klines(60, seed=2)
+        engine.update("binance", "BTC/USDT", "1h", btc)
+        engine.update("binance", "ETH/USDT", "1h", eth)
+        engine.update("okx", "BTC/USDT", "1h", btc)
+        engine.update("binance", "BTC/USDT", "4h", btc)
+
+        assert engine.get_stats()["series"] == 4
+        assert engine.reset(exchange="binance", symbol="BTC/USDT") == 2
+        assert engine.reset() == 2
+
+    def test_least_recently_used_series_evicted(self):
+        engine = StreamingIndicatorEngine(max_series=2)
+        klines = _random_klines(30)
+        for symbol in ("A", "B", "C"):
+            engine.update("binance", symbol, "1h", klines)
+        assert [key[1] for key in engine._states] == ["B", "C"]
+
+    def test_empty_klines(self):
+        engine = StreamingIndicatorEngine()
+        assert engine.update("binance", "BTC/USDT", "1h", []) == (
+            IndicatorCalculator().calculate([])
+        )
+
+    def test_shared_engine_per_config(self):
+        config = {"ema_periods": [7], "rsi_period": 5}
+        assert get_streaming_indicator_engine(config) is get_streaming_indicator_engine(
+            dict(reversed(list(config.items())))
+        )
+        assert get_streaming_indicator_engine(config) is not (
+            get_streaming_indicator_engine({"ema_periods": [8]})
+        )
+
+
+def test_timeframe_seconds():
+    assert timeframe_seconds("1m") == 60
+    assert timeframe_seconds("15m") == 900
+    assert timeframe_seconds("4h") == 14400
+    assert timeframe_seconds("1d") == 86400
+    assert timeframe_seconds("1M") is None
@@ -0,0 +1,209 @@
+"""
+Tests for app.services.kline_buffer.
+
+Covers KlineBufferStore: warm-up, delta fetches that patch the forming
+candle, serving limits from memory, gaps, shared in-flight fetches and
+Redis snapshots.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import kline_buffer
+from app.services.kline_buffer import KlineBufferStore, KlineRingBuffer
+from app.traders.base import OHLCV, KlineSeries
+
+START = datetime(2024, 1, 1)
+HOUR = 3600
+
+
+class FakeExchange:
+    """Hourly candles up to a settable clock; the newest one is still forming."""
+
+    def __init__(self, monkeypatch, hours=200.5):
+        self.now = START.timestamp() + hours * HOUR
+        self.limits = []
+        monkeypatch.setattr(kline_buffer.time, "time", lambda: self.now)
+
+    def _candle(self, i, forming=False):
+        price = 100.0 + i
+        close = price + (self.now % HOUR) / HOUR if forming else price + 0.5
+        return OHLCV(START + timedelta(hours=i), price, price + 1, price - 1, close, 10.0)
+
+    def series(self, limit):
+        newest = int((self.now - START.timestamp()) // HOUR)
+        first = max(newest - limit + 1, 0)
+        return [self._candle(i, forming=i == newest) for i in range(first, newest + 1)]
+
+    async def fetch(self, limit):
+        self.limits.append(limit)
+        return self.series(limit)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+async def _get(store, exchange, limit=168, ttl=1800, **kwargs):
+    return await store.get_klines(
+        "binance", "BTC/USDT", "1h", limit=limit, ttl=ttl, fetch=exchange.fetch, **kwargs
+    )
+
+
+class TestKlineBufferStore:
+    @pytest.mark.asyncio
+    async def test_warm_once_then_delta_fetches(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+
+        klines = await _get(store, exchange)
+        assert isinstance(klines, KlineSeries)
+        assert klines == exchange.series(168)
+        for _ in range(5):
+            exchange.advance(HOUR)
+            assert await _get(store, exchange) == exchange.series(168)
+
+        assert exchange.limits == [168, 3, 3, 3, 3, 3]
+        stats = store.get_stats()
+        assert stats["full_fetches"] == 1
+        assert stats["delta_fetches"] == 5
+        assert stats["candles_fetched"] == 168 + 5 * 3
+
+    @pytest.mark.asyncio
+    async def test_forming_candle_patched_after_ttl(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+        await _get(store, exchange, ttl=60)
+
+        exchange.advance(30)
+        cached = await _get(store, exchange, ttl=60)
+        assert exchange.limits == [168]
+        assert cached[-1] != exchange.series(1)[0]
+
+        exchange.advance(30)
+        refreshed = await _get(store, exchange, ttl=60)
+        assert exchange.limits == [168, 2]
+        assert refreshed == exchange.series(168)
+
+    @pytest.mark.asyncio
+    async def test_smaller_limits_served_from_memory(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+        await _get(store, exchange)
+
+        assert await _get(store, exchange, limit=20) == exchange.series(20)
+        assert exchange.limits == [168]
+        assert store.memory_hits == 1
+
+        # A longer window than buffered needs one full fetch
+        assert await _get(store, exchange, limit=190) == exchange.series(190)
+        assert exchange.limits == [168, 190]
+
+    @pytest.mark.asyncio
+    async def test_gap_longer_than_buffer_rewarms(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+        await _get(store, exchange, limit=24)
+
+        exchange.advance(100 * HOUR)
+        assert await _get(store, exchange, limit=24) == exchange.series(24)
+        assert exchange.limits == [24, 24]
+        assert store.full_fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_fetch(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+
+        results = await asyncio.gather(*(_get(store, exchange) for _ in range(5)))
+        assert all(r == results[0] for r in results)
+        assert exchange.limits == [168]
+
+    @pytest.mark.asyncio
+    async def test_larger_request_does_not_join_smaller_refresh(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+
+        small, large, again = await asyncio.gather(
+            _get(store, exchange, limit=100),
+            _get(store, exchange, limit=190),
+            _get(store, exchange, limit=100),
+        )
+        assert small == again == exchange.series(100)
+        assert large == exchange.series(190)
+        assert exchange.limits == [100, 190]
+
+    @pytest.mark.asyncio
+    async def test_failed_delta_keeps_buffer(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+        warm = await _get(store, exchange)
+
+        async def unavailable(limit):
+            return []
+
+        exchange.advance(HOUR)
+        result = await store.get_klines(
+            "binance", "BTC/USDT", "1h", limit=168, ttl=1800, fetch=unavailable
+        )
+        assert result == warm
+
+    @pytest.mark.asyncio
+    async def test_redis_snapshot_shared_between_processes(self, monkeypatch):
+        import fakeredis.aioredis
+
+        from app.services.redis_service import RedisService
+
+        redis = RedisService(fakeredis.aioredis.FakeRedis())
+
+        async def redis_getter():
+            return redis
+
+        exchange = FakeExchange(monkeypatch)
+        kwargs = {"redis_getter": redis_getter, "redis_key": "dal:kline:test"}
+        await _get(KlineBufferStore(), exchange, **kwargs)
+
+        # Another worker starts from the snapshot
+        assert await _get(KlineBufferStore(), exchange, **kwargs) == exchange.series(168)
+        exchange.advance(HOUR)
+        assert await _get(KlineBufferStore(), exchange, **kwargs) == exchange.series(168)
+        assert exchange.limits == [168, 3]
+
+    @pytest.mark.asyncio
+    async def test_reset(self, monkeypatch):
+        exchange = FakeExchange(monkeypatch)
+        store = KlineBufferStore()
+        await _get(store, exchange)
+        assert store.reset(exchange="okx") == 0
+        assert store.reset(symbol="BTC/USDT", timeframe="1h") == 1
+        await _get(store, exchange)
+        assert exchange.limits == [168, 168]
+
+
+class TestKlineRingBuffer:
+    def test_merge_requires_overlap(self):
+        buffer = KlineRingBuffer(3, "1h")
+        candles = [
+            OHLCV(START + timedelta(hours=i), 1.0, 2.0, 0.5, 1.5, 1.0) for i in range(6)
+        ]
+        buffer.replace(list(reversed(candles[:3])), 0.0)
+        assert buffer.tail(3) == candles[:3]
+
+        assert not buffer.merge(candles[4:], 1.0)
+        assert buffer.merge(candles[2:5], 1.0)
+        assert buffer.tail(10) == candles[2:5]
+        assert buffer.fetched_at == 1.0
+
+    def test_tail_unchanged_by_later_merge(self):
+        buffer = KlineRingBuffer(3, "1h")
+        candles = [
+            OHLCV(START + timedelta(hours=i), 1.0, 2.0, 0.5, 1.5, 1.0) for i in range(4)
+        ]
+        buffer.replace(candles[:3], 0.0)
+        served = buffer.tail(3)
+
+        revised = OHLCV(candles[2].timestamp, 1.0, 3.0, 0.5, 2.5, 2.0)
+        assert buffer.merge([revised, candles[3]], 1.0)
+        assert served == candles[:3]
+        assert buffer.tail(3) == [candles[1], revised, candles[3]]
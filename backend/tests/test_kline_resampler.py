@@ -0,0 +1,159 @@
+"""
+Tests for K-line resampling from a single base timeframe.
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.market_context import OHLCV
+from app.models.strategy import StrategyConfig
+from app.services.kline_resampler import (
+    can_resample,
+    resample_klines,
+    session_offset,
+)
+from app.traders.base import KlineSeries
+
+START = datetime(2024, 1, 1)  # A Monday
+
+
+def _klines(count, minutes=15, start=START):
+    return [
+        OHLCV(
+            start + timedelta(minutes=minutes * i),
+            100.0 + i,
+            101.0 + i + (i % 3),
+            99.0 + i - (i % 4),
+            100.5 + i,
+            1.0 + i % 5,
+        )
+        for i in range(count)
+    ]
+
+
+def _aggregate(chunk):
+    return OHLCV(
+        chunk[0].timestamp,
+        chunk[0].open,
+        max(k.high for k in chunk),
+        min(k.low for k in chunk),
+        chunk[-1].close,
+        sum(k.volume for k in chunk),
+    )
+
+
+class TestResampleKlines:
+    def test_hourly_from_quarter_hours(self):
+        klines = _klines(16)
+        result = resample_klines(klines, "1h")
+        assert isinstance(result, KlineSeries)
+        assert result == [_aggregate(klines[i : i + 4]) for i in range(0, 16, 4)]
+
+    def test_forming_candle_kept_and_partial_leading_dropped(self):
+        # Starts at 00:30, ends at 02:15
+        klines = _klines(8, start=START + timedelta(minutes=30))
+        result = resample_klines(klines, "1h")
+        assert [k.timestamp for k in result] == [
+            START + timedelta(hours=1),
+            START + timedelta(hours=2),
+        ]
+        assert result[-1] == _aggregate(klines[6:])
+
+    def test_only_partial_bucket(self):
+        assert len(resample_klines(_klines(2, start=START + timedelta(minutes=15)), "1h")) == 0
+        assert len(resample_klines([], "1h")) == 0
+
+    def test_weekly_opens_on_monday(self):
+        klines = _klines(21, minutes=24 * 60, start=START - timedelta(days=3))
+        result = resample_klines(klines, "1w")
+        assert [k.timestamp for k in result] == [
+            START,
+            START + timedelta(days=7),
+            START + timedelta(days=14),
+        ]
+        assert result[0] == _aggregate(klines[3:10])
+
+    def test_okx_daily_on_hong_kong_time(self):
+        klines = _klines(48, minutes=60)
+        result = resample_klines(klines, "1d", exchange="okx")
+        assert [k.timestamp for k in result] == [
+            START + timedelta(hours=16),
+            START + timedelta(hours=40),
+        ]
+        assert result[0] == _aggregate(klines[16:40])
+        # 4h candles are UTC-aligned on OKX too
+        assert resample_klines(klines, "4h", exchange="okx")[0].timestamp == START
+
+    def test_keeps_timezone(self):
+        klines = _klines(8, start=START.replace(tzinfo=UTC))
+        assert resample_klines(klines, "1h")[0].timestamp.tzinfo is not None
+
+    def test_session_offset_and_compatibility(self):
+        assert session_offset("binanceusdm", "1d") == 0
+        assert session_offset("okx", "1d") == 16 * 3600
+        assert session_offset("binanceusdm", "1w") == 4 * 86400
+        assert can_resample("15m", "4h")
+        assert can_resample("1h", "1d", "okx")
+        assert not can_resample("4h", "1h")
+        assert not can_resample("1h", "1h")
+        assert not can_resample("15m", "1x")
+        assert not can_resample("7m", "15m")
+        assert not can_resample("5h", "1d", "okx")  # 16:00 is not on the 5h grid
+        with pytest.raises(ValueError):
+            session_offset(None, "bad")
+
+
+class TestDataAccessLayerResampling:
+    @pytest.fixture
+    def trader(self):
+        trader = MagicMock()
+        trader.exchange_name = "binanceusdm"
+        trader.max_kline_limit = 1500
+        # The newest candle is forming, so the buffers stay fresh
+        now = datetime.now(UTC).timestamp()
+        end = datetime.fromtimestamp((now // 900 + 1) * 900, UTC)
+
+        async def get_klines(symbol, timeframe, limit):
+            minutes = {"15m": 15, "1d": 24 * 60}[timeframe]
+            count = min(limit, 1500)
+            return _klines(count, minutes, end - timedelta(minutes=minutes * count))
+
+        trader.get_klines = AsyncMock(side_effect=get_klines)
+        return trader
+
+    @pytest.fixture
+    def dal(self, trader, monkeypatch):
+        from app.services.data_access_layer import DataAccessLayer
+        from app.services.kline_buffer import KlineBufferStore
+
+        monkeypatch.setattr(
+            "app.services.data_access_layer.get_kline_buffers", KlineBufferStore
+        )
+        config = StrategyConfig(
+            timeframes=["15m", "1h", "4h", "1d"], base_timeframe="15m"
+        )
+        dal = DataAccessLayer(trader=trader, config=config)
+        dal._get_redis = AsyncMock(side_effect=RuntimeError("no redis"))
+        return dal
+
+    def test_plan(self, dal):
+        # 90 daily candles do not fit in one 15m fetch
+        assert dal._resample_bases == {"1h": "15m", "4h": "15m"}
+        assert dal._base_limit == 91 * 16
+
+    @pytest.mark.asyncio
+    async def test_one_fetch_for_derived_timeframes(self, dal, trader):
+        klines = {
+            tf: await dal.get_klines("BTC", tf) for tf in ("15m", "1h", "4h", "1d")
+        }
+        fetched = [call.args[1] for call in trader.get_klines.await_args_list]
+        assert fetched == ["15m", "1d"]
+
+        base = await trader.get_klines("BTC", "15m", dal._base_limit)
+        assert klines["15m"] == base[-96:]
+        assert klines["1h"] == resample_klines(base, "1h")[-168:]
+        assert len(klines["4h"]) == 90
+        forming = klines["4h"][-1]
+        assert forming == _aggregate([k for k in base if k.timestamp >= forming.timestamp])
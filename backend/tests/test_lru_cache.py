@@ -0,0 +1,108 @@
+"""
+Tests for app.services.lru_cache.
+"""
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.lru_cache import LRUCache, TieredCache
+
+
+class TestLRUCache:
+    def test_least_recently_used_evicted(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        assert cache.put("c", 3) == [2]
+        assert list(cache) == ["a", "c"]
+        assert cache.get("b") is None
+        assert "b" not in cache
+
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        cache = LRUCache(max_entries=4)
+        cache.put("short", "x", ttl=10)
+        cache.put("forever", "y")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get("short") is None
+        assert cache.get("forever") == "y"
+        assert len(cache) == 1
+
+    def test_pop_and_clear(self):
+        cache = LRUCache(max_entries=4)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+
+class _PrefixedCache(TieredCache):
+    label = "Test cache"
+
+    def __init__(self):
+        super().__init__(max_entries=8)
+        self.lookups: list[bool] = []
+
+    def _redis_key(self, key: str) -> str:
+        return f"t:{key}"
+
+    def _to_redis(self, value: str) -> dict:
+        return {"value": value}
+
+    def _from_redis(self, data):
+        return data.get("value") if isinstance(data, dict) else None
+
+    def _record(self, hit: bool) -> None:
+        self.lookups.append(hit)
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_store_encodes_under_redis_key(self):
+        redis = AsyncMock()
+        cache = _PrefixedCache()
+        await cache.store("k", "v", 30, AsyncMock(return_value=redis))
+        redis.set.assert_awaited_once_with("t:k", {"value": "v"}, ttl=30)
+        assert await cache.lookup("k", 30) == "v"
+        assert cache.lookups == [True]
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_decoded_and_promoted(self):
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value={"value": "v"})
+        cache = _PrefixedCache()
+        getter = AsyncMock(return_value=redis)
+
+        assert await cache.lookup("k", 30, getter) == "v"
+        assert await cache.lookup("k", 30, getter) == "v"
+        redis.get.assert_awaited_once_with("t:k")
+        assert cache.get_stats()["redis_hits"] == 1
+        assert cache.get_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unusable_redis_value_is_a_miss(self):
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value="garbage")
+        cache = _PrefixedCache()
+        assert await cache.lookup("k", 30, AsyncMock(return_value=redis)) is None
+        assert cache.misses == 1
+        assert cache.lookups == [False]
+
+    @pytest.mark.asyncio
+    async def test_entry_stored_while_redis_awaited_is_a_hit(self):
+        cache = _PrefixedCache()
+
+        async def slow_get(key):
+            await cache.store("k", "local", 30)
+            return None
+
+        redis = AsyncMock()
+        redis.get = slow_get
+        assert await cache.lookup("k", 30, AsyncMock(return_value=redis)) == "local"
+        assert cache.memory_hits == 1
+        assert cache.misses == 0
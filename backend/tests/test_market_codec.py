@@ -0,0 +1,123 @@
+"""
+Tests for app.services.market_codec.
+
+Covers binary K-line / funding round trips, timezone handling, compression,
+legacy JSON decoding and rejection of unknown versions.
+"""
+
+import json
+import random
+import struct
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services import market_codec
+from app.services.market_codec import (
+    decode_funding,
+    decode_kline_series,
+    decode_klines,
+    encode_funding,
+    encode_klines,
+    is_binary,
+)
+from app.traders.base import OHLCV, FundingRate, KlineSeries
+
+
+def _klines(count, tz=None):
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1, tzinfo=tz)
+    return [
+        OHLCV(
+            start + timedelta(hours=i),
+            rng.uniform(90, 110),
+            rng.uniform(110, 120),
+            rng.uniform(80, 90),
+            rng.uniform(90, 110),
+            rng.uniform(0, 1e6),
+        )
+        for i in range(count)
+    ]
+
+
+class TestKlineCodec:
+    @pytest.mark.parametrize("tz", [None, UTC])
+    def test_round_trip_is_exact(self, tz):
+        klines = _klines(168, tz)
+        raw = encode_klines(klines, meta=1700000000.5)
+        assert is_binary(raw)
+        assert decode_klines(raw) == (klines, 1700000000.5)
+        assert decode_klines(raw)[0][0].timestamp.tzinfo == tz
+
+    def test_smaller_than_json(self):
+        klines = _klines(168)
+        raw = encode_klines(klines)
+        assert len(raw) < len(json.dumps([k.to_dict() for k in klines])) / 2
+
+    def test_large_payloads_compressed(self):
+        # Flat prices compress well
+        klines = [
+            OHLCV(datetime(2024, 1, 1) + timedelta(minutes=i), 1.0, 1.0, 1.0, 1.0, 0.0)
+            for i in range(1000)
+        ]
+        raw = encode_klines(klines)
+        assert raw[4] & market_codec.FLAG_ZLIB
+        assert len(raw) < 1000 * market_codec.KLINE_DTYPE.itemsize / 4
+        assert decode_klines(raw)[0] == klines
+
+    def test_empty(self):
+        assert decode_klines(encode_klines([])) == ([], 0.0)
+
+    def test_custom_candle_type(self):
+        from app.backtest.data_provider import OHLCV as BacktestOHLCV
+
+        candles, _ = decode_klines(encode_klines(_klines(3)), BacktestOHLCV)
+        assert all(isinstance(c, BacktestOHLCV) for c in candles)
+        assert candles[0].close == _klines(3)[0].close
+
+    @pytest.mark.parametrize("tz", [None, UTC])
+    def test_kline_series_round_trip(self, tz):
+        klines = _klines(168, tz)
+        series = KlineSeries.from_candles(klines)
+        raw = encode_klines(series, meta=2.0)
+        assert raw == encode_klines(klines, meta=2.0)
+        decoded, meta = decode_kline_series(raw)
+        assert isinstance(decoded, KlineSeries)
+        assert (decoded, meta) == (series, 2.0)
+        assert decoded.utc == (tz is not None)
+
+    def test_legacy_json(self):
+        klines = _klines(3)
+        legacy_list = json.dumps([k.to_dict() for k in klines]).encode()
+        legacy_snapshot = json.dumps(
+            {"fetched_at": 42.0, "candles": [k.to_dict() for k in klines]}
+        ).encode()
+        assert decode_klines(legacy_list) == (klines, 0.0)
+        assert decode_klines(legacy_snapshot) == (klines, 42.0)
+        assert not is_binary(legacy_list)
+
+    def test_unknown_version_rejected(self):
+        raw = bytearray(encode_klines(_klines(2)))
+        raw[2] = market_codec.VERSION + 1
+        with pytest.raises(ValueError):
+            decode_klines(bytes(raw))
+
+    def test_kind_mismatch_rejected(self):
+        with pytest.raises(ValueError):
+            decode_klines(encode_funding([]))
+
+
+class TestFundingCodec:
+    def test_round_trip(self):
+        history = [
+            FundingRate(datetime(2024, 1, 1, tzinfo=UTC) + timedelta(hours=8 * i), r)
+            for i, r in enumerate([0.0001, -0.00025, 0.0003])
+        ]
+        raw = encode_funding(history)
+        assert len(raw) == struct.calcsize("<2sBBBd") + 16 * len(history)
+        assert decode_funding(raw) == history
+
+    def test_legacy_json(self):
+        history = [FundingRate(datetime(2024, 1, 1), 0.0001)]
+        raw = json.dumps([f.to_dict() for f in history]).encode()
+        assert decode_funding(raw) == history
@@ -0,0 +1,252 @@
+"""
+Tests for MarketContextBuilder - candle-close-aligned market contexts.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.market_context import OHLCV
+from app.models.strategy import AIStrategyConfig
+from app.services import market_context_builder
+from app.services.data_access_layer import DataAccessLayer
+from app.services.market_context_builder import (
+    MarketContextBuilder,
+    get_market_context_builder,
+    reset_market_context_builder,
+)
+from app.traders.base import MarketData
+
+START = datetime(2024, 1, 1)
+HOUR = 3600
+
+
+def _trader(price=100.0):
+    trader = MagicMock()
+    trader.exchange_name = "binance"
+    trader.max_kline_limit = 1000
+    trader.get_market_data = AsyncMock(
+        side_effect=lambda symbol: MarketData(
+            symbol=symbol,
+            mid_price=price,
+            bid_price=price,
+            ask_price=price,
+            volume_24h=0.0,
+        )
+    )
+    trader.get_klines = AsyncMock(
+        side_effect=lambda symbol, timeframe, limit: [
+            OHLCV(START + timedelta(hours=i), 100.0, 101.0, 99.0, 100.0 + i % 3, 1.0)
+            for i in range(limit)
+        ]
+    )
+    trader.get_funding_history = AsyncMock(return_value=[])
+    return trader
+
+
+def _config(symbols=("BTC", "ETH"), timeframes=("15m", "1h"), base_timeframe=None):
+    return AIStrategyConfig(
+        symbols=list(symbols),
+        timeframes=list(timeframes),
+        base_timeframe=base_timeframe,
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": START.timestamp() + 100 * HOUR + 5}
+    monkeypatch.setattr(market_context_builder.time, "time", lambda: now["t"])
+    return now
+
+
+@pytest.fixture
+def builder(monkeypatch):
+    """A fresh builder whose DataAccessLayers use private caches and no Redis."""
+    from app.services.indicator_cache import IndicatorCache
+    from app.services.indicator_stream import StreamingIndicatorEngine
+    from app.services.kline_buffer import KlineBufferStore
+
+    builder = MarketContextBuilder()
+    dal_module = "app.services.data_access_layer"
+    monkeypatch.setattr(f"{dal_module}.get_market_context_builder", lambda: builder)
+    monkeypatch.setattr(f"{dal_module}.get_kline_buffers", KlineBufferStore)
+    monkeypatch.setattr(f"{dal_module}.get_indicator_cache", IndicatorCache)
+    monkeypatch.setattr(
+        f"{dal_module}.get_streaming_indicator_engine", StreamingIndicatorEngine
+    )
+    monkeypatch.setattr(
+        f"{dal_module}.get_redis_service",
+        AsyncMock(side_effect=RuntimeError("no redis")),
+    )
+    return builder
+
+
+class TestMarketContextBuilder:
+    @pytest.mark.asyncio
+    async def test_agents_share_one_build(self, builder, clock):
+        prices = [100.0, 200.0, 300.0]
+        traders = [_trader(price) for price in prices]
+        for i, trader in enumerate(traders):
+            builder.register(f"agent-{i}", trader, _config())
+        assert len(builder.get_stats()["feeds"]) == 1
+
+        assert await builder.build_due() == 1
+        builds_klines = traders[0].get_klines.await_count
+        assert builds_klines == 4  # 2 symbols x 2 timeframes
+
+        for trader, price in zip(traders, prices):
+            dal = DataAccessLayer(trader=trader, config=_config())
+            contexts = await dal.get_market_contexts(["BTC", "ETH"])
+            assert dal.last_context_timings["precomputed"] is True
+            # Shared K-lines and indicators, the agent's own ticker
+            assert contexts["BTC"].current.mid_price == price
+            assert contexts["BTC"].indicators["1h"].ema
+
+        assert sum(t.get_klines.await_count for t in traders) == builds_klines
+        assert builder.get_stats()["builds"] == 1
+        assert builder.get_stats()["hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_tickers_refreshed_on_lookup(self, builder, clock):
+        builder.register("agent-1", _trader(100.0), _config())
+        await builder.build_due()
+
+        other = _trader(250.0)
+        dal = DataAccessLayer(trader=other, config=_config())
+        contexts = await dal.get_market_contexts(["BTC"])
+        assert contexts["BTC"].current.mid_price == 250.0
+        other.get_klines.assert_not_awaited()
+
+        # The published context itself is untouched
+        published = await builder.get_contexts(
+            "binance", ["15m", "1h"], dal._indicator_config_hash, ["BTC"]
+        )
+        assert published["BTC"].current.mid_price == 100.0
+
+    @pytest.mark.asyncio
+    async def test_uncovered_requests_build_on_demand(self, builder, clock):
+        builder.register("agent-1", _trader(), _config(symbols=["BTC"]))
+        await builder.build_due()
+
+        trader = _trader()
+        dal = DataAccessLayer(trader=trader, config=_config())
+        await dal.get_market_contexts(["BTC", "SOL"])
+        assert "precomputed" not in dal.last_context_timings
+        assert trader.get_klines.await_count == 4
+
+        other_timeframes = DataAccessLayer(trader=_trader(), config=_config(timeframes=["4h"]))
+        await other_timeframes.get_market_contexts(["BTC"])
+        assert "precomputed" not in other_timeframes.last_context_timings
+        assert builder.get_stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_base_timeframe_separates_feeds(self, builder, clock):
+        fetched, resampled = _trader(), _trader()
+        builder.register("agent-1", fetched, _config())
+        builder.register("agent-2", resampled, _config(base_timeframe="15m"))
+        feeds = builder.get_stats()["feeds"]
+        assert [feed["base_timeframe"] for feed in feeds] == [None, "15m"]
+
+        assert await builder.build_due() == 2
+        assert {c.args[1] for c in fetched.get_klines.await_args_list} == {"15m", "1h"}
+        assert {c.args[1] for c in resampled.get_klines.await_args_list} == {"15m"}
+
+        # Each agent reads the contexts of its own feed
+        for agent_id, base in (("agent-1", None), ("agent-2", "15m")):
+            dal = DataAccessLayer(trader=_trader(), config=_config(base_timeframe=base))
+            contexts = await dal.get_market_contexts(["BTC"])
+            assert dal.last_context_timings["precomputed"] is True
+            feed = builder._feeds[builder._agent_feeds[agent_id]]
+            assert contexts["BTC"].indicators == feed.contexts["BTC"].indicators
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_once_after_candle_close(self, builder, clock):
+        trader = _trader()
+        builder.register("agent-1", trader, _config())
+        await builder.build_due()
+        assert await builder.build_due() == 0
+
+        clock["t"] += 15 * 60  # Next 15m close
+        dals = [DataAccessLayer(trader=_trader(), config=_config()) for _ in range(5)]
+        await asyncio.gather(*(dal.get_market_contexts(["BTC", "ETH"]) for dal in dals))
+
+        assert builder.get_stats()["builds"] == 2
+        assert all(dal.last_context_timings.get("precomputed") for dal in dals)
+        assert builder.get_stats()["feeds"][0]["built_for"] == int(clock["t"] // 900) * 900
+
+    @pytest.mark.asyncio
+    async def test_new_symbol_invalidates_feed(self, builder, clock):
+        builder.register("agent-1", _trader(), _config(symbols=["BTC"]))
+        await builder.build_due()
+        builder.register("agent-2", _trader(), _config(symbols=["ETH"]))
+        assert await builder.build_due() == 1
+        assert builder.get_stats()["feeds"][0]["symbols"] == ["BTC", "ETH"]
+
+    @pytest.mark.asyncio
+    async def test_unregister_switches_trader_and_drops_feed(self, builder, clock):
+        first, second = _trader(), _trader()
+        builder.register("agent-1", first, _config(symbols=["BTC"]))
+        builder.register("agent-2", second, _config(symbols=["BTC", "ETH"]))
+
+        builder.unregister_agent("agent-1")
+        await builder.build_due()
+        first.get_klines.assert_not_awaited()
+        assert second.get_klines.await_count == 4
+
+        builder.unregister_agent("agent-2")
+        builder.unregister_agent("unknown")
+        assert builder.get_stats()["feeds"] == []
+
+    @pytest.mark.asyncio
+    async def test_failed_build_falls_back(self, builder, clock):
+        trader = _trader()
+        builder.register("agent-1", trader, _config())
+        feed = next(iter(builder._feeds.values()))
+        feed.dal.build_market_contexts = AsyncMock(side_effect=RuntimeError("down"))
+
+        dal = DataAccessLayer(trader=_trader(), config=_config())
+        contexts = await dal.get_market_contexts(["BTC"])
+        assert set(contexts) == {"BTC"}
+        assert "precomputed" not in dal.last_context_timings
+        assert builder.get_stats()["build_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_loop_builds_after_close(self, builder, monkeypatch):
+        monkeypatch.setattr(
+            market_context_builder.time, "time", lambda: 900.0 * 1000 - 0.05
+        )
+        builder._settle_seconds = 0.0
+        builder.register("agent-1", _trader(), _config())
+        builder.build_due = AsyncMock(return_value=1)
+
+        await builder.start()
+        await asyncio.sleep(0.2)
+        await builder.stop()
+        assert builder.build_due.await_count >= 1
+
+    def test_singleton(self):
+        reset_market_context_builder()
+        assert get_market_context_builder() is get_market_context_builder()
+        reset_market_context_builder()
+
+
+class TestLifecycleRegistration:
+    @pytest.mark.asyncio
+    async def test_register_and_unregister(self, builder, monkeypatch):
+        from app.workers import lifecycle
+
+        monkeypatch.setattr(
+            "app.services.market_context_builder.get_market_context_builder",
+            lambda: builder,
+        )
+        builder.start = AsyncMock(return_value=True)
+
+        config = {"symbols": ["BTC"], "timeframes": ["1h"]}
+        assert await lifecycle.register_market_context_feed("a1", _trader(), config)
+        assert builder.get_stats()["feeds"][0]["symbols"] == ["BTC"]
+        assert not await lifecycle.register_market_context_feed("a2", None, config)
+
+        await lifecycle.unregister_market_context_feed("a1")
+        assert builder.get_stats()["feeds"] == []
@@ -10,7 +10,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.market_codec import decode_klines, encode_klines
 from app.services.market_data_cache import MarketDataCache
+from app.traders.base import OHLCV
 
 
 # ==================== Helpers ====================
@@ -33,6 +35,8 @@ def _mock_redis() -> AsyncMock:
     redis = AsyncMock()
     redis.get = AsyncMock(return_value=None)
     redis.set = AsyncMock(return_value=True)
+    redis.get_bytes = AsyncMock(return_value=None)
+    redis.set_bytes = AsyncMock(return_value=True)
     redis.keys = AsyncMock(return_value=[])
     redis.delete = AsyncMock(return_value=0)
     return redis
@@ -57,8 +61,8 @@ class TestMarketDataCache:
     @pytest.mark.asyncio
     async def test_get_klines_cached(self, cache, redis):
         """Return cached K-line data when present."""
-        klines = [{"open": 50000, "close": 51000}]
-        redis.get.return_value = json.dumps(klines)
+        klines = [OHLCV(datetime(2025, 1, 1), 50000.0, 51000.0, 49000.0, 50500.0, 10.0)]
+        redis.get_bytes.return_value = encode_klines(klines)
 
         result = await cache.get_klines(
             symbol="BTC/USDT",
@@ -68,7 +72,25 @@ class TestMarketDataCache:
         )
 
         assert result == klines
-        redis.get.assert_awaited_once()
+        redis.get_bytes.assert_awaited_once()
+        redis.set_bytes.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_klines_legacy_json_rewritten(self, cache, redis):
+        """Legacy JSON values are decoded and rewritten in the binary format."""
+        klines = [OHLCV(datetime(2025, 1, 1), 50000.0, 51000.0, 49000.0, 50500.0, 10.0)]
+        redis.get_bytes.return_value = json.dumps([k.to_dict() for k in klines]).encode()
+
+        result = await cache.get_klines(
+            symbol="BTC/USDT",
+            timeframe="1h",
+            start_time=datetime(2025, 1, 1),
+            end_time=datetime(2025, 1, 2),
+        )
+
+        assert result == klines
+        rewritten = redis.set_bytes.call_args.args[1]
+        assert decode_klines(rewritten) == (klines, 0.0)
 
     @pytest.mark.asyncio
     async def test_get_klines_not_cached(self, cache, redis):
@@ -101,7 +123,7 @@ class TestMarketDataCache:
     @pytest.mark.asyncio
     async def test_set_klines(self, cache, redis):
         """Cache K-line data with default TTL."""
-        klines = [{"open": 50000, "close": 51000}]
+        klines = [OHLCV(datetime(2025, 1, 1), 50000.0, 51000.0, 49000.0, 50500.0, 10.0)]
 
         result = await cache.set_klines(
             symbol="BTC/USDT",
@@ -112,9 +134,10 @@ class TestMarketDataCache:
         )
 
         assert result is True
-        redis.set.assert_awaited_once()
-        call_kwargs = redis.set.call_args
-        assert call_kwargs.kwargs.get("ex") == MarketDataCache.KLINE_TTL
+        redis.set_bytes.assert_awaited_once()
+        call = redis.set_bytes.call_args
+        assert call.kwargs.get("ttl") == MarketDataCache.KLINE_TTL
+        assert decode_klines(call.args[1]) == (klines, 0.0)
 
     @pytest.mark.asyncio
     async def test_set_klines_custom_ttl(self, cache, redis):
@@ -129,13 +152,13 @@ class TestMarketDataCache:
         )
 
         assert result is True
-        call_kwargs = redis.set.call_args
-        assert call_kwargs.kwargs.get("ex") == 7200
+        call_kwargs = redis.set_bytes.call_args
+        assert call_kwargs.kwargs.get("ttl") == 7200
 
     @pytest.mark.asyncio
     async def test_set_klines_redis_error(self, cache, redis):
         """Return False gracefully on Redis error."""
-        redis.set.side_effect = Exception("write fail")
+        redis.set_bytes.side_effect = Exception("write fail")
 
         result = await cache.set_klines(
             symbol="BTC/USDT",
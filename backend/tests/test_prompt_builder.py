@@ -5,13 +5,15 @@ Covers PromptBuilder: system prompt, user prompt, enhanced user prompt,
 formatting helpers.
 """
 
+from dataclasses import replace
 from datetime import UTC, datetime
+from unittest.mock import patch
 
 import pytest
 
 from app.models.market_context import MarketContext, TechnicalIndicators
 from app.models.strategy import StrategyConfig, TradingMode
-from app.services.prompt_builder import PromptBuilder
+from app.services.prompt_builder import PromptBuilder, clear_prompt_caches
 from app.traders.base import AccountState, FundingRate, MarketData, OHLCV, Position
 
 
@@ -178,6 +180,15 @@ class TestBuildSystemPrompt:
         assert "Hard Constraints" in prompt
         assert "Output Format" in prompt
 
+    def test_system_prompt_byte_stable_across_builders(self):
+        """Provider prefix caches need an identical system prompt every cycle."""
+        config = StrategyConfig(language="zh")
+        first = PromptBuilder(config, TradingMode.BALANCED).build_system_prompt()
+        second = PromptBuilder(
+            StrategyConfig(language="zh"), TradingMode.BALANCED
+        ).build_system_prompt()
+        assert first.encode() == second.encode()
+
 
 class TestBuildUserPrompt:
     def test_basic_user_prompt(self):
@@ -280,6 +291,24 @@ class TestBuildUserPromptWithContext:
         assert "ATR" in prompt
         assert "Bollinger" in prompt
 
+    def test_key_levels_and_trend_strength(self):
+        config = StrategyConfig()
+        pb = PromptBuilder(config)
+        ctx = MarketContext(
+            symbol="BTC",
+            current=_make_market_data(),
+            indicators={"1h": TechnicalIndicators(rsi=55, trend_strength=32.456)},
+            key_levels={
+                "support": [{"price": 49500.0, "timeframes": ["1h", "4h"]}],
+                "resistance": [],
+            },
+        )
+        prompt = pb.build_user_prompt_with_context(_make_account(), {"BTC": ctx})
+        assert "Trend Strength (ADX): 32.5" in prompt
+        assert "Key Levels" in prompt
+        assert "- Support: $49,500.00 (1h, 4h)" in prompt
+        assert "- Resistance" not in prompt
+
     def test_enhanced_prompt_chinese(self):
         config = StrategyConfig(language="zh")
         pb = PromptBuilder(config)
@@ -300,6 +329,91 @@ class TestBuildUserPromptWithContext:
         assert "Your Task" in prompt
 
 
+class TestPromptMemoization:
+    def setup_method(self):
+        clear_prompt_caches()
+
+    def test_system_prompt_rendered_once_per_config(self):
+        config = StrategyConfig()
+        with patch.object(
+            PromptBuilder,
+            "_render_system_prompt",
+            autospec=True,
+            side_effect=lambda pb: f"prompt-{pb.max_positions}",
+        ) as render:
+            first = PromptBuilder(config).build_system_prompt()
+            again = PromptBuilder(StrategyConfig()).build_system_prompt()
+            other = PromptBuilder(config, max_positions=5).build_system_prompt()
+
+        assert first == again == "prompt-3"
+        assert other == "prompt-5"
+        assert render.call_count == 2
+
+    def test_strategy_edit_changes_key(self):
+        before = PromptBuilder(StrategyConfig(language="en")).build_system_prompt()
+        after = PromptBuilder(StrategyConfig(language="zh")).build_system_prompt()
+        assert before != after
+        assert "角色定义" in after
+
+    def test_unchanged_sections_reused_across_contexts(self):
+        pb = PromptBuilder(StrategyConfig())
+        ctx = MarketContext(
+            symbol="BTC",
+            current=_make_market_data(),
+            klines={"1h": [_make_kline() for _ in range(5)]},
+            indicators={"1h": TechnicalIndicators(rsi=55)},
+        )
+        first = pb._format_market_context(ctx)
+
+        # Another agent's context: equal values in new objects, fresh ticker
+        moved = MarketContext(
+            symbol="BTC",
+            current=replace(ctx.current, mid_price=51000.0),
+            klines={"1h": [_make_kline() for _ in range(8)]},
+            indicators={"1h": TechnicalIndicators(rsi=55)},
+        )
+        with patch.object(
+            PromptBuilder, "_format_technical_indicators", autospec=True
+        ) as fmt_ind, patch.object(
+            PromptBuilder, "_format_recent_klines", autospec=True
+        ) as fmt_klines:
+            second = pb._format_market_context(moved)
+
+        fmt_ind.assert_not_called()
+        fmt_klines.assert_not_called()
+        assert "$51,000.00" in second
+        assert second.split("RSI")[1] == first.split("RSI")[1]
+
+    def test_grown_kline_list_rendered_again(self):
+        pb = PromptBuilder(StrategyConfig())
+        klines = [_make_kline(close=50000) for _ in range(5)]
+        ctx = MarketContext(
+            symbol="BTC", current=_make_market_data(), klines={"1h": klines}
+        )
+        first = pb._format_market_context(ctx)
+        klines.append(_make_kline(close=52000))
+        second = pb._format_market_context(ctx)
+        assert first != second
+        assert "C:52,000.00" in second
+
+    def test_sections_cache_holds_text_only(self):
+        from app.services import prompt_builder
+
+        pb = PromptBuilder(StrategyConfig())
+        for i in range(prompt_builder._sections.max_entries + 10):
+            ctx = MarketContext(
+                symbol="BTC",
+                current=_make_market_data(),
+                klines={"1h": [_make_kline(close=50000 + i)]},
+                indicators={"1h": TechnicalIndicators(rsi=i % 100)},
+            )
+            pb._format_market_context(ctx)
+
+        sections = prompt_builder._sections
+        assert len(sections) == sections.max_entries
+        assert all(isinstance(sections.get(key), str) for key in list(sections))
+
+
 class TestGetSymbols:
     def test_default_symbols(self):
         config = StrategyConfig()
@@ -5,16 +5,23 @@ Covers: TaskQueueService, task functions (execute_strategy_cycle, etc.)
 """
 
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 import pytest_asyncio
+from arq.jobs import Job
 
-from app.workers.queue import TaskQueueService
+from app.services.backtest_jobs import (
+    BacktestJobStatus,
+    BacktestJobStore,
+    BacktestProgressRelay,
+)
+from app.workers.queue import BacktestLimitExceeded, TaskQueueService
 from app.workers.tasks import (
     create_trader_from_account,
     execute_strategy_cycle,
+    run_backtest_job,
     start_strategy_execution,
     stop_strategy_execution,
     sync_active_strategies,
@@ -894,13 +901,20 @@ class TestWorkerSettings:
                     password=None,
                 ),
                 worker_max_consecutive_errors=3,
+                backtest_job_timeout=3600,
             )
             
             settings = get_worker_settings()
 
             assert "functions" in settings
-            # 5 original + 3 agent-based + 1 utility (create_daily_snapshots)
-            assert len(settings["functions"]) == 9
+            # 5 original + 3 agent-based + 1 utility + 1 backtest
+            assert len(settings["functions"]) == 10
+            backtest = settings["functions"][-1]
+            assert backtest.name == "run_backtest_job"
+            assert backtest.coroutine is run_backtest_job
+            assert backtest.timeout_s == 3600
+            assert backtest.max_tries == 1
+            assert settings["allow_abort_jobs"] is True
             assert "on_startup" in settings
             assert "on_shutdown" in settings
             assert settings["max_jobs"] == 10
@@ -908,8 +922,10 @@ class TestWorkerSettings:
 
     def test_worker_settings_class(self):
         """Test WorkerSettings class"""
-        # 5 original + 3 agent-based + 1 utility (create_daily_snapshots)
-        assert len(WorkerSettings.functions) == 9
+        # 5 original + 3 agent-based + 1 utility + 1 backtest
+        assert len(WorkerSettings.functions) == 10
+        assert WorkerSettings.functions[-1].name == "run_backtest_job"
+        assert WorkerSettings.functions[-1].max_tries == 1
         assert WorkerSettings.max_jobs == 10
         assert WorkerSettings.job_timeout == 300
         assert WorkerSettings.queue_name == "bitrun:tasks"
@@ -932,6 +948,309 @@ class TestWorkerSettings:
             assert redis_settings["password"] == "secret"
 
 
+# ============================================================================
+# Background Backtest Tests
+# ============================================================================
+
+class TestBacktestJobs:
+    """Tests for queued backtests (submission, cap, cancellation, worker task)"""
+
+    @pytest_asyncio.fixture
+    async def redis(self):
+        from arq import ArqRedis
+        from fakeredis.aioredis import FakeRedis
+
+        fake = FakeRedis()
+        client = ArqRedis(connection_pool=fake.connection_pool)
+        yield client
+        await fake.aclose()
+
+    @pytest.fixture
+    def service(self, redis):
+        return TaskQueueService(redis)
+
+    @pytest.mark.asyncio
+    async def test_submit_backtest(self, service, redis):
+        """Submitting stores a queued job and enqueues the worker task"""
+        job_id = await service.submit_backtest("user-1", "quick", {"a": 1})
+
+        assert job_id.startswith("backtest:")
+        # The stored job must call run_backtest_job with its exact signature
+        info = await Job(job_id, redis, _queue_name=TaskQueueService.QUEUE_NAME).info()
+        assert info.function == "run_backtest_job"
+        assert info.args == (job_id, "user-1", "quick", {"a": 1})
+        assert info.kwargs == {}
+
+        job = await service.get_backtest_job(job_id, "user-1")
+        assert job["status"] == BacktestJobStatus.QUEUED.value
+        assert await service.get_backtest_job(job_id, "user-2") is None
+        assert [j["job_id"] for j in await service.list_backtest_jobs("user-1")] == [
+            job_id
+        ]
+
+    @pytest.mark.asyncio
+    async def test_submit_backtest_concurrency_cap(self, service):
+        """Users cannot exceed the concurrent backtest limit"""
+        with patch("app.workers.queue.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                backtest_max_concurrent_jobs_per_user=2, backtest_job_timeout=60
+            )
+            await service.submit_backtest("user-1", "quick", {})
+            await service.submit_backtest("user-1", "quick", {})
+            with pytest.raises(BacktestLimitExceeded):
+                await service.submit_backtest("user-1", "quick", {})
+
+            # Other users are unaffected
+            assert await service.submit_backtest("user-2", "quick", {})
+
+    @pytest.mark.asyncio
+    async def test_submit_backtest_enqueue_failure(self, service, redis):
+        """A failed enqueue releases the user's slot"""
+        redis.enqueue_job = AsyncMock(side_effect=Exception("Redis error"))
+
+        assert await service.submit_backtest("user-1", "quick", {}) is None
+        assert await service.list_backtest_jobs("user-1") == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_backtest(self, service, redis):
+        """Cancelling a queued job finishes it and frees the slot"""
+        job_id = await service.submit_backtest("user-1", "quick", {})
+
+        assert await service.cancel_backtest(job_id, "user-2") is False
+        with patch("app.workers.queue.Job") as mock_job:
+            mock_job.return_value.abort = AsyncMock(return_value=True)
+            assert await service.cancel_backtest(job_id, "user-1") is True
+
+        job = await service.get_backtest_job(job_id, "user-1")
+        assert job["status"] == BacktestJobStatus.CANCELLED.value
+        assert await service.list_backtest_jobs("user-1") == []
+        # Finished jobs cannot be cancelled again
+        assert await service.cancel_backtest(job_id, "user-1") is False
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_backtest_sets_flag(self, service, redis):
+        """Running jobs are flagged and stop at their next progress update"""
+        job_id = await service.submit_backtest("user-1", "quick", {})
+        store = BacktestJobStore(redis)
+        await store.update(job_id, status=BacktestJobStatus.RUNNING.value)
+
+        assert await service.cancel_backtest(job_id, "user-1") is True
+        assert await store.is_cancel_requested(job_id)
+        job = await store.get(job_id)
+        assert job["status"] == BacktestJobStatus.RUNNING.value
+
+    @staticmethod
+    def _quick_params():
+        return {
+            "symbols": ["BTC"],
+            "start_date": "2024-01-01T00:00:00",
+            "end_date": "2024-01-02T00:00:00",
+            "initial_balance": 10000,
+            "max_leverage": 3,
+            "max_position_ratio": 0.2,
+            "timeframe": "1h",
+            "exchange": "hyperliquid",
+        }
+
+    async def _run_job(self, redis, service, engine_run):
+        job_id = await service.submit_backtest("user-1", "quick", {})
+        user_id = str(uuid4())
+        store = BacktestJobStore(redis)
+        await store.update(job_id, user_id=user_id)
+
+        session = AsyncMock()
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        record = MagicMock(id=uuid4())
+
+        def make_engine(**kwargs):
+            async def run():
+                return await engine_run(kwargs["progress_callback"], job_id)
+
+            engine = MagicMock()
+            engine.cleanup = AsyncMock()
+            engine.run = AsyncMock(side_effect=run)
+            return engine
+
+        with patch("app.workers.tasks.AsyncSessionLocal", return_value=session_cm), \
+             patch("app.backtest.DataProvider") as mock_provider, \
+             patch("app.backtest.BacktestEngine", side_effect=make_engine), \
+             patch(
+                 "app.db.repositories.backtest.BacktestRepository.create_from_result",
+                 new=AsyncMock(return_value=record),
+             ):
+            mock_provider.return_value.initialize = AsyncMock()
+            mock_provider.return_value.load_data = AsyncMock()
+            result = await run_backtest_job(
+                {"redis": redis}, job_id, user_id, "quick", self._quick_params()
+            )
+        return job_id, user_id, record, result, session
+
+    @pytest.mark.asyncio
+    async def test_run_backtest_job_completes(self, service, redis):
+        """The worker task reports progress and persists the result"""
+        async def engine_run(progress, job_id):
+            await progress(50, 100, 10100.0)
+            await progress(100, 100, 10200.0)
+            return MagicMock()
+
+        job_id, user_id, record, result, session = await self._run_job(
+            redis, service, engine_run
+        )
+
+        assert result["status"] == BacktestJobStatus.COMPLETED.value
+        assert result["result_id"] == str(record.id)
+        session.commit.assert_awaited_once()
+        job = await BacktestJobStore(redis).get(job_id)
+        assert job["status"] == BacktestJobStatus.COMPLETED.value
+        assert job["candles_processed"] == 100
+        assert job["equity"] == 10200.0
+        assert job["progress"] == 100.0
+        assert await service.list_backtest_jobs(user_id) == []
+
+    @pytest.mark.asyncio
+    async def test_run_backtest_job_cancelled(self, service, redis):
+        """A cancellation request stops the run without saving a result"""
+        async def engine_run(progress, job_id):
+            await progress(10, 100, 10000.0)
+            await BacktestJobStore(redis).request_cancel(job_id)
+            await progress(20, 100, 10000.0)
+            return MagicMock()
+
+        job_id, _, _, result, session = await self._run_job(
+            redis, service, engine_run
+        )
+
+        assert result["status"] == BacktestJobStatus.CANCELLED.value
+        session.commit.assert_not_awaited()
+        job = await BacktestJobStore(redis).get(job_id)
+        assert job["status"] == BacktestJobStatus.CANCELLED.value
+        assert job["candles_processed"] == 10
+
+    @pytest.mark.asyncio
+    async def test_run_backtest_job_failure(self, service, redis):
+        """Errors are recorded on the job"""
+        async def engine_run(progress, job_id):
+            raise ValueError("No data to backtest")
+
+        job_id, _, _, result, _ = await self._run_job(redis, service, engine_run)
+
+        assert result["status"] == BacktestJobStatus.FAILED.value
+        job = await BacktestJobStore(redis).get(job_id)
+        assert job["error"] == "No data to backtest"
+
+    @pytest.mark.asyncio
+    async def test_run_sweep_job_stores_result_inline(self, service, redis):
+        """Sweeps run in the worker and keep their ranked rows on the job"""
+        job_id = await service.submit_backtest("user-1", "sweep", {})
+        params = {
+            **self._quick_params(),
+            "grid": {"sma_period": [10, 20]},
+            "rank_by": "sharpe_ratio",
+        }
+        rows = {"rank_by": "sharpe_ratio", "combinations": 2, "rows": []}
+
+        with patch("app.backtest.DataProvider") as mock_provider, \
+             patch("app.backtest.sweep.ParameterSweep") as mock_sweep:
+            mock_provider.return_value.initialize = AsyncMock()
+            mock_provider.return_value.load_data = AsyncMock()
+            mock_provider.return_value.close = AsyncMock()
+            mock_provider.return_value.get_store.return_value = [object()] * 48
+            mock_sweep.return_value.run = AsyncMock(
+                return_value=MagicMock(to_dict=MagicMock(return_value=rows))
+            )
+            result = await run_backtest_job(
+                {"redis": redis}, job_id, "user-1", "sweep", params
+            )
+
+        assert result["status"] == BacktestJobStatus.COMPLETED.value
+        mock_sweep.return_value.run.assert_awaited_once_with(
+            {"sma_period": [10, 20]}, rank_by="sharpe_ratio", progress_callback=ANY
+        )
+        job = await BacktestJobStore(redis).get(job_id)
+        assert job["status"] == BacktestJobStatus.COMPLETED.value
+        assert job["result"] == rows
+        assert await service.list_backtest_jobs("user-1") == []
+
+    @pytest.mark.asyncio
+    async def test_running_sweep_can_be_cancelled(self, service, redis):
+        """A cancelled sweep stops at the next finished combination"""
+        import asyncio
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        class OneThreadPool(ThreadPoolExecutor):
+            def __init__(self, max_workers, mp_context, initializer, initargs):
+                super().__init__(max_workers=1)
+
+        gates = [threading.Event() for _ in range(4)]
+        calls = []
+
+        def combination(job):
+            gate = gates[len(calls)]
+            calls.append(job["params"])
+            gate.wait(5)
+            return {"final_balance": 10000.0}
+
+        job_id = await service.submit_backtest("user-1", "sweep", {})
+        params = {
+            **self._quick_params(),
+            "grid": {"sma_period": [10, 20, 30, 40]},
+            "rank_by": "sharpe_ratio",
+        }
+        store = BacktestJobStore(redis)
+
+        with patch("app.backtest.DataProvider") as mock_provider, \
+             patch("app.backtest.sweep.ProcessPoolExecutor", OneThreadPool), \
+             patch("app.backtest.sweep.SharedCandleStore"), \
+             patch("app.backtest.sweep._run_combination", combination):
+            mock_provider.return_value.initialize = AsyncMock()
+            mock_provider.return_value.load_data = AsyncMock()
+            mock_provider.return_value.close = AsyncMock()
+            mock_provider.return_value.get_store.return_value = [object()] * 48
+            task = asyncio.create_task(
+                run_backtest_job({"redis": redis}, job_id, "user-1", "sweep", params)
+            )
+
+            gates[0].set()
+            for _ in range(500):
+                if len(calls) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            # First combination reported, second one running
+            assert (await store.get(job_id))["progress"] == 25.0
+
+            assert await service.cancel_backtest(job_id, "user-1") is True
+            gates[1].set()
+            result = await asyncio.wait_for(task, 5)
+            for gate in gates:
+                gate.set()
+
+        assert result["status"] == BacktestJobStatus.CANCELLED.value
+        # The worker may have picked up the next combination; the last is dropped
+        assert len(calls) < 4
+        job = await store.get(job_id)
+        assert job["status"] == BacktestJobStatus.CANCELLED.value
+        assert job["result"] is None
+        assert await service.list_backtest_jobs("user-1") == []
+
+    @pytest.mark.asyncio
+    async def test_progress_relay_forwards_to_websocket(self):
+        """Published job documents reach the owner's websocket"""
+        with patch(
+            "app.api.websocket.publish_backtest_progress", new=AsyncMock()
+        ) as mock_publish:
+            await BacktestProgressRelay.handle(
+                b'{"job_id": "backtest:1", "user_id": "user-1", "progress": 50}'
+            )
+            await BacktestProgressRelay.handle(b"not json")
+
+        mock_publish.assert_awaited_once()
+        assert mock_publish.call_args[0][0] == "user-1"
+        assert mock_publish.call_args[0][1]["progress"] == 50
+
+
 # ============================================================================
 # Singleton Management Tests
 # ============================================================================
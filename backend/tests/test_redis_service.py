@@ -360,6 +360,16 @@ class TestRedisService:
         
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_bytes_value_round_trip(self, service, mock_redis):
+        """Test binary values are stored and returned as is"""
+        data = b"BK\x01\x00\xff"
+        
+        assert await service.set_bytes("blob", data, ttl=300) is True
+        
+        assert await service.get_bytes("blob") == data
+        assert await service.get_bytes("missing") is None
+
     @pytest.mark.asyncio
     async def test_delete_key(self, service, mock_redis):
         """Test deleting cached value"""
@@ -99,6 +99,7 @@ class TestStrategyEngine:
         ai_response = MagicMock()
         ai_response.content = json.dumps(sample_decision_response)
         ai_response.tokens_used = 500
+        ai_response.cached_tokens = 0
         client.generate = AsyncMock(return_value=ai_response)
         return client
 
@@ -166,6 +167,7 @@ class TestStrategyEngine:
         ai_response = MagicMock()
         ai_response.content = "Invalid JSON response"
         ai_response.tokens_used = 100
+        ai_response.cached_tokens = 0
         mock_ai_client.generate = AsyncMock(return_value=ai_response)
 
         engine = StrategyEngine(
@@ -301,6 +303,7 @@ class TestStrategyEngine:
         ai_response = MagicMock()
         ai_response.content = json.dumps(hold_response)
         ai_response.tokens_used = 100
+        ai_response.cached_tokens = 0
         mock_ai_client.generate = AsyncMock(return_value=ai_response)
 
         engine = StrategyEngine(
@@ -525,6 +528,7 @@ class TestStrategyEngine:
         ai_response = MagicMock()
         ai_response.content = json.dumps(close_response)
         ai_response.tokens_used = 100
+        ai_response.cached_tokens = 0
         mock_ai_client.generate = AsyncMock(return_value=ai_response)
 
         # Account state with stale unrealized_pnl = 0 (simulating MockTrader state issue)
@@ -635,6 +639,146 @@ class TestStrategyEngine:
         # Verify the position service was called to get DB position
         mock_position_service.get_agent_position_for_symbol.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_streamed_decisions_execute_before_stream_ends(
+        self, mock_agent, mock_trader, sample_decision_response
+    ):
+        """Test decisions execute when their array closes, mid-stream."""
+        from app.services.ai.base import (
+            AIClientConfig,
+            AIProvider,
+            AIResponse,
+            AIStreamChunk,
+            BaseAIClient,
+        )
+
+        text = json.dumps(dict(sample_decision_response, next_review_minutes=30))
+        events = []
+
+        class StreamingClient(BaseAIClient):
+            @property
+            def provider(self):
+                return AIProvider.CUSTOM
+
+            async def generate(self, system_prompt, user_prompt, json_mode=True):
+                raise AssertionError("streaming path expected")
+
+            async def generate_stream(self, system_prompt, user_prompt, json_mode=True):
+                for i in range(0, len(text), 16):
+                    events.append("chunk")
+                    yield AIStreamChunk(content=text[i : i + 16])
+                yield AIStreamChunk(
+                    content="",
+                    response=AIResponse(
+                        content=text,
+                        model="test",
+                        provider=AIProvider.CUSTOM,
+                        tokens_used=42,
+                        input_tokens=40,
+                        output_tokens=2,
+                    ),
+                )
+
+            async def test_connection(self):
+                return True
+
+        engine = StrategyEngine(
+            agent=mock_agent,
+            trader=mock_trader,
+            ai_client=StreamingClient(AIClientConfig(api_key="k", model="test")),
+            db_session=None,
+            auto_execute=True,
+            use_enhanced_context=False,
+        )
+        # Streaming is opt-in
+        assert engine._should_stream() is False
+        engine._settings = engine._settings.model_copy(
+            update={"ai_stream_decisions": True}
+        )
+
+        async def execute(decision, account):
+            events.append("execute")
+            return [{"symbol": "BTC", "executed": True}]
+
+        engine._execute_decisions = AsyncMock(side_effect=execute)
+
+        with patch(
+            "app.services.strategy_engine.publish_decision_stream",
+            new_callable=AsyncMock,
+        ) as publish_stream:
+            result = await engine.run_cycle()
+
+        assert result["success"] is True
+        assert result["tokens_used"] == 42
+        assert result["executed"] == [{"symbol": "BTC", "executed": True}]
+        assert result["decision"].overall_confidence == 75
+        engine._execute_decisions.assert_called_once()
+        # Execution was scheduled while chunks were still arriving
+        assert "chunk" in events[events.index("execute") :]
+        streamed = "".join(c.kwargs["delta"] for c in publish_stream.call_args_list)
+        assert streamed == text
+
+    @pytest.mark.asyncio
+    async def test_stream_failing_after_execution_keeps_executed_decisions(
+        self, mock_agent, mock_trader, sample_decision_response
+    ):
+        """Test orders placed before a stream drop are still recorded."""
+        from app.services.ai.base import (
+            AIClientConfig,
+            AIProvider,
+            AIStreamChunk,
+            BaseAIClient,
+        )
+
+        text = json.dumps(sample_decision_response)
+        # The connection drops after the decisions array, before the final chunk
+        cut = text.index('"overall_confidence"')
+
+        class DroppingClient(BaseAIClient):
+            @property
+            def provider(self):
+                return AIProvider.CUSTOM
+
+            async def generate(self, system_prompt, user_prompt, json_mode=True):
+                raise AssertionError("streaming path expected")
+
+            async def generate_stream(self, system_prompt, user_prompt, json_mode=True):
+                for i in range(0, cut, 16):
+                    yield AIStreamChunk(content=text[i : min(i + 16, cut)])
+                raise ConnectionError("connection reset")
+
+            async def test_connection(self):
+                return True
+
+        engine = StrategyEngine(
+            agent=mock_agent,
+            trader=mock_trader,
+            ai_client=DroppingClient(AIClientConfig(api_key="k", model="test")),
+            db_session=None,
+            auto_execute=True,
+            use_enhanced_context=False,
+        )
+        engine._settings = engine._settings.model_copy(
+            update={"ai_stream_decisions": True}
+        )
+        executed = [{"symbol": "BTC", "executed": True}]
+        engine._execute_decisions = AsyncMock(return_value=executed)
+        engine._save_decision_record = AsyncMock(return_value=None)
+
+        with patch(
+            "app.services.strategy_engine.publish_decision_stream",
+            new_callable=AsyncMock,
+        ):
+            result = await engine.run_cycle()
+
+        assert result["success"] is True
+        assert result["executed"] == executed
+        engine._execute_decisions.assert_called_once()
+        record = engine._save_decision_record.call_args.kwargs
+        assert record["execution_results"] == executed
+        assert [d.symbol for d in record["decision"].decisions] == ["BTC"]
+        assert record["raw_response"] == text[:cut]
+
 
 class TestStrategyEnginePromptBuilding:
     """Tests for prompt building in strategy engine."""
@@ -717,6 +861,7 @@ class TestStrategyEnginePromptBuilding:
                 "overall_confidence": 50
             })
             response.tokens_used = 100
+            response.cached_tokens = 0
             return response
 
         mock_ai_client.generate = capture_generate
@@ -998,6 +998,65 @@ class TestOHLCVChangePercent:
         assert candle.change_percent == pytest.approx(-5.0)
 
 
+# ============================================================================
+# KlineSeries
+# ============================================================================
+
+CCXT_ROWS = [
+    [1704067200000 + i * 3_600_000, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0 * i]
+    for i in range(5)
+]
+
+
+class TestKlineSeries:
+    def test_matches_ohlcv_list(self):
+        from app.traders.base import OHLCV, KlineSeries
+        klines = KlineSeries.from_ccxt(CCXT_ROWS)
+        candles = [OHLCV.from_ccxt(row) for row in CCXT_ROWS]
+
+        assert len(klines) == 5
+        assert klines == candles
+        assert klines[-1] == candles[-1]
+        assert list(klines) == candles
+        assert klines.timestamps == [c.timestamp for c in candles]
+        assert klines.closes.tolist() == [c.close for c in candles]
+
+    def test_columns_and_slices_are_views(self):
+        import numpy as np
+        from app.traders.base import KlineSeries
+        klines = KlineSeries.from_ccxt(CCXT_ROWS)
+
+        assert np.shares_memory(klines.closes, klines.values)
+        window = klines[-3:]
+        assert isinstance(window, KlineSeries)
+        assert np.shares_memory(window.highs, klines.values)
+        assert window == KlineSeries.from_ccxt(CCXT_ROWS[-3:])
+        with pytest.raises(ValueError):
+            klines.closes[0] = 0.0
+
+    def test_from_candles_round_trip(self):
+        from app.traders.base import OHLCV, KlineSeries
+        candles = [OHLCV.from_ccxt(row) for row in CCXT_ROWS]
+        aware = [
+            OHLCV(c.timestamp.replace(tzinfo=UTC), c.open, c.high, c.low, c.close, c.volume)
+            for c in candles
+        ]
+
+        assert KlineSeries.from_candles(candles) == KlineSeries.from_ccxt(CCXT_ROWS)
+        assert KlineSeries.from_candles(aware).utc
+        assert KlineSeries.from_candles(aware) == aware
+        packed = KlineSeries.from_candles(candles)
+        assert KlineSeries.coerce(packed) is packed
+
+    def test_empty_and_invalid(self):
+        from app.traders.base import KlineSeries
+        assert not KlineSeries.from_ccxt([])
+        assert KlineSeries([]) == []
+        assert KlineSeries([]).closes.tolist() == []
+        with pytest.raises(ValueError):
+            KlineSeries([[1, 2, 3]])
+
+
 # ============================================================================
 # BaseTrader.open_long, open_short, _ensure_initialized
 # ============================================================================